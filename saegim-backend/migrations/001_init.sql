@@ -53,18 +53,247 @@ CREATE TABLE IF NOT EXISTS pages (
 
     annotation_data JSONB DEFAULT '{}'::jsonb,
     auto_extracted_data JSONB DEFAULT NULL,
+    partial_extracted_data JSONB DEFAULT NULL,
+    image_phash BIGINT DEFAULT NULL,
 
     status VARCHAR(20) NOT NULL DEFAULT 'pending'
         CHECK (status IN ('pending', 'in_progress', 'submitted', 'reviewed')),
     assigned_to UUID REFERENCES users(id) ON DELETE SET NULL,
     locked_at TIMESTAMPTZ DEFAULT NULL,
-    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    version INT NOT NULL DEFAULT 1
 );
 
 CREATE INDEX IF NOT EXISTS idx_pages_document_id ON pages(document_id);
 CREATE INDEX IF NOT EXISTS idx_pages_status ON pages(status);
 CREATE INDEX IF NOT EXISTS idx_pages_assigned_to ON pages(assigned_to);
-CREATE INDEX IF NOT EXISTS idx_pages_annotation ON pages USING GIN (annotation_data);
+-- annotation_data no longer holds layout elements (see page_elements), so a
+-- GIN index on it only slows down writes
+DROP INDEX IF EXISTS idx_pages_annotation;
+
+-- Columns added after the initial schema (no-ops on fresh databases)
+ALTER TABLE pages ADD COLUMN IF NOT EXISTS image_phash BIGINT DEFAULT NULL;
+ALTER TABLE pages ADD COLUMN IF NOT EXISTS version INT NOT NULL DEFAULT 1;
+ALTER TABLE pages ADD COLUMN IF NOT EXISTS partial_extracted_data JSONB DEFAULT NULL;
+
+COMMENT ON COLUMN pages.image_phash IS '64-bit perceptual hash of the page image for blank/duplicate page detection';
+COMMENT ON COLUMN pages.version IS 'Incremented on every change to the page representation; exposed as the ETag';
+COMMENT ON COLUMN pages.partial_extracted_data IS 'Elements received so far while an extraction is streaming; cleared when it ends';
+
+-- Partial results used to be written to auto_extracted_data; a failed
+-- stream left them there, truncated. Drop them so the page can be re-extracted.
+UPDATE pages
+SET auto_extracted_data = NULL
+WHERE auto_extracted_data->'extra'->'partial' = 'true'::jsonb;
+
+-- Extraction results per engine configuration (kept side by side for comparison)
+CREATE TABLE IF NOT EXISTS page_extraction_results (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    page_id UUID NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    engine_key CHAR(64) NOT NULL,
+    engine_type VARCHAR(50) NOT NULL,
+    engine_id VARCHAR(50) DEFAULT NULL,
+    result JSONB NOT NULL,
+    duration_ms INT DEFAULT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE (page_id, engine_key)
+);
+
+COMMENT ON COLUMN page_extraction_results.engine_key IS 'SHA-256 of the canonical engine configuration that produced the result';
+
+-- Layout elements, one row per entry of annotation_data.layout_dets.
+-- pages.annotation_data keeps page_attribute and extra, with an empty
+-- layout_dets placeholder; page_annotation() reassembles the document.
+CREATE TABLE IF NOT EXISTS page_elements (
+    page_id UUID NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+    position INT NOT NULL,
+    anno_id INT DEFAULT NULL,
+    category_type VARCHAR(50) DEFAULT NULL,
+    poly JSONB DEFAULT NULL,
+    text TEXT DEFAULT NULL,
+    latex TEXT DEFAULT NULL,
+    html TEXT DEFAULT NULL,
+    attribute JSONB DEFAULT NULL,
+    ignore BOOLEAN DEFAULT NULL,
+    reading_order INT DEFAULT NULL,
+    extra JSONB NOT NULL DEFAULT '{}'::jsonb,
+    PRIMARY KEY (page_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_page_elements_anno_id ON page_elements(page_id, anno_id);
+CREATE INDEX IF NOT EXISTS idx_page_elements_category ON page_elements(category_type);
+
+COMMENT ON COLUMN page_elements.position IS 'Index of the element in layout_dets (gaps allowed)';
+COMMENT ON COLUMN page_elements.extra IS 'Element keys without a column of their own, or of an unexpected type';
+
+-- Split a layout_det object into a page_elements row. Keys go to their
+-- column only if they have the expected JSON type; everything else stays
+-- in extra, so page_element_json() returns the element unchanged.
+CREATE OR REPLACE FUNCTION layout_det_row(p_page_id UUID, p_position INT, p_det JSONB)
+RETURNS page_elements
+LANGUAGE sql IMMUTABLE AS $$
+    WITH typed AS (
+        SELECT
+            jsonb_typeof(p_det->'anno_id') = 'number'
+                AND p_det->>'anno_id' ~ '^-?[0-9]{1,9}$' AS has_anno_id,
+            jsonb_typeof(p_det->'category_type') = 'string'
+                AND length(p_det->>'category_type') <= 50 AS has_category_type,
+            jsonb_typeof(p_det->'poly') = 'array' AS has_poly,
+            jsonb_typeof(p_det->'text') = 'string' AS has_text,
+            jsonb_typeof(p_det->'latex') = 'string' AS has_latex,
+            jsonb_typeof(p_det->'html') = 'string' AS has_html,
+            jsonb_typeof(p_det->'attribute') = 'object' AS has_attribute,
+            jsonb_typeof(p_det->'ignore') = 'boolean' AS has_ignore,
+            jsonb_typeof(p_det->'order') = 'number'
+                AND p_det->>'order' ~ '^-?[0-9]{1,9}$' AS has_order
+    )
+    SELECT
+        p_page_id,
+        p_position,
+        CASE WHEN has_anno_id THEN (p_det->>'anno_id')::int END,
+        CASE WHEN has_category_type THEN p_det->>'category_type' END,
+        CASE WHEN has_poly THEN p_det->'poly' END,
+        CASE WHEN has_text THEN p_det->>'text' END,
+        CASE WHEN has_latex THEN p_det->>'latex' END,
+        CASE WHEN has_html THEN p_det->>'html' END,
+        CASE WHEN has_attribute THEN p_det->'attribute' END,
+        CASE WHEN has_ignore THEN (p_det->>'ignore')::boolean END,
+        CASE WHEN has_order THEN (p_det->>'order')::int END,
+        CASE
+            WHEN jsonb_typeof(p_det) = 'object' THEN p_det - array_remove(ARRAY[
+                CASE WHEN has_anno_id THEN 'anno_id' END,
+                CASE WHEN has_category_type THEN 'category_type' END,
+                CASE WHEN has_poly THEN 'poly' END,
+                CASE WHEN has_text THEN 'text' END,
+                CASE WHEN has_latex THEN 'latex' END,
+                CASE WHEN has_html THEN 'html' END,
+                CASE WHEN has_attribute THEN 'attribute' END,
+                CASE WHEN has_ignore THEN 'ignore' END,
+                CASE WHEN has_order THEN 'order' END
+            ], NULL)
+            ELSE p_det
+        END
+    FROM typed
+$$;
+
+-- Rebuild the layout_det object of a page_elements row
+CREATE OR REPLACE FUNCTION page_element_json(e page_elements)
+RETURNS JSONB
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(e.extra) <> 'object' THEN e.extra
+        ELSE e.extra
+            || jsonb_strip_nulls(jsonb_build_object(
+                'anno_id', e.anno_id,
+                'category_type', e.category_type,
+                'text', e.text,
+                'latex', e.latex,
+                'html', e.html,
+                'ignore', e.ignore,
+                'order', e.reading_order
+            ))
+            || CASE WHEN e.poly IS NULL THEN '{}'::jsonb
+                    ELSE jsonb_build_object('poly', e.poly) END
+            || CASE WHEN e.attribute IS NULL THEN '{}'::jsonb
+                    ELSE jsonb_build_object('attribute', e.attribute) END
+    END
+$$;
+
+-- Full OmniDocBench annotation of a page (annotation_data + its elements)
+CREATE OR REPLACE FUNCTION page_annotation(p_page_id UUID, p_annotation JSONB)
+RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(p_annotation->'layout_dets') = 'array' THEN jsonb_set(
+            p_annotation,
+            '{layout_dets}',
+            COALESCE(
+                (
+                    SELECT jsonb_agg(page_element_json(e) ORDER BY e.position)
+                    FROM page_elements e
+                    WHERE e.page_id = p_page_id
+                ),
+                '[]'::jsonb
+            )
+        )
+        ELSE p_annotation
+    END
+$$;
+
+CREATE OR REPLACE VIEW page_annotations AS
+SELECT id AS page_id, page_annotation(id, annotation_data) AS annotation_data
+FROM pages;
+
+-- Move layout_dets still embedded in annotation_data into page_elements
+-- (no-op once every page has been split)
+INSERT INTO page_elements
+SELECT r.*
+FROM pages p
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(p.annotation_data->'layout_dets') = 'array'
+         THEN p.annotation_data->'layout_dets' ELSE '[]'::jsonb END
+) WITH ORDINALITY AS d(det, n)
+CROSS JOIN LATERAL layout_det_row(p.id, (d.n - 1)::int, d.det) AS r
+ON CONFLICT (page_id, position) DO NOTHING;
+
+UPDATE pages
+SET annotation_data = jsonb_set(annotation_data, '{layout_dets}', '[]'::jsonb)
+WHERE jsonb_typeof(annotation_data->'layout_dets') = 'array'
+  AND jsonb_array_length(annotation_data->'layout_dets') > 0;
+
+-- Change feed: every page or document change sends a small JSON event on
+-- the saegim_changes channel when its transaction commits. Each API worker
+-- LISTENs on one connection and fans events out to its subscribers.
+CREATE OR REPLACE FUNCTION notify_page_change()
+RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('saegim_changes', json_build_object(
+        'kind', 'page',
+        'op', lower(TG_OP),
+        'page_id', NEW.id,
+        'document_id', NEW.document_id,
+        'project_id', (SELECT project_id FROM documents WHERE id = NEW.document_id),
+        'status', NEW.status,
+        'version', NEW.version,
+        'assigned_to', NEW.assigned_to,
+        'locked', NEW.locked_at IS NOT NULL
+    )::text);
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE TRIGGER pages_notify_change
+AFTER INSERT OR UPDATE OF status, version, assigned_to, locked_at ON pages
+FOR EACH ROW EXECUTE FUNCTION notify_page_change();
+
+CREATE OR REPLACE FUNCTION notify_document_change()
+RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    d documents;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        d := OLD;
+    ELSE
+        d := NEW;
+    END IF;
+    PERFORM pg_notify('saegim_changes', json_build_object(
+        'kind', 'document',
+        'op', lower(TG_OP),
+        'document_id', d.id,
+        'project_id', d.project_id,
+        'status', d.status,
+        'total_pages', d.total_pages
+    )::text);
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE TRIGGER documents_notify_change
+AFTER INSERT OR DELETE OR UPDATE OF status, total_pages ON documents
+FOR EACH ROW EXECUTE FUNCTION notify_document_change();
 
 -- Task history table
 CREATE TABLE IF NOT EXISTS task_history (
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Start the shared local layout server.
+
+Runs one process per node that owns the layout models and serves
+``detect_layout`` requests to every API worker.  Point split pipeline
+engines at it with ``layout_server_url`` (e.g. ``http://127.0.0.1:5100``
+or ``unix:///run/saegim/layout.sock``).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+src_path = Path(__file__).parent.parent / 'src'
+sys.path.insert(0, str(src_path))
+
+import uvicorn  # noqa: E402
+
+from saegim.api.settings import get_settings  # noqa: E402
+from saegim.services.inference_options import InferenceOptions  # noqa: E402
+from saegim.services.layout_server import create_layout_server_app  # noqa: E402
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1', help='Bind host (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=5100, help='Bind port (default: 5100)')
+    parser.add_argument('--uds', default=None, help='Listen on a Unix domain socket instead')
+    parser.add_argument('--max-batch-size', type=int, default=8, help='Pages per forward pass')
+    parser.add_argument(
+        '--max-wait-ms',
+        type=float,
+        default=20.0,
+        help='How long a request waits for others to share its batch',
+    )
+    parser.add_argument('--device', default=None, help='Torch device (cpu, cuda, cuda:1, mps)')
+    parser.add_argument('--num-threads', type=int, default=None, help='Torch intra-op threads')
+    parser.add_argument('--interop-threads', type=int, default=None, help='Torch inter-op threads')
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Start the layout server with uvicorn."""
+    args = _parse_args()
+    settings = get_settings()
+
+    app = create_layout_server_app(
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        options=InferenceOptions(
+            device=args.device,
+            num_threads=args.num_threads,
+            num_interop_threads=args.interop_threads,
+        ),
+        image_root=Path(settings.storage_path),
+    )
+
+    # A single process by design: it is the one copy of the models on this node
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port,
+        uds=args.uds,
+        workers=1,
+        log_level=settings.log_level.lower(),
+        access_log=False,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""Negotiated brotli/gzip compression of JSON responses."""
+
+import asyncio
+import functools
+import gzip
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Supported content codings, in server preference order for equal q-values
+ENCODINGS = ('br', 'gzip')
+
+# Bodies at least this large are compressed in a worker thread
+_THREAD_MINIMUM_SIZE = 128 * 1024
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the content coding for a response from an Accept-Encoding header.
+
+    q-values are honoured: ``gzip;q=0`` refuses gzip, and ``*`` covers
+    codings that are not listed themselves. Among acceptable codings the
+    highest q-value wins, brotli before gzip on a tie.
+
+    Args:
+        accept_encoding: Accept-Encoding request header value.
+
+    Returns:
+        ``'br'``, ``'gzip'``, or None to send the body uncompressed.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.partition('=')
+        if name.strip().lower() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best: str | None = None
+    best_quality = 0.0
+    for coding in ENCODINGS:
+        aliases = ('gzip', 'x-gzip') if coding == 'gzip' else (coding,)
+        listed = [qualities[alias] for alias in aliases if alias in qualities]
+        quality = listed[0] if listed else qualities.get('*', 0.0)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """Derive the entity tag of a compressed representation.
+
+    A compressed body is a different representation than the identity
+    body, so it must not share its strong validator (RFC 9110 8.8.3).
+
+    Args:
+        etag: Entity tag of the uncompressed body, e.g. ``"7"``.
+        coding: Content coding applied to the body.
+
+    Returns:
+        Entity tag with the coding appended, e.g. ``"7-gzip"``.
+    """
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+
+class JSONCompressionMiddleware:
+    """Compress JSON responses with brotli or gzip for clients that accept it.
+
+    Only complete ``application/json`` bodies of at least ``minimum_size``
+    bytes are compressed. Page images and ZIP archives are already
+    compressed and pass through untouched, as do streaming responses and
+    responses that already carry a Content-Encoding. A compressed response
+    gets an ETag suffixed with its coding (see ``encoded_etag``).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application.
+            minimum_size: Smallest body in bytes worth compressing.
+            compresslevel: gzip compression level (1-9).
+            brotli_quality: brotli quality (0-11).
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request, compressing its JSON response if negotiated."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        coding = negotiate_encoding(request_headers.get('accept-encoding', ''))
+        held: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal held
+            if message['type'] == 'http.response.start':
+                headers = Headers(raw=message['headers'])
+                if message['status'] == 304:
+                    _restore_encoded_etag(message, request_headers.get('if-none-match', ''))
+                    await send(message)
+                    return
+                media_type = headers.get('content-type', '').partition(';')[0].strip().lower()
+                if media_type == 'application/json' and 'content-encoding' not in headers:
+                    held = message
+                    return
+                await send(message)
+                return
+            if held is None or message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            start, held = held, None
+            headers = MutableHeaders(raw=start['headers'])
+            headers.add_vary_header('Accept-Encoding')
+            body = message.get('body', b'')
+            if coding is None or message.get('more_body', False) or len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._compress(body, coding)
+            headers['Content-Encoding'] = coding
+            headers['Content-Length'] = str(len(compressed))
+            if 'etag' in headers:
+                headers['ETag'] = encoded_etag(headers['etag'], coding)
+            await send(start)
+            await send({**message, 'body': compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress(self, body: bytes, coding: str) -> bytes:
+        """Compress a response body, off the event loop when it is large.
+
+        Args:
+            body: Uncompressed response body.
+            coding: ``'br'`` or ``'gzip'``.
+
+        Returns:
+            Compressed body.
+        """
+        if coding == 'br':
+            compress = functools.partial(brotli.compress, body, quality=self.brotli_quality)
+        else:
+            compress = functools.partial(gzip.compress, body, self.compresslevel, mtime=0)
+        if len(body) >= _THREAD_MINIMUM_SIZE:
+            return await asyncio.to_thread(compress)
+        return compress()
+
+
+def _restore_encoded_etag(start: Message, if_none_match: str) -> None:
+    """Echo the compressed ETag the client validated in a 304 response.
+
+    A 304 has no body, so the handler sets the identity ETag. If the client's
+    cached copy is a compressed representation, the 304 must carry that
+    representation's ETag instead.
+
+    Args:
+        start: ``http.response.start`` message of the 304 response.
+        if_none_match: If-None-Match request header value.
+    """
+    headers = MutableHeaders(raw=start['headers'])
+    etag = headers.get('etag')
+    if etag is None:
+        return
+    listed = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    for coding in ENCODINGS:
+        if encoded_etag(etag, coding) in listed:
+            headers['ETag'] = encoded_etag(etag, coding)
+            return
@@ -1,4 +1,4 @@
-"""FastAPI dependency injection for authentication and authorization."""
+"""FastAPI dependency injection for authentication, authorization and preconditions."""
 
 import datetime
 import hashlib
@@ -9,9 +9,10 @@ import uuid
 import asyncpg
 import bcrypt
 import jwt
-from fastapi import Depends, HTTPException, Response, status
+from fastapi import Depends, Header, HTTPException, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from saegim.api.compression import ENCODINGS
 from saegim.api.settings import Settings, get_settings
 from saegim.core.database import get_pool
 from saegim.repositories import project_member_repo, refresh_token_repo, user_repo
@@ -348,3 +349,88 @@ def clear_refresh_cookie(response: Response, settings: Settings) -> None:
         samesite=settings.refresh_cookie_samesite,
         path='/api/v1/auth',
     )
+
+
+def page_etag(version: int) -> str:
+    """Build the ETag of a page version.
+
+    Args:
+        version: Page version.
+
+    Returns:
+        str: Strong entity tag, e.g. ``"7"``.
+    """
+    return f'"{version}"'
+
+
+def _etag_version(tag: str) -> int | None:
+    """Parse the page version out of a strong entity tag.
+
+    Compressed responses carry the coding as a suffix (``"7-gzip"``, see
+    ``compression.encoded_etag``); it names the same page version.
+
+    Args:
+        tag: Entity tag, e.g. ``"7"`` or ``"7-br"``.
+
+    Returns:
+        int or None: Page version, or None if the tag is not a page ETag.
+    """
+    if len(tag) < 3 or tag[0] != '"' or tag[-1] != '"':
+        return None
+    version, separator, coding = tag[1:-1].partition('-')
+    if not version.isdigit() or (separator and coding not in ENCODINGS):
+        return None
+    return int(version)
+
+
+def etag_matches(header: str, version: int) -> bool:
+    """Check an If-None-Match header against a page version (weak comparison).
+
+    Args:
+        header: If-None-Match header value.
+        version: Current page version.
+
+    Returns:
+        bool: True if any listed entity tag (or ``*``) matches, in any
+        content coding.
+    """
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag == '*' or _etag_version(tag.removeprefix('W/')) == version:
+            return True
+    return False
+
+
+def get_expected_version(
+    if_match: str | None = Header(default=None),
+) -> int | None:
+    """Parse the If-Match header of a page mutation into the expected version.
+
+    Args:
+        if_match: If-Match header value.
+
+    Returns:
+        int or None: Version the client last saw, or None if the header is
+        absent or ``*``.
+
+    Raises:
+        HTTPException: 412 for weak or unparsable entity tags (they can never
+            match under strong comparison), 400 for several entity tags.
+    """
+    if if_match is None or if_match.strip() == '*':
+        return None
+
+    tags = [tag.strip() for tag in if_match.split(',')]
+    if len(tags) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='If-Match with several entity tags is not supported',
+        )
+    tag = tags[0]
+    version = _etag_version(tag)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f'If-Match {tag} does not match any page version',
+        )
+    return version
@@ -3,6 +3,7 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi.responses import Response
 
 from saegim.api.deps import get_current_user
 from saegim.api.settings import Settings, get_settings
@@ -105,15 +106,18 @@ async def upload_document(
 @router.post('/documents/{document_id}/re-extract', response_model=DocumentStatusResponse)
 async def re_extract_document(
     document_id: uuid.UUID,
+    force: bool = False,
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
 ) -> DocumentStatusResponse:
     """Re-run extraction on all pages using the current OCR engine.
 
     Useful after changing the project's OCR engine to re-scan
-    existing documents with the new engine.
+    existing documents with the new engine. Pages that already have a
+    result for the current engine configuration reuse it.
 
     Args:
         document_id: Document UUID.
+        force: Re-run the engine even for pages with a stored result.
 
     Returns:
         DocumentStatusResponse: Updated document status.
@@ -126,7 +130,7 @@ async def re_extract_document(
     pool = get_pool()
 
     try:
-        result = await document_service.re_extract(pool, document_id)
+        result = await document_service.re_extract(pool, document_id, force=force)
     except LookupError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -237,14 +241,16 @@ async def get_document_status(
 async def list_document_pages(
     document_id: uuid.UUID,
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> list[PageListResponse]:
+) -> Response:
     """List all pages for a document.
 
+    The list is built as JSON by the database and returned as is.
+
     Args:
         document_id: Document UUID.
 
     Returns:
-        list[PageListResponse]: Pages in the document.
+        Response: JSON list of PageListResponse items.
 
     Raises:
         HTTPException: If document not found.
@@ -254,5 +260,5 @@ async def list_document_pages(
     if doc is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Document not found')
 
-    pages = await page_repo.list_by_document(pool, document_id)
-    return [PageListResponse.model_validate(dict(r)) for r in pages]
+    pages = await page_repo.list_by_document_json(pool, document_id)
+    return Response(content=pages, media_type='application/json')
@@ -0,0 +1,106 @@
+"""Server-sent change events for pages, documents and projects."""
+
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from saegim.api.deps import get_current_user, require_project_member
+from saegim.core.change_feed import get_change_feed
+from saegim.schemas.user import UserResponse
+
+router = APIRouter()
+
+# Seconds of silence before a keepalive comment is sent, so proxies keep
+# the stream open
+KEEPALIVE_SECONDS = 15.0
+
+# Milliseconds an EventSource client waits before reconnecting
+_RETRY_MS = 5000
+
+
+def format_event(event: dict[str, Any]) -> str:
+    """Format a change event as a server-sent event.
+
+    Args:
+        event: Change event.
+
+    Returns:
+        SSE message named after the event kind.
+    """
+    return f'event: {event["kind"]}\ndata: {json.dumps(event, separators=(",", ":"))}\n\n'
+
+
+async def _stream(topics: set[str]) -> AsyncIterator[str]:
+    """Yield server-sent events for some topics until the client disconnects.
+
+    Args:
+        topics: Change feed topics to follow.
+
+    Yields:
+        SSE messages and keepalive comments.
+    """
+    with get_change_feed().subscribe(topics) as queue:
+        yield f'retry: {_RETRY_MS}\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event)
+
+
+@router.get('/events')
+async def stream_events(
+    page_id: uuid.UUID | None = None,
+    document_id: uuid.UUID | None = None,
+    project_id: uuid.UUID | None = None,
+    current_user: UserResponse = Depends(get_current_user),  # noqa: B008
+) -> StreamingResponse:
+    """Stream change events as server-sent events.
+
+    Each event is a small JSON object naming what changed (``page`` or
+    ``document``) with its new status and version; clients refetch what
+    they need. A ``resync`` event means events may have been missed and
+    the client should reload.
+
+    Args:
+        page_id: Follow changes to this page.
+        document_id: Follow changes to this document and its pages.
+        project_id: Follow changes to documents and pages of this project.
+            Only project members (and admins) may follow a project.
+        current_user: Current authenticated user.
+
+    Returns:
+        StreamingResponse: ``text/event-stream`` of change events.
+
+    Raises:
+        HTTPException: 422 if no page, document or project is given, 403 if
+            the user is not a member of the project.
+    """
+    topics = {
+        f'{kind}:{value}'
+        for kind, value in (
+            ('page', page_id),
+            ('document', document_id),
+            ('project', project_id),
+        )
+        if value is not None
+    }
+    if not topics:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail='page_id, document_id or project_id is required',
+        )
+    if project_id is not None:
+        await require_project_member(project_id, current_user)
+    return StreamingResponse(
+        _stream(topics),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -18,14 +18,17 @@ router = APIRouter()
 async def export_project(
     project_id: uuid.UUID,
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> ExportResponse:
+) -> Response:
     """Export a project as OmniDocBench JSON.
 
+    The export is already JSON text, so it is returned without going
+    through ExportResponse, which only documents the shape.
+
     Args:
         project_id: Project UUID.
 
     Returns:
-        ExportResponse: Export data with all page annotations.
+        Response: ExportResponse JSON with all page annotations.
 
     Raises:
         HTTPException: If project not found.
@@ -34,7 +37,7 @@ async def export_project(
     result = await export_service.export_project(pool, project_id)
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Project not found')
-    return ExportResponse(**result)
+    return Response(content=result, media_type='application/json')
 
 
 @router.get('/projects/{project_id}/export/zip')
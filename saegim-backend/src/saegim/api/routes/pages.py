@@ -1,24 +1,30 @@
 """Page labeling endpoints."""
 
 import asyncio
-import json
 import logging
 import uuid
 from typing import Any
 
 import asyncpg
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
-from saegim.api.deps import get_current_user
+from saegim.api.deps import etag_matches, get_current_user, get_expected_version, page_etag
 from saegim.core.database import get_pool
 from saegim.repositories import task_repo
 from saegim.schemas.page import (
+    ElementBatch,
     ElementCreate,
+    ExtractionResultResponse,
+    ExtractionResultSummary,
     ExtractTextRequest,
     ExtractTextResponse,
+    JsonPatchOperation,
     PageAnnotationUpdate,
     PageAttributeUpdate,
+    PageMutationResponse,
+    PagePatchResponse,
     PageResponse,
+    PageView,
     ReadingOrderUpdate,
     RelationCreate,
     RelationDelete,
@@ -26,6 +32,8 @@ from saegim.schemas.page import (
 from saegim.schemas.task import AssignRequest, ReviewRequest
 from saegim.schemas.user import UserResponse
 from saegim.services import labeling_service
+from saegim.services.json_patch import JsonPatchError, JsonPatchTestFailedError
+from saegim.services.labeling_service import PageVersionConflictError
 from saegim.services.text_extraction_service import (
     NoTextProviderError,
     TextExtractionError,
@@ -39,49 +47,153 @@ router = APIRouter()
 
 
 def _record_to_page_response(record: asyncpg.Record) -> PageResponse:
-    """Convert a raw asyncpg Record to PageResponse, parsing JSON fields."""
+    """Convert a raw asyncpg Record to PageResponse."""
     data: dict[str, Any] = dict(record)
+    data['annotation_data'] = data.get('annotation_data') or {}
+    return PageResponse(**data)
 
-    annotation_data = data.get('annotation_data')
-    if isinstance(annotation_data, str):
-        annotation_data = json.loads(annotation_data)
-    data['annotation_data'] = annotation_data or {}
 
-    auto_extracted = data.get('auto_extracted_data')
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
-    data['auto_extracted_data'] = auto_extracted
+def _page_json_response(result: dict[str, Any]) -> Response:
+    """Build a page response around annotation JSON that is still JSON text.
 
-    return PageResponse(**data)
+    Only the page metadata goes through PageResponse, which computes the
+    storage URLs. The annotation and extraction JSON columns are embedded as
+    read from the database instead of being validated and serialized again.
+
+    Args:
+        result: Page data from ``get_page_data(..., raw_json=True)``.
+
+    Returns:
+        Response: JSON response with the same shape as PageResponse.
+    """
+    json_fields = ('annotation_data', 'auto_extracted_data', 'partial_extracted_data')
+    page = PageResponse(**{**result, **dict.fromkeys(json_fields), 'annotation_data': {}})
+    head = page.model_dump_json(exclude=set(json_fields))
+    embedded = ''.join(f',"{field}":{result.get(field) or "null"}' for field in json_fields)
+    body = f'{head[:-1]}{embedded}}}'
+    return Response(content=body, media_type='application/json')
+
+
+def _set_etag(response: Response, version: int) -> None:
+    """Set the ETag of a page on a response.
+
+    Args:
+        response: FastAPI response.
+        version: Page version.
+    """
+    response.headers['ETag'] = page_etag(version)
+
+
+def _edit_response(result: dict[str, Any], view: PageView) -> PageResponse | PageMutationResponse:
+    """Build the response of a page edit in the requested view.
+
+    Args:
+        result: Labeling service result.
+        view: Response view from the query string.
+
+    Returns:
+        PageResponse for the full view, PageMutationResponse for the minimal one.
+    """
+    if view == PageView.MINIMAL:
+        return PageMutationResponse(**result)
+    return PageResponse(**result)
+
+
+def _version_conflict(exc: PageVersionConflictError, expected_version: int | None) -> HTTPException:
+    """Map a page version conflict to an HTTP error.
+
+    A stale If-Match is a failed precondition (412). Without If-Match the
+    conflict comes from a concurrent write during a read-modify-write (409).
+
+    Args:
+        exc: Version conflict raised by the labeling service.
+        expected_version: Version from the If-Match header, if any.
+
+    Returns:
+        HTTPException: Error carrying the current ETag of the page.
+    """
+    code = (
+        status.HTTP_412_PRECONDITION_FAILED
+        if expected_version is not None
+        else status.HTTP_409_CONFLICT
+    )
+    return HTTPException(
+        status_code=code,
+        detail=str(exc),
+        headers={'ETag': page_etag(exc.current_version)},
+    )
+
+
+async def _raise_if_stale(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    expected_version: int | None,
+) -> None:
+    """Raise 412 if a conditional task transition failed on the page version.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        expected_version: Version from the If-Match header, if any.
+
+    Raises:
+        HTTPException: 412 if the page exists at another version.
+    """
+    try:
+        await labeling_service.raise_if_version_conflict(pool, page_id, expected_version)
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
 
 
 @router.get('/pages/{page_id}', response_model=PageResponse)
 async def get_page(
     page_id: uuid.UUID,
+    if_none_match: str | None = Header(default=None),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> PageResponse:
+) -> Response:
     """Get a page with annotation data for labeling.
 
+    The response carries the page version as its ETag. A request whose
+    If-None-Match lists the current ETag gets 304 Not Modified, checked
+    with a version-only query before the annotation is loaded.
+
+    The annotation JSON is sent as stored rather than through the response
+    model; response_model only documents the shape.
+
     Args:
         page_id: Page UUID.
+        if_none_match: If-None-Match header value.
 
     Returns:
-        PageResponse: Page data with annotations.
+        Response: PageResponse JSON, or an empty 304 response.
 
     Raises:
         HTTPException: If page not found.
     """
     pool = get_pool()
-    result = await labeling_service.get_page_data(pool, page_id)
+    if if_none_match is not None:
+        version = await labeling_service.get_page_version(pool, page_id)
+        if version is not None and etag_matches(if_none_match, version):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': page_etag(version), 'Cache-Control': 'private, no-cache'},
+            )
+
+    result = await labeling_service.get_page_data(pool, page_id, raw_json=True)
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
-    return PageResponse(**result)
+    response = _page_json_response(result)
+    _set_etag(response, result['version'])
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @router.put('/pages/{page_id}', response_model=PageResponse)
 async def update_annotation(
     page_id: uuid.UUID,
     body: PageAnnotationUpdate,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
 ) -> PageResponse:
     """Save annotation data for a page.
@@ -89,6 +201,8 @@ async def update_annotation(
     Args:
         page_id: Page UUID.
         body: Annotation data to save.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data.
@@ -97,23 +211,82 @@ async def update_annotation(
         HTTPException: If page not found.
     """
     pool = get_pool()
-    result = await labeling_service.save_annotation(pool, page_id, body.annotation_data)
+    try:
+        result = await labeling_service.save_annotation(
+            pool, page_id, body.annotation_data, expected_version=expected_version
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
+    _set_etag(response, result['version'])
     return PageResponse(**result)
 
 
-@router.put('/pages/{page_id}/attributes', response_model=PageResponse)
+@router.patch('/pages/{page_id}', response_model=PagePatchResponse)
+async def patch_annotation(
+    page_id: uuid.UUID,
+    body: list[JsonPatchOperation],
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
+    _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
+) -> PagePatchResponse:
+    """Apply an RFC 6902 JSON Patch to a page's annotation data.
+
+    Saves only the changed parts instead of the whole annotation. The
+    patch is applied atomically: if any operation fails, nothing is saved.
+
+    Args:
+        page_id: Page UUID.
+        body: JSON Patch operations against annotation_data.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
+
+    Returns:
+        PagePatchResponse: Page metadata without the annotation.
+
+    Raises:
+        HTTPException: 404 if the page is not found, 409 if a test
+            operation fails, 422 if the patch cannot be applied.
+    """
+    pool = get_pool()
+    operations = [op.model_dump(by_alias=True, exclude_unset=True) for op in body]
+    try:
+        result = await labeling_service.patch_annotation(
+            pool, page_id, operations, expected_version=expected_version
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
+    except JsonPatchTestFailedError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except JsonPatchError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc),
+        ) from exc
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
+    _set_etag(response, result['version'])
+    return PagePatchResponse(**result)
+
+
+@router.put('/pages/{page_id}/attributes', response_model=PageResponse | PageMutationResponse)
 async def update_page_attributes(
     page_id: uuid.UUID,
     body: PageAttributeUpdate,
+    response: Response,
+    view: PageView = PageView.FULL,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> PageResponse:
+) -> PageResponse | PageMutationResponse:
     """Save page-level attributes.
 
     Args:
         page_id: Page UUID.
         body: Page attribute data.
+        response: FastAPI response for setting the ETag header.
+        view: ``minimal`` returns only the page state and the change.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data.
@@ -122,27 +295,43 @@ async def update_page_attributes(
         HTTPException: If page not found.
     """
     pool = get_pool()
-    result = await labeling_service.save_page_attribute(pool, page_id, body.page_attribute)
+    try:
+        result = await labeling_service.save_page_attribute(
+            pool,
+            page_id,
+            body.page_attribute,
+            expected_version=expected_version,
+            full=view == PageView.FULL,
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
-    return PageResponse(**result)
+    _set_etag(response, result['version'])
+    return _edit_response(result, view)
 
 
 @router.post(
     '/pages/{page_id}/elements',
-    response_model=PageResponse,
+    response_model=PageResponse | PageMutationResponse,
     status_code=status.HTTP_201_CREATED,
 )
 async def add_element(
     page_id: uuid.UUID,
     body: ElementCreate,
+    response: Response,
+    view: PageView = PageView.FULL,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> PageResponse:
+) -> PageResponse | PageMutationResponse:
     """Add a new layout element to the page.
 
     Args:
         page_id: Page UUID.
         body: Element creation data.
+        response: FastAPI response for setting the ETag header.
+        view: ``minimal`` returns only the page state and the change.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data with new element.
@@ -152,15 +341,78 @@ async def add_element(
     """
     pool = get_pool()
     element = body.model_dump()
-    result = await labeling_service.add_element(pool, page_id, element)
+    try:
+        result = await labeling_service.add_element(
+            pool, page_id, element, expected_version=expected_version, full=view == PageView.FULL
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
-    return PageResponse(**result)
+    _set_etag(response, result['version'])
+    return _edit_response(result, view)
+
+
+@router.post(
+    '/pages/{page_id}/elements/batch',
+    response_model=PageResponse | PageMutationResponse,
+)
+async def apply_element_batch(
+    page_id: uuid.UUID,
+    body: ElementBatch,
+    response: Response,
+    view: PageView = PageView.FULL,
+    expected_version: int | None = Depends(get_expected_version),
+    _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
+) -> PageResponse | PageMutationResponse:
+    """Apply many element and relation operations to a page in one request.
+
+    Operations run in order in one transaction: if any fails, nothing
+    is saved. ``view=minimal`` returns the anno_ids of created elements.
+
+    Args:
+        page_id: Page UUID.
+        body: Batch of create, update, delete, add_relation and
+            delete_relation operations.
+        response: FastAPI response for setting the ETag header.
+        view: ``minimal`` returns only the page state and the change.
+        expected_version: Page version from the If-Match header.
+
+    Returns:
+        PageResponse: Updated page data.
+
+    Raises:
+        HTTPException: 404 if the page is not found, 409 if an operation
+            references a missing element or adds an invalid relation.
+    """
+    pool = get_pool()
+    operations = [op.model_dump(exclude_none=True) for op in body.operations]
+    try:
+        result = await labeling_service.apply_element_batch(
+            pool,
+            page_id,
+            operations,
+            expected_version=expected_version,
+            full=view == PageView.FULL,
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        ) from exc
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
+    _set_etag(response, result['version'])
+    return _edit_response(result, view)
 
 
 @router.post('/pages/{page_id}/accept-extraction', response_model=PageResponse)
 async def accept_extraction(
     page_id: uuid.UUID,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
 ) -> PageResponse:
     """Accept auto-extracted data as the initial annotation.
@@ -170,6 +422,8 @@ async def accept_extraction(
 
     Args:
         page_id: Page UUID.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data with accepted annotations.
@@ -178,18 +432,26 @@ async def accept_extraction(
         HTTPException: If page not found or preconditions not met.
     """
     pool = get_pool()
-    result = await labeling_service.accept_auto_extraction(pool, page_id)
+    try:
+        result = await labeling_service.accept_auto_extraction(
+            pool, page_id, expected_version=expected_version
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail='Cannot accept: no auto-extracted data or annotation already exists',
         )
+    _set_etag(response, result['version'])
     return PageResponse(**result)
 
 
 @router.post('/pages/{page_id}/force-accept-extraction', response_model=PageResponse)
 async def force_accept_extraction(
     page_id: uuid.UUID,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
 ) -> PageResponse:
     """Force-accept auto-extracted data, overwriting existing annotations.
@@ -199,6 +461,8 @@ async def force_accept_extraction(
 
     Args:
         page_id: Page UUID.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data with accepted annotations.
@@ -207,12 +471,114 @@ async def force_accept_extraction(
         HTTPException: If page not found or no auto-extracted data.
     """
     pool = get_pool()
-    result = await labeling_service.force_accept_auto_extraction(pool, page_id)
+    try:
+        result = await labeling_service.force_accept_auto_extraction(
+            pool, page_id, expected_version=expected_version
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail='Cannot accept: no auto-extracted data available',
         )
+    _set_etag(response, result['version'])
+    return PageResponse(**result)
+
+
+@router.get(
+    '/pages/{page_id}/extraction-results',
+    response_model=list[ExtractionResultSummary],
+)
+async def list_extraction_results(
+    page_id: uuid.UUID,
+    _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
+) -> list[ExtractionResultSummary]:
+    """List the extraction results stored for a page, one per engine configuration.
+
+    Args:
+        page_id: Page UUID.
+
+    Returns:
+        list[ExtractionResultSummary]: Stored results without payloads, newest first.
+    """
+    pool = get_pool()
+    results = await labeling_service.list_extraction_results(pool, page_id)
+    return [ExtractionResultSummary(**result) for result in results]
+
+
+@router.get(
+    '/pages/{page_id}/extraction-results/{result_id}',
+    response_model=ExtractionResultResponse,
+)
+async def get_extraction_result(
+    page_id: uuid.UUID,
+    result_id: uuid.UUID,
+    _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
+) -> ExtractionResultResponse:
+    """Get one stored extraction result of a page.
+
+    Args:
+        page_id: Page UUID.
+        result_id: Extraction result UUID.
+
+    Returns:
+        ExtractionResultResponse: Stored result with its payload.
+
+    Raises:
+        HTTPException: If the result is not found.
+    """
+    pool = get_pool()
+    result = await labeling_service.get_extraction_result(pool, page_id, result_id)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Extraction result not found',
+        )
+    return ExtractionResultResponse(**result)
+
+
+@router.post(
+    '/pages/{page_id}/extraction-results/{result_id}/select',
+    response_model=PageResponse,
+)
+async def select_extraction_result(
+    page_id: uuid.UUID,
+    result_id: uuid.UUID,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
+    _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
+) -> PageResponse:
+    """Make a stored extraction result the page's auto-extracted data.
+
+    Use accept-extraction or force-accept-extraction afterwards to copy it
+    into the annotation.
+
+    Args:
+        page_id: Page UUID.
+        result_id: Extraction result UUID.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
+
+    Returns:
+        PageResponse: Page data with the selected auto-extracted data.
+
+    Raises:
+        HTTPException: If the result is not found.
+    """
+    pool = get_pool()
+    try:
+        result = await labeling_service.select_extraction_result(
+            pool, page_id, result_id, expected_version=expected_version
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Extraction result not found',
+        )
+    _set_etag(response, result['version'])
     return PageResponse(**result)
 
 
@@ -242,7 +608,7 @@ async def extract_text(
     pool = get_pool()
 
     try:
-        image_path, text_provider = await resolve_text_provider(
+        image_path, text_provider, crop_encoding = await resolve_text_provider(
             pool, page_id, engine_id=body.engine_id
         )
     except LookupError as exc:
@@ -263,6 +629,7 @@ async def extract_text(
             body.poly,
             body.category_type,
             text_provider,
+            crop_encoding,
         )
     except TextExtractionError as exc:
         logger.warning('Text extraction failed for page %s: %s', page_id, exc)
@@ -276,19 +643,25 @@ async def extract_text(
 
 @router.post(
     '/pages/{page_id}/relations',
-    response_model=PageResponse,
+    response_model=PageResponse | PageMutationResponse,
     status_code=status.HTTP_201_CREATED,
 )
 async def add_relation(
     page_id: uuid.UUID,
     body: RelationCreate,
+    response: Response,
+    view: PageView = PageView.FULL,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> PageResponse:
+) -> PageResponse | PageMutationResponse:
     """Add a relation between two elements on a page.
 
     Args:
         page_id: Page UUID.
         body: Relation creation data.
+        response: FastAPI response for setting the ETag header.
+        view: ``minimal`` returns only the page state and the change.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data with new relation.
@@ -298,7 +671,15 @@ async def add_relation(
     """
     pool = get_pool()
     try:
-        result = await labeling_service.add_relation(pool, page_id, body.model_dump())
+        result = await labeling_service.add_relation(
+            pool,
+            page_id,
+            body.model_dump(),
+            expected_version=expected_version,
+            full=view == PageView.FULL,
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -306,20 +687,27 @@ async def add_relation(
         ) from exc
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
-    return PageResponse(**result)
+    _set_etag(response, result['version'])
+    return _edit_response(result, view)
 
 
-@router.delete('/pages/{page_id}/relations', response_model=PageResponse)
+@router.delete('/pages/{page_id}/relations', response_model=PageResponse | PageMutationResponse)
 async def delete_relation(
     page_id: uuid.UUID,
     body: RelationDelete,
+    response: Response,
+    view: PageView = PageView.FULL,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> PageResponse:
+) -> PageResponse | PageMutationResponse:
     """Delete a relation between two elements on a page.
 
     Args:
         page_id: Page UUID.
         body: Relation deletion data.
+        response: FastAPI response for setting the ETag header.
+        view: ``minimal`` returns only the page state and the change.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data.
@@ -328,25 +716,40 @@ async def delete_relation(
         HTTPException: If page not found.
     """
     pool = get_pool()
-    result = await labeling_service.delete_relation(
-        pool, page_id, body.source_anno_id, body.target_anno_id
-    )
+    try:
+        result = await labeling_service.delete_relation(
+            pool,
+            page_id,
+            body.source_anno_id,
+            body.target_anno_id,
+            expected_version=expected_version,
+            full=view == PageView.FULL,
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
-    return PageResponse(**result)
+    _set_etag(response, result['version'])
+    return _edit_response(result, view)
 
 
-@router.put('/pages/{page_id}/reading-order', response_model=PageResponse)
+@router.put('/pages/{page_id}/reading-order', response_model=PageResponse | PageMutationResponse)
 async def update_reading_order(
     page_id: uuid.UUID,
     body: ReadingOrderUpdate,
+    response: Response,
+    view: PageView = PageView.FULL,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> PageResponse:
+) -> PageResponse | PageMutationResponse:
     """Update reading order of layout elements.
 
     Args:
         page_id: Page UUID.
         body: Reading order update with anno_id-to-order mapping.
+        response: FastAPI response for setting the ETag header.
+        view: ``minimal`` returns only the page state and the change.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data.
@@ -355,26 +758,44 @@ async def update_reading_order(
         HTTPException: If page not found or invalid annotation IDs.
     """
     pool = get_pool()
-    result = await labeling_service.update_reading_order(pool, page_id, body.order_map)
+    try:
+        result = await labeling_service.update_reading_order(
+            pool,
+            page_id,
+            body.order_map,
+            expected_version=expected_version,
+            full=view == PageView.FULL,
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Page not found or invalid annotation IDs',
         )
-    return PageResponse(**result)
+    _set_etag(response, result['version'])
+    return _edit_response(result, view)
 
 
-@router.delete('/pages/{page_id}/elements/{anno_id}', response_model=PageResponse)
+@router.delete(
+    '/pages/{page_id}/elements/{anno_id}', response_model=PageResponse | PageMutationResponse
+)
 async def delete_element(
     page_id: uuid.UUID,
     anno_id: int,
+    response: Response,
+    view: PageView = PageView.FULL,
+    expected_version: int | None = Depends(get_expected_version),
     _current_user: UserResponse = Depends(get_current_user),  # noqa: B008
-) -> PageResponse:
+) -> PageResponse | PageMutationResponse:
     """Delete a layout element by annotation ID.
 
     Args:
         page_id: Page UUID.
         anno_id: Annotation ID of the element to delete.
+        response: FastAPI response for setting the ETag header.
+        view: ``minimal`` returns only the page state and the change.
+        expected_version: Page version from the If-Match header.
 
     Returns:
         PageResponse: Updated page data.
@@ -383,10 +804,16 @@ async def delete_element(
         HTTPException: If page not found.
     """
     pool = get_pool()
-    result = await labeling_service.delete_element(pool, page_id, anno_id)
+    try:
+        result = await labeling_service.delete_element(
+            pool, page_id, anno_id, expected_version=expected_version, full=view == PageView.FULL
+        )
+    except PageVersionConflictError as exc:
+        raise _version_conflict(exc, expected_version) from exc
     if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Page not found')
-    return PageResponse(**result)
+    _set_etag(response, result['version'])
+    return _edit_response(result, view)
 
 
 # --- Task workflow endpoints ---
@@ -430,6 +857,8 @@ async def _check_page_project_role(
 async def assign_page(
     page_id: uuid.UUID,
     body: AssignRequest,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     current_user: UserResponse = Depends(get_current_user),  # noqa: B008
 ) -> PageResponse:
     """Assign a page to a user. Only project owner or admin can assign.
@@ -437,6 +866,8 @@ async def assign_page(
     Args:
         page_id: Page UUID.
         body: Assignment request with target user_id.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
         current_user: Authenticated user.
 
     Returns:
@@ -448,24 +879,32 @@ async def assign_page(
     pool = get_pool()
     await _check_page_project_role(pool, page_id, current_user, frozenset({'owner'}))
 
-    result = await task_repo.assign_page(pool, page_id, body.user_id, current_user.id)
+    result = await task_repo.assign_page(
+        pool, page_id, body.user_id, current_user.id, expected_version=expected_version
+    )
     if result is None:
+        await _raise_if_stale(pool, page_id, expected_version)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail='Page not found or cannot be assigned in current state',
         )
+    _set_etag(response, result['version'])
     return _record_to_page_response(result)
 
 
 @router.post('/pages/{page_id}/submit', response_model=PageResponse)
 async def submit_page(
     page_id: uuid.UUID,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     current_user: UserResponse = Depends(get_current_user),  # noqa: B008
 ) -> PageResponse:
     """Submit a page for review. Only the assigned user can submit.
 
     Args:
         page_id: Page UUID.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
         current_user: Authenticated user.
 
     Returns:
@@ -475,12 +914,16 @@ async def submit_page(
         HTTPException: 409 if not assigned to user or invalid state.
     """
     pool = get_pool()
-    result = await task_repo.submit_page(pool, page_id, current_user.id)
+    result = await task_repo.submit_page(
+        pool, page_id, current_user.id, expected_version=expected_version
+    )
     if result is None:
+        await _raise_if_stale(pool, page_id, expected_version)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail='Page not found, not assigned to you, or not in progress',
         )
+    _set_etag(response, result['version'])
     return _record_to_page_response(result)
 
 
@@ -488,6 +931,8 @@ async def submit_page(
 async def review_page(
     page_id: uuid.UUID,
     body: ReviewRequest,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     current_user: UserResponse = Depends(get_current_user),  # noqa: B008
 ) -> PageResponse:
     """Review a submitted page (approve or reject). Only reviewer or admin can review.
@@ -495,6 +940,8 @@ async def review_page(
     Args:
         page_id: Page UUID.
         body: Review request with action and optional comment.
+        response: FastAPI response for setting the ETag header.
+        expected_version: Page version from the If-Match header.
         current_user: Authenticated user.
 
     Returns:
@@ -506,10 +953,14 @@ async def review_page(
     pool = get_pool()
     await _check_page_project_role(pool, page_id, current_user, frozenset({'reviewer', 'owner'}))
 
-    result = await task_repo.review_page(pool, page_id, current_user.id, body.action, body.comment)
+    result = await task_repo.review_page(
+        pool, page_id, current_user.id, body.action, body.comment, expected_version=expected_version
+    )
     if result is None:
+        await _raise_if_stale(pool, page_id, expected_version)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail='Page not found or not in submitted state',
         )
+    _set_etag(response, result['version'])
     return _record_to_page_response(result)
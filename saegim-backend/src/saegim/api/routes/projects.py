@@ -625,10 +625,10 @@ async def test_engine_connection(
             detail=f"Engine '{body.engine_id}' not found",
         )
 
-    from saegim.services.engines.factory import _build_engine_from_type
+    from saegim.services.engines.factory import build_engine_by_id
 
     try:
-        engine = _build_engine_from_type(entry['engine_type'], entry.get('config', {}))
+        engine = build_engine_by_id(config, body.engine_id)
         success, message = engine.test_connection()
     except ValueError as exc:
         success, message = False, str(exc)
@@ -649,8 +649,8 @@ async def get_available_engines(
 ) -> AvailableEnginesResponse:
     """Get list of engines available for per-element text extraction.
 
-    Returns all registered engines (excluding pdfminer since it doesn't
-    support region-level extraction).
+    Returns all registered engines (excluding pdfminer and ensembles since
+    they don't support region-level extraction).
 
     Args:
         project_id: Project UUID.
@@ -668,7 +668,7 @@ async def get_available_engines(
     engines: list[AvailableEngine] = []
     for eid, entry in engines_dict.items():
         et = entry.get('engine_type', '')
-        if et == 'pdfminer':
+        if et in ('pdfminer', 'ensemble'):
             continue
         engines.append(
             AvailableEngine(
@@ -10,11 +10,25 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from saegim.api.compression import JSONCompressionMiddleware
 from saegim.api.deps import hash_password
-from saegim.api.routes import admin, auth, documents, export, health, pages, projects, tasks, users
+from saegim.api.routes import (
+    admin,
+    auth,
+    documents,
+    events,
+    export,
+    health,
+    pages,
+    projects,
+    tasks,
+    users,
+)
 from saegim.api.settings import Settings, get_settings
+from saegim.core.change_feed import get_change_feed
 from saegim.core.database import close_pool, create_pool
 from saegim.repositories import user_repo
+from saegim.services.page_image_cache import get_page_cache
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +53,7 @@ async def _bootstrap_default_admin(pool: asyncpg.Pool) -> None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    """Manage application lifespan: DB pool creation and cleanup.
+    """Manage application lifespan: DB pool, change feed and cleanup.
 
     Args:
         app: FastAPI application instance.
@@ -51,8 +65,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         max_size=settings.db_pool_max_size,
     )
     await _bootstrap_default_admin(pool)
+    get_page_cache().resize(settings.page_image_cache_mb * 1024 * 1024)
+    change_feed = get_change_feed()
+    await change_feed.start(settings.database_url)
     logger.info('Application started')
     yield
+    await change_feed.stop()
     await close_pool()
     logger.info('Application stopped')
 
@@ -87,6 +105,15 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         allow_credentials=True,
         allow_methods=['*'],
         allow_headers=['*'],
+        expose_headers=['ETag'],
+    )
+
+    # Compress large JSON responses (page annotations, exports)
+    app.add_middleware(
+        JSONCompressionMiddleware,  # type: ignore[arg-type]
+        minimum_size=settings.gzip_minimum_size,
+        compresslevel=settings.gzip_compresslevel,
+        brotli_quality=settings.brotli_quality,
     )
 
     # Include routers
@@ -99,6 +126,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     app.include_router(tasks.router, prefix='/api/v1', tags=['tasks'])
     app.include_router(users.router, prefix='/api/v1', tags=['users'])
     app.include_router(export.router, prefix='/api/v1', tags=['export'])
+    app.include_router(events.router, prefix='/api/v1', tags=['events'])
 
     # Mount static files for serving page images and PDF documents
     storage_path = Path(settings.storage_path)
@@ -0,0 +1,183 @@
+"""Real-time change feed over PostgreSQL LISTEN/NOTIFY.
+
+Triggers on pages and documents (see migrations/001_init.sql) send a small
+JSON event on the ``saegim_changes`` channel when a change commits. Each
+API worker holds one LISTEN connection and fans the events out to the
+subscribers of the topics they concern, so the feed works the same with
+any number of workers.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'saegim_changes'
+
+# Topic kinds, each matching an ``<kind>_id`` field of the events
+TOPIC_KINDS = ('page', 'document', 'project')
+
+# Events buffered per subscriber; a slow subscriber loses the oldest
+_QUEUE_SIZE = 256
+
+# Seconds between attempts to (re)open the LISTEN connection
+_RECONNECT_DELAY = 5.0
+
+# Event sent to every subscriber after the LISTEN connection was reopened,
+# since changes made while it was down were missed
+RESYNC_EVENT: dict[str, Any] = {'kind': 'resync'}
+
+
+def event_topics(event: dict[str, Any]) -> set[str]:
+    """Get the topics a change event is published to.
+
+    Args:
+        event: Change event from the database.
+
+    Returns:
+        Topics such as ``page:<id>``, ``document:<id>`` and ``project:<id>``.
+    """
+    return {f'{kind}:{event[f"{kind}_id"]}' for kind in TOPIC_KINDS if event.get(f'{kind}_id')}
+
+
+def _put_latest(queue: asyncio.Queue[dict[str, Any]], event: dict[str, Any]) -> None:
+    """Queue an event, dropping the oldest one if the queue is full."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class ChangeFeed:
+    """Fan out change notifications from one LISTEN connection to subscribers."""
+
+    def __init__(self) -> None:
+        """Initialize a feed that is not listening yet."""
+        self._subscribers: dict[asyncio.Queue[dict[str, Any]], frozenset[str]] = {}
+        self._conn: asyncpg.Connection | None = None
+        self._database_url: str | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+
+    @property
+    def listening(self) -> bool:
+        """Whether the LISTEN connection is open."""
+        return self._conn is not None
+
+    async def start(self, database_url: str) -> None:
+        """Start listening for changes.
+
+        If the database cannot be reached, the feed keeps retrying in the
+        background instead of failing application startup.
+
+        Args:
+            database_url: PostgreSQL connection URL.
+        """
+        self._database_url = database_url
+        try:
+            await self._connect()
+        except (OSError, asyncpg.PostgresError) as exc:
+            logger.warning('Change feed could not connect: %s', exc)
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        self._database_url = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    @contextlib.contextmanager
+    def subscribe(self, topics: Iterable[str]) -> Iterator[asyncio.Queue[dict[str, Any]]]:
+        """Subscribe to change events of some topics.
+
+        Args:
+            topics: Topics to receive (see ``event_topics``).
+
+        Yields:
+            Queue receiving the matching events and resync events.
+        """
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        self._subscribers[queue] = frozenset(topics)
+        try:
+            yield queue
+        finally:
+            del self._subscribers[queue]
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Deliver an event to the subscribers of its topics.
+
+        Args:
+            event: Change event. Resync events go to every subscriber.
+        """
+        topics = event_topics(event)
+        for queue, wanted in self._subscribers.items():
+            if event.get('kind') == 'resync' or not wanted.isdisjoint(topics):
+                _put_latest(queue, event)
+
+    async def _connect(self) -> None:
+        """Open the LISTEN connection."""
+        conn = await asyncpg.connect(self._database_url)
+        await conn.add_listener(CHANNEL, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+        logger.info('Change feed listening on %s', CHANNEL)
+
+    def _on_notify(
+        self,
+        _conn: asyncpg.Connection,
+        _pid: int,
+        _channel: str,
+        payload: str,
+    ) -> None:
+        """Handle a notification from the database."""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning('Ignoring malformed change event: %s', payload)
+            return
+        self.publish(event)
+
+    def _on_terminated(self, _conn: asyncpg.Connection) -> None:
+        """Reconnect when the LISTEN connection is lost."""
+        if self._database_url is None:
+            return
+        self._conn = None
+        logger.warning('Change feed connection lost, reconnecting')
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        """Start the reconnect loop unless it is already running."""
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Retry opening the LISTEN connection until it succeeds or the feed stops."""
+        while self._database_url is not None:
+            await asyncio.sleep(_RECONNECT_DELAY)
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning('Change feed reconnect failed: %s', exc)
+                continue
+            self.publish(RESYNC_EVENT)
+            return
+
+
+_feed = ChangeFeed()
+
+
+def get_change_feed() -> ChangeFeed:
+    """Get the process-wide change feed.
+
+    Returns:
+        Shared ChangeFeed instance.
+    """
+    return _feed
@@ -4,15 +4,52 @@ import logging
 from pathlib import Path
 
 import asyncpg
+import orjson
 
 logger = logging.getLogger(__name__)
 
 _pool: asyncpg.Pool | None = None
 
 
+def _encode_json(value: object) -> str:
+    """Serialize a JSON/JSONB parameter with orjson.
+
+    Non-string dict keys are converted to strings, as ``json.dumps`` does.
+
+    Args:
+        value: JSON-serializable Python object.
+
+    Returns:
+        JSON text.
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Register orjson-based JSON codecs on a new pool connection.
+
+    JSON and JSONB values are decoded to Python objects when read, and
+    Python objects are encoded when passed as JSON/JSONB parameters, so
+    repositories work with dicts and lists instead of JSON strings.
+
+    Args:
+        conn: Newly opened connection.
+    """
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            type_name,
+            encoder=_encode_json,
+            decoder=orjson.loads,
+            schema='pg_catalog',
+        )
+
+
 async def create_pool(database_url: str, min_size: int = 2, max_size: int = 10) -> asyncpg.Pool:
     """Create and return a connection pool.
 
+    Connections decode JSON/JSONB columns to Python objects (see
+    ``_init_connection``).
+
     Args:
         database_url: PostgreSQL connection URL.
         min_size: Minimum number of connections in the pool.
@@ -26,6 +63,7 @@ async def create_pool(database_url: str, min_size: int = 2, max_size: int = 10)
         database_url,
         min_size=min_size,
         max_size=max_size,
+        init=_init_connection,
     )
     logger.info('Database connection pool created')
     return _pool
@@ -0,0 +1,129 @@
+"""Page extraction result repository.
+
+Stores one extraction result per page and engine configuration, so runs of
+different engines are kept side by side instead of overwriting
+``pages.auto_extracted_data``.
+"""
+
+import uuid
+
+import asyncpg
+
+
+async def upsert(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    *,
+    engine_key: str,
+    engine_type: str,
+    engine_id: str | None,
+    result: dict,
+    duration_ms: int | None = None,
+) -> None:
+    """Store the result of an engine configuration for a page.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        engine_key: Hash of the engine configuration.
+        engine_type: Engine type that produced the result.
+        engine_id: Engine instance ID, or None for legacy configs.
+        result: OmniDocBench-compatible extraction result.
+        duration_ms: Extraction time of the page in milliseconds.
+    """
+    await pool.execute(
+        """
+        INSERT INTO page_extraction_results
+            (page_id, engine_key, engine_type, engine_id, result, duration_ms)
+        VALUES ($1, $2, $3, $4, $5::jsonb, $6)
+        ON CONFLICT (page_id, engine_key) DO UPDATE
+        SET engine_type = EXCLUDED.engine_type,
+            engine_id = EXCLUDED.engine_id,
+            result = EXCLUDED.result,
+            duration_ms = EXCLUDED.duration_ms,
+            updated_at = NOW()
+        """,
+        page_id,
+        engine_key,
+        engine_type,
+        engine_id,
+        result,
+        duration_ms,
+    )
+
+
+async def get_for_pages(
+    pool: asyncpg.Pool,
+    page_ids: list[uuid.UUID],
+    engine_key: str,
+) -> list[asyncpg.Record]:
+    """Fetch stored results of one engine configuration for several pages.
+
+    Args:
+        pool: Database connection pool.
+        page_ids: Page UUIDs.
+        engine_key: Hash of the engine configuration.
+
+    Returns:
+        list[asyncpg.Record]: Records with page_id and result.
+    """
+    return await pool.fetch(
+        """
+        SELECT page_id, result
+        FROM page_extraction_results
+        WHERE page_id = ANY($1::uuid[]) AND engine_key = $2
+        """,
+        page_ids,
+        engine_key,
+    )
+
+
+async def list_by_page(pool: asyncpg.Pool, page_id: uuid.UUID) -> list[asyncpg.Record]:
+    """List the stored results of a page without their payloads.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+
+    Returns:
+        list[asyncpg.Record]: Result summaries, newest first.
+    """
+    return await pool.fetch(
+        """
+        SELECT id, page_id, engine_key, engine_type, engine_id, duration_ms,
+               jsonb_array_length(COALESCE(result->'layout_dets', '[]'::jsonb)) AS element_count,
+               created_at, updated_at
+        FROM page_extraction_results
+        WHERE page_id = $1
+        ORDER BY updated_at DESC
+        """,
+        page_id,
+    )
+
+
+async def get_by_id(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    result_id: uuid.UUID,
+) -> asyncpg.Record | None:
+    """Fetch one stored result of a page.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID the result must belong to.
+        result_id: Result UUID.
+
+    Returns:
+        asyncpg.Record or None: Result record with its payload.
+    """
+    return await pool.fetchrow(
+        """
+        SELECT id, page_id, engine_key, engine_type, engine_id, result, duration_ms,
+               jsonb_array_length(COALESCE(result->'layout_dets', '[]'::jsonb)) AS element_count,
+               created_at, updated_at
+        FROM page_extraction_results
+        WHERE id = $1 AND page_id = $2
+        """,
+        result_id,
+        page_id,
+    )
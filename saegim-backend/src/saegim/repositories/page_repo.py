@@ -1,10 +1,25 @@
 """Page repository with raw SQL queries for annotation data."""
 
-import json
 import uuid
+from collections.abc import Callable
 
 import asyncpg
 
+# Page columns returned by annotation writes
+_PAGE_COLUMNS = """
+    id, document_id, page_no, width, height, image_path,
+    page_annotation(id, annotation_data) AS annotation_data,
+    auto_extracted_data, status, assigned_to,
+    locked_at, updated_at, version
+"""
+
+# Page columns returned by sparse annotation writes (no annotation JSON)
+_PAGE_STATE_COLUMNS = 'id, status, updated_at, version'
+
+# Removes the ensemble's per-engine comparison data, which belongs to the
+# extraction result only and never to an annotation or an export
+_STRIP_ENGINE_EXTRA = "#- '{extra,engine_results}' #- '{extra,engine_errors}'"
+
 
 async def create(
     pool: asyncpg.Pool,
@@ -34,15 +49,16 @@ async def create(
         INSERT INTO pages (document_id, page_no, width, height, image_path, auto_extracted_data)
         VALUES ($1, $2, $3, $4, $5, $6::jsonb)
         RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
+                  page_annotation(id, annotation_data) AS annotation_data,
+                  auto_extracted_data, status, assigned_to,
+                  locked_at, updated_at, version
         """,
         document_id,
         page_no,
         width,
         height,
         image_path,
-        json.dumps(auto_extracted_data) if auto_extracted_data else None,
+        auto_extracted_data or None,
     )
 
 
@@ -59,32 +75,54 @@ async def get_by_id(pool: asyncpg.Pool, page_id: uuid.UUID) -> asyncpg.Record |
     return await pool.fetchrow(
         """
         SELECT id, document_id, page_no, width, height, image_path,
-               annotation_data, auto_extracted_data, status, assigned_to,
-               locked_at, updated_at
+               page_annotation(id, annotation_data) AS annotation_data,
+               auto_extracted_data, status, assigned_to,
+               locked_at, updated_at, version
         FROM pages WHERE id = $1
         """,
         page_id,
     )
 
 
+async def get_version(pool: asyncpg.Pool, page_id: uuid.UUID) -> int | None:
+    """Get the current version of a page without loading its data.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+
+    Returns:
+        int or None: Page version, or None if the page does not exist.
+    """
+    return await pool.fetchval('SELECT version FROM pages WHERE id = $1', page_id)
+
+
 async def get_by_id_with_context(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
+    *,
+    raw_json: bool = False,
 ) -> asyncpg.Record | None:
     """Get a page by ID with document and project context for navigation.
 
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
+        raw_json: Return annotation_data, auto_extracted_data and
+            partial_extracted_data as JSON text instead of decoded objects.
 
     Returns:
         asyncpg.Record or None: Page record with project_id, project_name, document_filename.
     """
+    cast = '::text' if raw_json else ''
     return await pool.fetchrow(
-        """
+        f"""
         SELECT p.id, p.document_id, p.page_no, p.width, p.height, p.image_path,
-               p.annotation_data, p.auto_extracted_data, p.status, p.assigned_to,
-               p.locked_at, p.updated_at,
+               page_annotation(p.id, p.annotation_data){cast} AS annotation_data,
+               p.auto_extracted_data{cast} AS auto_extracted_data,
+               p.partial_extracted_data{cast} AS partial_extracted_data,
+               p.status, p.assigned_to,
+               p.locked_at, p.updated_at, p.version,
                d.filename AS document_filename,
                d.pdf_path,
                d.project_id AS project_id,
@@ -93,7 +131,7 @@ async def get_by_id_with_context(
         JOIN documents d ON p.document_id = d.id
         JOIN projects pr ON d.project_id = pr.id
         WHERE p.id = $1
-        """,
+        """,  # noqa: S608
         page_id,
     )
 
@@ -118,6 +156,34 @@ async def list_by_document(pool: asyncpg.Pool, document_id: uuid.UUID) -> list[a
     )
 
 
+async def list_by_document_json(pool: asyncpg.Pool, document_id: uuid.UUID) -> str:
+    """List all pages for a document as a JSON array built by the database.
+
+    Args:
+        pool: Database connection pool.
+        document_id: Parent document UUID.
+
+    Returns:
+        str: JSON array of page list items, ordered by page number.
+    """
+    return await pool.fetchval(
+        """
+        SELECT COALESCE(
+            json_agg(
+                json_build_object(
+                    'id', id, 'page_no', page_no, 'width', width, 'height', height,
+                    'status', status, 'assigned_to', assigned_to, 'updated_at', updated_at
+                )
+                ORDER BY page_no
+            ),
+            '[]'
+        )::text
+        FROM pages WHERE document_id = $1
+        """,
+        document_id,
+    )
+
+
 async def list_by_document_for_export(
     pool: asyncpg.Pool,
     document_id: uuid.UUID,
@@ -132,11 +198,14 @@ async def list_by_document_for_export(
         list[asyncpg.Record]: Pages with full annotation and image data.
     """
     return await pool.fetch(
-        """
-        SELECT id, page_no, width, height, image_path, annotation_data
-        FROM pages WHERE document_id = $1
-        ORDER BY page_no
-        """,
+        f"""
+        SELECT p.id, p.page_no, p.width, p.height, p.image_path,
+               pa.annotation_data {_STRIP_ENGINE_EXTRA} AS annotation_data
+        FROM pages p
+        JOIN page_annotations pa ON pa.page_id = p.id
+        WHERE p.document_id = $1
+        ORDER BY p.page_no
+        """,  # noqa: S608
         document_id,
     )
 
@@ -172,7 +241,7 @@ async def count_processed_by_document(pool: asyncpg.Pool, document_id: uuid.UUID
         document_id: Parent document UUID.
 
     Returns:
-        int: Number of pages with auto_extracted_data populated.
+        int: Number of pages with auto_extracted_data.
     """
     count = await pool.fetchval(
         """
@@ -186,39 +255,214 @@ async def count_processed_by_document(pool: asyncpg.Pool, document_id: uuid.UUID
     return int(count or 0)
 
 
+# Inserts or overwrites page_elements rows from a JSON array of
+# [position, layout_det] pairs; $1 is the page ID
+_UPSERT_ELEMENTS = """
+    INSERT INTO page_elements
+    SELECT r.*
+    FROM jsonb_array_elements($2::jsonb) AS item
+    CROSS JOIN LATERAL layout_det_row($1, (item->>0)::int, item->1) AS r
+    ON CONFLICT (page_id, position) DO UPDATE SET
+        anno_id = EXCLUDED.anno_id,
+        category_type = EXCLUDED.category_type,
+        poly = EXCLUDED.poly,
+        text = EXCLUDED.text,
+        latex = EXCLUDED.latex,
+        html = EXCLUDED.html,
+        attribute = EXCLUDED.attribute,
+        ignore = EXCLUDED.ignore,
+        reading_order = EXCLUDED.reading_order,
+        extra = EXCLUDED.extra
+"""
+
+
+def _split_layout_dets(annotation_data: dict) -> tuple[dict, list]:
+    """Separate layout_dets from the rest of an annotation for storage.
+
+    Elements are stored as page_elements rows; pages.annotation_data keeps
+    an empty layout_dets placeholder that page_annotation() fills back in.
+
+    Args:
+        annotation_data: OmniDocBench annotation JSON.
+
+    Returns:
+        tuple: (annotation_data to store on the page, layout_dets to store
+        as rows). A non-list layout_dets stays in the annotation as is.
+    """
+    layout_dets = annotation_data.get('layout_dets')
+    if not isinstance(layout_dets, list):
+        return annotation_data, []
+    return {**annotation_data, 'layout_dets': []}, layout_dets
+
+
+async def _fetch_page(conn: asyncpg.Connection, page_id: uuid.UUID) -> asyncpg.Record | None:
+    """Read a page with its assembled annotation on a connection.
+
+    Args:
+        conn: Connection (inside the transaction that changed the page).
+        page_id: Page UUID.
+
+    Returns:
+        asyncpg.Record or None: Page record.
+    """
+    return await conn.fetchrow(
+        """
+        SELECT id, document_id, page_no, width, height, image_path,
+               page_annotation(id, annotation_data) AS annotation_data,
+               auto_extracted_data, status, assigned_to,
+               locked_at, updated_at, version
+        FROM pages WHERE id = $1
+        """,
+        page_id,
+    )
+
+
+async def _sync_elements(
+    conn: asyncpg.Connection,
+    page_id: uuid.UUID,
+    layout_dets: list,
+) -> None:
+    """Make a page's element rows match a layout_dets list.
+
+    Only positions whose element changed are written, so editing one
+    element of a large page touches one row.
+
+    Args:
+        conn: Connection inside a transaction holding the page row lock.
+        page_id: Page UUID.
+        layout_dets: Desired layout_dets, in order.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT e.position, page_element_json(e) AS det
+        FROM page_elements e
+        WHERE e.page_id = $1
+        """,
+        page_id,
+    )
+    current = {row['position']: row['det'] for row in rows}
+
+    changed = [
+        [position, det]
+        for position, det in enumerate(layout_dets)
+        if position not in current or current[position] != det
+    ]
+    if changed:
+        await conn.execute(_UPSERT_ELEMENTS, page_id, changed)
+    if any(position >= len(layout_dets) for position in current):
+        await conn.execute(
+            'DELETE FROM page_elements WHERE page_id = $1 AND position >= $2',
+            page_id,
+            len(layout_dets),
+        )
+
+
 async def update_annotation(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     annotation_data: dict,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> asyncpg.Record | None:
     """Update annotation data for a page.
 
+    Element rows are diffed against layout_dets, so unchanged elements
+    are not rewritten.
+
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
         annotation_data: OmniDocBench annotation JSON.
+        expected_version: Only update if the page is at this version. None = any.
+        full: Return the whole page. False = only id, status, updated_at
+            and version.
 
     Returns:
         asyncpg.Record or None: Updated page record.
     """
-    return await pool.fetchrow(
-        """
-        UPDATE pages
-        SET annotation_data = $1::jsonb, updated_at = NOW()
-        WHERE id = $2
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
-        json.dumps(annotation_data),
-        page_id,
-    )
+    stored, layout_dets = _split_layout_dets(annotation_data)
+    async with pool.acquire() as conn, conn.transaction():
+        updated = await conn.fetchrow(
+            f"""
+            UPDATE pages
+            SET annotation_data = $1::jsonb, updated_at = NOW(), version = version + 1
+            WHERE id = $2
+              AND ($3::int IS NULL OR version = $3)
+            RETURNING {_PAGE_STATE_COLUMNS}
+            """,  # noqa: S608
+            stored,
+            page_id,
+            expected_version,
+        )
+        if updated is None:
+            return None
+        await _sync_elements(conn, page_id, layout_dets)
+        return await _fetch_page(conn, page_id) if full else updated
+
+
+async def patch_annotation(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    apply: Callable[[dict], dict],
+    *,
+    expected_version: int | None = None,
+    full: bool = False,
+) -> asyncpg.Record | None:
+    """Update annotation data through a function, holding the page row lock.
+
+    The row is locked with ``SELECT ... FOR UPDATE`` so concurrent patches
+    of the same page apply one after another instead of losing updates.
+    If ``apply`` raises, the transaction is rolled back. Only the element
+    rows the patch changed are written.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        apply: Function mapping the current annotation to the new one.
+        expected_version: Only update if the page is at this version. None = any.
+        full: Return the whole page instead of its state.
+
+    Returns:
+        asyncpg.Record or None: id, status, updated_at and version of the
+        page (the whole page if ``full``), or None if the page does not
+        exist or is at another version.
+    """
+    async with pool.acquire() as conn, conn.transaction():
+        locked = await conn.fetchrow(
+            """
+            SELECT page_annotation(id, annotation_data) AS annotation_data FROM pages
+            WHERE id = $1 AND ($2::int IS NULL OR version = $2)
+            FOR UPDATE
+            """,
+            page_id,
+            expected_version,
+        )
+        if locked is None:
+            return None
+
+        stored, layout_dets = _split_layout_dets(apply(locked['annotation_data'] or {}))
+        record = await conn.fetchrow(
+            """
+            UPDATE pages
+            SET annotation_data = $1::jsonb, updated_at = NOW(), version = version + 1
+            WHERE id = $2
+            RETURNING id, status, updated_at, version
+            """,
+            stored,
+            page_id,
+        )
+        await _sync_elements(conn, page_id, layout_dets)
+        return await _fetch_page(conn, page_id) if full else record
 
 
 async def update_page_attribute(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     page_attribute: dict,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> asyncpg.Record | None:
     """Update page_attribute within annotation_data using jsonb_set.
 
@@ -226,26 +470,29 @@ async def update_page_attribute(
         pool: Database connection pool.
         page_id: Page UUID.
         page_attribute: Page attribute dictionary.
+        expected_version: Only update if the page is at this version. None = any.
+        full: Return the whole page. False = only id, status, updated_at
+            and version.
 
     Returns:
         asyncpg.Record or None: Updated page record.
     """
     return await pool.fetchrow(
-        """
+        f"""
         UPDATE pages
         SET annotation_data = jsonb_set(
-            COALESCE(annotation_data, '{}'::jsonb),
-            '{page_attribute}',
+            COALESCE(annotation_data, '{{}}'::jsonb),
+            '{{page_attribute}}',
             $1::jsonb
         ),
-        updated_at = NOW()
+        updated_at = NOW(), version = version + 1
         WHERE id = $2
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
-        json.dumps(page_attribute),
+          AND ($3::int IS NULL OR version = $3)
+        RETURNING {_PAGE_COLUMNS if full else _PAGE_STATE_COLUMNS}
+        """,  # noqa: S608
+        page_attribute,
         page_id,
+        expected_version,
     )
 
 
@@ -253,112 +500,149 @@ async def add_element(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     element: dict,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> asyncpg.Record | None:
-    """Add a layout element to annotation_data.layout_dets.
+    """Append a layout element to the page as a new page_elements row.
+
+    The element's ``anno_id`` (one past the page's largest) and ``order``
+    (number of elements) are allocated by the INSERT, overriding any given.
 
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
         element: Layout element dictionary.
+        expected_version: Only update if the page is at this version. None = any.
+        full: Return the whole page. False = only id, status, updated_at,
+            version and the added ``element``.
 
     Returns:
         asyncpg.Record or None: Updated page record.
     """
-    return await pool.fetchrow(
-        """
-        UPDATE pages
-        SET annotation_data = jsonb_set(
-            COALESCE(annotation_data, '{"layout_dets": []}'::jsonb),
-            '{layout_dets}',
-            COALESCE(annotation_data->'layout_dets', '[]'::jsonb) || $1::jsonb
-        ),
-        updated_at = NOW()
-        WHERE id = $2
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
-        json.dumps(element),
-        page_id,
-    )
+    async with pool.acquire() as conn, conn.transaction():
+        # Locks the page row first, so the INSERT below (a separate statement
+        # with a fresh snapshot) sees the elements of any add committed before
+        updated = await conn.fetchval(
+            """
+            UPDATE pages
+            SET annotation_data = jsonb_set(
+                COALESCE(annotation_data, '{}'::jsonb), '{layout_dets}', '[]'::jsonb
+            ),
+            updated_at = NOW(), version = version + 1
+            WHERE id = $1
+              AND ($2::int IS NULL OR version = $2)
+            RETURNING id
+            """,
+            page_id,
+            expected_version,
+        )
+        if updated is None:
+            return None
+        added = await conn.fetchrow(
+            """
+            WITH added AS (
+                INSERT INTO page_elements AS e
+                SELECT r.*
+                FROM (
+                    SELECT COALESCE(MAX(position) + 1, 0) AS position,
+                           COALESCE(MAX(anno_id) + 1, 0) AS anno_id,
+                           COUNT(*) AS reading_order
+                    FROM page_elements
+                    WHERE page_id = $1
+                ) AS next
+                CROSS JOIN LATERAL layout_det_row(
+                    $1,
+                    next.position,
+                    $2::jsonb
+                        || jsonb_build_object('anno_id', next.anno_id, 'order', next.reading_order)
+                ) AS r
+                RETURNING page_element_json(e) AS element
+            )
+            SELECT p.id, p.status, p.updated_at, p.version, added.element
+            FROM added, pages p
+            WHERE p.id = $1
+            """,
+            page_id,
+            element,
+        )
+        return await _fetch_page(conn, page_id) if full else added
 
 
 async def delete_element(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     anno_id: int,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> asyncpg.Record | None:
-    """Delete a layout element by anno_id from annotation_data.layout_dets.
+    """Delete the page_elements rows of a layout element by anno_id.
 
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
         anno_id: Annotation ID of the element to remove.
+        expected_version: Only update if the page is at this version. None = any.
+        full: Return the whole page. False = only id, status, updated_at
+            and version.
 
     Returns:
         asyncpg.Record or None: Updated page record.
     """
-    return await pool.fetchrow(
-        """
-        UPDATE pages
-        SET annotation_data = jsonb_set(
-            annotation_data,
-            '{layout_dets}',
-            (
-                SELECT COALESCE(jsonb_agg(elem), '[]'::jsonb)
-                FROM jsonb_array_elements(annotation_data->'layout_dets') AS elem
-                WHERE (elem->>'anno_id')::int != $1
-            )
-        ),
-        updated_at = NOW()
-        WHERE id = $2
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
-        anno_id,
-        page_id,
-    )
+    async with pool.acquire() as conn, conn.transaction():
+        updated = await conn.fetchrow(
+            f"""
+            UPDATE pages
+            SET updated_at = NOW(), version = version + 1
+            WHERE id = $1
+              AND ($2::int IS NULL OR version = $2)
+            RETURNING {_PAGE_STATE_COLUMNS}
+            """,  # noqa: S608
+            page_id,
+            expected_version,
+        )
+        if updated is None:
+            return None
+        await conn.execute(
+            'DELETE FROM page_elements WHERE page_id = $1 AND anno_id = $2',
+            page_id,
+            anno_id,
+        )
+        return await _fetch_page(conn, page_id) if full else updated
 
 
 async def accept_auto_extracted(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
+    *,
+    expected_version: int | None = None,
 ) -> asyncpg.Record | None:
     """Copy auto_extracted_data to annotation_data if annotation is empty.
 
-    Only updates when annotation_data has no layout_dets or is NULL/empty.
+    Only updates when the page has no layout elements.
 
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
+        expected_version: Only update if the page is at this version. None = any.
 
     Returns:
         asyncpg.Record or None: Updated page record, or None if preconditions not met.
     """
-    return await pool.fetchrow(
-        """
-        UPDATE pages
-        SET annotation_data = auto_extracted_data, updated_at = NOW()
-        WHERE id = $1
-          AND auto_extracted_data IS NOT NULL
-          AND (
-            annotation_data IS NULL
-            OR annotation_data = '{}'::jsonb
-            OR NOT (annotation_data ? 'layout_dets')
-            OR jsonb_array_length(COALESCE(annotation_data->'layout_dets', '[]'::jsonb)) = 0
-          )
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
+    return await _accept_auto_extracted(
+        pool,
         page_id,
+        expected_version,
+        only_if_empty=True,
     )
 
 
 async def force_accept_auto_extracted(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
+    *,
+    expected_version: int | None = None,
 ) -> asyncpg.Record | None:
     """Copy auto_extracted_data to annotation_data unconditionally.
 
@@ -367,35 +651,81 @@ async def force_accept_auto_extracted(
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
+        expected_version: Only update if the page is at this version. None = any.
 
     Returns:
         asyncpg.Record or None: Updated page record, or None if no auto data.
     """
-    return await pool.fetchrow(
-        """
-        UPDATE pages
-        SET annotation_data = auto_extracted_data, updated_at = NOW()
-        WHERE id = $1
-          AND auto_extracted_data IS NOT NULL
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
+    return await _accept_auto_extracted(
+        pool,
         page_id,
+        expected_version,
+        only_if_empty=False,
     )
 
 
+async def _accept_auto_extracted(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    expected_version: int | None,
+    *,
+    only_if_empty: bool,
+) -> asyncpg.Record | None:
+    """Copy auto_extracted_data into annotation_data and page_elements.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        expected_version: Only update if the page is at this version. None = any.
+        only_if_empty: Only update pages without layout elements.
+
+    Returns:
+        asyncpg.Record or None: Updated page record, or None if preconditions not met.
+    """
+    async with pool.acquire() as conn, conn.transaction():
+        accepted = await conn.fetchrow(
+            f"""
+            UPDATE pages
+            SET annotation_data = CASE
+                    WHEN jsonb_typeof(auto_extracted_data->'layout_dets') = 'array'
+                    THEN jsonb_set(auto_extracted_data, '{{layout_dets}}', '[]'::jsonb)
+                    ELSE auto_extracted_data
+                END {_STRIP_ENGINE_EXTRA},
+                updated_at = NOW(), version = version + 1
+            WHERE id = $1
+              AND ($2::int IS NULL OR version = $2)
+              AND auto_extracted_data IS NOT NULL
+              AND (NOT $3 OR NOT EXISTS (SELECT 1 FROM page_elements WHERE page_id = $1))
+            RETURNING auto_extracted_data
+            """,  # noqa: S608
+            page_id,
+            expected_version,
+            only_if_empty,
+        )
+        if accepted is None:
+            return None
+
+        _, layout_dets = _split_layout_dets(accepted['auto_extracted_data'])
+        await _sync_elements(conn, page_id, layout_dets)
+        return await _fetch_page(conn, page_id)
+
+
 async def update_auto_extracted_data(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     auto_extracted_data: dict,
+    *,
+    expected_version: int | None = None,
 ) -> asyncpg.Record | None:
     """Update auto_extracted_data for a page after async extraction.
 
+    Clears the page's partial result, which the final result supersedes.
+
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
         auto_extracted_data: OmniDocBench dict from OCR extraction.
+        expected_version: Only update if the page is at this version. None = any.
 
     Returns:
         asyncpg.Record or None: Updated page record.
@@ -403,21 +733,125 @@ async def update_auto_extracted_data(
     return await pool.fetchrow(
         """
         UPDATE pages
-        SET auto_extracted_data = $1::jsonb, updated_at = NOW()
+        SET auto_extracted_data = $1::jsonb, partial_extracted_data = NULL,
+            updated_at = NOW(), version = version + 1
         WHERE id = $2
+          AND ($3::int IS NULL OR version = $3)
         RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
+                  page_annotation(id, annotation_data) AS annotation_data,
+                  auto_extracted_data, status, assigned_to,
+                  locked_at, updated_at, version
+        """,
+        auto_extracted_data,
+        page_id,
+        expected_version,
+    )
+
+
+async def update_partial_extracted_data(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    partial_extracted_data: dict,
+) -> None:
+    """Store the elements received so far while a page is being extracted.
+
+    auto_extracted_data keeps the previous complete result until the
+    extraction finishes.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        partial_extracted_data: Partial OmniDocBench dict (``extra.partial`` set).
+    """
+    await pool.execute(
+        """
+        UPDATE pages
+        SET partial_extracted_data = $1::jsonb, updated_at = NOW(), version = version + 1
+        WHERE id = $2
+        """,
+        partial_extracted_data,
+        page_id,
+    )
+
+
+async def clear_partial_extracted_data(pool: asyncpg.Pool, document_id: uuid.UUID) -> None:
+    """Drop partial results of a document's pages after a failed extraction.
+
+    Args:
+        pool: Database connection pool.
+        document_id: Document UUID.
+    """
+    await pool.execute(
+        """
+        UPDATE pages
+        SET partial_extracted_data = NULL, updated_at = NOW(), version = version + 1
+        WHERE document_id = $1
+          AND partial_extracted_data IS NOT NULL
         """,
-        json.dumps(auto_extracted_data),
+        document_id,
+    )
+
+
+async def update_image_phash(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    image_phash: int,
+) -> None:
+    """Store the perceptual hash of a page image.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        image_phash: Signed 64-bit perceptual hash.
+    """
+    await pool.execute(
+        'UPDATE pages SET image_phash = $1 WHERE id = $2',
+        image_phash,
         page_id,
     )
 
 
+async def list_duplicate_candidates(
+    pool: asyncpg.Pool,
+    document_id: uuid.UUID,
+    engine_key: str,
+) -> list[asyncpg.Record]:
+    """List pages of other documents in the same project that an engine has extracted.
+
+    Only pages with a stored result for ``engine_key`` qualify, so a duplicate
+    reuses the output of the same engine configuration rather than whatever
+    the page currently shows.
+
+    Args:
+        pool: Database connection pool.
+        document_id: Document being extracted (its pages are excluded).
+        engine_key: Hash of the engine configuration about to run.
+
+    Returns:
+        list[asyncpg.Record]: Records with id, image_path and image_phash.
+    """
+    return await pool.fetch(
+        """
+        SELECT p.id, p.image_path, p.image_phash
+        FROM pages p
+        JOIN documents d ON p.document_id = d.id
+        JOIN page_extraction_results r ON r.page_id = p.id AND r.engine_key = $2
+        WHERE d.project_id = (SELECT project_id FROM documents WHERE id = $1)
+          AND p.document_id <> $1
+          AND p.image_phash IS NOT NULL
+        """,
+        document_id,
+        engine_key,
+    )
+
+
 async def add_relation(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     relation: dict,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> asyncpg.Record | None:
     """Add a relation to extra.relation array in annotation_data.
 
@@ -425,30 +859,33 @@ async def add_relation(
         pool: Database connection pool.
         page_id: Page UUID.
         relation: Relation dict with source_anno_id, target_anno_id, relation_type.
+        expected_version: Only update if the page is at this version. None = any.
+        full: Return the whole page. False = only id, status, updated_at
+            and version.
 
     Returns:
         asyncpg.Record or None: Updated page record.
     """
     return await pool.fetchrow(
-        """
+        f"""
         UPDATE pages
         SET annotation_data = jsonb_set(
             jsonb_set(
-                COALESCE(annotation_data, '{"extra": {"relation": []}}'::jsonb),
-                '{extra}',
-                COALESCE(annotation_data->'extra', '{"relation": []}'::jsonb)
+                COALESCE(annotation_data, '{{"extra": {{"relation": []}}}}'::jsonb),
+                '{{extra}}',
+                COALESCE(annotation_data->'extra', '{{"relation": []}}'::jsonb)
             ),
-            '{extra,relation}',
+            '{{extra,relation}}',
             COALESCE(annotation_data->'extra'->'relation', '[]'::jsonb) || $1::jsonb
         ),
-        updated_at = NOW()
+        updated_at = NOW(), version = version + 1
         WHERE id = $2
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
-        json.dumps(relation),
+          AND ($3::int IS NULL OR version = $3)
+        RETURNING {_PAGE_COLUMNS if full else _PAGE_STATE_COLUMNS}
+        """,  # noqa: S608
+        relation,
         page_id,
+        expected_version,
     )
 
 
@@ -457,6 +894,9 @@ async def delete_relation(
     page_id: uuid.UUID,
     source_anno_id: int,
     target_anno_id: int,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> asyncpg.Record | None:
     """Delete a relation by source and target anno_id from extra.relation array.
 
@@ -465,16 +905,19 @@ async def delete_relation(
         page_id: Page UUID.
         source_anno_id: Source annotation ID.
         target_anno_id: Target annotation ID.
+        expected_version: Only update if the page is at this version. None = any.
+        full: Return the whole page. False = only id, status, updated_at
+            and version.
 
     Returns:
         asyncpg.Record or None: Updated page record.
     """
     return await pool.fetchrow(
-        """
+        f"""
         UPDATE pages
         SET annotation_data = jsonb_set(
             annotation_data,
-            '{extra,relation}',
+            '{{extra,relation}}',
             (
                 SELECT COALESCE(jsonb_agg(rel), '[]'::jsonb)
                 FROM jsonb_array_elements(
@@ -486,40 +929,54 @@ async def delete_relation(
                 )
             )
         ),
-        updated_at = NOW()
+        updated_at = NOW(), version = version + 1
         WHERE id = $3
-        RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
-        """,
+          AND ($4::int IS NULL OR version = $4)
+        RETURNING {_PAGE_COLUMNS if full else _PAGE_STATE_COLUMNS}
+        """,  # noqa: S608
         source_anno_id,
         target_anno_id,
         page_id,
+        expected_version,
     )
 
 
-async def get_all_by_project(
+async def get_export_entries(
     pool: asyncpg.Pool,
     project_id: uuid.UUID,
 ) -> list[asyncpg.Record]:
-    """Get all pages for a project with annotation data (for export).
+    """Get the OmniDocBench entries of all pages of a project (for export).
+
+    Each entry is the page annotation with page_attribute moved into a
+    page_info object, serialized to JSON text by the database.
 
     Args:
         pool: Database connection pool.
         project_id: Project UUID.
 
     Returns:
-        list[asyncpg.Record]: All pages with full annotation data.
+        list[asyncpg.Record]: One record per page with the ``entry`` JSON text.
     """
     return await pool.fetch(
-        """
-        SELECT p.id, p.page_no, p.width, p.height, p.image_path,
-               p.annotation_data
+        f"""
+        SELECT (
+            ((COALESCE(pa.annotation_data, '{{}}'::jsonb) {_STRIP_ENGINE_EXTRA}) - 'page_attribute')
+            || jsonb_build_object(
+                'page_info', jsonb_build_object(
+                    'page_no', p.page_no,
+                    'height', p.height,
+                    'width', p.width,
+                    'image_path', p.image_path,
+                    'page_attribute', COALESCE(pa.annotation_data->'page_attribute', '{{}}'::jsonb)
+                )
+            )
+        )::text AS entry
         FROM pages p
+        JOIN page_annotations pa ON pa.page_id = p.id
         JOIN documents d ON p.document_id = d.id
         WHERE d.project_id = $1
         ORDER BY d.created_at, p.page_no
-        """,
+        """,  # noqa: S608
         project_id,
     )
 
@@ -538,13 +995,15 @@ async def get_all_by_project_with_document(
         list[asyncpg.Record]: Pages with annotation data and document filename.
     """
     return await pool.fetch(
-        """
+        f"""
         SELECT p.id, p.page_no, p.width, p.height, p.image_path,
-               p.annotation_data, d.filename AS document_filename
+               pa.annotation_data {_STRIP_ENGINE_EXTRA} AS annotation_data,
+               d.filename AS document_filename
         FROM pages p
+        JOIN page_annotations pa ON pa.page_id = p.id
         JOIN documents d ON p.document_id = d.id
         WHERE d.project_id = $1
         ORDER BY d.created_at, p.page_no
-        """,
+        """,  # noqa: S608
         project_id,
     )
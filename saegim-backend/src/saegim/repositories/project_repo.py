@@ -1,6 +1,5 @@
 """Project repository with raw SQL queries."""
 
-import json
 import logging
 import uuid
 from typing import Any
@@ -164,8 +163,7 @@ async def get_ocr_config(pool: asyncpg.Pool, project_id: uuid.UUID) -> dict[str,
     raw = row['ocr_config']
     if raw is None:
         return normalize_ocr_config({})
-    parsed = json.loads(raw) if isinstance(raw, str) else dict(raw)
-    return normalize_ocr_config(parsed)
+    return normalize_ocr_config(dict(raw))
 
 
 async def update_ocr_config(
@@ -185,7 +183,7 @@ async def update_ocr_config(
     """
     result = await pool.execute(
         'UPDATE projects SET ocr_config = $1::jsonb WHERE id = $2',
-        json.dumps(ocr_config),
+        ocr_config,
         project_id,
     )
     return result == 'UPDATE 1'
@@ -1,6 +1,5 @@
 """Task workflow repository with raw SQL queries."""
 
-import json
 import uuid
 
 import asyncpg
@@ -63,6 +62,8 @@ async def assign_page(
     page_id: uuid.UUID,
     user_id: uuid.UUID,
     assigned_by_id: uuid.UUID,
+    *,
+    expected_version: int | None = None,
 ) -> asyncpg.Record | None:
     """Assign a page to a user, setting status to in_progress.
 
@@ -73,6 +74,7 @@ async def assign_page(
         page_id: Page UUID.
         user_id: User UUID to assign.
         assigned_by_id: User UUID performing the assignment.
+        expected_version: Only update if the page is at this version. None = any.
 
     Returns:
         Updated page record, or None if page not found or invalid state.
@@ -81,15 +83,19 @@ async def assign_page(
         record = await conn.fetchrow(
             """
             UPDATE pages
-            SET assigned_to = $1, status = 'in_progress', updated_at = NOW()
+            SET assigned_to = $1, status = 'in_progress',
+                updated_at = NOW(), version = version + 1
             WHERE id = $2
               AND status IN ('pending', 'in_progress')
+              AND ($3::int IS NULL OR version = $3)
             RETURNING id, document_id, page_no, width, height, image_path,
-                      annotation_data, auto_extracted_data, status, assigned_to,
-                      locked_at, updated_at
+                      page_annotation(id, annotation_data) AS annotation_data,
+                      auto_extracted_data, status, assigned_to,
+                      locked_at, updated_at, version
             """,
             user_id,
             page_id,
+            expected_version,
         )
         if record is not None:
             await _record_history(conn, page_id, assigned_by_id, 'assigned')
@@ -100,6 +106,8 @@ async def submit_page(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     user_id: uuid.UUID,
+    *,
+    expected_version: int | None = None,
 ) -> asyncpg.Record | None:
     """Submit a page for review, setting status to submitted.
 
@@ -109,6 +117,7 @@ async def submit_page(
         pool: Database connection pool.
         page_id: Page UUID.
         user_id: User UUID submitting the page.
+        expected_version: Only update if the page is at this version. None = any.
 
     Returns:
         Updated page record, or None if preconditions not met.
@@ -117,16 +126,20 @@ async def submit_page(
         record = await conn.fetchrow(
             """
             UPDATE pages
-            SET status = 'submitted', locked_at = NULL, updated_at = NOW()
+            SET status = 'submitted', locked_at = NULL,
+                updated_at = NOW(), version = version + 1
             WHERE id = $1
               AND status = 'in_progress'
               AND assigned_to = $2
+              AND ($3::int IS NULL OR version = $3)
             RETURNING id, document_id, page_no, width, height, image_path,
-                      annotation_data, auto_extracted_data, status, assigned_to,
-                      locked_at, updated_at
+                      page_annotation(id, annotation_data) AS annotation_data,
+                      auto_extracted_data, status, assigned_to,
+                      locked_at, updated_at, version
             """,
             page_id,
             user_id,
+            expected_version,
         )
         if record is not None:
             await _record_history(conn, page_id, user_id, 'submitted')
@@ -139,6 +152,8 @@ async def review_page(
     reviewer_id: uuid.UUID,
     action: str,
     comment: str | None = None,
+    *,
+    expected_version: int | None = None,
 ) -> asyncpg.Record | None:
     """Review a submitted page (approve or reject).
 
@@ -150,6 +165,7 @@ async def review_page(
         reviewer_id: Reviewer's user UUID.
         action: 'approved' or 'rejected'.
         comment: Optional review comment.
+        expected_version: Only update if the page is at this version. None = any.
 
     Returns:
         Updated page record, or None if preconditions not met.
@@ -161,15 +177,18 @@ async def review_page(
         record = await conn.fetchrow(
             """
             UPDATE pages
-            SET status = $1, updated_at = NOW()
+            SET status = $1, updated_at = NOW(), version = version + 1
             WHERE id = $2
               AND status = 'submitted'
+              AND ($3::int IS NULL OR version = $3)
             RETURNING id, document_id, page_no, width, height, image_path,
-                      annotation_data, auto_extracted_data, status, assigned_to,
-                      locked_at, updated_at
+                      page_annotation(id, annotation_data) AS annotation_data,
+                      auto_extracted_data, status, assigned_to,
+                      locked_at, updated_at, version
             """,
             new_status,
             page_id,
+            expected_version,
         )
         if record is not None:
             snapshot = {'comment': comment} if comment else None
@@ -205,8 +224,9 @@ async def acquire_lock(
             OR locked_at < NOW() - INTERVAL '{LOCK_TIMEOUT_MINUTES} minutes'
           )
         RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
+                  page_annotation(id, annotation_data) AS annotation_data,
+                  auto_extracted_data, status, assigned_to,
+                  locked_at, updated_at, version
         """,  # noqa: S608
         page_id,
         user_id,
@@ -232,8 +252,9 @@ async def release_lock(
         SET locked_at = NULL, updated_at = NOW()
         WHERE id = $1
         RETURNING id, document_id, page_no, width, height, image_path,
-                  annotation_data, auto_extracted_data, status, assigned_to,
-                  locked_at, updated_at
+                  page_annotation(id, annotation_data) AS annotation_data,
+                  auto_extracted_data, status, assigned_to,
+                  locked_at, updated_at, version
         """,
         page_id,
     )
@@ -340,7 +361,7 @@ async def record_history(
         page_id,
         user_id,
         action,
-        json.dumps(snapshot) if snapshot else None,
+        snapshot or None,
     )
 
 
@@ -372,5 +393,5 @@ async def _record_history(
         page_id,
         user_id,
         action,
-        json.dumps(snapshot) if snapshot else None,
+        snapshot or None,
     )
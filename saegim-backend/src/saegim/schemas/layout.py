@@ -0,0 +1,36 @@
+"""Local layout server schemas."""
+
+from pydantic import BaseModel, Field
+
+
+class LayoutRegionSchema(BaseModel):
+    """A detected layout region."""
+
+    bbox: tuple[float, float, float, float]
+    category: str
+    score: float
+    text: str | None = None
+
+
+class DetectLayoutRequest(BaseModel):
+    """Request to detect layout on page images readable by the server."""
+
+    provider: str = Field(default='docling', description='Layout provider (layout_provider value)')
+    model_name: str | None = Field(
+        default=None,
+        description='HuggingFace model for Docling. None = provider default.',
+    )
+    image_paths: list[str] = Field(min_length=1, description='Page image paths on this node')
+
+
+class DetectLayoutResponse(BaseModel):
+    """Detected regions for each requested image, in request order."""
+
+    results: list[list[LayoutRegionSchema]]
+
+
+class LayoutServerHealth(BaseModel):
+    """Layout server status."""
+
+    status: str
+    detectors: list[str]
@@ -4,9 +4,9 @@ import datetime
 import uuid
 from enum import StrEnum
 from pathlib import PurePosixPath
-from typing import Any
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class PageStatus(StrEnum):
@@ -18,6 +18,13 @@ class PageStatus(StrEnum):
     REVIEWED = 'reviewed'
 
 
+class PageView(StrEnum):
+    """Response view of page edits."""
+
+    FULL = 'full'
+    MINIMAL = 'minimal'
+
+
 class PageResponse(BaseModel):
     """Schema for page response with annotation data."""
 
@@ -32,9 +39,11 @@ class PageResponse(BaseModel):
     pdf_url: str = ''
     annotation_data: dict[str, Any]
     auto_extracted_data: dict[str, Any] | None = None
+    partial_extracted_data: dict[str, Any] | None = None
     status: PageStatus
     assigned_to: uuid.UUID | None = None
     updated_at: datetime.datetime
+    version: int = 1
     project_id: uuid.UUID | None = None
     project_name: str | None = None
     document_filename: str | None = None
@@ -51,6 +60,26 @@ class PageResponse(BaseModel):
         return self
 
 
+class ExtractionResultSummary(BaseModel):
+    """Schema for a stored extraction result of one engine configuration."""
+
+    id: uuid.UUID
+    page_id: uuid.UUID
+    engine_key: str
+    engine_type: str
+    engine_id: str | None = None
+    duration_ms: int | None = None
+    element_count: int = 0
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class ExtractionResultResponse(ExtractionResultSummary):
+    """Schema for a stored extraction result with its payload."""
+
+    result: dict[str, Any]
+
+
 class PageListResponse(BaseModel):
     """Schema for page list item."""
 
@@ -69,6 +98,49 @@ class PageAnnotationUpdate(BaseModel):
     annotation_data: dict[str, Any]
 
 
+class JsonPatchOperation(BaseModel):
+    """Schema for one RFC 6902 JSON Patch operation on annotation_data."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    op: Literal['add', 'remove', 'replace', 'move', 'copy', 'test']
+    path: str
+    value: Any = None
+    from_: str | None = Field(default=None, alias='from')
+
+
+class PagePatchResponse(BaseModel):
+    """Schema for the result of a JSON Patch on a page.
+
+    Only the page metadata is returned, not the patched annotation.
+    """
+
+    id: uuid.UUID
+    status: PageStatus
+    updated_at: datetime.datetime
+    version: int
+    applied: int
+
+
+class PageMutationResponse(BaseModel):
+    """Schema for the sparse result of a page edit (``view=minimal``).
+
+    Only the page state and what the edit changed are returned, not the
+    annotation or auto-extracted data.
+    """
+
+    id: uuid.UUID
+    status: PageStatus
+    updated_at: datetime.datetime
+    version: int
+    element: dict[str, Any] | None = None
+    anno_id: int | None = None
+    relation: dict[str, Any] | None = None
+    page_attribute: dict[str, Any] | None = None
+    order_map: dict[str, int] | None = None
+    created_anno_ids: list[int] | None = None
+
+
 class PageAttributeUpdate(BaseModel):
     """Schema for updating page attributes."""
 
@@ -87,6 +159,21 @@ class ElementCreate(BaseModel):
     ignore: bool = Field(default=False)
 
 
+class ElementUpdate(BaseModel):
+    """Schema for changing fields of an existing layout element.
+
+    Only the fields that are given are changed.
+    """
+
+    category_type: str | None = Field(default=None, min_length=1)
+    poly: list[float] | None = Field(default=None, min_length=8, max_length=8)
+    text: str | None = None
+    latex: str | None = None
+    html: str | None = None
+    attribute: dict[str, Any] | None = None
+    ignore: bool | None = None
+
+
 RELATION_TYPES = frozenset(
     {
         'parent_son',
@@ -114,6 +201,56 @@ class RelationDelete(BaseModel):
     target_anno_id: int = Field(ge=0)
 
 
+class ElementCreateOperation(BaseModel):
+    """Batch operation adding a layout element."""
+
+    op: Literal['create']
+    element: ElementCreate
+
+
+class ElementUpdateOperation(BaseModel):
+    """Batch operation changing fields of a layout element."""
+
+    op: Literal['update']
+    anno_id: int = Field(ge=0)
+    changes: ElementUpdate
+
+
+class ElementDeleteOperation(BaseModel):
+    """Batch operation deleting a layout element."""
+
+    op: Literal['delete']
+    anno_id: int = Field(ge=0)
+
+
+class RelationCreateOperation(RelationCreate):
+    """Batch operation adding a relation between two elements."""
+
+    op: Literal['add_relation']
+
+
+class RelationDeleteOperation(RelationDelete):
+    """Batch operation deleting a relation between two elements."""
+
+    op: Literal['delete_relation']
+
+
+ElementBatchOperation = Annotated[
+    ElementCreateOperation
+    | ElementUpdateOperation
+    | ElementDeleteOperation
+    | RelationCreateOperation
+    | RelationDeleteOperation,
+    Field(discriminator='op'),
+]
+
+
+class ElementBatch(BaseModel):
+    """Schema for applying many element and relation operations at once."""
+
+    operations: list[ElementBatchOperation] = Field(min_length=1, max_length=1000)
+
+
 class ReadingOrderUpdate(BaseModel):
     """Schema for updating reading order of layout elements."""
 
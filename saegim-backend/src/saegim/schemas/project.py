@@ -26,16 +26,59 @@ class ProjectResponse(BaseModel):
 
 # --- OCR Config schemas ---
 
-EngineType = Literal['commercial_api', 'vllm', 'split_pipeline', 'pdfminer']
+EngineType = Literal['commercial_api', 'vllm', 'split_pipeline', 'ensemble', 'pdfminer']
 CommercialApiProvider = Literal['gemini', 'vllm']
 GeminiModel = Literal[
     'gemini-3-flash-preview',
     'gemini-3.1-pro-preview',
 ]
 SplitPipelineOcrProvider = Literal['gemini', 'vllm']
+CropImageFormat = Literal['png', 'jpeg', 'webp']
 
 
-class CommercialApiConfig(BaseModel):
+class CropEncodingConfig(BaseModel):
+    """Encoding of cropped regions sent for text OCR."""
+
+    crop_format: CropImageFormat = Field(default='png', description='Crop image format')
+    crop_quality: int = Field(
+        default=90,
+        ge=1,
+        le=100,
+        description='JPEG/WebP quality (ignored for PNG)',
+    )
+    crop_max_side: int | None = Field(
+        default=None,
+        ge=32,
+        description='Downscale crops so the longer side fits. None = original size.',
+    )
+    crop_grayscale: bool = Field(
+        default=False,
+        description='Send text-only regions as grayscale (figures and tables keep colour)',
+    )
+
+
+class PageRoutingConfig(BaseModel):
+    """Pages that bypass the engine during extraction."""
+
+    text_layer_routing: bool = Field(
+        default=False,
+        description=(
+            'Extract pages with a usable PDF text layer and no tables or vector drawings '
+            'directly with pdfminer; OCR only the rest. Routed pages get text blocks and '
+            'figures only (no table, formula or layout-model structure)'
+        ),
+    )
+    skip_blank_pages: bool = Field(
+        default=False,
+        description='Store an empty result for blank pages instead of extracting them',
+    )
+    reuse_duplicate_pages: bool = Field(
+        default=False,
+        description='Copy the result of an identical page in the project instead of extracting',
+    )
+
+
+class CommercialApiConfig(CropEncodingConfig, PageRoutingConfig):
     """Commercial VLM API configuration."""
 
     provider: CommercialApiProvider = Field(description='VLM provider type')
@@ -47,7 +90,7 @@ class CommercialApiConfig(BaseModel):
     )
 
 
-class VllmServerConfig(BaseModel):
+class VllmServerConfig(CropEncodingConfig, PageRoutingConfig):
     """vLLM server configuration."""
 
     host: str = Field(default='localhost', description='Server host')
@@ -63,13 +106,56 @@ class VllmServerConfig(BaseModel):
     )
 
 
-class SplitPipelineConfig(BaseModel):
+class SplitPipelineConfig(CropEncodingConfig, PageRoutingConfig):
     """Split pipeline configuration (Docling layout + text OCR)."""
 
     docling_model_name: str = Field(
         default='ibm-granite/granite-docling-258M',
         description='Docling model for layout detection',
     )
+    layout_batch_size: int = Field(
+        default=1,
+        ge=1,
+        le=32,
+        description='Pages per layout detector forward pass',
+    )
+    layout_device: str | None = Field(
+        default=None,
+        pattern=r'^(cpu|mps|cuda(:\d+)?)$',
+        description='Torch device for the layout model. None = CUDA if available.',
+    )
+    layout_num_threads: int | None = Field(
+        default=None,
+        ge=1,
+        description='Intra-op threads for the layout model. None = torch default.',
+    )
+    layout_interop_threads: int | None = Field(
+        default=None,
+        ge=1,
+        description='Inter-op threads for the layout model. None = torch default.',
+    )
+    layout_max_concurrency: int | None = Field(
+        default=1,
+        ge=1,
+        description='Concurrent layout inferences per process. None = unbounded.',
+    )
+    layout_server_url: str = Field(
+        default='',
+        pattern=r'^$|^(https?|unix)://',
+        description='Shared local layout server (http://host:port or unix:///path.sock). '
+        'Empty = load the layout model in each worker.',
+    )
+    text_layer_regions: bool = Field(
+        default=False,
+        description='Fill region text from the PDF text layer; OCR only regions without text',
+    )
+    reuse_repeated_regions: bool = Field(
+        default=False,
+        description=(
+            'OCR recurring header/footer regions once per document and reuse their text; '
+            "a changed number (e.g. an embedded page number) is OCR'd on its own"
+        ),
+    )
     ocr_provider: SplitPipelineOcrProvider = Field(description='OCR text provider')
     ocr_api_key: str = Field(default='', description='OCR API key (for Gemini)')
     ocr_host: str = Field(default='localhost', description='OCR server host (for vLLM)')
@@ -85,16 +171,57 @@ class SplitPipelineConfig(BaseModel):
     )
 
 
+class EnsembleConfig(PageRoutingConfig):
+    """Ensemble configuration (several engine instances merged per page)."""
+
+    engine_ids: list[str] = Field(
+        min_length=2,
+        description='Registered engine instances to run, in priority order',
+    )
+    box_engine_id: str = Field(
+        default='',
+        description='Engine whose boxes and categories are kept. Empty = first engine.',
+    )
+    text_preferences: dict[str, list[str]] = Field(
+        default_factory=dict,
+        description='Per-category engine order for region text (e.g. {"table": ["gemini"]})',
+    )
+    iou_threshold: float = Field(
+        default=0.5,
+        gt=0.0,
+        le=1.0,
+        description='Minimum IoU for regions of two engines to be merged',
+    )
+
+    @model_validator(mode='after')
+    def validate_engine_references(self) -> 'EnsembleConfig':
+        """Ensure box and text preferences only name member engines."""
+        members = set(self.engine_ids)
+        if len(members) != len(self.engine_ids):
+            msg = 'engine_ids must not contain duplicates'
+            raise ValueError(msg)
+        if self.box_engine_id and self.box_engine_id not in members:
+            msg = f"box_engine_id '{self.box_engine_id}' is not in engine_ids"
+            raise ValueError(msg)
+        for category, engine_ids in self.text_preferences.items():
+            unknown = set(engine_ids) - members
+            if unknown:
+                msg = f"text_preferences['{category}'] names unknown engines: {sorted(unknown)}"
+                raise ValueError(msg)
+        return self
+
+
 # --- Multi-instance engine registry schemas ---
 
 # Valid engine types that can be registered as instances
-RegisterableEngineType = Literal['commercial_api', 'vllm', 'split_pipeline']
+RegisterableEngineType = Literal['commercial_api', 'vllm', 'split_pipeline', 'ensemble']
 
 # Mapping from engine_type to expected config class for validation
 _ENGINE_CONFIG_CLASSES: dict[str, type[BaseModel]] = {
     'commercial_api': CommercialApiConfig,
     'vllm': VllmServerConfig,
     'split_pipeline': SplitPipelineConfig,
+    'ensemble': EnsembleConfig,
 }
 
 
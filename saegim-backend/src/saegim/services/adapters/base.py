@@ -3,15 +3,24 @@
 from typing import Any, Protocol
 
 from saegim.services.docir import PageIR
+from saegim.services.image_encoding import ImageEncoding
 
 
 class ModelAdapter(Protocol):
     """Protocol for model-specific adapters.
 
-    Adapters handle prompt construction and response parsing
-    for different VLM/OCR models.
+    Adapters handle image preprocessing, prompt construction and response
+    parsing for different VLM/OCR models.
+
+    Attributes:
+        image_encoding: Preferred input size and encoding of the model.
+            Page images are resized and re-encoded accordingly before
+            ``build_messages`` is called, and the page size passed to
+            ``build_messages``/``parse_response`` is the resized one.
     """
 
+    image_encoding: ImageEncoding
+
     def build_messages(
         self,
         image_b64: str,
@@ -49,3 +58,24 @@ class ModelAdapter(Protocol):
             Parsed PageIR.
         """
         ...
+
+    def parse_partial(
+        self,
+        content: str,
+        page_width: int,
+        page_height: int,
+    ) -> PageIR:
+        """Parse an incomplete streamed completion into PageIR.
+
+        Only elements that are fully received are returned, so a partial
+        result never contains a truncated element.
+
+        Args:
+            content: Message content received so far.
+            page_width: Image width in pixels.
+            page_height: Image height in pixels.
+
+        Returns:
+            PageIR with the complete elements received so far.
+        """
+        ...
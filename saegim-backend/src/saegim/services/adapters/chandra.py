@@ -12,6 +12,7 @@ from typing import Any
 from partialjson import JSONParser
 
 from saegim.services.docir import ElementIR, Geometry, PageIR
+from saegim.services.image_encoding import ImageEncoding
 from saegim.services.ocr_provider import STRUCTURED_OCR_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,9 @@ _partial_parser = JSONParser(strict=False)
 class ChandraAdapter:
     """Adapter for Chandra and STRUCTURED_OCR_PROMPT-compatible models."""
 
+    # Qwen-VL based models resize larger inputs server-side anyway
+    image_encoding = ImageEncoding(format='jpeg', quality=95, max_side=2048)
+
     def build_messages(
         self,
         image_b64: str,
@@ -73,6 +77,25 @@ class ChandraAdapter:
         elements = parse_openai_response(result)
         return elements_to_page_ir(elements, page_width, page_height)
 
+    def parse_partial(
+        self,
+        content: str,
+        page_width: int,
+        page_height: int,
+    ) -> PageIR:
+        """Parse an incomplete streamed JSON array into PageIR.
+
+        Args:
+            content: Message content received so far.
+            page_width: Image width in pixels.
+            page_height: Image height in pixels.
+
+        Returns:
+            PageIR with the complete elements received so far.
+        """
+        elements = parse_partial_elements(content)
+        return elements_to_page_ir(elements, page_width, page_height)
+
 
 def parse_openai_response(result: dict[str, Any]) -> list[dict[str, Any]]:
     """Parse OpenAI-compatible chat response to extract layout elements.
@@ -114,6 +137,35 @@ def parse_openai_response(result: dict[str, Any]) -> list[dict[str, Any]]:
         return []
 
 
+def parse_partial_elements(text: str) -> list[dict[str, Any]]:
+    """Parse the complete elements of a truncated JSON array.
+
+    The last element is dropped unless the text ends right after an object
+    or the array, since partialjson fills in a truncated element with
+    whatever was received so far.
+
+    Args:
+        text: Streamed model output received so far.
+
+    Returns:
+        List of complete element dicts.
+    """
+    text = strip_markdown_fences(text).strip()
+    if not text:
+        return []
+
+    try:
+        elements = _partial_parser.parse(text)
+    except (json.JSONDecodeError, KeyError, IndexError, ValueError):
+        return []
+    if not isinstance(elements, list):
+        return []
+
+    if not text.rstrip(',').rstrip().endswith(('}', ']')):
+        elements = elements[:-1]
+    return [elem for elem in elements if isinstance(elem, dict)]
+
+
 def loads_lenient(text: str) -> list | dict | str | int | float | bool | None:
     r"""Parse JSON with lenient handling of LLM output quirks.
 
@@ -13,6 +13,7 @@ import re
 from typing import Any
 
 from saegim.services.docir import ElementIR, Geometry, PageIR
+from saegim.services.image_encoding import ImageEncoding
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,9 @@ _IMAGE_PATTERN = re.compile(r'!\[image\]\(image_\d+\.png\)(\d+),(\d+),(\d+),(\d+
 class LightOnOcrAdapter:
     """Adapter for LightOnOCR and prompt-free VLM models."""
 
+    # LightOnOCR is trained on pages rendered with a 1540px longest side
+    image_encoding = ImageEncoding(format='jpeg', quality=95, max_side=1540)
+
     def build_messages(
         self,
         image_b64: str,
@@ -71,6 +75,25 @@ class LightOnOcrAdapter:
         text = _extract_content(result)
         return _parse_lighton_output(text, page_width, page_height)
 
+    def parse_partial(
+        self,
+        content: str,
+        page_width: int,
+        page_height: int,
+    ) -> PageIR:
+        """Parse the complete lines of a streamed LightOnOCR output.
+
+        Args:
+            content: Message content received so far.
+            page_width: Image width in pixels.
+            page_height: Image height in pixels.
+
+        Returns:
+            PageIR built from all lines terminated by a newline.
+        """
+        complete = content[: content.rfind('\n') + 1]
+        return _parse_lighton_output(complete, page_width, page_height)
+
 
 def _extract_content(result: dict[str, Any]) -> str:
     """Extract text content from OpenAI-compatible response.
@@ -9,11 +9,15 @@ import logging
 from typing import Any
 
 from saegim.services.docir import ElementIR, PageIR
+from saegim.services.image_encoding import ImageEncoding
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_PROMPT = 'OCR:'
 
+# Output has no geometry, so only the upload size matters
+_IMAGE_ENCODING = ImageEncoding(format='jpeg', quality=95, max_side=2048)
+
 
 class PaddleOcrVlAdapter:
     """Adapter for PaddleOCR-VL and task-prompt-based VLM models.
@@ -22,6 +26,8 @@ class PaddleOcrVlAdapter:
         prompt: Task prompt to send with the image.
     """
 
+    image_encoding = _IMAGE_ENCODING
+
     def __init__(self, prompt: str = _DEFAULT_PROMPT) -> None:
         """Initialize PaddleOCR-VL adapter.
 
@@ -80,6 +86,24 @@ class PaddleOcrVlAdapter:
         text = _extract_content(result)
         return _parse_paddleocr_output(text, page_width, page_height, self._prompt)
 
+    def parse_partial(
+        self,
+        content: str,
+        page_width: int,
+        page_height: int,
+    ) -> PageIR:
+        """Parse a streamed PaddleOCR-VL output into PageIR.
+
+        Args:
+            content: Message content received so far.
+            page_width: Image width in pixels.
+            page_height: Image height in pixels.
+
+        Returns:
+            PageIR with a single text_block holding the text so far.
+        """
+        return _parse_paddleocr_output(content, page_width, page_height, self._prompt)
+
 
 def _extract_content(result: dict[str, Any]) -> str:
     """Extract text content from OpenAI-compatible response.
@@ -7,7 +7,7 @@ format-agnostic Exporters in the 3-stage OCR pipeline.
 See docs/architecture/docir-architecture.md for the full specification.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any, Literal
 
 ElementKind = Literal[
@@ -109,3 +109,41 @@ class RecognitionResult:
     text: str
     category_hint: str
     confidence: float | None = None
+
+
+def rescale_page_ir(page: PageIR, width_px: int, height_px: int) -> PageIR:
+    """Scale element geometry of a page to a different pixel size.
+
+    Used when the model saw a downscaled copy of the page: coordinates are
+    mapped back to the original page pixels.
+
+    Args:
+        page: PageIR in the coordinate space the model returned.
+        width_px: Target page width in pixels.
+        height_px: Target page height in pixels.
+
+    Returns:
+        PageIR with scaled geometry, or the same page if the size matches.
+    """
+    if (page.width_px, page.height_px) == (width_px, height_px):
+        return page
+    if page.width_px <= 0 or page.height_px <= 0:
+        return replace(page, width_px=width_px, height_px=height_px)
+
+    sx = width_px / page.width_px
+    sy = height_px / page.height_px
+
+    elements = []
+    for elem in page.elements:
+        geometry = elem.geometry
+        if geometry is not None:
+            bbox = geometry.bbox
+            if bbox is not None:
+                bbox = (bbox[0] * sx, bbox[1] * sy, bbox[2] * sx, bbox[3] * sy)
+            polygon = geometry.polygon
+            if polygon is not None:
+                polygon = [(x * sx, y * sy) for x, y in polygon]
+            elem = replace(elem, geometry=replace(geometry, bbox=bbox, polygon=polygon))
+        elements.append(elem)
+
+    return replace(page, width_px=width_px, height_px=height_px, elements=tuple(elements))
@@ -3,15 +3,29 @@
 Uses IBM's granite-docling-258M vision-language model to detect text blocks,
 tables, figures, equations, and other document elements from page images.
 Outputs DocTags format which is parsed into LayoutRegion instances.
+
+Generation is bounded per page: the token budget scales with the page's
+ink density, and each sequence stops as soon as it closes the DocTags
+document or starts looping on a repeated token pattern.
 """
 
 import logging
 import re
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 from PIL import Image
 
+from saegim.services.inference_options import (
+    DEFAULT_INFERENCE_OPTIONS,
+    InferenceOptions,
+    apply_thread_settings,
+    inference_slot,
+    resolve_device,
+)
 from saegim.services.layout_types import LayoutRegion
 
 logger = logging.getLogger(__name__)
@@ -50,6 +64,28 @@ _ELEMENT_RE = re.compile(
 # Pattern to extract loc values
 _LOC_RE = re.compile(r'<loc_(\d+)>')
 
+# Closing tag of a DocTags document; nothing useful is generated after it
+_DOCTAGS_END = '</doctag>'
+
+# Generation token budget bounds and tokens per unit of ink ratio.
+# A dense single-column text page has an ink ratio around 0.1-0.15.
+_MIN_NEW_TOKENS = 1024
+_MAX_NEW_TOKENS = 8192
+_TOKENS_PER_INK = 48000
+
+# Pixels darker than this (0-255 grayscale) count as ink
+_INK_THRESHOLD = 160
+# Long edge of the thumbnail used to measure ink density
+_INK_SAMPLE_SIZE = 256
+
+# A loop is a pattern of at most this many tokens ...
+_REPETITION_MAX_PERIOD = 64
+# ... repeated back to back over at least this many generated tokens.
+# Large enough that runs of empty table cells are not mistaken for a loop.
+_REPETITION_MIN_SPAN = 256
+# Check for loops every N generated tokens
+_REPETITION_CHECK_INTERVAL = 16
+
 
 def _extract_locs(locs_str: str) -> tuple[int, int, int, int]:
     """Extract four location values from DocTags loc tokens.
@@ -254,6 +290,157 @@ def parse_doctags_to_regions(
     return regions
 
 
+def ink_ratio(image: Image.Image) -> float:
+    """Measure the fraction of dark pixels on a page image.
+
+    Args:
+        image: PIL Image of the page.
+
+    Returns:
+        Ink ratio between 0.0 (blank) and 1.0 (fully dark).
+    """
+    sample = image.convert('L')
+    sample.thumbnail((_INK_SAMPLE_SIZE, _INK_SAMPLE_SIZE))
+    pixels = np.asarray(sample)
+    if pixels.size == 0:
+        return 0.0
+    return float(np.count_nonzero(pixels < _INK_THRESHOLD)) / pixels.size
+
+
+def token_budget(
+    image: Image.Image,
+    *,
+    min_tokens: int = _MIN_NEW_TOKENS,
+    max_tokens: int = _MAX_NEW_TOKENS,
+) -> int:
+    """Estimate the DocTags token budget for a page from its ink density.
+
+    Args:
+        image: PIL Image of the page.
+        min_tokens: Budget for a blank page.
+        max_tokens: Upper bound for dense pages.
+
+    Returns:
+        max_new_tokens for generate().
+    """
+    budget = min_tokens + int(ink_ratio(image) * _TOKENS_PER_INK)
+    return max(min_tokens, min(budget, max_tokens))
+
+
+def has_repetition_loop(
+    token_ids: Sequence[int],
+    *,
+    max_period: int = _REPETITION_MAX_PERIOD,
+    min_span: int = _REPETITION_MIN_SPAN,
+) -> bool:
+    """Check whether a token sequence ends in a degenerate repetition loop.
+
+    Args:
+        token_ids: Generated token ids.
+        max_period: Longest repeated pattern to look for.
+        min_span: Minimum number of trailing tokens the repetition must cover.
+
+    Returns:
+        True if the last ``min_span`` tokens repeat with a period of at most
+        ``max_period`` tokens.
+    """
+    if len(token_ids) < min_span:
+        return False
+    window = list(token_ids[-min_span:])
+    return any(
+        window[:-period] == window[period:]
+        for period in range(1, min(max_period, min_span // 2) + 1)
+    )
+
+
+class DocTagsStopMonitor:
+    """Decides per sequence when DocTags generation can stop early.
+
+    Fed the tail of every sequence after each generation step. A sequence is
+    finished once its output contains the closing ``</doctag>`` tag or once
+    it is stuck repeating the same token pattern.
+    """
+
+    def __init__(self, decode: Callable[[list[int]], str], batch_size: int) -> None:
+        """Initialize the monitor.
+
+        Args:
+            decode: Callable turning a list of token ids into text.
+            batch_size: Number of sequences being generated.
+        """
+        self._decode = decode
+        self.finished = [False] * batch_size
+        self.looped = [False] * batch_size
+
+    def update(self, tails: list[list[int]], generated: int) -> list[bool]:
+        """Inspect the newest tokens of every sequence.
+
+        Args:
+            tails: Last ``_REPETITION_MIN_SPAN`` token ids of each sequence
+                (prompt tokens included while fewer have been generated).
+            generated: Number of tokens generated so far.
+
+        Returns:
+            Finished flag for each sequence.
+        """
+        check_loop = generated >= _REPETITION_MIN_SPAN and (
+            generated % _REPETITION_CHECK_INTERVAL == 0
+        )
+        # Enough tokens to cover the closing tag split over several tokens
+        end_tokens = min(generated, 8)
+        for idx, tail in enumerate(tails):
+            if self.finished[idx] or end_tokens == 0:
+                continue
+            if _DOCTAGS_END in self._decode(tail[-end_tokens:]):
+                self.finished[idx] = True
+            elif check_loop and has_repetition_loop(tail):
+                self.finished[idx] = True
+                self.looped[idx] = True
+        return list(self.finished)
+
+
+def _build_stopping_criteria(monitor: DocTagsStopMonitor, prompt_length: int) -> object:
+    """Wrap a DocTagsStopMonitor as a transformers stopping criterion.
+
+    Args:
+        monitor: Monitor deciding which sequences are finished.
+        prompt_length: Length of the (padded) prompt in tokens.
+
+    Returns:
+        StoppingCriteriaList for generate().
+    """
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class _DocTagsStoppingCriteria(StoppingCriteria):
+        def __call__(
+            self,
+            input_ids: torch.LongTensor,
+            scores: torch.FloatTensor,  # noqa: ARG002
+            **kwargs: object,  # noqa: ARG002
+        ) -> torch.BoolTensor:
+            tails = input_ids[:, -_REPETITION_MIN_SPAN:].tolist()
+            finished = monitor.update(tails, input_ids.shape[1] - prompt_length)
+            return torch.tensor(finished, dtype=torch.bool, device=input_ids.device)
+
+    return StoppingCriteriaList([_DocTagsStoppingCriteria()])
+
+
+def _clean_doctags(text: str) -> str:
+    """Strip padding and anything generated after the closing DocTags tag.
+
+    Args:
+        text: Decoded generation output.
+
+    Returns:
+        DocTags string.
+    """
+    end = text.find(_DOCTAGS_END)
+    if end != -1:
+        text = text[: end + len(_DOCTAGS_END)]
+    return text.replace('<eos>', '').replace('<pad>', '').strip()
+
+
 class DoclingLayoutDetector:
     """Granite Docling 258M based document layout detector.
 
@@ -262,13 +449,29 @@ class DoclingLayoutDetector:
     Implements the LayoutDetector protocol.
     """
 
-    def __init__(self, model_name: str = 'ibm-granite/granite-docling-258M') -> None:
+    def __init__(
+        self,
+        model_name: str = 'ibm-granite/granite-docling-258M',
+        *,
+        batch_size: int = 1,
+        options: InferenceOptions = DEFAULT_INFERENCE_OPTIONS,
+    ) -> None:
         """Initialize DoclingLayoutDetector with the specified model.
 
         Args:
             model_name: HuggingFace model identifier.
+            batch_size: Maximum number of pages per generate() call.
+            options: Device, thread and concurrency settings.
+
+        Raises:
+            ValueError: If batch_size is less than 1.
         """
+        if batch_size < 1:
+            msg = f'batch_size must be at least 1, got {batch_size}'
+            raise ValueError(msg)
         self.model_name = model_name
+        self.batch_size = batch_size
+        self._options = options
         self._processor: Any = None
         self._model: Any = None
         self._device: str = 'cpu'
@@ -287,9 +490,36 @@ class DoclingLayoutDetector:
         image = Image.open(image_path)
         page_width, page_height = image.size
 
-        doctags = self._run_inference(image)
+        with self._inference_slot():
+            doctags = self._run_inference(image)
         return parse_doctags_to_regions(doctags, page_width, page_height)
 
+    def detect_layout_batch(self, image_paths: Sequence[Path]) -> list[list[LayoutRegion]]:
+        """Detect layout regions from several page images.
+
+        Pages are generated ``batch_size`` at a time with left-padded prompts.
+
+        Args:
+            image_paths: Paths to the page image files.
+
+        Returns:
+            Detected LayoutRegion lists, one per image in input order.
+        """
+        if not image_paths:
+            return []
+
+        self._ensure_model_loaded()
+
+        results: list[list[LayoutRegion]] = []
+        for start in range(0, len(image_paths), self.batch_size):
+            images = [Image.open(path) for path in image_paths[start : start + self.batch_size]]
+            with self._inference_slot():
+                doctags_list = self._run_batch_inference(images)
+            for image, doctags in zip(images, doctags_list, strict=True):
+                page_width, page_height = image.size
+                results.append(parse_doctags_to_regions(doctags, page_width, page_height))
+        return results
+
     def test_connection(self) -> tuple[bool, str]:
         """Test that torch and transformers are available.
 
@@ -304,9 +534,18 @@ class DoclingLayoutDetector:
         except (ImportError, ModuleNotFoundError):
             return (False, 'torch and transformers are required for DoclingLayoutDetector')
 
-        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        device = resolve_device(torch, self._options.device)
         return (True, f'DoclingLayoutDetector available (device: {device})')
 
+    def _inference_slot(self) -> AbstractContextManager[None]:
+        """Acquire a per-process inference slot for this model.
+
+        Returns:
+            Context manager holding the slot.
+        """
+        key = f'{type(self).__name__}:{self.model_name}'
+        return inference_slot(key, self._options.max_concurrency)
+
     def _ensure_model_loaded(self) -> None:
         """Lazy-load the model and processor on first use.
 
@@ -320,7 +559,8 @@ class DoclingLayoutDetector:
             import torch
             from transformers import AutoModelForImageTextToText, AutoProcessor
 
-            self._device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            self._device = resolve_device(torch, self._options.device)
+            apply_thread_settings(torch, self._options)
             logger.info(
                 'Loading DoclingLayoutDetector model %s on %s (CUDA available: %s)',
                 self.model_name,
@@ -329,9 +569,11 @@ class DoclingLayoutDetector:
             )
 
             self._processor = AutoProcessor.from_pretrained(self.model_name)
+            # Decoder-only generation needs prompts aligned on the right edge
+            self._processor.tokenizer.padding_side = 'left'
             self._model = AutoModelForImageTextToText.from_pretrained(
                 self.model_name,
-                torch_dtype=torch.bfloat16 if self._device == 'cuda' else torch.float32,
+                torch_dtype=torch.bfloat16 if self._device.startswith('cuda') else torch.float32,
             ).to(self._device)  # type: ignore[invalid-argument-type]
 
             logger.info('DoclingLayoutDetector model loaded successfully on %s', self._device)
@@ -352,6 +594,17 @@ class DoclingLayoutDetector:
         Returns:
             DocTags string output from the model.
         """
+        return self._run_batch_inference([image])[0]
+
+    def _run_batch_inference(self, images: list[Image.Image]) -> list[str]:
+        """Run one generate() call over a batch of page images.
+
+        Args:
+            images: PIL Images of the pages.
+
+        Returns:
+            DocTags strings, one per image.
+        """
         messages = [
             {
                 'role': 'user',
@@ -363,17 +616,39 @@ class DoclingLayoutDetector:
         ]
 
         prompt = self._processor.apply_chat_template(messages, add_generation_prompt=True)
-        inputs = self._processor(text=prompt, images=[image], return_tensors='pt').to(self._device)
+        inputs = self._processor(
+            text=[prompt] * len(images),
+            images=[[image] for image in images],
+            padding=True,
+            return_tensors='pt',
+        ).to(self._device)
 
         import torch
 
+        prompt_length = inputs.input_ids.shape[1]
+        max_new_tokens = max(token_budget(image) for image in images)
+        monitor = DocTagsStopMonitor(
+            lambda ids: self._processor.tokenizer.decode(ids, skip_special_tokens=False),
+            len(images),
+        )
+
         with torch.no_grad():
-            generated_ids = self._model.generate(**inputs, max_new_tokens=8192)
+            generated_ids = self._model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                stopping_criteria=_build_stopping_criteria(monitor, prompt_length),
+            )
+
+        if any(monitor.looped):
+            logger.warning(
+                'Stopped DocTags generation on a repetition loop for %d of %d pages',
+                sum(monitor.looped),
+                len(images),
+            )
 
         decoded = self._processor.batch_decode(
-            generated_ids[:, inputs.input_ids.shape[1] :],
+            generated_ids[:, prompt_length:],
             skip_special_tokens=False,
-        )[0]
+        )
 
-        decoded = decoded.replace('<eos>', '').replace('<pad>', '').strip()
-        return decoded
+        return [_clean_doctags(text) for text in decoded]
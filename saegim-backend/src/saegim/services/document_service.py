@@ -1,20 +1,52 @@
 """Document service for PDF upload and image conversion."""
 
 import asyncio
+import hashlib
+import json
 import logging
+import time
 import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import asyncpg
 import pypdfium2 as pdfium
 
-from saegim.repositories import document_repo, page_repo, project_repo
-from saegim.services import attribute_classifier, extraction_service
+from saegim.repositories import document_repo, extraction_result_repo, page_repo, project_repo
+from saegim.services import attribute_classifier, extraction_service, page_fingerprint, text_layer
 from saegim.services.engines import build_engine, build_engine_by_id
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between partial-result writes for a streaming page
+_PARTIAL_WRITE_INTERVAL_S = 1.0
+
+# Upper bound on how long the extraction thread waits for a partial write
+_PARTIAL_WRITE_TIMEOUT_S = 10.0
+
+_EMPTY_PAGE_RESULT: dict[str, Any] = {
+    'layout_dets': [],
+    'page_attribute': {},
+    'extra': {'relation': []},
+}
+
+
+@dataclass(frozen=True)
+class EngineRun:
+    """Engine configuration whose results are stored per page.
+
+    Attributes:
+        key: SHA-256 of the canonical engine configuration.
+        engine_type: Engine type string.
+        engine_id: Engine instance ID, or None for legacy and pdfminer configs.
+    """
+
+    key: str
+    engine_type: str
+    engine_id: str | None = None
+
 
 async def upload_and_convert(
     pool: asyncpg.Pool,
@@ -103,6 +135,8 @@ async def upload_and_convert(
                 image_path=str(image_path),
                 auto_extracted_data=extracted,
             )
+            if extracted is not None:
+                await _record_result(pool, page_record['id'], engine_run(ocr_config), extracted)
 
             # Collect page info for async extraction
             if not use_pdfminer:
@@ -147,6 +181,7 @@ async def upload_and_convert(
                 document_id,
                 page_info_list,
                 ocr_config,
+                pdf_path=pdf_path,
             )
         )
         _task.add_done_callback(lambda t: t.result() if not t.cancelled() else None)
@@ -220,23 +255,93 @@ def _resolve_engine_type(ocr_config: dict[str, Any]) -> str:
     return ocr_config.get('engine_type', 'pdfminer')
 
 
+def _resolve_engine_config(ocr_config: dict[str, Any]) -> dict[str, Any]:
+    """Resolve the default engine's type-specific config from OCR config.
+
+    Supports both new multi-instance format and legacy flat format.
+
+    Args:
+        ocr_config: OCR configuration dict.
+
+    Returns:
+        Engine config dict (empty for pdfminer or unknown engines).
+    """
+    if 'engines' in ocr_config:
+        entry = ocr_config.get('engines', {}).get(ocr_config.get('default_engine_id'))
+        return (entry or {}).get('config', {})
+
+    return ocr_config.get(_resolve_engine_type(ocr_config), {})
+
+
+def engine_run(ocr_config: dict[str, Any]) -> EngineRun:
+    """Identify the default engine configuration of an OCR config.
+
+    The key hashes the engine type and its config (and the members of an
+    ensemble), not the display name, so renaming an engine keeps its
+    stored results while any setting change starts a new result set.
+
+    Args:
+        ocr_config: OCR configuration dict (multi-instance or legacy format).
+
+    Returns:
+        EngineRun of the default engine.
+    """
+    engine_type = _resolve_engine_type(ocr_config)
+    engine_id: str | None = None
+    canonical: dict[str, Any] = {'engine_type': engine_type, 'config': {}}
+
+    if 'engines' in ocr_config and engine_type != 'pdfminer':
+        engines = ocr_config.get('engines', {})
+        engine_id = ocr_config.get('default_engine_id')
+        canonical['config'] = engines[engine_id].get('config', {})
+        if engine_type == 'ensemble':
+            canonical['members'] = {
+                member_id: {
+                    'engine_type': engines.get(member_id, {}).get('engine_type'),
+                    'config': engines.get(member_id, {}).get('config'),
+                }
+                for member_id in canonical['config'].get('engine_ids', [])
+            }
+    elif engine_type != 'pdfminer':
+        canonical['config'] = ocr_config.get(engine_type, {})
+
+    payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+    key = hashlib.sha256(payload.encode()).hexdigest()
+    return EngineRun(key=key, engine_type=engine_type, engine_id=engine_id)
+
+
 async def _run_ocr_extraction_background(
     pool: asyncpg.Pool,
     document_id: uuid.UUID,
     page_info_list: list[dict],
     ocr_config: dict[str, Any],
+    *,
+    pdf_path: Path | None = None,
+    force: bool = False,
 ) -> None:
     """Run OCR extraction as a background asyncio task.
 
     Builds an OCR engine and extracts each page in a thread pool,
     then updates the database with results via asyncpg.
 
+    Engine config flags route pages around the engine:
+    ``skip_blank_pages`` stores an empty result for blank pages,
+    ``reuse_duplicate_pages`` copies the result of an identical page in the
+    project, and ``text_layer_routing`` extracts pages with a usable PDF
+    text layer with pdfminer. Only the remaining pages go through the engine.
+
+    Every result is also stored per engine configuration. Pages that already
+    have a result for the same configuration reuse it instead of running
+    the engine again, unless ``force`` is set.
+
     Args:
         pool: Database connection pool.
         document_id: Document UUID.
         page_info_list: List of page info dicts with keys:
             page_id, page_idx, width, height, image_path.
         ocr_config: OCR provider configuration dict.
+        pdf_path: Source PDF, required for text layer routing.
+        force: Re-run the engine even for pages with a stored result.
     """
     engine_type = _resolve_engine_type(ocr_config)
     logger.info(
@@ -247,44 +352,87 @@ async def _run_ocr_extraction_background(
     )
 
     try:
+        run = engine_run(ocr_config)
+        if not force:
+            page_info_list = await _reuse_stored_results(pool, page_info_list, run)
+
+        engine_config = _resolve_engine_config(ocr_config)
+        twins: dict[str, uuid.UUID] = {}
+        skip_blank = bool(engine_config.get('skip_blank_pages'))
+        reuse_duplicates = bool(engine_config.get('reuse_duplicate_pages'))
+        if skip_blank or reuse_duplicates:
+            page_info_list, twins = await _skip_blank_and_duplicate_pages(
+                pool,
+                document_id,
+                page_info_list,
+                run,
+                skip_blank=skip_blank,
+                reuse_duplicates=reuse_duplicates,
+            )
+
+        if pdf_path is not None and engine_config.get('text_layer_routing'):
+            page_info_list = await _extract_text_layer_pages(pool, pdf_path, page_info_list, run)
+
         if 'engines' in ocr_config:
             engine = build_engine_by_id(ocr_config)
         else:
             engine = build_engine(ocr_config)
 
-        for page in page_info_list:
-            page_id = page['page_id']
-            page_idx = page['page_idx']
-
-            logger.info('Extracting page %s (idx=%d) with %s', page_id, page_idx, engine_type)
-
-            extracted = await asyncio.to_thread(
-                engine.extract_page,
-                Path(page['image_path']),
-                page['width'],
-                page['height'],
+        if pdf_path is not None:
+            engine.use_pdf_text_layer(
+                pdf_path,
+                {Path(page['image_path']): page['page_idx'] for page in page_info_list},
             )
 
-            extracted = attribute_classifier.classify_attributes(extracted)
+        batch_size = engine.batch_size
+        if batch_size > 1:
+            # Local layout models run several pages per forward pass
+            for start in range(0, len(page_info_list), batch_size):
+                batch = page_info_list[start : start + batch_size]
+                logger.info(
+                    'Extracting pages %d-%d with %s (batch of %d)',
+                    batch[0]['page_idx'],
+                    batch[-1]['page_idx'],
+                    engine_type,
+                    len(batch),
+                )
+                started = time.monotonic()
+                results = await asyncio.to_thread(
+                    engine.extract_pages,
+                    [(Path(page['image_path']), page['width'], page['height']) for page in batch],
+                )
+                # Batched pages share the forward pass; split its time evenly
+                duration_ms = _elapsed_ms(started) // len(batch)
+                for page, extracted in zip(batch, results, strict=True):
+                    await _store_page_result(pool, page, extracted, run, duration_ms)
+        else:
+            for page in page_info_list:
+                logger.info(
+                    'Extracting page %s (idx=%d) with %s',
+                    page['page_id'],
+                    page['page_idx'],
+                    engine_type,
+                )
 
-            await page_repo.update_auto_extracted_data(
-                pool,
-                uuid.UUID(page_id),
-                extracted,
-            )
+                started = time.monotonic()
+                extracted = await asyncio.to_thread(
+                    engine.extract_page_streaming,
+                    Path(page['image_path']),
+                    page['width'],
+                    page['height'],
+                    _make_partial_publisher(pool, uuid.UUID(page['page_id'])),
+                )
+                await _store_page_result(pool, page, extracted, run, _elapsed_ms(started))
 
-            logger.info(
-                'Updated page %s (idx=%d) with %d elements',
-                page_id,
-                page_idx,
-                len(extracted.get('layout_dets', [])),
-            )
+        if twins:
+            await _copy_twin_results(pool, twins, run)
 
         await document_repo.update_status(pool, document_id=document_id, status='ready')
         logger.info('OCR extraction completed for document %s', document_id)
 
     except Exception:
         logger.exception('OCR extraction failed for document %s', document_id)
+        await page_repo.clear_partial_extracted_data(pool, document_id)
         await document_repo.update_status(
             pool,
             document_id=document_id,
@@ -292,19 +440,347 @@ async def _run_ocr_extraction_background(
         )
 
 
+async def _reuse_stored_results(
+    pool: asyncpg.Pool,
+    page_info_list: list[dict],
+    run: EngineRun,
+) -> list[dict]:
+    """Restore stored results of the same engine configuration.
+
+    Args:
+        pool: Database connection pool.
+        page_info_list: Page info dicts with a page_id key.
+        run: Engine configuration about to run.
+
+    Returns:
+        Pages without a stored result, in input order.
+    """
+    stored = {
+        str(record['page_id']): record['result']
+        for record in await extraction_result_repo.get_for_pages(
+            pool,
+            [uuid.UUID(page['page_id']) for page in page_info_list],
+            run.key,
+        )
+    }
+    if not stored:
+        return page_info_list
+
+    logger.info(
+        'Reusing stored %s results for %d of %d pages',
+        run.engine_type,
+        len(stored),
+        len(page_info_list),
+    )
+    remaining: list[dict] = []
+    for page in page_info_list:
+        result = stored.get(page['page_id'])
+        if result is None:
+            remaining.append(page)
+            continue
+        await page_repo.update_auto_extracted_data(pool, uuid.UUID(page['page_id']), result)
+    return remaining
+
+
+async def _skip_blank_and_duplicate_pages(
+    pool: asyncpg.Pool,
+    document_id: uuid.UUID,
+    page_info_list: list[dict],
+    run: EngineRun,
+    *,
+    skip_blank: bool,
+    reuse_duplicates: bool,
+) -> tuple[list[dict], dict[str, uuid.UUID]]:
+    """Fingerprint page images and route blank and duplicate pages around the engine.
+
+    Blank pages get an empty result right away, stored under ``run`` like
+    any other result. A duplicate is matched to a
+    twin (a page of another document in the project with a result for
+    ``run``, or an earlier page of this document) and gets the twin's result
+    for ``run`` copied once extraction is done.
+
+    Args:
+        pool: Database connection pool.
+        document_id: Document being extracted.
+        page_info_list: Page info dicts with page_id and image_path keys.
+        run: Engine configuration about to run.
+        skip_blank: Store empty results for blank pages.
+        reuse_duplicates: Reuse the results of duplicate pages.
+
+    Returns:
+        Tuple of (pages that still need extraction, page_id -> twin page UUID).
+    """
+    known: list[tuple[uuid.UUID, Path, int]] = []
+    if reuse_duplicates:
+        known = [
+            (record['id'], Path(record['image_path']), record['image_phash'])
+            for record in await page_repo.list_duplicate_candidates(pool, document_id, run.key)
+        ]
+
+    remaining: list[dict] = []
+    twins: dict[str, uuid.UUID] = {}
+    for page in page_info_list:
+        page_id = uuid.UUID(page['page_id'])
+        image_path = Path(page['image_path'])
+        try:
+            fingerprint = await asyncio.to_thread(page_fingerprint.fingerprint_file, image_path)
+        except OSError:
+            logger.warning('Cannot fingerprint page %s (%s)', page_id, image_path)
+            remaining.append(page)
+            continue
+
+        await page_repo.update_image_phash(pool, page_id, fingerprint.phash)
+
+        if skip_blank and fingerprint.blank:
+            logger.info('Skipping blank page %s (idx=%d)', page_id, page['page_idx'])
+            await page_repo.update_auto_extracted_data(pool, page_id, _EMPTY_PAGE_RESULT)
+            await _record_result(pool, page_id, run, _EMPTY_PAGE_RESULT)
+            continue
+
+        if reuse_duplicates:
+            twin_id = await _find_twin(known, image_path, fingerprint.phash)
+            if twin_id is not None:
+                logger.info('Page %s duplicates page %s, reusing its result', page_id, twin_id)
+                twins[page['page_id']] = twin_id
+                continue
+            known.append((page_id, image_path, fingerprint.phash))
+
+        remaining.append(page)
+
+    return remaining, twins
+
+
+async def _copy_twin_results(
+    pool: asyncpg.Pool,
+    twins: dict[str, uuid.UUID],
+    run: EngineRun,
+) -> None:
+    """Copy the stored results of twin pages onto their duplicates.
+
+    The copy comes from ``page_extraction_results`` rather than the twin's
+    ``auto_extracted_data``, which may hold another engine's output, and is
+    stored under ``run`` for the duplicate as well.
+
+    Args:
+        pool: Database connection pool.
+        twins: Duplicate page_id -> twin page UUID.
+        run: Engine configuration whose results are copied.
+    """
+    stored = {
+        record['page_id']: record['result']
+        for record in await extraction_result_repo.get_for_pages(
+            pool, list(set(twins.values())), run.key
+        )
+    }
+    for page_id, twin_id in twins.items():
+        result = stored.get(twin_id)
+        if result is None:
+            logger.warning('Twin page %s of page %s has no %s result', twin_id, page_id, run.key)
+            continue
+        await page_repo.update_auto_extracted_data(pool, uuid.UUID(page_id), result)
+        await _record_result(pool, uuid.UUID(page_id), run, result)
+
+
+async def _find_twin(
+    known: list[tuple[uuid.UUID, Path, int]],
+    image_path: Path,
+    phash: int,
+) -> uuid.UUID | None:
+    """Find an earlier page showing the same content.
+
+    Args:
+        known: (page_id, image_path, phash) of pages that are or will be extracted.
+        image_path: Page image to match.
+        phash: Perceptual hash of the page image.
+
+    Returns:
+        Twin page UUID, or None if the page is unique.
+    """
+    for twin_id, twin_path, twin_phash in known:
+        distance = page_fingerprint.hamming_distance(phash, twin_phash)
+        if distance > page_fingerprint.NEAR_DUPLICATE_DISTANCE:
+            continue
+        try:
+            if await asyncio.to_thread(page_fingerprint.same_page, image_path, twin_path):
+                return twin_id
+        except OSError:
+            continue
+    return None
+
+
+async def _extract_text_layer_pages(
+    pool: asyncpg.Pool,
+    pdf_path: Path,
+    page_info_list: list[dict],
+    run: EngineRun | None = None,
+) -> list[dict]:
+    """Extract pages with a usable PDF text layer directly from the PDF.
+
+    Args:
+        pool: Database connection pool.
+        pdf_path: Source PDF path.
+        page_info_list: Page info dicts with page_id and page_idx keys.
+        run: Engine configuration the results are stored under.
+
+    Returns:
+        Pages that still need OCR, in input order.
+    """
+    text_pages = await asyncio.to_thread(
+        text_layer.find_text_layer_pages,
+        pdf_path,
+        [page['page_idx'] for page in page_info_list],
+    )
+    logger.info(
+        'Text layer routing: %d of %d pages use the PDF text layer',
+        len(text_pages),
+        len(page_info_list),
+    )
+
+    remaining: list[dict] = []
+    for page in page_info_list:
+        if page['page_idx'] not in text_pages:
+            remaining.append(page)
+            continue
+        started = time.monotonic()
+        extracted = await asyncio.to_thread(
+            extraction_service.extract_page_elements,
+            pdf_path,
+            page_no=page['page_idx'],
+            scale=2.0,
+        )
+        await _store_page_result(pool, page, extracted, run, _elapsed_ms(started))
+    return remaining
+
+
+async def _store_page_result(
+    pool: asyncpg.Pool,
+    page: dict,
+    extracted: dict[str, Any],
+    run: EngineRun | None = None,
+    duration_ms: int | None = None,
+) -> None:
+    """Classify attributes of an extraction result and store it on the page.
+
+    Args:
+        pool: Database connection pool.
+        page: Page info dict with page_id and page_idx keys.
+        extracted: OmniDocBench-compatible extraction result.
+        run: Engine configuration to also store the result under.
+        duration_ms: Extraction time of the page in milliseconds.
+    """
+    extracted = attribute_classifier.classify_attributes(extracted)
+    page_id = uuid.UUID(page['page_id'])
+
+    await page_repo.update_auto_extracted_data(pool, page_id, extracted)
+    if run is not None:
+        await _record_result(pool, page_id, run, extracted, duration_ms)
+
+    logger.info(
+        'Updated page %s (idx=%d) with %d elements',
+        page['page_id'],
+        page['page_idx'],
+        len(extracted.get('layout_dets', [])),
+    )
+
+
+async def _record_result(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    run: EngineRun,
+    extracted: dict[str, Any],
+    duration_ms: int | None = None,
+) -> None:
+    """Store a page result under its engine configuration.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        run: Engine configuration that produced the result.
+        extracted: OmniDocBench-compatible extraction result.
+        duration_ms: Extraction time of the page in milliseconds.
+    """
+    await extraction_result_repo.upsert(
+        pool,
+        page_id,
+        engine_key=run.key,
+        engine_type=run.engine_type,
+        engine_id=run.engine_id,
+        result=extracted,
+        duration_ms=duration_ms,
+    )
+
+
+def _elapsed_ms(started: float) -> int:
+    """Milliseconds since a ``time.monotonic()`` timestamp.
+
+    Args:
+        started: Start time from ``time.monotonic()``.
+
+    Returns:
+        Elapsed whole milliseconds.
+    """
+    return int((time.monotonic() - started) * 1000)
+
+
+def _make_partial_publisher(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+) -> Callable[[dict[str, Any]], None]:
+    """Build a callback that stores partial extraction results for a page.
+
+    Partials go to ``partial_extracted_data``, so the page keeps its previous
+    complete ``auto_extracted_data`` until the final result replaces it. The
+    callback runs in the extraction worker thread. Writes are throttled and
+    awaited so a late partial can never outlive the final result.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+
+    Returns:
+        Callback accepting partial OmniDocBench dicts.
+    """
+    loop = asyncio.get_running_loop()
+    last_write = 0.0
+
+    def _publish(partial: dict[str, Any]) -> None:
+        nonlocal last_write
+        now = time.monotonic()
+        if now - last_write < _PARTIAL_WRITE_INTERVAL_S:
+            return
+        last_write = now
+
+        future = asyncio.run_coroutine_threadsafe(
+            page_repo.update_partial_extracted_data(pool, page_id, partial),
+            loop,
+        )
+        try:
+            future.result(timeout=_PARTIAL_WRITE_TIMEOUT_S)
+        except Exception:
+            future.cancel()
+            logger.warning('Failed to store partial result for page %s', page_id, exc_info=True)
+
+    return _publish
+
+
 async def re_extract(
     pool: asyncpg.Pool,
     document_id: uuid.UUID,
+    *,
+    force: bool = False,
 ) -> dict:
     """Re-run extraction on all pages of an existing document.
 
     Uses the current OCR engine configured on the parent project.
     For pdfminer: synchronous extraction using the PDF file.
-    For other engines: background task using page images.
+    For other engines: background task using page images. Pages that
+    already have a stored result for the same engine configuration reuse
+    it unless ``force`` is set.
 
     Args:
         pool: Database connection pool.
         document_id: Document UUID.
+        force: Re-run the engine even for pages with a stored result.
 
     Returns:
         dict with id and status.
@@ -349,6 +825,7 @@ async def re_extract(
             )
             extracted = attribute_classifier.classify_attributes(extracted)
             await page_repo.update_auto_extracted_data(pool, p['id'], extracted)
+            await _record_result(pool, p['id'], engine_run(ocr_config), extracted)
 
         await document_repo.update_status(
             pool,
@@ -380,6 +857,8 @@ async def re_extract(
             document_id,
             page_info_list,
             ocr_config,
+            pdf_path=pdf_path,
+            force=force,
         )
     )
     _task.add_done_callback(lambda t: t.result() if not t.cancelled() else None)
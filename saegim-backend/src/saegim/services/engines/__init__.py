@@ -4,6 +4,7 @@ Provides a unified interface for different OCR engine types:
 - commercial_api: Commercial VLM API (Gemini)
 - vllm: vLLM server (OpenAI-compatible)
 - split_pipeline: Docling layout detection + Gemini/vLLM text OCR
+- ensemble: Several registered engines run concurrently and merged
 - pdfminer: Fallback (no GPU required)
 """
 
@@ -5,9 +5,15 @@ and implement extract_page() and test_connection().
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping, Sequence
 from pathlib import Path
 from typing import Any
 
+PartialResultCallback = Callable[[dict[str, Any]], None]
+
+# (image_path, page_width, page_height) of a page to extract
+PageInput = tuple[Path, int, int]
+
 
 class BaseOCREngine(ABC):
     """Abstract base class for OCR engines.
@@ -35,6 +41,69 @@ class BaseOCREngine(ABC):
             OmniDocBench-compatible dict with layout_dets, page_attribute, extra.
         """
 
+    def extract_page_streaming(
+        self,
+        image_path: Path,
+        page_width: int,
+        page_height: int,
+        on_partial: PartialResultCallback,  # noqa: ARG002
+    ) -> dict[str, Any]:
+        """Extract a page, reporting intermediate results while generating.
+
+        Engines that cannot stream ignore ``on_partial`` and behave like
+        ``extract_page``.
+
+        Args:
+            image_path: Path to the page image file.
+            page_width: Image width in pixels.
+            page_height: Image height in pixels.
+            on_partial: Callback receiving partial OmniDocBench dicts
+                (marked with ``extra.partial``).
+
+        Returns:
+            Final OmniDocBench-compatible dict.
+        """
+        return self.extract_page(image_path, page_width, page_height)
+
+    @property
+    def batch_size(self) -> int:
+        """Number of pages the engine prefers to receive per extract_pages call.
+
+        Returns:
+            Preferred batch size (1 = page-at-a-time).
+        """
+        return 1
+
+    def extract_pages(self, pages: Sequence[PageInput]) -> list[dict[str, Any]]:
+        """Extract several pages in one call.
+
+        The default implementation extracts pages one by one. Engines backed
+        by local models override it to batch inference.
+
+        Args:
+            pages: (image_path, page_width, page_height) tuples.
+
+        Returns:
+            OmniDocBench-compatible dicts, one per page in input order.
+        """
+        return [self.extract_page(path, width, height) for path, width, height in pages]
+
+    def use_pdf_text_layer(
+        self,
+        pdf_path: Path,  # noqa: ARG002
+        page_indices: Mapping[Path, int],  # noqa: ARG002
+    ) -> None:
+        """Offer the source PDF of the pages about to be extracted.
+
+        Engines that can take region text from the PDF text layer override
+        this; the default ignores it.
+
+        Args:
+            pdf_path: Path to the source PDF.
+            page_indices: Zero-based PDF page index of each page image.
+        """
+        return
+
     @abstractmethod
     def test_connection(self) -> tuple[bool, str]:
         """Test connectivity to the engine's external services.
@@ -0,0 +1,309 @@
+"""Ensemble engine.
+
+Runs several registered engine instances on the same pages concurrently and
+merges their results:
+
+- regions of different engines are matched by bounding-box IoU,
+- boxes and categories come from one engine (``box_engine_id``),
+- region content (text, LaTeX, HTML) comes from the first engine in the
+  category's preference order that produced any,
+- regions only one engine found are kept.
+
+Every member's raw result is stored under ``extra.engine_results`` so the
+engines can be compared on the same page. It stays in the extraction result:
+accepting the result and exporting drop ``engine_results`` and
+``engine_errors`` (see ``page_repo``).
+"""
+
+import logging
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from saegim.services.engines.base import BaseOCREngine, PageInput
+from saegim.services.layout_types import bbox_iou
+
+logger = logging.getLogger(__name__)
+
+# Keys of a layout_det that hold recognized content
+_CONTENT_KEYS = ('text', 'latex', 'html')
+
+_DEFAULT_IOU_THRESHOLD = 0.5
+
+
+class EnsembleEngine(BaseOCREngine):
+    """OCR engine combining several engine instances.
+
+    Args:
+        members: Member engines keyed by engine instance ID, in priority order.
+        box_engine_id: Member whose boxes and categories are kept for matched
+            regions. None = first member.
+        text_preferences: Per-category member order for region content.
+            Categories not listed use the member order.
+        iou_threshold: Minimum IoU for regions of two engines to match.
+    """
+
+    def __init__(
+        self,
+        members: Mapping[str, BaseOCREngine],
+        *,
+        box_engine_id: str | None = None,
+        text_preferences: Mapping[str, Sequence[str]] | None = None,
+        iou_threshold: float = _DEFAULT_IOU_THRESHOLD,
+    ) -> None:
+        """Initialize the ensemble engine.
+
+        Args:
+            members: Member engines keyed by engine instance ID.
+            box_engine_id: Member providing boxes. None = first member.
+            text_preferences: Per-category member order for region content.
+            iou_threshold: Minimum IoU for a region match.
+
+        Raises:
+            ValueError: If there are no members or box_engine_id is not one.
+        """
+        if not members:
+            msg = 'Ensemble engine needs at least one member engine'
+            raise ValueError(msg)
+        if box_engine_id is not None and box_engine_id not in members:
+            msg = f"Box engine '{box_engine_id}' is not a member of the ensemble"
+            raise ValueError(msg)
+
+        self._members = dict(members)
+        self._box_engine_id = box_engine_id
+        self._text_preferences = {k: list(v) for k, v in (text_preferences or {}).items()}
+        self._iou_threshold = iou_threshold
+
+    def extract_page(
+        self,
+        image_path: Path,
+        page_width: int,
+        page_height: int,
+    ) -> dict[str, Any]:
+        """Extract a page with every member engine and merge the results.
+
+        Args:
+            image_path: Path to the page image file.
+            page_width: Image width in pixels.
+            page_height: Image height in pixels.
+
+        Returns:
+            Merged OmniDocBench-compatible dict.
+        """
+        return self.extract_pages([(image_path, page_width, page_height)])[0]
+
+    @property
+    def batch_size(self) -> int:
+        """Largest batch size preferred by a member engine.
+
+        Returns:
+            Preferred batch size.
+        """
+        return max(member.batch_size for member in self._members.values())
+
+    def extract_pages(self, pages: Sequence[PageInput]) -> list[dict[str, Any]]:
+        """Extract pages with all members concurrently and merge per page.
+
+        A failing member is logged and left out of the merge; the call fails
+        only if every member fails.
+
+        Args:
+            pages: (image_path, page_width, page_height) tuples.
+
+        Returns:
+            Merged OmniDocBench-compatible dicts, one per page in input order.
+
+        Raises:
+            Exception: The first member's error if all members fail.
+        """
+        with ThreadPoolExecutor(max_workers=len(self._members)) as executor:
+            futures = {
+                engine_id: executor.submit(member.extract_pages, pages)
+                for engine_id, member in self._members.items()
+            }
+
+        outputs: dict[str, list[dict[str, Any]]] = {}
+        errors: dict[str, BaseException] = {}
+        for engine_id, future in futures.items():
+            error = future.exception()
+            if error is None:
+                outputs[engine_id] = future.result()
+            else:
+                logger.warning('Ensemble member %s failed: %s', engine_id, error)
+                errors[engine_id] = error
+
+        if not outputs:
+            raise next(iter(errors.values()))
+
+        return [
+            merge_results(
+                {engine_id: results[i] for engine_id, results in outputs.items()},
+                box_engine_id=self._box_engine_id,
+                text_preferences=self._text_preferences,
+                iou_threshold=self._iou_threshold,
+                errors={engine_id: str(error) for engine_id, error in errors.items()},
+            )
+            for i in range(len(pages))
+        ]
+
+    def use_pdf_text_layer(self, pdf_path: Path, page_indices: Mapping[Path, int]) -> None:
+        """Offer the source PDF to every member engine.
+
+        Args:
+            pdf_path: Path to the source PDF.
+            page_indices: Zero-based PDF page index of each page image.
+        """
+        for member in self._members.values():
+            member.use_pdf_text_layer(pdf_path, page_indices)
+
+    def test_connection(self) -> tuple[bool, str]:
+        """Test every member engine.
+
+        Returns:
+            Tuple of (success, combined message). Succeeds only if all
+            members do.
+        """
+        messages = []
+        all_ok = True
+        for engine_id, member in self._members.items():
+            ok, message = member.test_connection()
+            all_ok = all_ok and ok
+            messages.append(f'{engine_id}: {message}')
+        return (all_ok, ' | '.join(messages))
+
+
+def merge_results(
+    results: Mapping[str, dict[str, Any]],
+    *,
+    box_engine_id: str | None = None,
+    text_preferences: Mapping[str, Sequence[str]] | None = None,
+    iou_threshold: float = _DEFAULT_IOU_THRESHOLD,
+    errors: Mapping[str, str] | None = None,
+) -> dict[str, Any]:
+    """Merge the page results of several engines.
+
+    Args:
+        results: OmniDocBench page dicts keyed by engine ID, in priority order.
+        box_engine_id: Engine whose boxes and categories win. None or a
+            missing engine = first engine in ``results``.
+        text_preferences: Per-category engine order for region content.
+        iou_threshold: Minimum IoU for regions of two engines to match.
+        errors: Error messages of engines that failed on this page.
+
+    Returns:
+        Merged OmniDocBench-compatible dict with raw results in
+        ``extra.engine_results``.
+    """
+    engine_order = list(results)
+    anchor_id = box_engine_id if box_engine_id in results else engine_order[0]
+    others = [engine_id for engine_id in engine_order if engine_id != anchor_id]
+
+    # Each cluster maps engine ID -> layout_det; the first det is the anchor
+    clusters: list[dict[str, dict[str, Any]]] = []
+    for engine_id in [anchor_id, *others]:
+        taken: set[int] = set()
+        for det in results[engine_id].get('layout_dets', []):
+            match = _best_match(det, clusters, taken, iou_threshold)
+            if match is None:
+                clusters.append({engine_id: det})
+                taken.add(len(clusters) - 1)
+            else:
+                clusters[match][engine_id] = det
+                taken.add(match)
+
+    preferences = text_preferences or {}
+    layout_dets = []
+    for order, cluster in enumerate(clusters):
+        anchor = next(iter(cluster.values()))
+        merged = {key: value for key, value in anchor.items() if key not in _CONTENT_KEYS}
+        merged['order'] = order
+        merged['anno_id'] = order
+
+        category = anchor.get('category_type', '')
+        for engine_id in _content_order(category, preferences, engine_order):
+            source = cluster.get(engine_id)
+            if source is not None and any(source.get(key) for key in _CONTENT_KEYS):
+                merged.update({key: source[key] for key in _CONTENT_KEYS if source.get(key)})
+                break
+        layout_dets.append(merged)
+
+    extra: dict[str, Any] = {'relation': [], 'engine_results': dict(results)}
+    if errors:
+        extra['engine_errors'] = dict(errors)
+    return {
+        'layout_dets': layout_dets,
+        'page_attribute': results[anchor_id].get('page_attribute', {}),
+        'extra': extra,
+    }
+
+
+def _best_match(
+    det: dict[str, Any],
+    clusters: list[dict[str, dict[str, Any]]],
+    taken: set[int],
+    iou_threshold: float,
+) -> int | None:
+    """Find the cluster whose anchor overlaps a region the most.
+
+    Args:
+        det: Layout det to place.
+        clusters: Existing clusters.
+        taken: Clusters already holding a det of the same engine.
+        iou_threshold: Minimum IoU for a match.
+
+    Returns:
+        Index of the best cluster, or None if none overlaps enough.
+    """
+    bbox = _det_bbox(det)
+    if bbox is None:
+        return None
+
+    best, best_iou = None, iou_threshold
+    for idx, cluster in enumerate(clusters):
+        if idx in taken:
+            continue
+        anchor_bbox = _det_bbox(next(iter(cluster.values())))
+        if anchor_bbox is None:
+            continue
+        iou = bbox_iou(bbox, anchor_bbox)
+        if iou >= best_iou:
+            best, best_iou = idx, iou
+    return best
+
+
+def _det_bbox(det: dict[str, Any]) -> tuple[float, float, float, float] | None:
+    """Get the axis-aligned bounding box of a layout det.
+
+    Args:
+        det: Layout det with an 8-float ``poly``.
+
+    Returns:
+        (x1, y1, x2, y2), or None if the det has no polygon.
+    """
+    poly = det.get('poly')
+    if not poly:
+        return None
+    xs, ys = poly[0::2], poly[1::2]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _content_order(
+    category: str,
+    preferences: Mapping[str, Sequence[str]],
+    engine_order: list[str],
+) -> list[str]:
+    """Order engines by preference for a category's content.
+
+    Args:
+        category: OmniDocBench category of the region.
+        preferences: Per-category engine order.
+        engine_order: Default engine order.
+
+    Returns:
+        Engine IDs, preferred ones first, then the rest in default order.
+    """
+    preferred = [
+        engine_id for engine_id in preferences.get(category, ()) if engine_id in engine_order
+    ]
+    return preferred + [engine_id for engine_id in engine_order if engine_id not in preferred]
@@ -45,6 +45,9 @@ def build_engine_by_id(
     engine_type = entry.get('engine_type', '')
     config = entry.get('config', {})
 
+    if engine_type == 'ensemble':
+        return _build_ensemble(ocr_config, config)
+
     return _build_engine_from_type(engine_type, config)
 
 
@@ -72,6 +75,9 @@ def _build_engine_from_type(
         return _build_vllm(config)
     if engine_type == 'split_pipeline':
         return _build_split_pipeline(config)
+    if engine_type == 'ensemble':
+        msg = 'Ensemble engines are built from the engine registry (use build_engine_by_id)'
+        raise ValueError(msg)
 
     valid = "'commercial_api', 'vllm', 'split_pipeline', 'pdfminer'"
     msg = f"Unknown engine_type: '{engine_type}'. Use {valid}."
@@ -163,6 +169,8 @@ def _build_split_pipeline(config: dict[str, Any]) -> BaseOCREngine:
         SplitPipelineEngine instance.
     """
     from saegim.services.engines.split_pipeline_engine import SplitPipelineEngine
+    from saegim.services.image_encoding import image_encoding_from_config
+    from saegim.services.inference_options import inference_options_from_config
 
     docling_model_name = config.get('docling_model_name', 'ibm-granite/granite-docling-258M')
     ocr_provider = config.get('ocr_provider', '')
@@ -177,4 +185,48 @@ def _build_split_pipeline(config: dict[str, Any]) -> BaseOCREngine:
         ocr_provider=ocr_provider,
         ocr_config=ocr_config,
         layout_provider=layout_provider,
+        crop_encoding=image_encoding_from_config(config),
+        layout_batch_size=config.get('layout_batch_size', 1),
+        layout_options=inference_options_from_config(config),
+        layout_server_url=config.get('layout_server_url') or None,
+        text_layer_regions=config.get('text_layer_regions', False),
+        reuse_repeated_regions=config.get('reuse_repeated_regions', False),
+    )
+
+
+def _build_ensemble(ocr_config: dict[str, Any], config: dict[str, Any]) -> BaseOCREngine:
+    """Build an ensemble engine from registered member instances.
+
+    Args:
+        ocr_config: Multi-instance OCR config holding the member engines.
+        config: Ensemble config with 'engine_ids', 'box_engine_id', etc.
+
+    Returns:
+        EnsembleEngine instance.
+
+    Raises:
+        ValueError: If a member is missing or is itself an ensemble.
+    """
+    from saegim.services.engines.ensemble_engine import EnsembleEngine
+
+    engines = ocr_config.get('engines', {})
+    members: dict[str, BaseOCREngine] = {}
+    for member_id in config.get('engine_ids', []):
+        entry = engines.get(member_id)
+        if entry is None:
+            msg = f"Ensemble member '{member_id}' not found in config"
+            raise ValueError(msg)
+        if entry.get('engine_type') == 'ensemble':
+            msg = f"Ensemble member '{member_id}' is itself an ensemble"
+            raise ValueError(msg)
+        members[member_id] = _build_engine_from_type(
+            entry.get('engine_type', ''),
+            entry.get('config', {}),
+        )
+
+    return EnsembleEngine(
+        members,
+        box_engine_id=config.get('box_engine_id') or None,
+        text_preferences=config.get('text_preferences') or {},
+        iou_threshold=config.get('iou_threshold', 0.5),
     )
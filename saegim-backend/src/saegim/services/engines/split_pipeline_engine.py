@@ -5,28 +5,42 @@ Uses a layout detector and a separate OCR provider for text:
 - OCR: Gemini API or vLLM (extracts text from cropped regions)
 
 The engine crops regions from the original image and sends them
-to the OCR provider in sequence.
+to the OCR provider in sequence. With ``text_layer_regions`` enabled,
+regions of born-digital pages take their text from the PDF instead, and
+with ``reuse_repeated_regions`` running headers and footers are OCR'd once
+per document, and later pages OCR only the digits that changed in them.
 """
 
 import logging
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Literal, get_args
 
 from saegim.services.docling_layout_service import DoclingLayoutDetector
-from saegim.services.engines.base import BaseOCREngine
+from saegim.services.engines.base import BaseOCREngine, PageInput
 from saegim.services.gemini_ocr_service import GeminiTextOcrProvider
+from saegim.services.image_encoding import DEFAULT_ENCODING, ImageEncoding
+from saegim.services.inference_options import DEFAULT_INFERENCE_OPTIONS, InferenceOptions
 from saegim.services.layout_types import LayoutDetector
 from saegim.services.ocr_connection_test import (
     check_gemini_connection,
     check_vllm_connection,
 )
 from saegim.services.ocr_pipeline import OcrPipeline
+from saegim.services.repeated_regions import RepeatedRegionCache
+from saegim.services.text_layer import PdfRegionTextSource
 from saegim.services.vllm_ocr_service import VllmTextOcrProvider
 
 logger = logging.getLogger(__name__)
 
 SplitOcrProvider = Literal['gemini', 'vllm']
-SplitLayoutProvider = Literal['docling', 'pp_doclayout']
+SplitLayoutProvider = Literal[
+    'docling',
+    'pp_doclayout',
+    'pp_doclayout_onnx',
+    'pp_doclayout_onnx_int8',
+]
+_LAYOUT_PROVIDERS: tuple[str, ...] = get_args(SplitLayoutProvider)
 
 
 class SplitPipelineEngine(BaseOCREngine):
@@ -39,7 +53,17 @@ class SplitPipelineEngine(BaseOCREngine):
         docling_model_name: HuggingFace model identifier for Docling.
         ocr_provider: OCR text provider ('gemini' or 'vllm').
         ocr_config: OCR provider configuration dict.
-        layout_provider: Layout detector type ('docling' or 'pp_doclayout').
+        layout_provider: Layout detector type ('docling', 'pp_doclayout',
+            'pp_doclayout_onnx' or 'pp_doclayout_onnx_int8').
+        crop_encoding: How cropped regions are encoded for the OCR provider.
+        layout_batch_size: Pages per layout detector forward pass.
+        layout_options: Device, thread and concurrency settings of the layout model.
+        layout_server_url: Shared local layout server to use instead of
+            loading the layout model in-process.
+        text_layer_regions: Fill region text from the PDF text layer and
+            OCR only regions without extractable characters.
+        reuse_repeated_regions: OCR recurring header/footer regions once and
+            reuse their text on later pages, OCR'ing only changed digits.
     """
 
     def __init__(
@@ -49,6 +73,12 @@ class SplitPipelineEngine(BaseOCREngine):
         ocr_config: dict[str, Any],
         *,
         layout_provider: SplitLayoutProvider = 'docling',
+        crop_encoding: ImageEncoding = DEFAULT_ENCODING,
+        layout_batch_size: int = 1,
+        layout_options: InferenceOptions = DEFAULT_INFERENCE_OPTIONS,
+        layout_server_url: str | None = None,
+        text_layer_regions: bool = False,
+        reuse_repeated_regions: bool = False,
     ) -> None:
         """Initialize the split pipeline engine.
 
@@ -57,6 +87,13 @@ class SplitPipelineEngine(BaseOCREngine):
             ocr_provider: OCR provider type.
             ocr_config: OCR provider configuration.
             layout_provider: Layout detector backend.
+            crop_encoding: Crop image encoding for the OCR provider.
+            layout_batch_size: Pages per layout detector forward pass.
+            layout_options: Layout model runtime settings.
+            layout_server_url: Layout server URL (http://host:port or
+                unix:///path.sock). None = load the model in-process.
+            text_layer_regions: Take region text from the PDF text layer.
+            reuse_repeated_regions: Reuse OCR text of running headers/footers.
 
         Raises:
             ValueError: If ocr_provider or layout_provider is unknown.
@@ -65,11 +102,24 @@ class SplitPipelineEngine(BaseOCREngine):
         self._ocr_provider_name = ocr_provider
         self._ocr_config = ocr_config
         self._layout_provider_name = layout_provider
-
-        layout_detector = _create_layout_detector(layout_provider, docling_model_name)
+        self._layout_batch_size = layout_batch_size
+        self._text_layer_regions = text_layer_regions
+
+        layout_detector = create_layout_detector(
+            layout_provider,
+            docling_model_name,
+            batch_size=layout_batch_size,
+            options=layout_options,
+            server_url=layout_server_url,
+        )
         text_provider = _create_text_provider(ocr_provider, ocr_config)
         self._layout_detector = layout_detector
-        self._pipeline = OcrPipeline(layout_detector, text_provider)
+        self._pipeline = OcrPipeline(
+            layout_detector,
+            text_provider,
+            crop_encoding=crop_encoding,
+            repeated_regions=RepeatedRegionCache() if reuse_repeated_regions else None,
+        )
 
     def extract_page(
         self,
@@ -89,6 +139,36 @@ class SplitPipelineEngine(BaseOCREngine):
         """
         return self._pipeline.extract_page(image_path, page_width, page_height)
 
+    @property
+    def batch_size(self) -> int:
+        """Number of pages batched through the layout detector.
+
+        Returns:
+            Configured layout batch size.
+        """
+        return self._layout_batch_size
+
+    def extract_pages(self, pages: Sequence[PageInput]) -> list[dict[str, Any]]:
+        """Extract several pages with batched layout detection.
+
+        Args:
+            pages: (image_path, page_width, page_height) tuples.
+
+        Returns:
+            OmniDocBench-compatible dicts, one per page in input order.
+        """
+        return self._pipeline.extract_pages([path for path, _, _ in pages])
+
+    def use_pdf_text_layer(self, pdf_path: Path, page_indices: Mapping[Path, int]) -> None:
+        """Take region text from the PDF text layer if enabled.
+
+        Args:
+            pdf_path: Path to the source PDF.
+            page_indices: Zero-based PDF page index of each page image.
+        """
+        if self._text_layer_regions:
+            self._pipeline.set_text_source(PdfRegionTextSource(pdf_path, page_indices))
+
     def test_connection(self) -> tuple[bool, str]:
         """Test layout detector availability and OCR provider connectivity.
 
@@ -106,15 +186,22 @@ class SplitPipelineEngine(BaseOCREngine):
         return (True, f'{layout_msg} | {ocr_msg}')
 
 
-def _create_layout_detector(
+def create_layout_detector(
     provider: str,
     docling_model_name: str,
+    *,
+    batch_size: int = 1,
+    options: InferenceOptions = DEFAULT_INFERENCE_OPTIONS,
+    server_url: str | None = None,
 ) -> LayoutDetector:
     """Create a layout detector for the split pipeline.
 
     Args:
         provider: Layout provider type string.
         docling_model_name: HuggingFace model identifier (used for Docling).
+        batch_size: Pages per forward pass for batched detection.
+        options: Device, thread and concurrency settings.
+        server_url: Delegate detection to a local layout server at this URL.
 
     Returns:
         LayoutDetector instance.
@@ -122,16 +209,39 @@ def _create_layout_detector(
     Raises:
         ValueError: If provider is unknown.
     """
+    if provider not in _LAYOUT_PROVIDERS:
+        valid = "'docling', 'pp_doclayout', 'pp_doclayout_onnx' or 'pp_doclayout_onnx_int8'"
+        msg = f"Unknown layout provider: '{provider}'. Use {valid}."
+        raise ValueError(msg)
+
+    if server_url:
+        from saegim.services.remote_layout_detector import RemoteLayoutDetector
+
+        return RemoteLayoutDetector(
+            server_url,
+            provider=provider,
+            model_name=docling_model_name if provider == 'docling' else None,
+        )
+
     if provider == 'docling':
-        return DoclingLayoutDetector(model_name=docling_model_name)
+        return DoclingLayoutDetector(
+            model_name=docling_model_name,
+            batch_size=batch_size,
+            options=options,
+        )
 
     if provider == 'pp_doclayout':
         from saegim.services.pp_doclayout_service import PPDocLayoutV3Detector
 
-        return PPDocLayoutV3Detector()
+        return PPDocLayoutV3Detector(batch_size=batch_size, options=options)
 
-    msg = f"Unknown layout provider: '{provider}'. Use 'docling' or 'pp_doclayout'."
-    raise ValueError(msg)
+    from saegim.services.pp_doclayout_onnx_service import PPDocLayoutV3OnnxDetector
+
+    return PPDocLayoutV3OnnxDetector(
+        batch_size=batch_size,
+        quantize=provider == 'pp_doclayout_onnx_int8',
+        options=options,
+    )
 
 
 def _create_text_provider(
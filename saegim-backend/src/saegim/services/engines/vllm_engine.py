@@ -7,7 +7,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
-from saegim.services.engines.base import BaseOCREngine
+from saegim.services.engines.base import BaseOCREngine, PartialResultCallback
 from saegim.services.ocr_connection_test import check_vllm_connection
 from saegim.services.vllm_ocr_service import VllmOcrProvider
 
@@ -62,6 +62,28 @@ class VllmEngine(BaseOCREngine):
         """
         return self._provider.extract_page(image_path, page_width, page_height)
 
+    def extract_page_streaming(
+        self,
+        image_path: Path,
+        page_width: int,
+        page_height: int,
+        on_partial: PartialResultCallback,
+    ) -> dict[str, Any]:
+        """Extract layout elements via a streamed vLLM completion.
+
+        Args:
+            image_path: Path to the page image file.
+            page_width: Image width in pixels.
+            page_height: Image height in pixels.
+            on_partial: Callback receiving partial OmniDocBench dicts.
+
+        Returns:
+            Final OmniDocBench-compatible dict.
+        """
+        return self._provider.extract_page(
+            image_path, page_width, page_height, on_partial=on_partial
+        )
+
     def test_connection(self) -> tuple[bool, str]:
         """Test vLLM server connectivity.
 
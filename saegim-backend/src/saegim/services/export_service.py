@@ -50,51 +50,31 @@ def _document_dir_name(filename: str) -> str:
 async def export_project(
     pool: asyncpg.Pool,
     project_id: uuid.UUID,
-) -> dict[str, Any] | None:
+) -> str | None:
     """Export a project as OmniDocBench JSON format.
 
     Combines all page annotation_data with page_info to produce
-    the final benchmark dataset format.
+    the final benchmark dataset format. The page entries are built and
+    serialized by the database and joined here without being decoded.
 
     Args:
         pool: Database connection pool.
         project_id: Project UUID.
 
     Returns:
-        dict or None: Export data with project name, total pages, and data array.
+        str or None: Export JSON with project name, total pages, and data array.
     """
     project = await project_repo.get_by_id(pool, project_id)
     if project is None:
         return None
 
-    pages = await page_repo.get_all_by_project(pool, project_id)
-
-    result: list[dict[str, Any]] = []
-    for page in pages:
-        annotation = page['annotation_data']
-        if isinstance(annotation, str):
-            annotation = json.loads(annotation)
-        annotation = annotation or {}
-
-        page_attribute = annotation.pop('page_attribute', {})
-
-        entry = {
-            **annotation,
-            'page_info': {
-                'page_no': page['page_no'],
-                'height': page['height'],
-                'width': page['width'],
-                'image_path': page['image_path'],
-                'page_attribute': page_attribute,
-            },
-        }
-        result.append(entry)
+    pages = await page_repo.get_export_entries(pool, project_id)
+    data = ','.join(page['entry'] for page in pages)
 
-    return {
-        'project_name': project['name'],
-        'total_pages': len(result),
-        'data': result,
-    }
+    return (
+        f'{{"project_name":{json.dumps(project["name"])},'
+        f'"total_pages":{len(pages)},"data":[{data}]}}'
+    )
 
 
 async def export_project_zip(
@@ -129,10 +109,7 @@ async def export_project_zip(
 
     with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
         for page in pages:
-            annotation = page['annotation_data']
-            if isinstance(annotation, str):
-                annotation = json.loads(annotation)
-            annotation = annotation or {}
+            annotation = dict(page['annotation_data'] or {})
 
             page_attribute = annotation.pop('page_attribute', {})
 
@@ -140,10 +117,10 @@ async def export_project_zip(
             image_name = f'page_{page["page_no"]:03d}.png'
             relative_image_path = f'images/{doc_dir}/{image_name}'
 
-            # Add page image to ZIP
+            # Add page image to ZIP (PNG is already compressed, so store it as is)
             source_path = Path(page['image_path'])
             if source_path.exists():
-                zf.write(str(source_path), relative_image_path)
+                zf.write(str(source_path), relative_image_path, zipfile.ZIP_STORED)
 
             entry = {
                 **annotation,
@@ -201,10 +178,7 @@ async def export_document_zip(
 
     with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
         for page in pages:
-            annotation = page['annotation_data']
-            if isinstance(annotation, str):
-                annotation = json.loads(annotation)
-            annotation = annotation or {}
+            annotation = dict(page['annotation_data'] or {})
 
             page_attribute = annotation.pop('page_attribute', {})
 
@@ -213,7 +187,7 @@ async def export_document_zip(
 
             source_path = Path(page['image_path'])
             if source_path.exists():
-                zf.write(str(source_path), relative_image_path)
+                zf.write(str(source_path), relative_image_path, zipfile.ZIP_STORED)
 
             entry = {
                 **annotation,
@@ -13,7 +13,9 @@ from typing import Any
 import httpx
 
 from saegim.services.adapters.chandra import elements_to_page_ir
+from saegim.services.docir import rescale_page_ir
 from saegim.services.exporters.omnidocbench import export_page
+from saegim.services.image_encoding import ImageEncoding, detect_mime_type, prepare_page_image
 from saegim.services.ocr_provider import (
     STRUCTURED_OCR_PROMPT,
     get_text_prompt,
@@ -23,6 +25,9 @@ logger = logging.getLogger(__name__)
 
 _GEMINI_API_BASE = 'https://generativelanguage.googleapis.com/v1beta'
 
+# Gemini tiles images internally; a 2048px page keeps small text legible
+_PAGE_IMAGE_ENCODING = ImageEncoding(format='jpeg', quality=95, max_side=2048)
+
 
 class _SafeFormatDict(dict):
     """Dict subclass that returns the key placeholder for missing keys.
@@ -43,6 +48,8 @@ class GeminiOcrProvider:
         api_key: str,
         model: str = 'gemini-3-flash-preview',
         custom_prompt: str = '',
+        *,
+        image_encoding: ImageEncoding = _PAGE_IMAGE_ENCODING,
     ) -> None:
         """Initialize Gemini OCR provider.
 
@@ -50,10 +57,12 @@ class GeminiOcrProvider:
             api_key: Google Gemini API key.
             model: Gemini model name.
             custom_prompt: Custom OCR prompt. Empty string uses default.
+            image_encoding: Size and encoding of page images sent to the API.
         """
         self._api_key = api_key
         self._model = model
         self._custom_prompt = custom_prompt
+        self._image_encoding = image_encoding
 
     def extract_page(
         self,
@@ -74,19 +83,15 @@ class GeminiOcrProvider:
         Raises:
             RuntimeError: If Gemini API call fails.
         """
+        image = prepare_page_image(image_path, self._image_encoding, page_width, page_height)
         if self._custom_prompt:
             prompt = self._custom_prompt.format_map(
-                _SafeFormatDict(width=page_width, height=page_height),
+                _SafeFormatDict(width=image.width, height=image.height),
             )
         else:
-            prompt = STRUCTURED_OCR_PROMPT.format(width=page_width, height=page_height)
-        image_data = image_path.read_bytes()
-        image_b64 = base64.b64encode(image_data).decode('utf-8')
-
-        # Determine MIME type from extension
-        suffix = image_path.suffix.lower()
-        mime_map = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg'}
-        mime_type = mime_map.get(suffix, 'image/png')
+            prompt = STRUCTURED_OCR_PROMPT.format(width=image.width, height=image.height)
+        image_b64 = base64.b64encode(image.data).decode('utf-8')
+        mime_type = image.mime_type
 
         url = f'{_GEMINI_API_BASE}/models/{self._model}:generateContent?key={self._api_key}'
         payload = {
@@ -122,8 +127,8 @@ class GeminiOcrProvider:
             raise RuntimeError(msg) from exc
 
         elements = _parse_gemini_response(result)
-        page_ir = elements_to_page_ir(elements, page_width, page_height)
-        return export_page(page_ir)
+        page_ir = elements_to_page_ir(elements, image.width, image.height)
+        return export_page(rescale_page_ir(page_ir, page_width, page_height))
 
 
 def _parse_gemini_response(result: dict[str, Any]) -> list[dict[str, Any]]:
@@ -202,6 +207,7 @@ class GeminiTextOcrProvider:
         """
         prompt = get_text_prompt(category_hint)
         image_b64 = base64.b64encode(image_bytes).decode('utf-8')
+        mime_type = detect_mime_type(image_bytes)
 
         url = f'{_GEMINI_API_BASE}/models/{self._model}:generateContent?key={self._api_key}'
         payload = {
@@ -211,7 +217,7 @@ class GeminiTextOcrProvider:
                         {'text': prompt},
                         {
                             'inline_data': {
-                                'mime_type': 'image/png',
+                                'mime_type': mime_type,
                                 'data': image_b64,
                             },
                         },
@@ -0,0 +1,203 @@
+"""Image encoding options for OCR request payloads.
+
+Cropped regions and full pages are base64-encoded into JSON requests for
+the OCR models.  Lossless PNG of a 2x-rendered page or a large table crop
+can be several megabytes, most of which the model's own resizer throws
+away, so callers may choose a cheaper encoding: JPEG or WebP with a
+quality setting, downscaling to the model's input resolution, and
+grayscale for text-only regions.
+"""
+
+import io
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+from PIL import Image
+
+from saegim.services.page_image_cache import load_page_array
+
+logger = logging.getLogger(__name__)
+
+ImageFormat = Literal['png', 'jpeg', 'webp']
+
+_PIL_FORMATS: dict[str, str] = {'png': 'PNG', 'jpeg': 'JPEG', 'webp': 'WEBP'}
+
+_SUFFIX_FORMATS: dict[str, str] = {
+    '.png': 'png',
+    '.jpg': 'jpeg',
+    '.jpeg': 'jpeg',
+    '.webp': 'webp',
+}
+
+# Categories whose colour carries meaning (charts, photos, shaded cells)
+_COLOR_CATEGORIES = frozenset({'figure', 'table'})
+
+
+@dataclass(frozen=True)
+class ImageEncoding:
+    """How to encode an image before sending it to an OCR model.
+
+    Attributes:
+        format: Output format ('png', 'jpeg' or 'webp').
+        quality: Lossy quality (1-100), ignored for PNG.
+        max_side: Downscale so the longer side is at most this many pixels.
+            None keeps the original resolution.
+        grayscale: Convert text-only regions to grayscale.
+    """
+
+    format: ImageFormat = 'png'
+    quality: int = 90
+    max_side: int | None = None
+    grayscale: bool = False
+
+
+DEFAULT_ENCODING = ImageEncoding()
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """A page image encoded for a model request.
+
+    Attributes:
+        data: Encoded image bytes.
+        mime_type: MIME type of ``data``.
+        width: Width of the encoded image in pixels.
+        height: Height of the encoded image in pixels.
+    """
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+
+
+def image_encoding_from_config(config: dict[str, Any]) -> ImageEncoding:
+    """Build an ImageEncoding from an engine config's crop_* fields.
+
+    Args:
+        config: Engine configuration dict.
+
+    Returns:
+        ImageEncoding with defaults for missing fields.
+    """
+    return ImageEncoding(
+        format=config.get('crop_format', DEFAULT_ENCODING.format),
+        quality=config.get('crop_quality', DEFAULT_ENCODING.quality),
+        max_side=config.get('crop_max_side', DEFAULT_ENCODING.max_side),
+        grayscale=config.get('crop_grayscale', DEFAULT_ENCODING.grayscale),
+    )
+
+
+def encode_image(
+    bitmap: np.ndarray,
+    encoding: ImageEncoding = DEFAULT_ENCODING,
+    *,
+    category: str = '',
+) -> bytes:
+    """Encode a bitmap according to the given encoding options.
+
+    Args:
+        bitmap: Image as a ``(height, width)`` or ``(height, width, channels)``
+            uint8 array.
+        encoding: Encoding options.
+        category: OmniDocBench category of the region. Figures and tables
+            keep their colour even when grayscale is enabled.
+
+    Returns:
+        Encoded image bytes.
+    """
+    image = Image.fromarray(bitmap)
+
+    if encoding.grayscale and category not in _COLOR_CATEGORIES:
+        image = image.convert('L')
+    elif encoding.format == 'jpeg' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    size = scaled_size(image.width, image.height, encoding.max_side)
+    if size != image.size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+
+    buf = io.BytesIO()
+    if encoding.format == 'png':
+        image.save(buf, format='PNG')
+    else:
+        image.save(buf, format=_PIL_FORMATS[encoding.format], quality=encoding.quality)
+    return buf.getvalue()
+
+
+def scaled_size(width: int, height: int, max_side: int | None) -> tuple[int, int]:
+    """Compute the size of an image downscaled to fit a maximum side.
+
+    Args:
+        width: Original width in pixels.
+        height: Original height in pixels.
+        max_side: Maximum length of the longer side. None = no limit.
+
+    Returns:
+        Tuple of (width, height); unchanged if the image already fits.
+    """
+    longest = max(width, height)
+    if max_side is None or longest <= max_side:
+        return (width, height)
+    scale = max_side / longest
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
+
+
+def prepare_page_image(
+    image_path: Path,
+    encoding: ImageEncoding,
+    page_width: int,
+    page_height: int,
+) -> PreparedImage:
+    """Resize and re-encode a page image for a full-page model request.
+
+    The original file bytes are reused when the image already fits the
+    encoding's max side and is stored in the requested format.  Images that
+    cannot be decoded locally are passed through unchanged and left for the
+    server to reject.
+
+    Args:
+        image_path: Path to the page image file.
+        encoding: Preferred encoding of the target model.
+        page_width: Image width in pixels (used for pass-through).
+        page_height: Image height in pixels (used for pass-through).
+
+    Returns:
+        PreparedImage with the bytes to send and their pixel size.
+    """
+    source_format = _SUFFIX_FORMATS.get(image_path.suffix.lower(), 'png')
+
+    try:
+        with Image.open(image_path) as image:
+            width, height = image.size
+    except OSError:
+        logger.warning('Cannot read image header, sending as-is: %s', image_path)
+        data = image_path.read_bytes()
+        return PreparedImage(data, detect_mime_type(data), page_width, page_height)
+
+    target = scaled_size(width, height, encoding.max_side)
+    if target == (width, height) and encoding.format == source_format and not encoding.grayscale:
+        data = image_path.read_bytes()
+        return PreparedImage(data, detect_mime_type(data), width, height)
+
+    data = encode_image(load_page_array(image_path), encoding)
+    return PreparedImage(data, detect_mime_type(data), target[0], target[1])
+
+
+def detect_mime_type(image_bytes: bytes) -> str:
+    """Detect the MIME type of encoded image bytes from their signature.
+
+    Args:
+        image_bytes: Encoded image bytes.
+
+    Returns:
+        MIME type string, 'image/png' if the format is not recognized.
+    """
+    if image_bytes[:3] == b'\xff\xd8\xff':
+        return 'image/jpeg'
+    if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'image/png'
@@ -0,0 +1,157 @@
+"""Runtime tuning for local layout models.
+
+PyTorch defaults to one intra-op thread per core.  When several extraction
+tasks (or uvicorn workers) run layout inference at the same time, each
+forward pass tries to use every core and throughput collapses.  These
+options pin the device, cap the thread pools and bound the number of
+concurrent inferences per process, so extra pages queue instead of
+thrashing.
+"""
+
+import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InferenceOptions:
+    """How a local layout model is placed and scheduled.
+
+    Attributes:
+        device: Torch device ('cpu', 'cuda', 'cuda:1', 'mps').
+            None picks CUDA when available, otherwise CPU.
+        num_threads: Torch intra-op threads. None keeps the torch default.
+        num_interop_threads: Torch inter-op threads. None keeps the default.
+        max_concurrency: Maximum concurrent inferences per model per process.
+            None = unbounded.
+    """
+
+    device: str | None = None
+    num_threads: int | None = None
+    num_interop_threads: int | None = None
+    max_concurrency: int | None = 1
+
+
+DEFAULT_INFERENCE_OPTIONS = InferenceOptions()
+
+
+def inference_options_from_config(config: dict[str, Any]) -> InferenceOptions:
+    """Build InferenceOptions from an engine config's layout_* fields.
+
+    Args:
+        config: Engine configuration dict.
+
+    Returns:
+        InferenceOptions with defaults for missing fields.
+    """
+    return InferenceOptions(
+        device=config.get('layout_device') or DEFAULT_INFERENCE_OPTIONS.device,
+        num_threads=config.get('layout_num_threads', DEFAULT_INFERENCE_OPTIONS.num_threads),
+        num_interop_threads=config.get(
+            'layout_interop_threads',
+            DEFAULT_INFERENCE_OPTIONS.num_interop_threads,
+        ),
+        max_concurrency=config.get(
+            'layout_max_concurrency',
+            DEFAULT_INFERENCE_OPTIONS.max_concurrency,
+        ),
+    )
+
+
+def resolve_device(torch: ModuleType, requested: str | None) -> str:
+    """Pick the torch device for a model.
+
+    Args:
+        torch: The imported torch module.
+        requested: Requested device, or None for automatic selection.
+
+    Returns:
+        Device string. A CUDA request falls back to CPU if CUDA is unavailable.
+    """
+    if requested is None:
+        return 'cuda' if torch.cuda.is_available() else 'cpu'
+    if requested.startswith('cuda') and not torch.cuda.is_available():
+        logger.warning('Device %s requested but CUDA is not available, using cpu', requested)
+        return 'cpu'
+    return requested
+
+
+def apply_thread_settings(torch: ModuleType, options: InferenceOptions) -> None:
+    """Apply torch thread pool sizes.
+
+    Torch thread pools are process-wide, so the last detector to load wins.
+    The inter-op pool can only be sized before any parallel work has run;
+    later attempts are logged and ignored.
+
+    Args:
+        torch: The imported torch module.
+        options: Inference options with thread counts.
+    """
+    if options.num_threads is not None:
+        torch.set_num_threads(options.num_threads)
+
+    if options.num_interop_threads is not None:
+        try:
+            torch.set_num_interop_threads(options.num_interop_threads)
+        except RuntimeError:
+            logger.warning(
+                'Cannot set torch inter-op threads to %d after parallel work has started',
+                options.num_interop_threads,
+            )
+
+
+class _Gate:
+    """Counting semaphore remembering its limit and the conflicting limits seen."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.ignored_limits: set[int] = set()
+
+
+_gates: dict[str, _Gate] = {}
+_gates_lock = threading.Lock()
+
+
+@contextmanager
+def inference_slot(key: str, max_concurrency: int | None) -> Iterator[None]:
+    """Hold one of a model's concurrent-inference slots.
+
+    Slots are shared by every detector in the process with the same key,
+    because each extraction task builds its own engine. The first limit
+    configured for a key stays in force; a different limit for the same key
+    is logged and ignored, so alternating configurations cannot bypass it.
+
+    Args:
+        key: Identifies the model (e.g. class name and model name).
+        max_concurrency: Number of slots. None = no limit.
+
+    Yields:
+        None while the slot is held.
+    """
+    if max_concurrency is None:
+        yield
+        return
+
+    with _gates_lock:
+        gate = _gates.get(key)
+        if gate is None:
+            gate = _Gate(max_concurrency)
+            _gates[key] = gate
+        elif gate.limit != max_concurrency and max_concurrency not in gate.ignored_limits:
+            gate.ignored_limits.add(max_concurrency)
+            logger.warning(
+                'Ignoring max_concurrency=%d for %s; already limited to %d',
+                max_concurrency,
+                key,
+                gate.limit,
+            )
+
+    with gate.semaphore:
+        yield
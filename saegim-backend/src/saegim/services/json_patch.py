@@ -0,0 +1,240 @@
+"""RFC 6902 JSON Patch for annotation documents.
+
+Applies add / remove / replace / move / copy / test operations addressed by
+RFC 6901 JSON Pointers. A patch is all-or-nothing: operations run on a deep
+copy, and the original document is untouched if any operation fails.
+"""
+
+import copy
+from collections.abc import Iterable, Mapping
+
+JsonValue = dict[str, 'JsonValue'] | list['JsonValue'] | str | int | float | bool | None
+
+# Reference token addressing the position after the last array element
+_END_OF_ARRAY = '-'
+
+_MISSING = object()
+
+
+class JsonPatchError(Exception):
+    """Raised when a patch is malformed or cannot be applied."""
+
+
+class JsonPatchTestFailedError(JsonPatchError):
+    """Raised when a ``test`` operation does not match the document."""
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """Split a JSON Pointer into unescaped reference tokens.
+
+    Args:
+        pointer: JSON Pointer such as ``/layout_dets/0/text``.
+
+    Returns:
+        Reference tokens; empty for the whole document.
+
+    Raises:
+        JsonPatchError: If the pointer does not start with '/'.
+    """
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        msg = f"Invalid JSON pointer '{pointer}'"
+        raise JsonPatchError(msg)
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _array_index(container: list, token: str, *, allow_end: bool) -> int:
+    """Resolve an array reference token to an index.
+
+    Args:
+        container: Target array.
+        token: Reference token (digits, or '-' for the end).
+        allow_end: Whether the index one past the last element is valid.
+
+    Returns:
+        Array index.
+
+    Raises:
+        JsonPatchError: If the token is not a valid index.
+    """
+    if token == _END_OF_ARRAY and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        msg = f"Invalid array index '{token}'"
+        raise JsonPatchError(msg)
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        msg = f'Array index {index} out of range'
+        raise JsonPatchError(msg)
+    return index
+
+
+def _resolve(document: JsonValue, tokens: list[str]) -> JsonValue:
+    """Get the value a token path points to.
+
+    Args:
+        document: Document root.
+        tokens: Reference tokens.
+
+    Returns:
+        Referenced value.
+
+    Raises:
+        JsonPatchError: If the path does not exist.
+    """
+    value = document
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                msg = f"Path member '{token}' not found"
+                raise JsonPatchError(msg)
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[_array_index(value, token, allow_end=False)]
+        else:
+            msg = f"Cannot index into a scalar with '{token}'"
+            raise JsonPatchError(msg)
+    return value
+
+
+def _add(document: JsonValue, tokens: list[str], value: JsonValue) -> JsonValue:
+    """Insert or set a value.
+
+    Args:
+        document: Document root.
+        tokens: Reference tokens of the target location.
+        value: Value to add.
+
+    Returns:
+        New document root.
+    """
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, key, allow_end=True), value)
+    else:
+        msg = f"Cannot add '{key}' to a scalar"
+        raise JsonPatchError(msg)
+    return document
+
+
+def _remove(document: JsonValue, tokens: list[str]) -> JsonValue:
+    """Remove a value and return it.
+
+    Args:
+        document: Document root.
+        tokens: Reference tokens of the value to remove.
+
+    Returns:
+        Removed value.
+
+    Raises:
+        JsonPatchError: If the path does not exist or is the root.
+    """
+    if not tokens:
+        msg = 'Cannot remove the document root'
+        raise JsonPatchError(msg)
+    parent = _resolve(document, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            msg = f"Path member '{key}' not found"
+            raise JsonPatchError(msg)
+        return parent.pop(key)
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, key, allow_end=False))
+    msg = f"Cannot remove '{key}' from a scalar"
+    raise JsonPatchError(msg)
+
+
+def _operand(operation: Mapping[str, JsonValue], name: str) -> JsonValue:
+    """Get a required member of an operation.
+
+    Args:
+        operation: Patch operation.
+        name: Member name.
+
+    Returns:
+        Member value.
+
+    Raises:
+        JsonPatchError: If the member is missing.
+    """
+    value = operation.get(name, _MISSING)
+    if value is _MISSING:
+        msg = f"Operation '{operation.get('op')}' requires '{name}'"
+        raise JsonPatchError(msg)
+    return value
+
+
+def _apply_operation(document: JsonValue, operation: Mapping[str, JsonValue]) -> JsonValue:
+    """Apply one operation in place.
+
+    Args:
+        document: Document root.
+        operation: Patch operation.
+
+    Returns:
+        New document root.
+
+    Raises:
+        JsonPatchError: If the operation is invalid or cannot be applied.
+        JsonPatchTestFailedError: If a ``test`` operation does not match.
+    """
+    op = operation.get('op')
+    tokens = parse_pointer(_operand(operation, 'path'))
+
+    if op == 'add':
+        return _add(document, tokens, copy.deepcopy(_operand(operation, 'value')))
+    if op == 'remove':
+        _remove(document, tokens)
+        return document
+    if op == 'replace':
+        value = copy.deepcopy(_operand(operation, 'value'))
+        if not tokens:
+            return value
+        _remove(document, tokens)
+        return _add(document, tokens, value)
+    if op in ('move', 'copy'):
+        source = parse_pointer(_operand(operation, 'from'))
+        if op == 'move':
+            if tokens[: len(source)] == source and tokens != source:
+                msg = 'Cannot move a value into one of its children'
+                raise JsonPatchError(msg)
+            value = _remove(document, source)
+        else:
+            value = copy.deepcopy(_resolve(document, source))
+        return _add(document, tokens, value)
+    if op == 'test':
+        if _resolve(document, tokens) != _operand(operation, 'value'):
+            msg = f"Test failed at '{operation['path']}'"
+            raise JsonPatchTestFailedError(msg)
+        return document
+
+    msg = f"Unknown patch operation '{op}'"
+    raise JsonPatchError(msg)
+
+
+def apply_patch(document: JsonValue, operations: Iterable[Mapping[str, JsonValue]]) -> JsonValue:
+    """Apply a JSON Patch to a document.
+
+    Args:
+        document: JSON document (not modified).
+        operations: RFC 6902 operations, applied in order.
+
+    Returns:
+        Patched copy of the document.
+
+    Raises:
+        JsonPatchError: If any operation is invalid or cannot be applied.
+        JsonPatchTestFailedError: If a ``test`` operation does not match.
+    """
+    patched = copy.deepcopy(document)
+    for operation in operations:
+        patched = _apply_operation(patched, operation)
+    return patched
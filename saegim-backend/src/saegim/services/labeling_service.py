@@ -1,36 +1,54 @@
 """Labeling service for annotation data management."""
 
-import json
 import uuid
 from typing import Any
 
 import asyncpg
 
-from saegim.repositories import page_repo
+from saegim.repositories import extraction_result_repo, page_repo
+from saegim.services import json_patch
 
 
-async def get_page_data(pool: asyncpg.Pool, page_id: uuid.UUID) -> dict[str, Any] | None:
-    """Get page data including annotation for the labeling UI.
+class PageVersionConflictError(Exception):
+    """Raised when a page changed since the version an edit was based on.
+
+    Attributes:
+        current_version: Version the page is at now.
+    """
+
+    def __init__(self, current_version: int) -> None:
+        """Initialize the error.
+
+        Args:
+            current_version: Version the page is at now.
+        """
+        super().__init__(f'Page was modified (now at version {current_version})')
+        self.current_version = current_version
+
+
+def _check_version(current_version: int, expected_version: int | None) -> None:
+    """Fail if a page is not at the expected version.
 
     Args:
-        pool: Database connection pool.
-        page_id: Page UUID.
+        current_version: Version the page is at.
+        expected_version: Version the edit is based on. None = any.
 
-    Returns:
-        dict or None: Page data with annotation if found.
+    Raises:
+        PageVersionConflictError: If the versions differ.
     """
-    record = await page_repo.get_by_id_with_context(pool, page_id)
-    if record is None:
-        return None
+    if expected_version is not None and current_version != expected_version:
+        raise PageVersionConflictError(current_version)
 
-    annotation_data = record['annotation_data']
-    if isinstance(annotation_data, str):
-        annotation_data = json.loads(annotation_data)
 
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
+def _page_result(record: asyncpg.Record) -> dict[str, Any]:
+    """Build the page data returned by reads and full-view edits.
 
+    Args:
+        record: Page record with the columns of a page write.
+
+    Returns:
+        dict: Page data with annotation and auto-extracted data.
+    """
     return {
         'id': record['id'],
         'document_id': record['document_id'],
@@ -38,11 +56,101 @@ async def get_page_data(pool: asyncpg.Pool, page_id: uuid.UUID) -> dict[str, Any
         'width': record['width'],
         'height': record['height'],
         'image_path': record['image_path'],
-        'annotation_data': annotation_data or {},
-        'auto_extracted_data': auto_extracted,
+        'annotation_data': record['annotation_data'] or {},
+        'auto_extracted_data': record['auto_extracted_data'],
         'status': record['status'],
         'assigned_to': record['assigned_to'],
         'updated_at': record['updated_at'],
+        'version': record['version'],
+    }
+
+
+def _mutation_result(record: asyncpg.Record, **changes: object) -> dict[str, Any]:
+    """Build the sparse result of an annotation edit.
+
+    Args:
+        record: Page record with at least id, status, updated_at and version.
+        **changes: What the edit changed (element, relation, ...).
+
+    Returns:
+        dict: Page state and the changes, without annotation JSON.
+    """
+    return {
+        'id': record['id'],
+        'status': record['status'],
+        'updated_at': record['updated_at'],
+        'version': record['version'],
+        **changes,
+    }
+
+
+async def raise_if_version_conflict(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    expected_version: int | None,
+) -> None:
+    """Explain a conditional update that matched no row.
+
+    The update may have failed because the page is gone, a state
+    precondition did not hold, or the page moved to another version;
+    only the last one is a conflict.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        expected_version: Version the update was conditioned on. None = any.
+
+    Raises:
+        PageVersionConflictError: If the page exists at another version.
+    """
+    if expected_version is None:
+        return
+    current_version = await page_repo.get_version(pool, page_id)
+    if current_version is not None:
+        _check_version(current_version, expected_version)
+
+
+async def get_page_version(pool: asyncpg.Pool, page_id: uuid.UUID) -> int | None:
+    """Get the current version of a page without loading its data.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+
+    Returns:
+        int or None: Page version if found.
+    """
+    return await page_repo.get_version(pool, page_id)
+
+
+async def get_page_data(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    *,
+    raw_json: bool = False,
+) -> dict[str, Any] | None:
+    """Get page data including annotation for the labeling UI.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        raw_json: Return annotation_data, auto_extracted_data and
+            partial_extracted_data as the JSON text stored in the database,
+            for responses that embed it as is.
+
+    Returns:
+        dict or None: Page data with annotation if found.
+    """
+    record = await page_repo.get_by_id_with_context(pool, page_id, raw_json=raw_json)
+    if record is None:
+        return None
+
+    result = _page_result(record)
+    result['partial_extracted_data'] = record['partial_extracted_data']
+    if raw_json:
+        result['annotation_data'] = record['annotation_data'] or '{}'
+    return {
+        **result,
         'project_id': record['project_id'],
         'project_name': record['project_name'],
         'document_filename': record['document_filename'],
@@ -54,6 +162,8 @@ async def save_annotation(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     annotation_data: dict[str, Any],
+    *,
+    expected_version: int | None = None,
 ) -> dict[str, Any] | None:
     """Save annotation data for a page.
 
@@ -61,34 +171,70 @@ async def save_annotation(
         pool: Database connection pool.
         page_id: Page UUID.
         annotation_data: OmniDocBench annotation JSON.
+        expected_version: Version the client last saw (If-Match). None = any.
 
     Returns:
         dict or None: Updated page data if found.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
     """
-    record = await page_repo.update_annotation(pool, page_id, annotation_data)
+    record = await page_repo.update_annotation(
+        pool, page_id, annotation_data, expected_version=expected_version
+    )
     if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
+    return _page_result(record)
+
+
+async def patch_annotation(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    operations: list[dict[str, Any]],
+    *,
+    expected_version: int | None = None,
+) -> dict[str, Any] | None:
+    """Apply a JSON Patch to a page's annotation data.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        operations: RFC 6902 operations against annotation_data.
+        expected_version: Version the client last saw (If-Match). None = any.
 
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
+    Returns:
+        dict or None: Page id, status, updated_at, version and the number of
+        applied operations, or None if the page was not found.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
+        JsonPatchError: If the patch cannot be applied or the result is
+            not a JSON object.
+        JsonPatchTestFailedError: If a ``test`` operation does not match.
+    """
+
+    def apply(annotation: dict[str, Any]) -> dict[str, Any]:
+        patched = json_patch.apply_patch(annotation, operations)
+        if not isinstance(patched, dict):
+            msg = 'annotation_data must remain a JSON object'
+            raise json_patch.JsonPatchError(msg)
+        return patched
+
+    record = await page_repo.patch_annotation(
+        pool, page_id, apply, expected_version=expected_version
+    )
+    if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
+        return None
 
     return {
         'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
         'status': record['status'],
-        'assigned_to': record['assigned_to'],
         'updated_at': record['updated_at'],
+        'version': record['version'],
+        'applied': len(operations),
     }
 
 
@@ -96,6 +242,9 @@ async def save_page_attribute(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     page_attribute: dict[str, Any],
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> dict[str, Any] | None:
     """Save page attribute within annotation data.
 
@@ -103,96 +252,73 @@ async def save_page_attribute(
         pool: Database connection pool.
         page_id: Page UUID.
         page_attribute: Page attribute dictionary.
+        expected_version: Version the client last saw (If-Match). None = any.
+        full: Return the whole page. False = a sparse result without
+            annotation JSON (see ``_mutation_result``).
 
     Returns:
         dict or None: Updated page data if found.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
     """
-    record = await page_repo.update_page_attribute(pool, page_id, page_attribute)
+    record = await page_repo.update_page_attribute(
+        pool, page_id, page_attribute, expected_version=expected_version, full=full
+    )
     if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
+    if not full:
+        return _mutation_result(record, page_attribute=page_attribute)
 
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
-
-    return {
-        'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': record['status'],
-        'assigned_to': record['assigned_to'],
-        'updated_at': record['updated_at'],
-    }
+    return _page_result(record)
 
 
 async def add_element(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     element: dict[str, Any],
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> dict[str, Any] | None:
     """Add a new layout element to the page.
 
+    The database allocates the element's ``anno_id`` and ``order``.
+
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
         element: Layout element dictionary.
+        expected_version: Version the client last saw (If-Match). None = any.
+        full: Return the whole page. False = a sparse result without
+            annotation JSON (see ``_mutation_result``).
 
     Returns:
         dict or None: Updated page data if found.
-    """
-    page = await page_repo.get_by_id(pool, page_id)
-    if page is None:
-        return None
-
-    annotation = page['annotation_data']
-    if isinstance(annotation, str):
-        annotation = json.loads(annotation)
-    annotation = annotation or {}
-
-    layout_dets = annotation.get('layout_dets', [])
-    max_anno_id = max((e.get('anno_id', -1) for e in layout_dets), default=-1)
-    element['anno_id'] = max_anno_id + 1
-    element['order'] = len(layout_dets)
 
-    record = await page_repo.add_element(pool, page_id, element)
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
+    """
+    record = await page_repo.add_element(
+        pool, page_id, element, expected_version=expected_version, full=full
+    )
     if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
+    if not full:
+        return _mutation_result(record, element=record['element'])
 
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
-
-    return {
-        'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': record['status'],
-        'assigned_to': record['assigned_to'],
-        'updated_at': record['updated_at'],
-    }
+    return _page_result(record)
 
 
 async def accept_auto_extraction(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
+    *,
+    expected_version: int | None = None,
 ) -> dict[str, Any] | None:
     """Accept auto-extracted data as the initial annotation.
 
@@ -201,41 +327,104 @@ async def accept_auto_extraction(
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
+        expected_version: Version the client last saw (If-Match). None = any.
 
     Returns:
         dict or None: Updated page data, or None if page not found or
         preconditions not met (no auto data or annotation already exists).
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
     """
-    record = await page_repo.accept_auto_extracted(pool, page_id)
+    record = await page_repo.accept_auto_extracted(pool, page_id, expected_version=expected_version)
     if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
+    return _page_result(record)
 
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
 
-    return {
-        'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': record['status'],
-        'assigned_to': record['assigned_to'],
-        'updated_at': record['updated_at'],
-    }
+async def list_extraction_results(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+) -> list[dict[str, Any]]:
+    """List the stored extraction results of a page, one per engine configuration.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+
+    Returns:
+        list[dict]: Result summaries without payloads, newest first.
+    """
+    records = await extraction_result_repo.list_by_page(pool, page_id)
+    return [dict(record) for record in records]
+
+
+async def get_extraction_result(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    result_id: uuid.UUID,
+) -> dict[str, Any] | None:
+    """Get one stored extraction result of a page.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        result_id: Extraction result UUID.
+
+    Returns:
+        dict or None: Result with its payload, or None if not found.
+    """
+    record = await extraction_result_repo.get_by_id(pool, page_id, result_id)
+    if record is None:
+        return None
+
+    return dict(record)
+
+
+async def select_extraction_result(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    result_id: uuid.UUID,
+    *,
+    expected_version: int | None = None,
+) -> dict[str, Any] | None:
+    """Make a stored extraction result the page's auto-extracted data.
+
+    The annotation is left untouched; accept or force-accept the page
+    afterwards to copy the selected result into it.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        result_id: Extraction result UUID.
+        expected_version: Version the client last saw (If-Match). None = any.
+
+    Returns:
+        dict or None: Updated page data, or None if the result was not found.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
+    """
+    stored = await get_extraction_result(pool, page_id, result_id)
+    if stored is None:
+        return None
+
+    record = await page_repo.update_auto_extracted_data(
+        pool, page_id, stored['result'], expected_version=expected_version
+    )
+    if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
+        return None
+    return await get_page_data(pool, page_id)
 
 
 async def force_accept_auto_extraction(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
+    *,
+    expected_version: int | None = None,
 ) -> dict[str, Any] | None:
     """Force-accept auto-extracted data, overwriting existing annotation.
 
@@ -245,41 +434,31 @@ async def force_accept_auto_extraction(
     Args:
         pool: Database connection pool.
         page_id: Page UUID.
+        expected_version: Version the client last saw (If-Match). None = any.
 
     Returns:
         dict or None: Updated page data, or None if no auto data.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
     """
-    record = await page_repo.force_accept_auto_extracted(pool, page_id)
+    record = await page_repo.force_accept_auto_extracted(
+        pool, page_id, expected_version=expected_version
+    )
     if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
-
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
-
-    return {
-        'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': record['status'],
-        'assigned_to': record['assigned_to'],
-        'updated_at': record['updated_at'],
-    }
+    return _page_result(record)
 
 
 async def add_relation(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     relation: dict[str, Any],
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> dict[str, Any] | None:
     """Add a relation between two elements.
 
@@ -289,11 +468,15 @@ async def add_relation(
         pool: Database connection pool.
         page_id: Page UUID.
         relation: Relation dict with source_anno_id, target_anno_id, relation_type.
+        expected_version: Version the client last saw (If-Match). None = any.
+        full: Return the whole page. False = a sparse result without
+            annotation JSON (see ``_mutation_result``).
 
     Returns:
         dict or None: Updated page data if found, None if page not found.
 
     Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
         ValueError: If validation fails (self-reference, missing elements, duplicate).
     """
     source_id = relation['source_anno_id']
@@ -306,11 +489,9 @@ async def add_relation(
     page = await page_repo.get_by_id(pool, page_id)
     if page is None:
         return None
+    _check_version(page['version'], expected_version)
 
-    annotation = page['annotation_data']
-    if isinstance(annotation, str):
-        annotation = json.loads(annotation)
-    annotation = annotation or {}
+    annotation = page['annotation_data'] or {}
 
     layout_dets = annotation.get('layout_dets', [])
     anno_ids = {e.get('anno_id') for e in layout_dets}
@@ -328,31 +509,18 @@ async def add_relation(
             msg = 'Duplicate relation already exists'
             raise ValueError(msg)
 
-    record = await page_repo.add_relation(pool, page_id, relation)
+    # Guard the read-modify-write: the checks above ran against this version
+    record = await page_repo.add_relation(
+        pool, page_id, relation, expected_version=page['version'], full=full
+    )
     if record is None:
+        await raise_if_version_conflict(pool, page_id, page['version'])
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
-
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
+    if not full:
+        return _mutation_result(record, relation=relation)
 
-    return {
-        'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': record['status'],
-        'assigned_to': record['assigned_to'],
-        'updated_at': record['updated_at'],
-    }
+    return _page_result(record)
 
 
 async def delete_relation(
@@ -360,6 +528,9 @@ async def delete_relation(
     page_id: uuid.UUID,
     source_anno_id: int,
     target_anno_id: int,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> dict[str, Any] | None:
     """Delete a relation between two elements.
 
@@ -368,41 +539,44 @@ async def delete_relation(
         page_id: Page UUID.
         source_anno_id: Source annotation ID.
         target_anno_id: Target annotation ID.
+        expected_version: Version the client last saw (If-Match). None = any.
+        full: Return the whole page. False = a sparse result without
+            annotation JSON (see ``_mutation_result``).
 
     Returns:
         dict or None: Updated page data if found.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
     """
-    record = await page_repo.delete_relation(pool, page_id, source_anno_id, target_anno_id)
+    record = await page_repo.delete_relation(
+        pool,
+        page_id,
+        source_anno_id,
+        target_anno_id,
+        expected_version=expected_version,
+        full=full,
+    )
     if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
+    if not full:
+        return _mutation_result(
+            record,
+            relation={'source_anno_id': source_anno_id, 'target_anno_id': target_anno_id},
+        )
 
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
-
-    return {
-        'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': record['status'],
-        'assigned_to': record['assigned_to'],
-        'updated_at': record['updated_at'],
-    }
+    return _page_result(record)
 
 
 async def update_reading_order(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     order_map: dict[str, int],
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> dict[str, Any] | None:
     """Update reading order for layout elements.
 
@@ -413,20 +587,24 @@ async def update_reading_order(
         pool: Database connection pool.
         page_id: Page UUID.
         order_map: Mapping of anno_id (as string) to new order (int).
+        expected_version: Version the client last saw (If-Match). None = any.
+        full: Return the whole page. False = a sparse result without
+            annotation JSON (see ``_mutation_result``).
 
     Returns:
         dict or None: Updated page data if found and valid.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
     """
     parsed_map: dict[int, int] = {int(k): v for k, v in order_map.items()}
 
     record = await page_repo.get_by_id(pool, page_id)
     if record is None:
         return None
+    _check_version(record['version'], expected_version)
 
-    annotation = record['annotation_data']
-    if isinstance(annotation, str):
-        annotation = json.loads(annotation)
-    annotation = annotation or {}
+    annotation = record['annotation_data'] or {}
 
     layout_dets = annotation.get('layout_dets', [])
     existing_ids = {el.get('anno_id') for el in layout_dets}
@@ -441,37 +619,27 @@ async def update_reading_order(
     ]
     updated_annotation = {**annotation, 'layout_dets': updated_dets}
 
-    result = await page_repo.update_annotation(pool, page_id, updated_annotation)
+    # Guard the read-modify-write: the new order was computed from this version
+    result = await page_repo.update_annotation(
+        pool, page_id, updated_annotation, expected_version=record['version'], full=full
+    )
     if result is None:
+        await raise_if_version_conflict(pool, page_id, record['version'])
         return None
 
-    result_annotation = result['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
+    if not full:
+        return _mutation_result(result, order_map=order_map)
 
-    auto_extracted = result['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
-
-    return {
-        'id': result['id'],
-        'document_id': result['document_id'],
-        'page_no': result['page_no'],
-        'width': result['width'],
-        'height': result['height'],
-        'image_path': result['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': result['status'],
-        'assigned_to': result['assigned_to'],
-        'updated_at': result['updated_at'],
-    }
+    return _page_result(result)
 
 
 async def delete_element(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     anno_id: int,
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
 ) -> dict[str, Any] | None:
     """Delete a layout element by anno_id.
 
@@ -479,32 +647,165 @@ async def delete_element(
         pool: Database connection pool.
         page_id: Page UUID.
         anno_id: Annotation ID of the element.
+        expected_version: Version the client last saw (If-Match). None = any.
+        full: Return the whole page. False = a sparse result without
+            annotation JSON (see ``_mutation_result``).
 
     Returns:
         dict or None: Updated page data if found.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
     """
-    record = await page_repo.delete_element(pool, page_id, anno_id)
+    record = await page_repo.delete_element(
+        pool, page_id, anno_id, expected_version=expected_version, full=full
+    )
     if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
         return None
 
-    result_annotation = record['annotation_data']
-    if isinstance(result_annotation, str):
-        result_annotation = json.loads(result_annotation)
+    if not full:
+        return _mutation_result(record, anno_id=anno_id)
 
-    auto_extracted = record['auto_extracted_data']
-    if isinstance(auto_extracted, str):
-        auto_extracted = json.loads(auto_extracted)
+    return _page_result(record)
 
-    return {
-        'id': record['id'],
-        'document_id': record['document_id'],
-        'page_no': record['page_no'],
-        'width': record['width'],
-        'height': record['height'],
-        'image_path': record['image_path'],
-        'annotation_data': result_annotation or {},
-        'auto_extracted_data': auto_extracted,
-        'status': record['status'],
-        'assigned_to': record['assigned_to'],
-        'updated_at': record['updated_at'],
+
+def _apply_element_batch(
+    annotation: dict[str, Any],
+    operations: list[dict[str, Any]],
+    created: list[int],
+) -> dict[str, Any]:
+    """Apply element and relation operations to an annotation in memory.
+
+    Elements are indexed by anno_id once, so each operation checks its
+    references without scanning layout_dets. New elements get anno_ids
+    after the largest one on the page, in operation order, and are never
+    given an anno_id freed by a delete of the same batch.
+
+    Args:
+        annotation: Current annotation data.
+        operations: Batch operations, as dumped from ElementBatch.
+        created: List receiving the anno_ids of created elements.
+
+    Returns:
+        dict: New annotation data.
+
+    Raises:
+        ValueError: If an operation references a missing element, adds a
+            self-referencing or duplicate relation.
+    """
+    layout_dets = [dict(el) for el in annotation.get('layout_dets', [])]
+    elements: dict[Any, list[dict[str, Any]]] = {}
+    for el in layout_dets:
+        elements.setdefault(el.get('anno_id'), []).append(el)
+
+    extra = annotation.get('extra') or {}
+    relations = list(extra.get('relation', []))
+    relations_changed = False
+    element_count = len(layout_dets)
+    next_anno_id = max((i for i in elements if isinstance(i, int)), default=-1) + 1
+
+    def require(index: int, anno_id: int, role: str = 'Element') -> None:
+        if anno_id not in elements:
+            msg = f'operations[{index}]: {role} with anno_id {anno_id} not found'
+            raise ValueError(msg)
+
+    for index, operation in enumerate(operations):
+        op = operation['op']
+        if op == 'create':
+            element = {**operation['element'], 'anno_id': next_anno_id, 'order': element_count}
+            layout_dets.append(element)
+            elements[next_anno_id] = [element]
+            created.append(next_anno_id)
+            next_anno_id += 1
+            element_count += 1
+        elif op == 'update':
+            require(index, operation['anno_id'])
+            for el in elements[operation['anno_id']]:
+                el.update(operation['changes'])
+        elif op == 'delete':
+            require(index, operation['anno_id'])
+            element_count -= len(elements.pop(operation['anno_id']))
+        else:
+            source_id = operation['source_anno_id']
+            target_id = operation['target_anno_id']
+            pair = (source_id, target_id)
+            existing = [
+                (r.get('source_anno_id'), r.get('target_anno_id')) == pair for r in relations
+            ]
+            if op == 'add_relation':
+                if source_id == target_id:
+                    msg = f'operations[{index}]: Self-referencing relation is not allowed'
+                    raise ValueError(msg)
+                require(index, source_id, 'Source element')
+                require(index, target_id, 'Target element')
+                if any(existing):
+                    msg = f'operations[{index}]: Duplicate relation already exists'
+                    raise ValueError(msg)
+                relations.append(
+                    {
+                        'source_anno_id': source_id,
+                        'target_anno_id': target_id,
+                        'relation_type': operation['relation_type'],
+                    }
+                )
+            else:
+                relations = [r for r, match in zip(relations, existing, strict=True) if not match]
+            relations_changed = True
+
+    result = {
+        **annotation,
+        'layout_dets': [el for el in layout_dets if el.get('anno_id') in elements],
     }
+    if relations_changed:
+        result['extra'] = {**extra, 'relation': relations}
+    return result
+
+
+async def apply_element_batch(
+    pool: asyncpg.Pool,
+    page_id: uuid.UUID,
+    operations: list[dict[str, Any]],
+    *,
+    expected_version: int | None = None,
+    full: bool = True,
+) -> dict[str, Any] | None:
+    """Apply many element and relation operations to a page at once.
+
+    Operations run in order against the locked page in one transaction,
+    and only the element rows they change are written. If any operation
+    fails, nothing is saved.
+
+    Args:
+        pool: Database connection pool.
+        page_id: Page UUID.
+        operations: Batch operations (create, update, delete, add_relation,
+            delete_relation), as dumped from ElementBatch.
+        expected_version: Version the client last saw (If-Match). None = any.
+        full: Return the whole page. False = a sparse result without
+            annotation JSON (see ``_mutation_result``).
+
+    Returns:
+        dict or None: Updated page data if found.
+
+    Raises:
+        PageVersionConflictError: If the page is no longer at expected_version.
+        ValueError: If an operation references a missing element, adds a
+            self-referencing or duplicate relation.
+    """
+    created: list[int] = []
+    record = await page_repo.patch_annotation(
+        pool,
+        page_id,
+        lambda annotation: _apply_element_batch(annotation, operations, created),
+        expected_version=expected_version,
+        full=full,
+    )
+    if record is None:
+        await raise_if_version_conflict(pool, page_id, expected_version)
+        return None
+
+    if not full:
+        return _mutation_result(record, created_anno_ids=created)
+
+    return _page_result(record)
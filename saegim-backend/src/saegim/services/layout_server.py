@@ -0,0 +1,250 @@
+"""Shared local layout server.
+
+One process per node owns the layout models and serves detection requests
+from every uvicorn worker over localhost HTTP or a Unix domain socket, so
+model memory is paid once per node instead of once per worker.
+
+Requests for the same model are queued and flushed to the detector in
+batches: the first request waits up to ``max_wait_ms`` for others to join,
+then up to ``max_batch_size`` pages run through ``detect_layout_batch``.
+
+Start with ``python scripts/start_layout_server.py``.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from fastapi import FastAPI, HTTPException, status
+
+from saegim.schemas.layout import (
+    DetectLayoutRequest,
+    DetectLayoutResponse,
+    LayoutRegionSchema,
+    LayoutServerHealth,
+)
+from saegim.services.inference_options import DEFAULT_INFERENCE_OPTIONS, InferenceOptions
+from saegim.services.layout_types import LayoutDetector, LayoutRegion
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DOCLING_MODEL = 'ibm-granite/granite-docling-258M'
+
+_Pending = tuple[Path, asyncio.Future[list[LayoutRegion]]]
+
+
+class LayoutBatcher:
+    """Collects concurrent requests for one detector into batches.
+
+    Args:
+        detector: Layout detector that owns the model.
+        max_batch_size: Maximum pages per detect_layout_batch call.
+        max_wait_s: How long the first queued page waits for others.
+    """
+
+    def __init__(
+        self,
+        detector: LayoutDetector,
+        *,
+        max_batch_size: int = 8,
+        max_wait_s: float = 0.02,
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            detector: Layout detector that owns the model.
+            max_batch_size: Maximum pages per detect_layout_batch call.
+            max_wait_s: How long the first queued page waits for others.
+        """
+        self.detector = detector
+        self._max_batch_size = max_batch_size
+        self._max_wait_s = max_wait_s
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def detect(self, image_paths: list[Path]) -> list[list[LayoutRegion]]:
+        """Queue pages for detection and wait for their results.
+
+        Args:
+            image_paths: Page image paths.
+
+        Returns:
+            Detected regions for each page, in input order.
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for path in image_paths:
+            future: asyncio.Future[list[LayoutRegion]] = loop.create_future()
+            self._queue.put_nowait((path, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def close(self) -> None:
+        """Stop the batching worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_s
+            while len(batch) < self._max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+            await self._process(batch)
+
+    async def _process(self, batch: list[_Pending]) -> None:
+        """Run one batch and resolve its futures.
+
+        If the batched call fails, pages are retried one at a time so a
+        single unreadable image does not fail its neighbours.
+
+        Args:
+            batch: Queued (path, future) pairs.
+        """
+        paths = [path for path, _ in batch]
+        try:
+            results = await asyncio.to_thread(self.detector.detect_layout_batch, paths)
+        except Exception as exc:  # noqa: BLE001
+            if len(batch) == 1:
+                future = batch[0][1]
+                if not future.done():
+                    future.set_exception(exc)
+                return
+            logger.warning('Batch of %d pages failed, retrying one by one', len(batch))
+            for item in batch:
+                await self._process([item])
+            return
+
+        for (_, future), regions in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(regions)
+
+
+def create_layout_server_app(
+    *,
+    max_batch_size: int = 8,
+    max_wait_ms: float = 20.0,
+    options: InferenceOptions = DEFAULT_INFERENCE_OPTIONS,
+    image_root: Path | None = None,
+) -> FastAPI:
+    """Create the layout server application.
+
+    Args:
+        max_batch_size: Maximum pages per forward pass.
+        max_wait_ms: How long a request waits for others to share its batch.
+        options: Device and thread settings for the models.
+        image_root: If set, only images under this directory are served.
+
+    Returns:
+        FastAPI application.
+    """
+    batchers: dict[tuple[str, str | None], LayoutBatcher] = {}
+    root = image_root.resolve() if image_root is not None else None
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        yield
+        for batcher in batchers.values():
+            await batcher.close()
+
+    app = FastAPI(title='saegim layout server', lifespan=lifespan)
+
+    def _get_batcher(provider: str, model_name: str | None) -> LayoutBatcher:
+        key = (provider, model_name)
+        batcher = batchers.get(key)
+        if batcher is None:
+            from saegim.services.engines.split_pipeline_engine import create_layout_detector
+
+            detector = create_layout_detector(
+                provider,
+                model_name or _DEFAULT_DOCLING_MODEL,
+                batch_size=max_batch_size,
+                # Requests are already serialized per model by the batcher
+                options=dataclasses.replace(options, max_concurrency=None),
+            )
+            batcher = LayoutBatcher(
+                detector,
+                max_batch_size=max_batch_size,
+                max_wait_s=max_wait_ms / 1000,
+            )
+            batchers[key] = batcher
+            logger.info('Registered layout detector %s (%s)', provider, model_name or 'default')
+        return batcher
+
+    def _resolve_image(image_path: str) -> Path:
+        path = Path(image_path).resolve()
+        if root is not None and not path.is_relative_to(root):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f'Image outside served root: {image_path}',
+            )
+        if not path.is_file():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'Image not found: {image_path}',
+            )
+        return path
+
+    @app.get('/health', response_model=LayoutServerHealth)
+    async def health() -> LayoutServerHealth:
+        """Report server status and loaded detectors."""
+        return LayoutServerHealth(
+            status='ok',
+            detectors=[f'{provider}:{model or "default"}' for provider, model in batchers],
+        )
+
+    @app.post('/detect', response_model=DetectLayoutResponse)
+    async def detect(body: DetectLayoutRequest) -> DetectLayoutResponse:
+        """Detect layout regions on page images."""
+        paths = [_resolve_image(p) for p in body.image_paths]
+        try:
+            batcher = _get_batcher(body.provider, body.model_name)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+        try:
+            results = await batcher.detect(paths)
+        except Exception as exc:
+            logger.exception('Layout detection failed for %s', body.image_paths)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f'Layout detection failed: {exc}',
+            ) from exc
+
+        return DetectLayoutResponse(
+            results=[
+                [
+                    LayoutRegionSchema(
+                        bbox=region.bbox,
+                        category=region.category,
+                        score=region.score,
+                        text=region.text,
+                    )
+                    for region in regions
+                ]
+                for regions in results
+            ]
+        )
+
+    return app
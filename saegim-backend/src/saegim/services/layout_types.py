@@ -4,6 +4,7 @@ Provides the LayoutRegion dataclass and LayoutDetector protocol
 used by OCR pipeline engines.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Protocol
@@ -26,6 +27,29 @@ class LayoutRegion:
     text: str | None = None
 
 
+def bbox_iou(
+    a: tuple[float, float, float, float],
+    b: tuple[float, float, float, float],
+) -> float:
+    """Compute the intersection-over-union of two bounding boxes.
+
+    Args:
+        a: First box as (x1, y1, x2, y2).
+        b: Second box as (x1, y1, x2, y2).
+
+    Returns:
+        IoU in the range 0-1 (0 for disjoint or degenerate boxes).
+    """
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix2 - ix1) * max(0.0, iy2 - iy1)
+    if inter == 0.0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area_a + area_b - inter)
+
+
 class LayoutDetector(Protocol):
     """Protocol for layout detection backends.
 
@@ -43,3 +67,16 @@ class LayoutDetector(Protocol):
             List of detected layout regions.
         """
         ...
+
+    def detect_layout_batch(self, image_paths: Sequence[Path]) -> list[list[LayoutRegion]]:
+        """Detect layout regions from several page images.
+
+        Local model backends run multiple pages per forward pass.
+
+        Args:
+            image_paths: Paths to the page image files.
+
+        Returns:
+            Detected layout regions for each image, in input order.
+        """
+        ...
@@ -2,20 +2,33 @@
 
 Combines a pluggable layout detector with text-only OCR providers
 (Gemini, vLLM, or built-in text) to produce OmniDocBench pages.
+
+An optional region text source (e.g. the PDF text layer) is consulted
+first; regions it has no text for fall back to OCR.  An optional
+RepeatedRegionCache reuses the OCR text of running headers and footers
+recognized on earlier pages of the document; when only a number in one
+changed, just that span is OCR'd and spliced into the cached text.
 """
 
-import io
 import logging
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, Protocol
 
+import numpy as np
 from PIL import Image
 
 from saegim.services.exporters.omnidocbench import bbox_to_poly
+from saegim.services.image_encoding import DEFAULT_ENCODING, ImageEncoding, encode_image
 from saegim.services.layout_types import LayoutDetector, LayoutRegion
+from saegim.services.page_image_cache import crop_view, load_page_array
+from saegim.services.repeated_regions import RegionKey, RepeatedRegionCache
 
 logger = logging.getLogger(__name__)
 
+# Categories whose text needs structure (HTML, LaTeX) only OCR can produce
+_OCR_ONLY_CATEGORIES = frozenset({'figure', 'table', 'equation_isolated'})
+
 
 class TextOcrProvider(Protocol):
     """Protocol for text-only OCR providers (2-stage pipeline).
@@ -36,6 +49,22 @@ class TextOcrProvider(Protocol):
         ...
 
 
+class RegionTextSource(Protocol):
+    """Protocol for sources that supply region text without OCR."""
+
+    def region_text(self, image_path: Path, bbox: tuple[float, float, float, float]) -> str:
+        """Return the text inside a region of a page image.
+
+        Args:
+            image_path: Path to the page image file.
+            bbox: Region box (x0, y0, x1, y1) in image pixels.
+
+        Returns:
+            Region text, or empty string if the source has none.
+        """
+        ...
+
+
 class OcrPipeline:
     """2-stage OCR pipeline: layout detection + text extraction.
 
@@ -49,6 +78,9 @@ class OcrPipeline:
         text_provider: TextOcrProvider | None = None,
         *,
         use_builtin_ocr: bool = False,
+        crop_encoding: ImageEncoding = DEFAULT_ENCODING,
+        text_source: RegionTextSource | None = None,
+        repeated_regions: RepeatedRegionCache | None = None,
     ) -> None:
         """Initialize the 2-stage OCR pipeline.
 
@@ -56,10 +88,25 @@ class OcrPipeline:
             layout_detector: Layout detection backend (e.g. DoclingLayoutDetector).
             text_provider: Text-only OCR provider (Gemini or vLLM).
             use_builtin_ocr: If True, use built-in text from layout results.
+            crop_encoding: How cropped regions are encoded for the text provider.
+            text_source: Source tried before OCR for plain-text regions.
+            repeated_regions: Cache of header/footer text shared across the
+                pages of a document. None = OCR every region.
         """
         self._layout_detector = layout_detector
         self._text_provider = text_provider
         self._use_builtin_ocr = use_builtin_ocr
+        self._crop_encoding = crop_encoding
+        self._text_source = text_source
+        self._repeated_regions = repeated_regions
+
+    def set_text_source(self, text_source: RegionTextSource | None) -> None:
+        """Replace the region text source.
+
+        Args:
+            text_source: Source tried before OCR, or None to always OCR.
+        """
+        self._text_source = text_source
 
     def extract_page(
         self,
@@ -78,6 +125,33 @@ class OcrPipeline:
             OmniDocBench-compatible dict with layout_dets, page_attribute, extra.
         """
         regions = self._layout_detector.detect_layout(image_path)
+        return self._build_page(image_path, regions)
+
+    def extract_pages(self, image_paths: Sequence[Path]) -> list[dict[str, Any]]:
+        """Run the 2-stage pipeline on several pages with batched layout detection.
+
+        Args:
+            image_paths: Paths to the page image files.
+
+        Returns:
+            OmniDocBench-compatible dicts, one per page in input order.
+        """
+        batch_regions = self._layout_detector.detect_layout_batch(image_paths)
+        return [
+            self._build_page(image_path, regions)
+            for image_path, regions in zip(image_paths, batch_regions, strict=True)
+        ]
+
+    def _build_page(self, image_path: Path, regions: list[LayoutRegion]) -> dict[str, Any]:
+        """Extract region text and assemble the page result.
+
+        Args:
+            image_path: Path to the page image file.
+            regions: Layout regions detected on the page.
+
+        Returns:
+            OmniDocBench-compatible dict with layout_dets, page_attribute, extra.
+        """
         logger.info('Detected %d layout regions in %s', len(regions), image_path.name)
 
         if not regions:
@@ -87,15 +161,56 @@ class OcrPipeline:
                 'extra': {'relation': []},
             }
 
-        image = Image.open(image_path)
+        # Decoded lazily so builtin-OCR and figure-only pages never touch the bitmap
+        page: np.ndarray | None = None
 
         layout_dets = []
+        from_source = 0
+        reused = 0
+        spliced = 0
         for i, region in enumerate(regions):
-            text = self._extract_region_text(image, region)
+            text = self._source_text(image_path, region)
+            if text:
+                from_source += 1
+            elif self._needs_crop(region):
+                if page is None:
+                    page = load_page_array(image_path)
+                key = (
+                    self._repeated_regions.key(page, region.category, region.bbox)
+                    if self._repeated_regions is not None
+                    else None
+                )
+                cached = self._repeated_regions.get(key) if key is not None else None
+                if cached is not None:
+                    text = cached
+                    reused += 1
+                elif key is not None and (span_text := self._changed_span_text(page, region, key)):
+                    text = span_text
+                    spliced += 1
+                else:
+                    text = self._extract_region_text(page, region)
+                    if key is not None:
+                        self._repeated_regions.put(key, text)
+            else:
+                text = self._extract_region_text(page, region)
             det = _build_layout_det(region, text, order=i)
             layout_dets.append(det)
 
-        image.close()
+        if self._text_source is not None:
+            logger.info(
+                '%d of %d regions in %s took text from the text source',
+                from_source,
+                len(regions),
+                image_path.name,
+            )
+        if reused:
+            logger.info('Reused text of %d repeated regions in %s', reused, image_path.name)
+        if spliced:
+            logger.info(
+                "OCR'd only the changed digits of %d repeated regions in %s",
+                spliced,
+                image_path.name,
+            )
 
         return {
             'layout_dets': layout_dets,
@@ -103,15 +218,67 @@ class OcrPipeline:
             'extra': {'relation': []},
         }
 
+    def _source_text(self, image_path: Path, region: LayoutRegion) -> str:
+        """Look up a region's text in the text source.
+
+        Args:
+            image_path: Path to the page image file.
+            region: Layout region with bounding box and category.
+
+        Returns:
+            Region text, or empty string if the region must be OCR'd.
+        """
+        if self._text_source is None or region.category in _OCR_ONLY_CATEGORIES:
+            return ''
+        return self._text_source.region_text(image_path, region.bbox)
+
+    def _needs_crop(self, region: LayoutRegion) -> bool:
+        """Check whether a region's text comes from a cropped image.
+
+        Args:
+            region: Layout region with bounding box and category.
+
+        Returns:
+            True if the region is sent to the text OCR provider.
+        """
+        if self._use_builtin_ocr or self._text_provider is None:
+            return False
+        # Skip non-text regions (figures)
+        return region.category != 'figure'
+
+    def _changed_span_text(
+        self,
+        page: np.ndarray,
+        region: LayoutRegion,
+        key: RegionKey,
+    ) -> str:
+        """OCR only the changed digits of a repeated region.
+
+        Args:
+            page: Decoded page bitmap.
+            region: Layout region with bounding box and category.
+            key: Cache key of the region, which missed the cache.
+
+        Returns:
+            Cached text with the OCR'd digits spliced in, or empty string if
+            the region has to be OCR'd whole.
+        """
+        span = self._repeated_regions.changed_span(key)
+        if span is None:
+            return ''
+        cropped_bytes = _crop_region(page, span.bbox, self._crop_encoding, category=region.category)
+        digits = self._text_provider.extract_text(cropped_bytes, region.category)
+        return span.splice(digits) if digits.strip() else ''
+
     def _extract_region_text(
         self,
-        image: Image.Image,
+        image: Image.Image | np.ndarray | None,
         region: LayoutRegion,
     ) -> str:
         """Extract text from a single layout region.
 
         Args:
-            image: Full page PIL Image.
+            image: Full page bitmap, or None if the region needs no crop.
             region: Layout region with bounding box and category.
 
         Returns:
@@ -120,45 +287,52 @@ class OcrPipeline:
         if self._use_builtin_ocr:
             return region.text or ''
 
-        if self._text_provider is None:
+        if image is None or not self._needs_crop(region):
             return ''
 
-        # Skip non-text regions (figures)
-        if region.category == 'figure':
-            return ''
-
-        cropped_bytes = _crop_region(image, region.bbox)
+        cropped_bytes = _crop_region(
+            image, region.bbox, self._crop_encoding, category=region.category
+        )
         return self._text_provider.extract_text(cropped_bytes, region.category)
 
 
 def _crop_region(
-    image: Image.Image,
+    image: Image.Image | np.ndarray,
     bbox: tuple[float, float, float, float],
+    encoding: ImageEncoding = DEFAULT_ENCODING,
+    *,
+    category: str = '',
 ) -> bytes:
-    """Crop a region from an image and return as PNG bytes.
+    """Crop a region from an image and return it as encoded bytes.
 
     Args:
-        image: Full page PIL Image.
+        image: Full page PIL Image or decoded page bitmap.
         bbox: Bounding box as (x1, y1, x2, y2) in pixels.
+        encoding: Output encoding (PNG by default).
+        category: OmniDocBench category of the region.
 
     Returns:
-        Cropped image as PNG bytes, empty bytes if region has zero area.
+        Cropped image bytes, empty bytes if region has zero area.
     """
-    x1, y1, x2, y2 = bbox
-    # Clamp to image bounds
-    x1 = max(0, min(x1, image.width))
-    y1 = max(0, min(y1, image.height))
-    x2 = max(0, min(x2, image.width))
-    y2 = max(0, min(y2, image.height))
-
-    ix1, iy1, ix2, iy2 = int(x1), int(y1), int(x2), int(y2)
-    if ix2 <= ix1 or iy2 <= iy1:
+    page = image if isinstance(image, np.ndarray) else _pil_to_array(image)
+    region = crop_view(page, bbox)
+    if region is None:
         return b''
+    return encode_image(region, encoding, category=category)
+
+
+def _pil_to_array(image: Image.Image) -> np.ndarray:
+    """Convert a PIL Image into an array suitable for cropping.
 
-    cropped = image.crop((ix1, iy1, ix2, iy2))
-    buf = io.BytesIO()
-    cropped.save(buf, format='PNG')
-    return buf.getvalue()
+    Args:
+        image: PIL Image in any mode.
+
+    Returns:
+        uint8 array of the image pixels.
+    """
+    if image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGB')
+    return np.asarray(image)
 
 
 def _build_layout_det(
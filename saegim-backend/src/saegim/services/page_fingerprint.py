@@ -0,0 +1,179 @@
+"""Page image fingerprints for blank and duplicate page detection.
+
+Scanned books contain blank separator pages and reports repeat the same
+boilerplate pages.  A cheap pass over the rendered page images finds both
+before extraction:
+
+- blank pages have (almost) no pixels darker than the paper,
+- duplicates share a 64-bit perceptual hash (DCT of a 32x32 thumbnail)
+  within a small Hamming distance and are then confirmed pixel by pixel,
+  since pages with the same layout but different text can hash alike.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Pixels this much darker than the paper (median brightness) count as ink
+_INK_CONTRAST = 64
+
+# Pages with less ink than this are blank (scanner noise, punch holes)
+_BLANK_INK_RATIO = 0.002
+
+# Side of the thumbnail the perceptual hash is computed from
+_HASH_SIZE = 32
+
+# Low-frequency DCT block kept for the hash (8x8 = 64 bits)
+_HASH_BITS_SIDE = 8
+
+# Maximum Hamming distance between hashes of duplicate candidates
+NEAR_DUPLICATE_DISTANCE = 4
+
+# Width of the grayscale thumbnails compared to confirm a duplicate
+_VERIFY_WIDTH = 256
+
+# A thumbnail pixel differs if its brightness changes by more than this
+_VERIFY_PIXEL_DIFF = 48
+
+# Duplicates may differ in at most this fraction of thumbnail pixels
+_VERIFY_MAX_DIFF_RATIO = 0.001
+
+_INT64_MASK = (1 << 64) - 1
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Build an orthonormal DCT-II matrix.
+
+    Args:
+        size: Matrix side.
+
+    Returns:
+        (size, size) float array.
+    """
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(_HASH_SIZE)
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+    """Fingerprint of a rendered page image.
+
+    Attributes:
+        phash: 64-bit perceptual hash as a signed integer (fits BIGINT).
+        ink_ratio: Fraction of pixels noticeably darker than the paper.
+    """
+
+    phash: int
+    ink_ratio: float
+
+    @property
+    def blank(self) -> bool:
+        """Whether the page has no content worth extracting."""
+        return self.ink_ratio < _BLANK_INK_RATIO
+
+
+def _grayscale(image: Image.Image, width: int) -> np.ndarray:
+    """Downscale an image to a grayscale array of the given width.
+
+    Args:
+        image: PIL Image of the page.
+        width: Target width in pixels (height keeps the aspect ratio).
+
+    Returns:
+        (height, width) uint8 array.
+    """
+    height = max(1, round(image.height * width / max(image.width, 1)))
+    return np.asarray(image.convert('L').resize((width, height), Image.Resampling.BILINEAR))
+
+
+def compute_fingerprint(image: Image.Image) -> PageFingerprint:
+    """Compute the fingerprint of a page image.
+
+    Args:
+        image: PIL Image of the page.
+
+    Returns:
+        PageFingerprint of the page.
+    """
+    pixels = _grayscale(image, _VERIFY_WIDTH).astype(np.int16)
+    paper = np.median(pixels)
+    ink_ratio = float(np.count_nonzero(pixels < paper - _INK_CONTRAST)) / pixels.size
+
+    thumb = np.asarray(
+        image.convert('L').resize((_HASH_SIZE, _HASH_SIZE), Image.Resampling.BILINEAR),
+        dtype=np.float64,
+    )
+    coeffs = (_DCT @ thumb @ _DCT.T)[:_HASH_BITS_SIDE, :_HASH_BITS_SIDE].flatten()
+    bits = coeffs > np.median(coeffs)
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return PageFingerprint(phash=_to_signed(value), ink_ratio=ink_ratio)
+
+
+def fingerprint_file(image_path: Path) -> PageFingerprint:
+    """Compute the fingerprint of a page image file.
+
+    Args:
+        image_path: Path to the page image.
+
+    Returns:
+        PageFingerprint of the page.
+    """
+    with Image.open(image_path) as image:
+        return compute_fingerprint(image)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count differing bits between two 64-bit hashes.
+
+    Args:
+        a: First hash (signed or unsigned).
+        b: Second hash (signed or unsigned).
+
+    Returns:
+        Number of differing bits.
+    """
+    return ((a ^ b) & _INT64_MASK).bit_count()
+
+
+def same_page(path_a: Path, path_b: Path) -> bool:
+    """Confirm that two page images show the same content.
+
+    Args:
+        path_a: First page image.
+        path_b: Second page image.
+
+    Returns:
+        True if the images differ in at most a tiny fraction of pixels.
+    """
+    with Image.open(path_a) as image_a, Image.open(path_b) as image_b:
+        if abs(image_a.width / image_a.height - image_b.width / image_b.height) > 0.01:
+            return False
+        pixels_a = _grayscale(image_a, _VERIFY_WIDTH).astype(np.int16)
+        pixels_b = _grayscale(image_b, _VERIFY_WIDTH).astype(np.int16)
+
+    if pixels_a.shape != pixels_b.shape:
+        return False
+    differing = np.count_nonzero(np.abs(pixels_a - pixels_b) > _VERIFY_PIXEL_DIFF)
+    return differing / pixels_a.size <= _VERIFY_MAX_DIFF_RATIO
+
+
+def _to_signed(value: int) -> int:
+    """Reinterpret an unsigned 64-bit value as signed (for BIGINT storage).
+
+    Args:
+        value: Unsigned value below 2**64.
+
+    Returns:
+        Signed 64-bit integer.
+    """
+    return value - (1 << 64) if value >= (1 << 63) else value
@@ -0,0 +1,222 @@
+"""Decode-once cache for rendered page images.
+
+Page images are 2x-scale PNG renders that are cropped many times: once per
+layout region in the split pipeline and once per user-drawn region in the
+labeling UI.  Decoding the full PNG each time dominates the cost of a crop,
+so decoded RGB bitmaps are kept in a bounded LRU cache as read-only NumPy
+arrays.  Crops are then plain array slices (views) that share memory with
+the cached page.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Roughly 40 pages of A4 rendered at 2x (1190 x 1684 x 3 bytes each)
+_DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_CacheKey = tuple[str, int, int]
+
+
+class PageImageCache:
+    """Thread-safe LRU cache of decoded page bitmaps.
+
+    Entries are keyed by resolved path, modification time and file size, so
+    a page image that is re-rendered on disk is decoded again instead of
+    being served stale.
+
+    Args:
+        max_bytes: Upper bound on the total size of cached bitmaps.
+    """
+
+    def __init__(self, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Upper bound on the total size of cached bitmaps.
+                Zero or negative disables caching.
+        """
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[_CacheKey, np.ndarray] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        """Upper bound on the total size of cached bitmaps.
+
+        Returns:
+            Byte budget of the cache.
+        """
+        return self._max_bytes
+
+    @property
+    def current_bytes(self) -> int:
+        """Total size of the bitmaps currently held.
+
+        Returns:
+            Number of bytes in use.
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        """Return the number of cached bitmaps."""
+        return len(self._entries)
+
+    def get(self, image_path: Path) -> np.ndarray:
+        """Return the decoded RGB bitmap of a page image.
+
+        Args:
+            image_path: Path to the page image file.
+
+        Returns:
+            Read-only ``(height, width, 3)`` uint8 array.
+
+        Raises:
+            OSError: If the file is missing or cannot be decoded.
+        """
+        resolved = image_path.resolve()
+        stat = resolved.stat()
+        key = (str(resolved), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+
+        # Decode outside the lock so concurrent pages do not serialize.
+        page = _decode_rgb(resolved)
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            if page.nbytes <= self._max_bytes:
+                self._entries[key] = page
+                self._size += page.nbytes
+                self._evict()
+        return page
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the byte budget, evicting entries if needed.
+
+        Args:
+            max_bytes: New upper bound on the total size of cached bitmaps.
+        """
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop all cached bitmaps."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until within budget.
+
+        Must be called with the lock held.
+        """
+        while self._entries and self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.nbytes
+
+
+def _decode_rgb(image_path: Path) -> np.ndarray:
+    """Decode an image file into a read-only RGB array.
+
+    Args:
+        image_path: Path to the image file.
+
+    Returns:
+        Read-only ``(height, width, 3)`` uint8 array.
+    """
+    with Image.open(image_path) as image:
+        rgb = image if image.mode == 'RGB' else image.convert('RGB')
+        page = np.asarray(rgb, dtype=np.uint8).copy()
+    page.flags.writeable = False
+    return page
+
+
+_cache = PageImageCache()
+
+
+def get_page_cache() -> PageImageCache:
+    """Get the process-wide page image cache.
+
+    Returns:
+        Shared PageImageCache instance.
+    """
+    return _cache
+
+
+def load_page_array(image_path: Path) -> np.ndarray:
+    """Load a decoded page bitmap through the process-wide cache.
+
+    Args:
+        image_path: Path to the page image file.
+
+    Returns:
+        Read-only ``(height, width, 3)`` uint8 array.
+
+    Raises:
+        OSError: If the file is missing or cannot be decoded.
+    """
+    return _cache.get(image_path)
+
+
+def clamp_bbox(
+    bbox: tuple[float, float, float, float],
+    width: int,
+    height: int,
+) -> tuple[int, int, int, int] | None:
+    """Clamp a bounding box to image bounds and round to integer pixels.
+
+    Args:
+        bbox: Bounding box as (x1, y1, x2, y2) in pixels.
+        width: Image width in pixels.
+        height: Image height in pixels.
+
+    Returns:
+        Integer (x1, y1, x2, y2) box, or None if the region has zero area.
+    """
+    x1, y1, x2, y2 = bbox
+    x1 = max(0, min(x1, width))
+    y1 = max(0, min(y1, height))
+    x2 = max(0, min(x2, width))
+    y2 = max(0, min(y2, height))
+
+    ix1, iy1, ix2, iy2 = int(x1), int(y1), int(x2), int(y2)
+    if ix2 <= ix1 or iy2 <= iy1:
+        return None
+    return (ix1, iy1, ix2, iy2)
+
+
+def crop_view(
+    page: np.ndarray,
+    bbox: tuple[float, float, float, float],
+) -> np.ndarray | None:
+    """Crop a region from a page bitmap without copying pixel data.
+
+    Args:
+        page: Page bitmap as a ``(height, width, channels)`` array.
+        bbox: Bounding box as (x1, y1, x2, y2) in pixels.
+
+    Returns:
+        Array view of the region, or None if the region has zero area.
+    """
+    height, width = page.shape[:2]
+    box = clamp_bbox(bbox, width, height)
+    if box is None:
+        return None
+    ix1, iy1, ix2, iy2 = box
+    return page[iy1:iy2, ix1:ix2]
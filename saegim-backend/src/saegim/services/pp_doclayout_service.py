@@ -9,11 +9,20 @@ Model: PaddlePaddle/PP-DocLayoutV3_safetensors (HuggingFace transformers).
 
 import importlib
 import logging
+from collections.abc import Sequence
+from contextlib import AbstractContextManager
 from pathlib import Path
 from typing import Any
 
 from PIL import Image
 
+from saegim.services.inference_options import (
+    DEFAULT_INFERENCE_OPTIONS,
+    InferenceOptions,
+    apply_thread_settings,
+    inference_slot,
+    resolve_device,
+)
 from saegim.services.layout_types import LayoutRegion
 
 logger = logging.getLogger(__name__)
@@ -74,6 +83,34 @@ def parse_detections_to_regions(
     return regions
 
 
+def result_to_detections(
+    result: dict[str, Any],
+    id2label: dict[int, str],
+) -> list[dict[str, Any]]:
+    """Convert one post-processed detection result into plain detection dicts.
+
+    Args:
+        result: Post-processor output with 'scores', 'labels', 'boxes' tensors.
+        id2label: Mapping from class index to PP-DocLayoutV3 label.
+
+    Returns:
+        List of detection dicts with 'label', 'score', 'box' keys.
+    """
+    return [
+        {
+            'label': id2label[label_id.item()],
+            'score': score.item(),
+            'box': box.tolist(),
+        }
+        for score, label_id, box in zip(
+            result['scores'],
+            result['labels'],
+            result['boxes'],
+            strict=True,
+        )
+    ]
+
+
 class PPDocLayoutV3Detector:
     """PP-DocLayoutV3 based document layout detector.
 
@@ -87,14 +124,26 @@ class PPDocLayoutV3Detector:
         model_name: str = _DEFAULT_MODEL,
         *,
         threshold: float = _DEFAULT_THRESHOLD,
+        batch_size: int = 1,
+        options: InferenceOptions = DEFAULT_INFERENCE_OPTIONS,
     ) -> None:
         """Initialize PPDocLayoutV3Detector with the specified model.
 
         Args:
             model_name: HuggingFace model identifier.
             threshold: Detection confidence threshold (0-1).
+            batch_size: Maximum number of pages per forward pass.
+            options: Device, thread and concurrency settings.
+
+        Raises:
+            ValueError: If batch_size is less than 1.
         """
+        if batch_size < 1:
+            msg = f'batch_size must be at least 1, got {batch_size}'
+            raise ValueError(msg)
         self.model_name = model_name
+        self.batch_size = batch_size
+        self._options = options
         self._threshold = threshold
         self._processor: Any = None
         self._model: Any = None
@@ -110,9 +159,35 @@ class PPDocLayoutV3Detector:
             List of detected LayoutRegion instances.
         """
         self._ensure_model_loaded()
-        detections = self._run_inference(image_path)
+        with self._inference_slot():
+            detections = self._run_inference(image_path)
         return parse_detections_to_regions(detections)
 
+    def detect_layout_batch(self, image_paths: Sequence[Path]) -> list[list[LayoutRegion]]:
+        """Detect layout regions from several page images.
+
+        The processor resizes every page to the model's fixed input size, so
+        ``batch_size`` pages are stacked into a single forward pass.
+
+        Args:
+            image_paths: Paths to the page image files.
+
+        Returns:
+            Detected LayoutRegion lists, one per image in input order.
+        """
+        if not image_paths:
+            return []
+
+        self._ensure_model_loaded()
+
+        results: list[list[LayoutRegion]] = []
+        for start in range(0, len(image_paths), self.batch_size):
+            images = [Image.open(path) for path in image_paths[start : start + self.batch_size]]
+            with self._inference_slot():
+                batch = self._run_batch_inference(images)
+            results.extend(parse_detections_to_regions(detections) for detections in batch)
+        return results
+
     def test_connection(self) -> tuple[bool, str]:
         """Test that torch and transformers are available.
 
@@ -125,9 +200,18 @@ class PPDocLayoutV3Detector:
         except (ImportError, ModuleNotFoundError):
             return (False, 'torch and transformers are required for PPDocLayoutV3Detector')
 
-        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        device = resolve_device(torch, self._options.device)
         return (True, f'PPDocLayoutV3Detector available (device: {device})')
 
+    def _inference_slot(self) -> AbstractContextManager[None]:
+        """Acquire a per-process inference slot for this model.
+
+        Returns:
+            Context manager holding the slot.
+        """
+        key = f'{type(self).__name__}:{self.model_name}'
+        return inference_slot(key, self._options.max_concurrency)
+
     def _ensure_model_loaded(self) -> None:
         """Lazy-load the model and processor on first use.
 
@@ -141,7 +225,8 @@ class PPDocLayoutV3Detector:
             import torch
             from transformers import AutoImageProcessor, AutoModelForObjectDetection
 
-            self._device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            self._device = resolve_device(torch, self._options.device)
+            apply_thread_settings(torch, self._options)
             logger.info(
                 'Loading PPDocLayoutV3 model %s on %s (CUDA available: %s)',
                 self.model_name,
@@ -155,7 +240,7 @@ class PPDocLayoutV3Detector:
             )
             self._model = AutoModelForObjectDetection.from_pretrained(
                 self.model_name,
-                torch_dtype=torch.bfloat16 if self._device == 'cuda' else torch.float32,
+                torch_dtype=torch.bfloat16 if self._device.startswith('cuda') else torch.float32,
                 trust_remote_code=True,
             ).to(self._device)
 
@@ -177,35 +262,30 @@ class PPDocLayoutV3Detector:
         Returns:
             List of detection dicts with 'label', 'score', 'box' keys.
         """
+        return self._run_batch_inference([Image.open(image_path)])[0]
+
+    def _run_batch_inference(self, images: list[Image.Image]) -> list[list[dict[str, Any]]]:
+        """Run one forward pass over a batch of page images.
+
+        Args:
+            images: PIL Images of the pages.
+
+        Returns:
+            Detection dict lists (with 'label', 'score', 'box' keys), one per image.
+        """
         import torch
 
-        image = Image.open(image_path)
-        inputs = self._processor(images=image, return_tensors='pt').to(self._device)
+        inputs = self._processor(images=images, return_tensors='pt').to(self._device)
 
         with torch.no_grad():
             outputs = self._model(**inputs)
 
-        target_sizes = torch.tensor([image.size[::-1]], device=self._device)
+        target_sizes = torch.tensor([image.size[::-1] for image in images], device=self._device)
         results = self._processor.post_process_object_detection(
             outputs,
             threshold=self._threshold,
             target_sizes=target_sizes,
-        )[0]
-
-        detections: list[dict[str, Any]] = []
-        for score, label_id, box in zip(
-            results['scores'],
-            results['labels'],
-            results['boxes'],
-            strict=True,
-        ):
-            label = self._model.config.id2label[label_id.item()]
-            detections.append(
-                {
-                    'label': label,
-                    'score': score.item(),
-                    'box': box.tolist(),
-                }
-            )
+        )
 
-        return detections
+        id2label = self._model.config.id2label
+        return [result_to_detections(result, id2label) for result in results]
@@ -0,0 +1,153 @@
+"""Client for the shared local layout server.
+
+Each uvicorn worker that runs split-pipeline extraction would otherwise load
+its own copy of the layout model.  RemoteLayoutDetector implements the
+LayoutDetector protocol by forwarding page image paths to one layout server
+process per node (see ``saegim.services.layout_server``), which owns the
+models and batches concurrent requests.
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+import httpx
+
+from saegim.schemas.layout import DetectLayoutRequest, DetectLayoutResponse, LayoutServerHealth
+from saegim.services.layout_types import LayoutRegion
+
+logger = logging.getLogger(__name__)
+
+_UNIX_PREFIX = 'unix://'
+
+# Base URL used for requests over a Unix domain socket (host is ignored)
+_UDS_BASE_URL = 'http://layout-server'
+
+# Generation-based detectors can take minutes on dense pages
+_REQUEST_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+def _client_args(server_url: str) -> tuple[str, httpx.HTTPTransport | None]:
+    """Resolve the base URL and transport for a server URL.
+
+    Args:
+        server_url: ``http://host:port`` or ``unix:///path/to.sock``.
+
+    Returns:
+        Tuple of (base_url, transport). Transport is None for plain HTTP.
+    """
+    if server_url.startswith(_UNIX_PREFIX):
+        socket_path = server_url.removeprefix(_UNIX_PREFIX)
+        return _UDS_BASE_URL, httpx.HTTPTransport(uds=socket_path)
+    return server_url.rstrip('/'), None
+
+
+class RemoteLayoutDetector:
+    """Layout detector backed by the shared local layout server.
+
+    Implements the LayoutDetector protocol. Page images are passed by path,
+    so the server must run on the same node (same filesystem) as the worker.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        *,
+        provider: str = 'docling',
+        model_name: str | None = None,
+    ) -> None:
+        """Initialize the remote detector.
+
+        Args:
+            server_url: ``http://host:port`` or ``unix:///path/to.sock``.
+            provider: Layout provider the server should use.
+            model_name: HuggingFace model for Docling. None = provider default.
+        """
+        self.server_url = server_url
+        self.provider = provider
+        self.model_name = model_name
+
+    def detect_layout(self, image_path: Path) -> list[LayoutRegion]:
+        """Detect layout regions from a page image.
+
+        Args:
+            image_path: Path to the page image file.
+
+        Returns:
+            List of detected LayoutRegion instances.
+
+        Raises:
+            RuntimeError: If the layout server request fails.
+        """
+        return self.detect_layout_batch([image_path])[0]
+
+    def detect_layout_batch(self, image_paths: Sequence[Path]) -> list[list[LayoutRegion]]:
+        """Detect layout regions from several page images in one request.
+
+        Args:
+            image_paths: Paths to the page image files.
+
+        Returns:
+            Detected LayoutRegion lists, one per image in input order.
+
+        Raises:
+            RuntimeError: If the layout server request fails.
+        """
+        if not image_paths:
+            return []
+
+        request = DetectLayoutRequest(
+            provider=self.provider,
+            model_name=self.model_name,
+            image_paths=[str(Path(path).resolve()) for path in image_paths],
+        )
+        try:
+            with self._client() as client:
+                response = client.post('/detect', json=request.model_dump())
+                response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            msg = f'Layout server error {exc.response.status_code}: {exc.response.text}'
+            raise RuntimeError(msg) from exc
+        except httpx.RequestError as exc:
+            msg = f'Layout server request failed ({self.server_url}): {exc}'
+            raise RuntimeError(msg) from exc
+
+        body = DetectLayoutResponse.model_validate(response.json())
+        return [
+            [
+                LayoutRegion(
+                    bbox=region.bbox,
+                    category=region.category,
+                    score=region.score,
+                    text=region.text,
+                )
+                for region in regions
+            ]
+            for regions in body.results
+        ]
+
+    def test_connection(self) -> tuple[bool, str]:
+        """Check that the layout server is reachable.
+
+        Returns:
+            Tuple of (success, message).
+        """
+        try:
+            with self._client() as client:
+                response = client.get('/health', timeout=5.0)
+                response.raise_for_status()
+        except httpx.HTTPError as exc:
+            return (False, f'Layout server unreachable at {self.server_url}: {exc}')
+
+        health = LayoutServerHealth.model_validate(response.json())
+        loaded = ', '.join(health.detectors) or 'no models loaded yet'
+        return (True, f'Layout server at {self.server_url} ({self.provider}; {loaded})')
+
+    def _client(self) -> httpx.Client:
+        """Create an HTTP client for the layout server.
+
+        Returns:
+            httpx.Client bound to the server's base URL.
+        """
+        base_url, transport = _client_args(self.server_url)
+        return httpx.Client(base_url=base_url, transport=transport, timeout=_REQUEST_TIMEOUT)
@@ -0,0 +1,405 @@
+"""Document-level cache of recurring header and footer regions.
+
+Running headers and footers repeat on nearly every page of a document, and
+the split pipeline would otherwise OCR them again on every page.  The cache
+clusters margin regions by category, position and ink pattern; a region
+that matches an already recognized one reuses its text.
+
+A match needs:
+
+- the same category and a box at (nearly) the same position,
+- the same ink mask after trimming to the ink and allowing one pixel of
+  jitter.
+
+A single-line region that misses only because a number in it changed
+(``Chapter 3`` on one page, ``Chapter 4`` on the next) is diffed word by
+word against the cached template. The words whose ink matches on both ends
+keep their cached text, and only the span of changed words is cropped and
+OCR'd; see ``RepeatedRegionCache.changed_span``. The changed words of the
+template must contain a digit, so a header whose title changed is OCR'd
+whole.
+
+Page number regions are never cached, since their digits change on every
+page.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Regions entirely inside this fraction of the page height, at the top or
+# bottom, are treated as running headers / footers
+_MARGIN_BAND = 0.12
+
+# Categories that are headers or footers wherever they are on the page
+_MARGIN_CATEGORIES = frozenset({'header', 'footer'})
+
+# Categories never reused (their content changes from page to page)
+_UNCACHED_CATEGORIES = frozenset({'page_number', 'figure', 'table', 'equation_isolated'})
+
+# Box corners may move this fraction of the page size between pages
+_POSITION_TOLERANCE = 0.01
+
+# Pixels this much darker than the crop's background count as ink
+_INK_CONTRAST = 64
+
+# Trimmed ink masks may differ in size by this fraction
+_SIZE_TOLERANCE = 0.03
+
+# Ink pixels outside the other mask (dilated by 1px), relative to ink count
+_MAX_INK_DIFF_RATIO = 0.005
+
+# Recurring regions remembered per document
+_MAX_ENTRIES = 64
+
+# Column gaps wider than this fraction of the line height separate words
+_WORD_GAP = 0.25
+
+# At most this many words may differ from the template for a partial OCR
+_MAX_CHANGED_WORDS = 2
+
+_BBox = tuple[float, float, float, float]
+
+
+@dataclass(frozen=True, eq=False)
+class RegionKey:
+    """Identity of a margin region on one page.
+
+    Attributes:
+        category: OmniDocBench category of the region.
+        bbox: Region box normalized to the page size (0..1).
+        ink: Trimmed boolean ink mask of the crop.
+        origin: Page pixel (x, y) of the top-left corner of ``ink``.
+    """
+
+    category: str
+    bbox: _BBox
+    ink: np.ndarray = field(repr=False)
+    origin: tuple[int, int] = (0, 0)
+
+
+@dataclass(frozen=True)
+class ChangedSpan:
+    """Part of a region that differs from a cached template.
+
+    Attributes:
+        bbox: Page pixel box (x0, y0, x1, y1) of the changed words.
+        prefix: Cached text before the changed words.
+        suffix: Cached text after the changed words.
+    """
+
+    bbox: _BBox
+    prefix: str
+    suffix: str
+
+    def splice(self, text: str) -> str:
+        """Insert the OCR text of the changed words into the cached text.
+
+        Args:
+            text: OCR text of the span crop.
+
+        Returns:
+            Text of the whole region.
+        """
+        return f'{self.prefix}{text.strip()}{self.suffix}'
+
+
+def is_margin_region(category: str, bbox: _BBox, page_height: int) -> bool:
+    """Check whether a region is a running header or footer candidate.
+
+    Args:
+        category: OmniDocBench category of the region.
+        bbox: Region box (x0, y0, x1, y1) in image pixels.
+        page_height: Page image height in pixels.
+
+    Returns:
+        True if the region may recur across pages.
+    """
+    if category in _UNCACHED_CATEGORIES:
+        return False
+    if category in _MARGIN_CATEGORIES:
+        return True
+    _, y0, _, y1 = bbox
+    band = page_height * _MARGIN_BAND
+    return y1 <= band or y0 >= page_height - band
+
+
+def ink_mask(crop: np.ndarray) -> np.ndarray | None:
+    """Binarize a region crop and trim it to its ink.
+
+    Args:
+        crop: Region pixels, (h, w) grayscale or (h, w, c) color.
+
+    Returns:
+        Boolean ink mask trimmed to the ink bounding box, or None if the
+        crop has no ink.
+    """
+    located = _locate_ink(crop)
+    return located[0] if located is not None else None
+
+
+def _locate_ink(crop: np.ndarray) -> tuple[np.ndarray, tuple[int, int]] | None:
+    """Binarize a region crop and find its ink.
+
+    Args:
+        crop: Region pixels, (h, w) grayscale or (h, w, c) color.
+
+    Returns:
+        Trimmed ink mask and its (x, y) offset in the crop, or None if the
+        crop has no ink.
+    """
+    gray = crop.mean(axis=2) if crop.ndim == 3 else crop.astype(np.float64)
+    if gray.size == 0:
+        return None
+    return _trim(gray < np.median(gray) - _INK_CONTRAST)
+
+
+def _trim(mask: np.ndarray) -> tuple[np.ndarray, tuple[int, int]] | None:
+    """Trim a boolean mask to the bounding box of its set pixels.
+
+    Args:
+        mask: Boolean mask.
+
+    Returns:
+        Trimmed mask and its (x, y) offset, or None if no pixel is set.
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0:
+        return None
+    trimmed = mask[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+    return trimmed, (int(cols[0]), int(rows[0]))
+
+
+def _word_spans(mask: np.ndarray) -> list[tuple[int, int]]:
+    """Split a single-line ink mask into words at wide column gaps.
+
+    Args:
+        mask: Trimmed boolean ink mask of one text line.
+
+    Returns:
+        (start, end) column ranges of the words, left to right.
+    """
+    cols = np.flatnonzero(mask.any(axis=0))
+    gap = max(2, round(mask.shape[0] * _WORD_GAP))
+    breaks = np.flatnonzero(np.diff(cols) > gap)
+    starts = [int(cols[0]), *(int(cols[i + 1]) for i in breaks)]
+    ends = [*(int(cols[i]) + 1 for i in breaks), int(cols[-1]) + 1]
+    return list(zip(starts, ends, strict=True))
+
+
+def _word_ink(mask: np.ndarray, span: tuple[int, int]) -> np.ndarray:
+    """Cut one word out of a line mask, trimmed to its ink.
+
+    Args:
+        mask: Trimmed boolean ink mask of the line.
+        span: (start, end) column range of the word.
+
+    Returns:
+        Trimmed ink mask of the word.
+    """
+    located = _trim(mask[:, span[0] : span[1]])
+    # A word span always contains ink, see _word_spans
+    return located[0] if located is not None else mask[:, span[0] : span[1]]
+
+
+def _dilate(mask: np.ndarray) -> np.ndarray:
+    """Grow a boolean mask by one pixel in each direction.
+
+    Args:
+        mask: Boolean mask.
+
+    Returns:
+        Dilated mask of the same shape.
+    """
+    padded = np.pad(mask, 1)
+    height, width = mask.shape
+    grown = np.zeros_like(mask)
+    for dy in range(3):
+        for dx in range(3):
+            grown |= padded[dy : dy + height, dx : dx + width]
+    return grown
+
+
+def _resize_mask(mask: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    """Resize a boolean mask with nearest-neighbour sampling.
+
+    Args:
+        mask: Boolean mask.
+        shape: Target (height, width).
+
+    Returns:
+        Resized mask.
+    """
+    if mask.shape == shape:
+        return mask
+    rows = (np.arange(shape[0]) * mask.shape[0] // shape[0]).clip(0, mask.shape[0] - 1)
+    cols = (np.arange(shape[1]) * mask.shape[1] // shape[1]).clip(0, mask.shape[1] - 1)
+    return mask[np.ix_(rows, cols)]
+
+
+def same_ink(a: np.ndarray, b: np.ndarray) -> bool:
+    """Compare two trimmed ink masks, tolerating one pixel of jitter.
+
+    Args:
+        a: First trimmed ink mask.
+        b: Second trimmed ink mask.
+
+    Returns:
+        True if the masks show the same glyphs.
+    """
+    for side_a, side_b in zip(a.shape, b.shape, strict=True):
+        if abs(side_a - side_b) > max(2, side_a * _SIZE_TOLERANCE):
+            return False
+    b = _resize_mask(b, a.shape)
+
+    ink = max(int(np.count_nonzero(a)), int(np.count_nonzero(b)))
+    extra_b = np.count_nonzero(b & ~_dilate(a))
+    extra_a = np.count_nonzero(a & ~_dilate(b))
+    return max(extra_a, extra_b) <= ink * _MAX_INK_DIFF_RATIO
+
+
+class RepeatedRegionCache:
+    """Text of recurring margin regions within one document.
+
+    Not thread-safe; each extraction task builds its own engine and pipeline.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: list[tuple[RegionKey, str]] = []
+        self.hits = 0
+        self.partial_hits = 0
+
+    def __len__(self) -> int:
+        """Return the number of remembered regions."""
+        return len(self._entries)
+
+    def key(self, page: np.ndarray, category: str, bbox: _BBox) -> RegionKey | None:
+        """Build the cache key of a region.
+
+        Args:
+            page: Decoded page bitmap.
+            category: OmniDocBench category of the region.
+            bbox: Region box (x0, y0, x1, y1) in image pixels.
+
+        Returns:
+            RegionKey, or None if the region is not a cacheable margin region.
+        """
+        height, width = page.shape[:2]
+        if not is_margin_region(category, bbox, height):
+            return None
+
+        x0, y0, x1, y1 = (max(0, int(v)) for v in bbox)
+        located = _locate_ink(page[y0:y1, x0:x1])
+        if located is None:
+            return None
+        mask, (dx, dy) = located
+        normalized = (bbox[0] / width, bbox[1] / height, bbox[2] / width, bbox[3] / height)
+        return RegionKey(category=category, bbox=normalized, ink=mask, origin=(x0 + dx, y0 + dy))
+
+    def get(self, key: RegionKey) -> str | None:
+        """Find the text of a matching region recognized on an earlier page.
+
+        Args:
+            key: Key of the region on the current page.
+
+        Returns:
+            Cached text, or None on a miss.
+        """
+        for known, text in self._candidates(key):
+            if same_ink(known.ink, key.ink):
+                self.hits += 1
+                return text
+        return None
+
+    def changed_span(self, key: RegionKey) -> ChangedSpan | None:
+        """Find the changed digits of a region that missed the cache.
+
+        The region and each cached template at the same position are split
+        into words at wide ink gaps. Words that match from the left and from
+        the right keep the template's text; what remains in between is the
+        changed span. Only single-line templates whose words line up with
+        their text tokens qualify, and the changed template words must
+        contain a digit and number at most ``_MAX_CHANGED_WORDS``.
+
+        Args:
+            key: Key of the region on the current page.
+
+        Returns:
+            Changed span with the cached text around it, or None if the
+            region has to be OCR'd whole.
+        """
+        new_words = _word_spans(key.ink)
+        for known, text in self._candidates(key):
+            if '\n' in text.strip():
+                continue
+            tokens = list(re.finditer(r'\S+', text))
+            known_words = _word_spans(known.ink)
+            if len(tokens) != len(known_words):
+                continue
+
+            limit = min(len(known_words), len(new_words))
+            head = 0
+            while head < limit and same_ink(
+                _word_ink(known.ink, known_words[head]), _word_ink(key.ink, new_words[head])
+            ):
+                head += 1
+            tail = 0
+            while tail < limit - head and same_ink(
+                _word_ink(known.ink, known_words[-1 - tail]),
+                _word_ink(key.ink, new_words[-1 - tail]),
+            ):
+                tail += 1
+
+            changed = len(known_words) - head - tail
+            added = len(new_words) - head - tail
+            if head + tail == 0 or not 0 < changed <= _MAX_CHANGED_WORDS:
+                continue
+            if not 0 < added <= _MAX_CHANGED_WORDS:
+                continue
+            first, last = tokens[head], tokens[head + changed - 1]
+            if not any(char.isdigit() for char in text[first.start() : last.end()]):
+                continue
+
+            x, y = key.origin
+            pad = max(2, round(key.ink.shape[0] * _WORD_GAP))
+            start, end = new_words[head][0], new_words[head + added - 1][1]
+            bbox = (
+                float(x + start - pad),
+                float(y - pad),
+                float(x + end + pad),
+                float(y + key.ink.shape[0] + pad),
+            )
+            self.partial_hits += 1
+            return ChangedSpan(bbox=bbox, prefix=text[: first.start()], suffix=text[last.end() :])
+        return None
+
+    def put(self, key: RegionKey, text: str) -> None:
+        """Remember the OCR text of a region.
+
+        Args:
+            key: Key of the region.
+            text: Recognized text. Empty text is not cached.
+        """
+        if text and len(self._entries) < _MAX_ENTRIES:
+            self._entries.append((key, text))
+
+    def _candidates(self, key: RegionKey) -> list[tuple[RegionKey, str]]:
+        """List cached regions of the same category at the same position.
+
+        Args:
+            key: Key of the region on the current page.
+
+        Returns:
+            Matching (key, text) entries in insertion order.
+        """
+        return [
+            (known, text)
+            for known, text in self._entries
+            if known.category == key.category
+            and all(
+                abs(a - b) <= _POSITION_TOLERANCE for a, b in zip(known.bbox, key.bbox, strict=True)
+            )
+        ]
@@ -4,18 +4,25 @@ Crops a region from a page image and sends it to the configured
 text OCR provider (Gemini or vLLM) for text extraction.
 """
 
-import io
 import logging
 import uuid
 from pathlib import Path
 from typing import Any
 
 import asyncpg
+import numpy as np
 from PIL import Image
 
 from saegim.repositories import page_repo, project_repo
 from saegim.services.gemini_ocr_service import GeminiTextOcrProvider
+from saegim.services.image_encoding import (
+    DEFAULT_ENCODING,
+    ImageEncoding,
+    encode_image,
+    image_encoding_from_config,
+)
 from saegim.services.ocr_pipeline import TextOcrProvider
+from saegim.services.page_image_cache import crop_view, load_page_array
 from saegim.services.vllm_ocr_service import VllmTextOcrProvider
 
 logger = logging.getLogger(__name__)
@@ -44,36 +51,38 @@ def poly_to_bbox(poly: list[float]) -> tuple[float, float, float, float]:
 
 
 def crop_region(
-    image: Image.Image,
+    image: Image.Image | np.ndarray,
     bbox: tuple[float, float, float, float],
+    encoding: ImageEncoding = DEFAULT_ENCODING,
+    *,
+    category: str = '',
 ) -> bytes:
-    """Crop a region from an image and return as PNG bytes.
+    """Crop a region from an image and return it as encoded bytes.
 
     Args:
-        image: Full page PIL Image.
+        image: Full page PIL Image or decoded page bitmap.
         bbox: Bounding box as (x1, y1, x2, y2) in pixels.
+        encoding: Output encoding (PNG by default).
+        category: OmniDocBench category of the region.
 
     Returns:
-        Cropped image as PNG bytes.
+        Cropped image bytes.
 
     Raises:
         TextExtractionError: If the region has zero or negative area.
     """
-    x1, y1, x2, y2 = bbox
-    x1 = max(0, min(x1, image.width))
-    y1 = max(0, min(y1, image.height))
-    x2 = max(0, min(x2, image.width))
-    y2 = max(0, min(y2, image.height))
-
-    ix1, iy1, ix2, iy2 = int(x1), int(y1), int(x2), int(y2)
-    if ix2 <= ix1 or iy2 <= iy1:
-        msg = f'Region has zero area: ({ix1}, {iy1}, {ix2}, {iy2})'
+    if isinstance(image, Image.Image):
+        if image.mode not in ('RGB', 'RGBA', 'L'):
+            image = image.convert('RGB')
+        image = np.asarray(image)
+
+    region = crop_view(image, bbox)
+    if region is None:
+        x1, y1, x2, y2 = bbox
+        msg = f'Region has zero area: ({x1:g}, {y1:g}, {x2:g}, {y2:g})'
         raise TextExtractionError(msg)
 
-    cropped = image.crop((ix1, iy1, ix2, iy2))
-    buf = io.BytesIO()
-    cropped.save(buf, format='PNG')
-    return buf.getvalue()
+    return encode_image(region, encoding, category=category)
 
 
 def build_text_provider(
@@ -150,11 +159,35 @@ def _build_text_provider_by_id(
     return None
 
 
+def build_crop_encoding(
+    ocr_config: dict[str, Any],
+    engine_id: str | None = None,
+) -> ImageEncoding:
+    """Build the crop encoding configured for an engine.
+
+    Args:
+        ocr_config: Project OCR configuration dict.
+        engine_id: Engine instance ID to use. None = use default.
+
+    Returns:
+        ImageEncoding from the engine's crop_* fields (PNG if unset).
+    """
+    if 'engines' in ocr_config:
+        effective_id = engine_id or ocr_config.get('default_engine_id')
+        entry = ocr_config.get('engines', {}).get(effective_id) or {}
+        return image_encoding_from_config(entry.get('config', {}))
+
+    # Legacy flat format fallback
+    engine_type = engine_id or ocr_config.get('engine_type', '')
+    return image_encoding_from_config(ocr_config.get(engine_type, {}))
+
+
 def extract_text_from_region(
     image_path: Path,
     poly: list[float],
     category_type: str,
     text_provider: TextOcrProvider,
+    crop_encoding: ImageEncoding = DEFAULT_ENCODING,
 ) -> str:
     """Extract text from a region of a page image.
 
@@ -163,6 +196,7 @@ def extract_text_from_region(
         poly: 8-float polygon defining the region.
         category_type: OmniDocBench category type for prompt selection.
         text_provider: Text-only OCR provider.
+        crop_encoding: How the cropped region is encoded for the provider.
 
     Returns:
         Extracted text string.
@@ -173,15 +207,12 @@ def extract_text_from_region(
     bbox = poly_to_bbox(poly)
 
     try:
-        image = Image.open(image_path)
+        page = load_page_array(image_path)
     except (OSError, FileNotFoundError) as exc:
         msg = f'Failed to open image: {image_path}'
         raise TextExtractionError(msg) from exc
 
-    try:
-        cropped_bytes = crop_region(image, bbox)
-    finally:
-        image.close()
+    cropped_bytes = crop_region(page, bbox, crop_encoding, category=category_type)
 
     try:
         return text_provider.extract_text(cropped_bytes, category_type)
@@ -194,7 +225,7 @@ async def resolve_text_provider(
     pool: asyncpg.Pool,
     page_id: uuid.UUID,
     engine_id: str | None = None,
-) -> tuple[Path, TextOcrProvider]:
+) -> tuple[Path, TextOcrProvider, ImageEncoding]:
     """Resolve the text OCR provider and image path for a page.
 
     Looks up the page's project OCR config and builds the appropriate
@@ -207,7 +238,7 @@ async def resolve_text_provider(
         engine_id: Engine instance ID to use. None = project default.
 
     Returns:
-        Tuple of (image_path, text_provider).
+        Tuple of (image_path, text_provider, crop_encoding).
 
     Raises:
         LookupError: If the page is not found.
@@ -234,7 +265,8 @@ async def resolve_text_provider(
         )
         raise NoTextProviderError(msg)
 
-    return (image_path, text_provider)
+    crop_encoding = build_crop_encoding(ocr_config, engine_id)
+    return (image_path, text_provider, crop_encoding)
 
 
 def _build_from_split_pipeline(
@@ -0,0 +1,356 @@
+"""PDF text layer inspection and region text lookup.
+
+Born-digital PDFs already carry the page text, so running a VLM over their
+page images only re-derives what the file contains.  This module checks
+each page's text layer with pypdfium2 and decides whether it is good
+enough to extract directly:
+
+- enough characters to be a real text page (not just a page number),
+- characters that map to Unicode (fonts without a ToUnicode map yield
+  replacement or private-use code points),
+- not dominated by images (a scanned page with a small OCR'd caption
+  still needs OCR),
+- no more than a couple of vector paths. Table rules and vector drawings
+  are paths, and pdfminer's text blocks would lose their structure, so
+  such pages stay with the engine.
+
+PdfRegionTextSource goes one level finer for the split pipeline: it pulls
+the characters inside each detected layout region out of the PDF through
+a grid index over the character boxes.
+
+PDFium is not thread-safe, so all pdfium calls here hold ``_PDFIUM_LOCK``.
+"""
+
+import itertools
+import logging
+import threading
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Minimum non-whitespace characters for a page to count as a text page
+_MIN_CHARS = 20
+
+# Minimum fraction of characters that decode to real text
+_MIN_VALID_RATIO = 0.9
+
+# Maximum fraction of the page area covered by images
+_MAX_IMAGE_COVERAGE = 0.5
+
+# Maximum vector path objects on the page (a header rule and a footnote
+# separator); booktabs tables already draw three rules
+_MAX_PATH_OBJECTS = 2
+
+# Cell size (image pixels) of the character grid index
+_GRID_CELL = 64
+
+_PDFIUM_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TextLayerStats:
+    """Text layer statistics of one PDF page.
+
+    Attributes:
+        char_count: Non-whitespace characters in the text layer.
+        valid_ratio: Fraction of those characters that decode to real text.
+        image_coverage: Fraction of the page area covered by image objects.
+        path_count: Vector path objects drawn on the page (rules, table
+            borders, drawings).
+    """
+
+    char_count: int
+    valid_ratio: float
+    image_coverage: float
+    path_count: int = 0
+
+    @property
+    def usable(self) -> bool:
+        """Whether the page text can be taken from the PDF instead of OCR."""
+        return (
+            self.char_count >= _MIN_CHARS
+            and self.valid_ratio >= _MIN_VALID_RATIO
+            and self.image_coverage <= _MAX_IMAGE_COVERAGE
+            and self.path_count <= _MAX_PATH_OBJECTS
+        )
+
+
+def _is_valid_char(char: str) -> bool:
+    """Check whether a text layer character decodes to real text.
+
+    Args:
+        char: Single character from the text layer.
+
+    Returns:
+        False for replacement, private-use, unassigned and control characters.
+    """
+    if char == '\ufffd':
+        return False
+    return unicodedata.category(char) not in ('Co', 'Cn', 'Cc', 'Cs')
+
+
+def _image_coverage(page: pdfium.PdfPage) -> float:
+    """Estimate the fraction of a page covered by image objects.
+
+    Overlapping images are counted twice; the result is capped at 1.0.
+
+    Args:
+        page: pypdfium2 page.
+
+    Returns:
+        Covered fraction between 0.0 and 1.0.
+    """
+    page_width, page_height = page.get_size()
+    page_area = page_width * page_height
+    if page_area <= 0:
+        return 0.0
+
+    covered = 0.0
+    for obj in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE]):
+        left, bottom, right, top = obj.get_bounds()
+        width = min(right, page_width) - max(left, 0.0)
+        height = min(top, page_height) - max(bottom, 0.0)
+        if width > 0 and height > 0:
+            covered += width * height
+    return min(covered / page_area, 1.0)
+
+
+def _path_count(page: pdfium.PdfPage) -> int:
+    """Count the vector path objects that are drawn on a page.
+
+    Paths positioned entirely outside the page box are not visible and
+    are ignored.
+
+    Args:
+        page: pypdfium2 page.
+
+    Returns:
+        Number of visible path objects.
+    """
+    page_width, page_height = page.get_size()
+    count = 0
+    for obj in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_PATH]):
+        left, bottom, right, top = obj.get_bounds()
+        if right >= 0 and left <= page_width and top >= 0 and bottom <= page_height:
+            count += 1
+    return count
+
+
+def analyze_page(page: pdfium.PdfPage) -> TextLayerStats:
+    """Collect text layer statistics for a page.
+
+    Args:
+        page: pypdfium2 page.
+
+    Returns:
+        TextLayerStats of the page.
+    """
+    textpage = page.get_textpage()
+    try:
+        chars = [char for char in textpage.get_text_range() if not char.isspace()]
+    finally:
+        textpage.close()
+
+    valid = sum(1 for char in chars if _is_valid_char(char))
+    return TextLayerStats(
+        char_count=len(chars),
+        valid_ratio=valid / len(chars) if chars else 0.0,
+        image_coverage=_image_coverage(page),
+        path_count=_path_count(page),
+    )
+
+
+def find_text_layer_pages(pdf_path: Path, page_indices: Iterable[int]) -> set[int]:
+    """Find pages whose text layer is good enough to skip OCR.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        page_indices: Zero-based page indices to check.
+
+    Returns:
+        Indices of pages with a usable text layer.
+    """
+    usable: set[int] = set()
+    with _PDFIUM_LOCK:
+        pdf_doc = pdfium.PdfDocument(str(pdf_path))
+        try:
+            for page_idx in page_indices:
+                page = pdf_doc[page_idx]
+                try:
+                    stats = analyze_page(page)
+                finally:
+                    page.close()
+                logger.debug('Text layer of page %d in %s: %s', page_idx, pdf_path, stats)
+                if stats.usable:
+                    usable.add(page_idx)
+        finally:
+            pdf_doc.close()
+    return usable
+
+
+@dataclass(frozen=True)
+class PdfChar:
+    """One character of a page's text layer.
+
+    Attributes:
+        char: The character (whitespace and line breaks included).
+        center: (x, y) center of the glyph box in image pixels, top-left origin.
+    """
+
+    char: str
+    center: tuple[float, float]
+
+
+class CharGrid:
+    """Grid index over a page's characters for region lookups.
+
+    Only visible (non-whitespace) characters are indexed; whitespace is kept
+    in ``chars`` so region text keeps its word and line breaks.
+    """
+
+    def __init__(self, chars: list[PdfChar], cell: float = _GRID_CELL) -> None:
+        """Build the index.
+
+        Args:
+            chars: Page characters in text layer order.
+            cell: Grid cell size in pixels.
+        """
+        self.chars = chars
+        self._cell = cell
+        self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for idx, pdf_char in enumerate(chars):
+            if pdf_char.char.isspace():
+                continue
+            x, y = pdf_char.center
+            self._cells[int(x // cell), int(y // cell)].append(idx)
+
+    def text_in(self, bbox: tuple[float, float, float, float]) -> str:
+        """Collect the text whose glyph centers fall inside a box.
+
+        Args:
+            bbox: (x0, y0, x1, y1) in image pixels.
+
+        Returns:
+            Region text in text layer order; empty if no characters match.
+        """
+        x0, y0, x1, y1 = bbox
+        selected: list[int] = []
+        for cx in range(int(x0 // self._cell), int(x1 // self._cell) + 1):
+            for cy in range(int(y0 // self._cell), int(y1 // self._cell) + 1):
+                for idx in self._cells.get((cx, cy), ()):
+                    x, y = self.chars[idx].center
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        selected.append(idx)
+        if not selected:
+            return ''
+
+        selected.sort()
+        parts = [self.chars[selected[0]].char]
+        for prev, idx in itertools.pairwise(selected):
+            if idx > prev + 1:
+                skipped = ''.join(c.char for c in self.chars[prev + 1 : idx])
+                parts.append('\n' if '\n' in skipped else ' ')
+            parts.append(self.chars[idx].char)
+        return ''.join(parts).strip()
+
+
+def load_page_chars(pdf_path: Path, page_idx: int, image_width: int) -> list[PdfChar]:
+    """Read the characters of a PDF page in page-image coordinates.
+
+    The render factor is derived from the image width, so pages rendered at
+    any scale line up with their text layer.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        page_idx: Zero-based page index.
+        image_width: Width of the rendered page image in pixels.
+
+    Returns:
+        Page characters in text layer order.
+    """
+    chars: list[PdfChar] = []
+    with _PDFIUM_LOCK:
+        pdf_doc = pdfium.PdfDocument(str(pdf_path))
+        try:
+            page = pdf_doc[page_idx]
+            textpage = page.get_textpage()
+            try:
+                page_width, page_height = page.get_size()
+                scale = image_width / page_width
+                for idx in range(textpage.count_chars()):
+                    char = chr(pdfium_c.FPDFText_GetUnicode(textpage.raw, idx))
+                    left, bottom, right, top = textpage.get_charbox(idx)
+                    center = (
+                        (left + right) / 2 * scale,
+                        (page_height - (bottom + top) / 2) * scale,
+                    )
+                    chars.append(PdfChar(char=char, center=center))
+            finally:
+                textpage.close()
+                page.close()
+        finally:
+            pdf_doc.close()
+    return chars
+
+
+class PdfRegionTextSource:
+    """Region text taken from a PDF's text layer.
+
+    Implements the RegionTextSource protocol of the OCR pipeline. The
+    character grid of the most recently used page is cached, since a page's
+    regions are looked up one after another.
+    """
+
+    def __init__(self, pdf_path: Path, page_indices: Mapping[Path, int]) -> None:
+        """Initialize the text source.
+
+        Args:
+            pdf_path: Path to the source PDF.
+            page_indices: Zero-based PDF page index of each page image.
+        """
+        self.pdf_path = pdf_path
+        self._page_indices = dict(page_indices)
+        self._cached: tuple[Path, CharGrid] | None = None
+
+    def region_text(self, image_path: Path, bbox: tuple[float, float, float, float]) -> str:
+        """Return the PDF text inside a region of a page image.
+
+        Args:
+            image_path: Path to the page image.
+            bbox: Region box (x0, y0, x1, y1) in image pixels.
+
+        Returns:
+            Region text, or empty string if the page or region has no text.
+        """
+        grid = self._grid(image_path)
+        return grid.text_in(bbox) if grid is not None else ''
+
+    def _grid(self, image_path: Path) -> CharGrid | None:
+        """Build (or reuse) the character grid of a page image.
+
+        Args:
+            image_path: Path to the page image.
+
+        Returns:
+            CharGrid, or None if the image is not a page of this PDF.
+        """
+        if self._cached is not None and self._cached[0] == image_path:
+            return self._cached[1]
+
+        page_idx = self._page_indices.get(image_path)
+        if page_idx is None:
+            return None
+
+        with Image.open(image_path) as image:
+            image_width = image.width
+        grid = CharGrid(load_page_chars(self.pdf_path, page_idx, image_width))
+        self._cached = (image_path, grid)
+        return grid
@@ -6,7 +6,10 @@ via the adapter → exporter pipeline.
 """
 
 import base64
+import json
 import logging
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -14,12 +17,17 @@ import httpx
 
 from saegim.services.adapters.base import ModelAdapter
 from saegim.services.adapters.resolver import resolve_adapter
+from saegim.services.docir import rescale_page_ir
 from saegim.services.exporters.omnidocbench import export_page
+from saegim.services.image_encoding import detect_mime_type, prepare_page_image
 from saegim.services.ocr_provider import get_text_prompt
 
 logger = logging.getLogger(__name__)
 
-_MIME_MAP = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg'}
+PartialCallback = Callable[[dict[str, Any]], None]
+
+# Minimum seconds between intermediate results while streaming
+_PARTIAL_INTERVAL_S = 0.5
 
 
 class VllmOcrProvider:
@@ -60,13 +68,20 @@ class VllmOcrProvider:
         image_path: Path,
         page_width: int,
         page_height: int,
+        *,
+        on_partial: PartialCallback | None = None,
     ) -> dict[str, Any]:
         """Extract structured layout elements from a page image via vLLM.
 
+        When ``on_partial`` is given the completion is streamed and the
+        callback receives OmniDocBench dicts with the elements parsed so far
+        (marked with ``extra.partial``) while the model is still generating.
+
         Args:
             image_path: Path to the page image file.
             page_width: Image width in pixels.
             page_height: Image height in pixels.
+            on_partial: Optional callback for intermediate results.
 
         Returns:
             OmniDocBench-compatible dict with layout_dets, page_attribute, extra.
@@ -74,11 +89,14 @@ class VllmOcrProvider:
         Raises:
             RuntimeError: If vLLM API call fails.
         """
-        image_data = image_path.read_bytes()
-        image_b64 = base64.b64encode(image_data).decode('utf-8')
-        mime_type = _MIME_MAP.get(image_path.suffix.lower(), 'image/png')
-
-        messages = self._adapter.build_messages(image_b64, mime_type, page_width, page_height)
+        image = prepare_page_image(
+            image_path, self._adapter.image_encoding, page_width, page_height
+        )
+        image_b64 = base64.b64encode(image.data).decode('utf-8')
+
+        messages = self._adapter.build_messages(
+            image_b64, image.mime_type, image.width, image.height
+        )
         url = f'{self.base_url}/v1/chat/completions'
         payload = {
             'model': self._model,
@@ -87,11 +105,21 @@ class VllmOcrProvider:
             'max_tokens': 4096,
         }
 
+        def _publish(content: str) -> None:
+            partial_ir = self._adapter.parse_partial(content, image.width, image.height)
+            if partial_ir.elements and on_partial is not None:
+                partial = export_page(rescale_page_ir(partial_ir, page_width, page_height))
+                partial.setdefault('extra', {})['partial'] = True
+                on_partial(partial)
+
         try:
-            with httpx.Client(timeout=httpx.Timeout(300.0)) as client:
-                response = client.post(url, json=payload)
-                response.raise_for_status()
-                result = response.json()
+            if on_partial is None:
+                with httpx.Client(timeout=httpx.Timeout(300.0)) as client:
+                    response = client.post(url, json=payload)
+                    response.raise_for_status()
+                    result = response.json()
+            else:
+                result = _stream_completion(url, payload, _publish)
         except httpx.HTTPStatusError as exc:
             msg = f'vLLM API returned {exc.response.status_code}: {exc.response.text}'
             raise RuntimeError(msg) from exc
@@ -99,8 +127,71 @@ class VllmOcrProvider:
             msg = f'vLLM API request failed: {exc}'
             raise RuntimeError(msg) from exc
 
-        page_ir = self._adapter.parse_response(result, page_width, page_height)
-        return export_page(page_ir)
+        page_ir = self._adapter.parse_response(result, image.width, image.height)
+        return export_page(rescale_page_ir(page_ir, page_width, page_height))
+
+
+def _stream_completion(
+    url: str,
+    payload: dict[str, Any],
+    on_content: Callable[[str], None],
+) -> dict[str, Any]:
+    """Run a streaming chat completion and collect the message content.
+
+    ``on_content`` is called with the accumulated content at most every
+    ``_PARTIAL_INTERVAL_S`` seconds, and only after a chunk that may close
+    an element (a newline or closing brace).
+
+    Args:
+        url: Chat completions endpoint URL.
+        payload: Request payload (``stream`` is enabled here).
+        on_content: Callback receiving the content received so far.
+
+    Returns:
+        Non-streaming style response dict with the full message content.
+
+    Raises:
+        httpx.HTTPStatusError: If the server returns an error status.
+        httpx.RequestError: If the request fails.
+    """
+    parts: list[str] = []
+    last_publish = time.monotonic()
+
+    with (
+        httpx.Client(timeout=httpx.Timeout(300.0)) as client,
+        client.stream('POST', url, json={**payload, 'stream': True}) as response,
+    ):
+        if response.is_error:
+            response.read()
+        response.raise_for_status()
+
+        for line in response.iter_lines():
+            if not line.startswith('data:'):
+                continue
+            data = line.removeprefix('data:').strip()
+            if data == '[DONE]':
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                logger.warning('Skipping malformed stream chunk: %s', data[:200])
+                continue
+
+            choices = chunk.get('choices') or []
+            if not choices:
+                continue
+            delta = (choices[0].get('delta') or {}).get('content') or ''
+            if not delta:
+                continue
+            parts.append(delta)
+
+            now = time.monotonic()
+            closes_element = '}' in delta or '\n' in delta
+            if closes_element and now - last_publish >= _PARTIAL_INTERVAL_S:
+                last_publish = now
+                on_content(''.join(parts))
+
+    return {'choices': [{'message': {'content': ''.join(parts)}}]}
 
 
 class VllmTextOcrProvider:
@@ -151,6 +242,7 @@ class VllmTextOcrProvider:
         """
         prompt = get_text_prompt(category_hint)
         image_b64 = base64.b64encode(image_bytes).decode('utf-8')
+        mime_type = detect_mime_type(image_bytes)
 
         url = f'{self.base_url}/v1/chat/completions'
         payload = {
@@ -163,7 +255,7 @@ class VllmTextOcrProvider:
                         {
                             'type': 'image_url',
                             'image_url': {
-                                'url': f'data:image/png;base64,{image_b64}',
+                                'url': f'data:{mime_type};base64,{image_b64}',
                             },
                         },
                     ],
@@ -0,0 +1,132 @@
+"""Tests for JSON response compression."""
+
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from saegim.api.compression import JSONCompressionMiddleware, encoded_etag, negotiate_encoding
+
+LARGE_JSON = '{"layout_dets": [' + ','.join(['{"text": "본문"}'] * 200) + ']}'
+
+
+@pytest.fixture
+def compressed_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(JSONCompressionMiddleware, minimum_size=1024)  # type: ignore[arg-type]
+
+    @app.get('/large')
+    async def large() -> Response:
+        return Response(content=LARGE_JSON, media_type='application/json', headers={'ETag': '"7"'})
+
+    @app.get('/not-modified')
+    async def not_modified() -> Response:
+        return Response(status_code=304, headers={'ETag': '"7"'})
+
+    @app.get('/small')
+    async def small() -> dict:
+        return {'ok': True}
+
+    @app.get('/image')
+    async def image() -> Response:
+        return Response(content=b'\x89PNG' * 1024, media_type='image/png')
+
+    return TestClient(app)
+
+
+class TestNegotiateEncoding:
+    @pytest.mark.parametrize(
+        ('header', 'expected'),
+        [
+            ('gzip, deflate, br', 'br'),
+            ('br;q=0.5, gzip;q=1.0', 'gzip'),
+            ('gzip', 'gzip'),
+            ('x-gzip', 'gzip'),
+            ('br', 'br'),
+            ('gzip;q=0', None),
+            ('*', 'br'),
+            ('*;q=0', None),
+            ('br;q=0, *', 'gzip'),
+            ('gzip;q=0, br;q=0, *', None),
+            ('identity', None),
+            ('', None),
+        ],
+    )
+    def test_negotiation(self, header: str, expected: str | None):
+        assert negotiate_encoding(header) == expected
+
+
+class TestEncodedEtag:
+    def test_appends_coding(self):
+        assert encoded_etag('"7"', 'gzip') == '"7-gzip"'
+        assert encoded_etag('W/"7"', 'br') == 'W/"7-br"'
+
+
+class TestJSONCompressionMiddleware:
+    def test_compresses_large_json(self, compressed_client: TestClient):
+        response = compressed_client.get('/large', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert int(response.headers['Content-Length']) < len(LARGE_JSON.encode())
+        assert response.text == LARGE_JSON
+
+    def test_content_length_is_compressed_size(self, compressed_client: TestClient):
+        response = compressed_client.get('/large', headers={'Accept-Encoding': 'gzip'})
+        expected = gzip.compress(LARGE_JSON.encode(), 6, mtime=0)
+
+        assert int(response.headers['Content-Length']) == len(expected)
+
+    def test_small_json_not_compressed(self, compressed_client: TestClient):
+        response = compressed_client.get('/small', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.json() == {'ok': True}
+
+    def test_non_json_not_compressed(self, compressed_client: TestClient):
+        response = compressed_client.get('/image', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in response.headers
+        assert 'Vary' not in response.headers
+
+    def test_identity_when_gzip_not_accepted(self, compressed_client: TestClient):
+        response = compressed_client.get('/large', headers={'Accept-Encoding': 'identity'})
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert response.text == LARGE_JSON
+
+    def test_brotli_preferred(self, compressed_client: TestClient):
+        response = compressed_client.get('/large', headers={'Accept-Encoding': 'gzip, br'})
+
+        assert response.headers['Content-Encoding'] == 'br'
+        assert response.text == LARGE_JSON
+        expected = brotli.compress(LARGE_JSON.encode(), quality=4)
+        assert int(response.headers['Content-Length']) == len(expected)
+
+    @pytest.mark.parametrize('coding', ['gzip', 'br'])
+    def test_compressed_response_gets_own_etag(self, compressed_client: TestClient, coding):
+        response = compressed_client.get('/large', headers={'Accept-Encoding': coding})
+
+        assert response.headers['ETag'] == f'"7-{coding}"'
+
+    def test_identity_keeps_etag(self, compressed_client: TestClient):
+        response = compressed_client.get('/large', headers={'Accept-Encoding': 'identity'})
+
+        assert response.headers['ETag'] == '"7"'
+
+    def test_not_modified_echoes_validated_etag(self, compressed_client: TestClient):
+        response = compressed_client.get(
+            '/not-modified',
+            headers={'Accept-Encoding': 'br, gzip', 'If-None-Match': '"7-gzip"'},
+        )
+
+        assert response.status_code == 304
+        assert response.headers['ETag'] == '"7-gzip"'
+
+    def test_app_compresses_api_json(self, client: TestClient):
+        response = client.get('/openapi.json', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
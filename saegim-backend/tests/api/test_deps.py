@@ -6,13 +6,17 @@ from unittest.mock import AsyncMock, MagicMock
 
 import jwt
 import pytest
+from fastapi import HTTPException
 
 from saegim.api.deps import (
     _hash_token,
     clear_refresh_cookie,
     create_access_token,
     create_refresh_token,
+    etag_matches,
+    get_expected_version,
     hash_password,
+    page_etag,
     rotate_refresh_token,
     set_refresh_cookie,
     validate_refresh_token,
@@ -326,3 +330,40 @@ class TestRefreshCookieHelpers:
             samesite='lax',
             path='/api/v1/auth',
         )
+
+
+class TestPagePreconditions:
+    def test_page_etag(self):
+        assert page_etag(7) == '"7"'
+
+    def test_etag_matches(self):
+        assert etag_matches('"7"', 7)
+        assert etag_matches('W/"7"', 7)
+        assert etag_matches('"3", "7"', 7)
+        assert etag_matches('*', 7)
+        assert not etag_matches('"6"', 7)
+
+    def test_etag_matches_compressed_representations(self):
+        assert etag_matches('"7-gzip"', 7)
+        assert etag_matches('W/"7-br", "3"', 7)
+        assert not etag_matches('"6-gzip"', 7)
+        assert not etag_matches('"7-deflate"', 7)
+
+    def test_expected_version_absent(self):
+        assert get_expected_version(None) is None
+        assert get_expected_version('*') is None
+
+    def test_expected_version_parsed(self):
+        assert get_expected_version('"12"') == 12
+        assert get_expected_version('"12-gzip"') == 12
+
+    @pytest.mark.parametrize('header', ['W/"12"', '12', '"abc"', '""', '"12-"', '"12-zip"'])
+    def test_unmatchable_tag_fails_precondition(self, header):
+        with pytest.raises(HTTPException) as exc_info:
+            get_expected_version(header)
+        assert exc_info.value.status_code == 412
+
+    def test_several_tags_rejected(self):
+        with pytest.raises(HTTPException) as exc_info:
+            get_expected_version('"1", "2"')
+        assert exc_info.value.status_code == 400
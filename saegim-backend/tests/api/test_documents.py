@@ -1,5 +1,6 @@
 """Tests for document endpoints."""
 
+import json
 from unittest.mock import AsyncMock, patch
 
 from fastapi import status
@@ -116,14 +117,16 @@ class TestDocumentEndpoints:
                 return_value=sample_document_record,
             ),
             patch(
-                'saegim.repositories.page_repo.list_by_document',
+                'saegim.repositories.page_repo.list_by_document_json',
                 new_callable=AsyncMock,
-                return_value=mock_pages,
+                return_value=json.dumps(mock_pages),
             ),
         ):
             response = client.get(f'/api/v1/documents/{doc_id}/pages')
 
         assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'] == 'application/json'
+        assert response.json() == mock_pages
 
 
 class TestReExtractEndpoint:
@@ -193,3 +196,22 @@ class TestReExtractEndpoint:
         data = response.json()
         assert data['status'] == 'extracting'
         assert data['processed_pages'] == 0
+
+    def test_re_extract_force(self, client: TestClient, sample_document_record):
+        doc_id = sample_document_record['id']
+        with (
+            patch(
+                'saegim.services.document_service.re_extract',
+                new_callable=AsyncMock,
+                return_value={'id': doc_id, 'status': 'extracting'},
+            ) as mock_re_extract,
+            patch(
+                'saegim.repositories.document_repo.get_by_id',
+                new_callable=AsyncMock,
+                return_value=sample_document_record,
+            ),
+        ):
+            response = client.post(f'/api/v1/documents/{doc_id}/re-extract?force=true')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_re_extract.await_args.kwargs == {'force': True}
@@ -0,0 +1,127 @@
+"""Tests for the server-sent change events endpoint."""
+
+import json
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from saegim.api.routes import events
+from saegim.core.change_feed import ChangeFeed
+from saegim.schemas.user import UserResponse
+
+
+def _user(role: str = 'annotator') -> UserResponse:
+    return UserResponse(
+        id=uuid.uuid4(),
+        name='Test User',
+        login_id='testuser',
+        email='test@example.com',
+        role=role,
+        must_change_password=False,
+        created_at='2026-01-01T00:00:00Z',
+    )
+
+
+class TestStreamEvents:
+    def test_requires_a_topic(self, client: TestClient):
+        response = client.get('/api/v1/events')
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_rejects_invalid_id(self, client: TestClient):
+        response = client.get('/api/v1/events', params={'page_id': 'not-a-uuid'})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    async def test_streams_matching_events(self):
+        feed = ChangeFeed()
+        document_id = uuid.uuid4()
+        event = {
+            'kind': 'page',
+            'op': 'UPDATE',
+            'page_id': str(uuid.uuid4()),
+            'document_id': str(document_id),
+            'status': 'submitted',
+            'version': 4,
+        }
+
+        with patch.object(events, 'get_change_feed', return_value=feed):
+            response = await events.stream_events(document_id=document_id)
+            body = response.body_iterator
+
+            assert response.media_type == 'text/event-stream'
+            assert response.headers['cache-control'] == 'no-cache'
+            assert await anext(body) == 'retry: 5000\n\n'
+            feed.publish({**event, 'document_id': str(uuid.uuid4())})
+            feed.publish(event)
+            message = await anext(body)
+            await body.aclose()
+
+        assert message.startswith('event: page\ndata: ')
+        assert json.loads(message.split('data: ', 1)[1]) == event
+        assert feed._subscribers == {}
+
+    @pytest.mark.asyncio
+    async def test_sends_keepalive_when_idle(self):
+        feed = ChangeFeed()
+
+        with (
+            patch.object(events, 'get_change_feed', return_value=feed),
+            patch.object(events, 'KEEPALIVE_SECONDS', 0),
+        ):
+            response = await events.stream_events(page_id=uuid.uuid4())
+            body = response.body_iterator
+            await anext(body)
+
+            assert await anext(body) == ': keepalive\n\n'
+            await body.aclose()
+
+    def test_project_stream_rejects_non_member(self, client: TestClient):
+        with patch(
+            'saegim.repositories.project_member_repo.get_role',
+            new_callable=AsyncMock,
+            return_value=None,
+        ) as mock_role:
+            response = client.get('/api/v1/events', params={'project_id': str(uuid.uuid4())})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        mock_role.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_project_stream_allows_member(self):
+        project_id = uuid.uuid4()
+        user = _user()
+
+        with (
+            patch.object(events, 'get_change_feed', return_value=ChangeFeed()),
+            patch('saegim.api.deps.get_pool'),
+            patch(
+                'saegim.repositories.project_member_repo.get_role',
+                new_callable=AsyncMock,
+                return_value='annotator',
+            ) as mock_role,
+        ):
+            response = await events.stream_events(project_id=project_id, current_user=user)
+            await response.body_iterator.aclose()
+
+        assert response.media_type == 'text/event-stream'
+        assert mock_role.await_args.args[1:] == (project_id, user.id)
+
+    @pytest.mark.asyncio
+    async def test_project_stream_admin_bypasses_membership(self):
+        with (
+            patch.object(events, 'get_change_feed', return_value=ChangeFeed()),
+            patch(
+                'saegim.repositories.project_member_repo.get_role', new_callable=AsyncMock
+            ) as mock_role,
+        ):
+            response = await events.stream_events(
+                project_id=uuid.uuid4(), current_user=_user('admin')
+            )
+            await response.body_iterator.aclose()
+
+        mock_role.assert_not_called()
@@ -1,5 +1,6 @@
 """Tests for export endpoints."""
 
+import json
 from unittest.mock import AsyncMock, patch
 
 from fastapi import status
@@ -39,7 +40,7 @@ class TestExportEndpoints:
         with patch(
             'saegim.services.export_service.export_project',
             new_callable=AsyncMock,
-            return_value=export_data,
+            return_value=json.dumps(export_data),
         ):
             response = client.post('/api/v1/projects/00000000-0000-0000-0000-000000000001/export')
 
@@ -91,7 +92,7 @@ class TestExportEndpoints:
         with patch(
             'saegim.services.export_service.export_project',
             new_callable=AsyncMock,
-            return_value=export_data,
+            return_value=json.dumps(export_data),
         ):
             response = client.post('/api/v1/projects/00000000-0000-0000-0000-000000000001/export')
 
@@ -1,10 +1,26 @@
 """Tests for page labeling endpoints."""
 
+import json
+import uuid
 from unittest.mock import AsyncMock, patch
 
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from saegim.services.json_patch import JsonPatchError, JsonPatchTestFailedError
+from saegim.services.labeling_service import PageVersionConflictError
+
+
+def _raw_page(record: dict, **changes: object) -> dict:
+    """Page data as returned by get_page_data(..., raw_json=True)."""
+    page = {**record, **changes}
+    page['annotation_data'] = json.dumps(page['annotation_data'])
+    for field in ('auto_extracted_data', 'partial_extracted_data'):
+        if page.get(field) is not None:
+            page[field] = json.dumps(page[field])
+    return page
+
 
 class TestPageEndpoints:
     """Test cases for page labeling API endpoints."""
@@ -14,7 +30,7 @@ class TestPageEndpoints:
         with patch(
             'saegim.services.labeling_service.get_page_data',
             new_callable=AsyncMock,
-            return_value=sample_page_record,
+            return_value=_raw_page(sample_page_record),
         ):
             response = client.get(f'/api/v1/pages/{page_id}')
 
@@ -26,6 +42,54 @@ class TestPageEndpoints:
         assert 'annotation_data' in data
         assert 'layout_dets' in data['annotation_data']
 
+    def test_get_page_embeds_stored_json(self, client: TestClient, sample_page_record):
+        auto = {'layout_dets': [{'anno_id': 0}]}
+        page = _raw_page(
+            sample_page_record, auto_extracted_data=auto, pdf_path='/storage/pdfs/test.pdf'
+        )
+        with patch(
+            'saegim.services.labeling_service.get_page_data',
+            new_callable=AsyncMock,
+            return_value=page,
+        ) as mock_get:
+            response = client.get(f'/api/v1/pages/{sample_page_record["id"]}')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_get.await_args.kwargs == {'raw_json': True}
+        assert page['annotation_data'] in response.text
+        data = response.json()
+        assert data['annotation_data'] == sample_page_record['annotation_data']
+        assert data['auto_extracted_data'] == auto
+        assert data['image_url'] == '/storage/images/test_p1.png'
+        assert data['pdf_url'] == '/storage/pdfs/test.pdf'
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    def test_get_page_without_auto_extracted_data(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.get_page_data',
+            new_callable=AsyncMock,
+            return_value=_raw_page(sample_page_record, auto_extracted_data=None),
+        ):
+            response = client.get(f'/api/v1/pages/{sample_page_record["id"]}')
+
+        assert response.json()['auto_extracted_data'] is None
+
+    def test_get_page_embeds_partial_result(self, client: TestClient, sample_page_record):
+        auto = {'layout_dets': [{'anno_id': 0}]}
+        partial = {'layout_dets': [{'anno_id': 0}, {'anno_id': 1}], 'extra': {'partial': True}}
+        with patch(
+            'saegim.services.labeling_service.get_page_data',
+            new_callable=AsyncMock,
+            return_value=_raw_page(
+                sample_page_record, auto_extracted_data=auto, partial_extracted_data=partial
+            ),
+        ):
+            response = client.get(f'/api/v1/pages/{sample_page_record["id"]}')
+
+        data = response.json()
+        assert data['auto_extracted_data'] == auto
+        assert data['partial_extracted_data'] == partial
+
     def test_get_page_not_found(self, client: TestClient):
         with patch(
             'saegim.services.labeling_service.get_page_data',
@@ -68,6 +132,86 @@ class TestPageEndpoints:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_patch_annotation(self, client: TestClient, sample_page_record):
+        page_id = sample_page_record['id']
+        ops = [
+            {'op': 'replace', 'path': '/layout_dets/0/text', 'value': 'new'},
+            {'op': 'move', 'from': '/layout_dets/0', 'path': '/layout_dets/-'},
+            {'op': 'add', 'path': '/extra/note', 'value': None},
+        ]
+        with patch(
+            'saegim.services.labeling_service.patch_annotation',
+            new_callable=AsyncMock,
+            return_value={
+                'id': page_id,
+                'status': 'in_progress',
+                'updated_at': sample_page_record['updated_at'],
+                'version': 2,
+                'applied': 3,
+            },
+        ) as mock_patch:
+            response = client.patch(
+                f'/api/v1/pages/{page_id}',
+                content=json.dumps(ops),
+                headers={'Content-Type': 'application/json-patch+json'},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['applied'] == 3
+        assert 'annotation_data' not in response.json()
+        assert mock_patch.await_args.args[2] == [
+            {'op': 'replace', 'path': '/layout_dets/0/text', 'value': 'new'},
+            {'op': 'move', 'from': '/layout_dets/0', 'path': '/layout_dets/-'},
+            {'op': 'add', 'path': '/extra/note', 'value': None},
+        ]
+
+    def test_patch_annotation_not_found(self, client: TestClient):
+        with patch(
+            'saegim.services.labeling_service.patch_annotation',
+            new_callable=AsyncMock,
+            return_value=None,
+        ):
+            response = client.patch(
+                '/api/v1/pages/00000000-0000-0000-0000-000000000000',
+                json=[{'op': 'remove', 'path': '/extra'}],
+            )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_patch_annotation_invalid_operation(self, client: TestClient):
+        with patch(
+            'saegim.services.labeling_service.patch_annotation',
+            new_callable=AsyncMock,
+            side_effect=JsonPatchError("Path member 'missing' not found"),
+        ):
+            response = client.patch(
+                '/api/v1/pages/00000000-0000-0000-0000-000000000000',
+                json=[{'op': 'remove', 'path': '/missing'}],
+            )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_patch_annotation_failed_test(self, client: TestClient):
+        with patch(
+            'saegim.services.labeling_service.patch_annotation',
+            new_callable=AsyncMock,
+            side_effect=JsonPatchTestFailedError("Test failed at '/extra'"),
+        ):
+            response = client.patch(
+                '/api/v1/pages/00000000-0000-0000-0000-000000000000',
+                json=[{'op': 'test', 'path': '/extra', 'value': {}}],
+            )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_patch_annotation_unknown_op(self, client: TestClient):
+        response = client.patch(
+            '/api/v1/pages/00000000-0000-0000-0000-000000000000',
+            json=[{'op': 'frobnicate', 'path': '/extra'}],
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
     def test_update_page_attributes(self, client: TestClient, sample_page_record):
         page_id = sample_page_record['id']
         with patch(
@@ -263,3 +407,375 @@ class TestPageEndpoints:
         )
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_list_extraction_results(self, client: TestClient, sample_page_record):
+        page_id = sample_page_record['id']
+        summary = {
+            'id': uuid.uuid4(),
+            'page_id': page_id,
+            'engine_key': 'a' * 64,
+            'engine_type': 'vllm',
+            'engine_id': 'vlm',
+            'duration_ms': 1200,
+            'element_count': 3,
+            'created_at': sample_page_record['updated_at'],
+            'updated_at': sample_page_record['updated_at'],
+        }
+        with patch(
+            'saegim.services.labeling_service.list_extraction_results',
+            new_callable=AsyncMock,
+            return_value=[summary],
+        ):
+            response = client.get(f'/api/v1/pages/{page_id}/extraction-results')
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]['engine_type'] == 'vllm'
+        assert data[0]['element_count'] == 3
+        assert 'result' not in data[0]
+
+    def test_get_extraction_result_not_found(self, client: TestClient):
+        with patch(
+            'saegim.services.labeling_service.get_extraction_result',
+            new_callable=AsyncMock,
+            return_value=None,
+        ):
+            response = client.get(
+                '/api/v1/pages/00000000-0000-0000-0000-000000000000'
+                '/extraction-results/00000000-0000-0000-0000-000000000001'
+            )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_select_extraction_result(self, client: TestClient, sample_page_record):
+        page_id = sample_page_record['id']
+        result_id = uuid.uuid4()
+        selected = {'layout_dets': [], 'page_attribute': {}, 'extra': {'relation': []}}
+        with patch(
+            'saegim.services.labeling_service.select_extraction_result',
+            new_callable=AsyncMock,
+            return_value={**sample_page_record, 'auto_extracted_data': selected},
+        ) as mock_select:
+            response = client.post(f'/api/v1/pages/{page_id}/extraction-results/{result_id}/select')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['auto_extracted_data'] == selected
+        assert mock_select.await_args.args[2] == result_id
+
+    def test_select_extraction_result_not_found(self, client: TestClient):
+        with patch(
+            'saegim.services.labeling_service.select_extraction_result',
+            new_callable=AsyncMock,
+            return_value=None,
+        ):
+            response = client.post(
+                '/api/v1/pages/00000000-0000-0000-0000-000000000000'
+                '/extraction-results/00000000-0000-0000-0000-000000000001/select'
+            )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestPageVersions:
+    """Test cases for page ETags and If-Match / If-None-Match preconditions."""
+
+    def test_get_page_sets_etag(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.get_page_data',
+            new_callable=AsyncMock,
+            return_value=_raw_page(sample_page_record, version=4),
+        ):
+            response = client.get(f'/api/v1/pages/{sample_page_record["id"]}')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] == '"4"'
+        assert response.json()['version'] == 4
+
+    def test_get_page_not_modified(self, client: TestClient, sample_page_record):
+        with (
+            patch(
+                'saegim.services.labeling_service.get_page_version',
+                new_callable=AsyncMock,
+                return_value=4,
+            ),
+            patch(
+                'saegim.services.labeling_service.get_page_data',
+                new_callable=AsyncMock,
+            ) as mock_get,
+        ):
+            response = client.get(
+                f'/api/v1/pages/{sample_page_record["id"]}',
+                headers={'If-None-Match': '"4"'},
+            )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers['ETag'] == '"4"'
+        mock_get.assert_not_awaited()
+
+    def test_get_page_modified_since_etag(self, client: TestClient, sample_page_record):
+        with (
+            patch(
+                'saegim.services.labeling_service.get_page_version',
+                new_callable=AsyncMock,
+                return_value=5,
+            ),
+            patch(
+                'saegim.services.labeling_service.get_page_data',
+                new_callable=AsyncMock,
+                return_value=_raw_page(sample_page_record, version=5),
+            ),
+        ):
+            response = client.get(
+                f'/api/v1/pages/{sample_page_record["id"]}',
+                headers={'If-None-Match': '"4"'},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] == '"5"'
+
+    def test_update_passes_if_match(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.save_annotation',
+            new_callable=AsyncMock,
+            return_value={**sample_page_record, 'version': 4},
+        ) as mock_save:
+            response = client.put(
+                f'/api/v1/pages/{sample_page_record["id"]}',
+                json={'annotation_data': {}},
+                headers={'If-Match': '"3"'},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] == '"4"'
+        assert mock_save.await_args.kwargs['expected_version'] == 3
+
+    def test_update_stale_if_match(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.save_annotation',
+            new_callable=AsyncMock,
+            side_effect=PageVersionConflictError(5),
+        ):
+            response = client.put(
+                f'/api/v1/pages/{sample_page_record["id"]}',
+                json={'annotation_data': {}},
+                headers={'If-Match': '"3"'},
+            )
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert response.headers['ETag'] == '"5"'
+
+    def test_concurrent_write_without_if_match(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.add_element',
+            new_callable=AsyncMock,
+            side_effect=PageVersionConflictError(5),
+        ):
+            response = client.post(
+                f'/api/v1/pages/{sample_page_record["id"]}/elements',
+                json={'category_type': 'text_block', 'poly': [0, 0, 1, 0, 1, 1, 0, 1]},
+            )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_weak_if_match_fails_precondition(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.save_annotation',
+            new_callable=AsyncMock,
+        ) as mock_save:
+            response = client.put(
+                f'/api/v1/pages/{sample_page_record["id"]}',
+                json={'annotation_data': {}},
+                headers={'If-Match': 'W/"3"'},
+            )
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        mock_save.assert_not_awaited()
+
+    def test_submit_stale_if_match(self, client: TestClient, sample_page_record):
+        with (
+            patch(
+                'saegim.repositories.task_repo.submit_page',
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch(
+                'saegim.services.labeling_service.raise_if_version_conflict',
+                new_callable=AsyncMock,
+                side_effect=PageVersionConflictError(5),
+            ),
+        ):
+            response = client.post(
+                f'/api/v1/pages/{sample_page_record["id"]}/submit',
+                headers={'If-Match': '"3"'},
+            )
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+
+class TestSparseResponses:
+    """Test cases for the minimal response view of page edits."""
+
+    @pytest.fixture
+    def page_state(self, sample_page_record):
+        return {
+            'id': sample_page_record['id'],
+            'status': 'in_progress',
+            'updated_at': sample_page_record['updated_at'],
+            'version': 5,
+        }
+
+    def test_add_element_minimal(self, client: TestClient, page_state):
+        element = {'anno_id': 3, 'order': 3, 'category_type': 'text_block'}
+        with patch(
+            'saegim.services.labeling_service.add_element',
+            new_callable=AsyncMock,
+            return_value={**page_state, 'element': element},
+        ) as mock_add:
+            response = client.post(
+                f'/api/v1/pages/{page_state["id"]}/elements?view=minimal',
+                json={
+                    'category_type': 'text_block',
+                    'poly': [100, 200, 300, 200, 300, 400, 100, 400],
+                },
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert mock_add.await_args.kwargs['full'] is False
+        body = response.json()
+        assert body['element'] == element
+        assert body['version'] == 5
+        assert 'annotation_data' not in body
+        assert 'auto_extracted_data' not in body
+        assert response.headers['ETag'] == '"5"'
+
+    def test_delete_element_minimal(self, client: TestClient, page_state):
+        with patch(
+            'saegim.services.labeling_service.delete_element',
+            new_callable=AsyncMock,
+            return_value={**page_state, 'anno_id': 2},
+        ):
+            response = client.delete(f'/api/v1/pages/{page_state["id"]}/elements/2?view=minimal')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['anno_id'] == 2
+        assert 'annotation_data' not in response.json()
+
+    def test_full_view_is_default(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.delete_element',
+            new_callable=AsyncMock,
+            return_value=sample_page_record,
+        ) as mock_delete:
+            response = client.delete(f'/api/v1/pages/{sample_page_record["id"]}/elements/0')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_delete.await_args.kwargs['full'] is True
+        assert 'annotation_data' in response.json()
+
+    def test_unknown_view_rejected(self, client: TestClient, sample_page_record):
+        response = client.delete(
+            f'/api/v1/pages/{sample_page_record["id"]}/elements/0?view=compact'
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestElementBatch:
+    """Test cases for the batch element endpoint."""
+
+    def test_applies_operations(self, client: TestClient, sample_page_record):
+        operations = [
+            {
+                'op': 'create',
+                'element': {'category_type': 'figure', 'poly': [0, 0, 9, 0, 9, 9, 0, 9]},
+            },
+            {'op': 'update', 'anno_id': 0, 'changes': {'category_type': 'title'}},
+            {'op': 'delete', 'anno_id': 1},
+            {'op': 'add_relation', 'source_anno_id': 0, 'target_anno_id': 2},
+            {'op': 'delete_relation', 'source_anno_id': 0, 'target_anno_id': 1},
+        ]
+        with patch(
+            'saegim.services.labeling_service.apply_element_batch',
+            new_callable=AsyncMock,
+            return_value={**sample_page_record, 'version': 3},
+        ) as mock_batch:
+            response = client.post(
+                f'/api/v1/pages/{sample_page_record["id"]}/elements/batch',
+                json={'operations': operations},
+                headers={'If-Match': '"2"'},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] == '"3"'
+        sent = mock_batch.await_args.args[2]
+        assert sent[0]['element']['text'] == ''
+        assert sent[1] == {'op': 'update', 'anno_id': 0, 'changes': {'category_type': 'title'}}
+        assert sent[3]['relation_type'] == 'parent_son'
+        assert mock_batch.await_args.kwargs == {'expected_version': 2, 'full': True}
+
+    def test_minimal_returns_created_anno_ids(self, client: TestClient, sample_page_record):
+        state = {
+            'id': sample_page_record['id'],
+            'status': 'in_progress',
+            'updated_at': sample_page_record['updated_at'],
+            'version': 3,
+            'created_anno_ids': [4, 5],
+        }
+        with patch(
+            'saegim.services.labeling_service.apply_element_batch',
+            new_callable=AsyncMock,
+            return_value=state,
+        ):
+            response = client.post(
+                f'/api/v1/pages/{sample_page_record["id"]}/elements/batch?view=minimal',
+                json={'operations': [{'op': 'delete', 'anno_id': 0}]},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['created_anno_ids'] == [4, 5]
+        assert 'annotation_data' not in response.json()
+
+    def test_invalid_reference_conflict(self, client: TestClient, sample_page_record):
+        with patch(
+            'saegim.services.labeling_service.apply_element_batch',
+            new_callable=AsyncMock,
+            side_effect=ValueError('operations[0]: Element with anno_id 9 not found'),
+        ):
+            response = client.post(
+                f'/api/v1/pages/{sample_page_record["id"]}/elements/batch',
+                json={'operations': [{'op': 'delete', 'anno_id': 9}]},
+            )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert 'anno_id 9' in response.json()['detail']
+
+    @pytest.mark.parametrize(
+        'operations',
+        [
+            [],
+            [{'op': 'rename', 'anno_id': 0}],
+            [{'op': 'update', 'anno_id': 0, 'changes': {'poly': [1, 2]}}],
+            [{'op': 'create', 'element': {'category_type': ''}}],
+        ],
+    )
+    def test_invalid_body_rejected(self, client: TestClient, sample_page_record, operations):
+        response = client.post(
+            f'/api/v1/pages/{sample_page_record["id"]}/elements/batch',
+            json={'operations': operations},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_not_found(self, client: TestClient):
+        with patch(
+            'saegim.services.labeling_service.apply_element_batch',
+            new_callable=AsyncMock,
+            return_value=None,
+        ):
+            response = client.post(
+                f'/api/v1/pages/{uuid.uuid4()}/elements/batch',
+                json={'operations': [{'op': 'delete', 'anno_id': 0}]},
+            )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -431,6 +431,31 @@ class TestGetAvailableEngines:
         assert 'gemini-flash' in engine_ids
         assert 'my-vllm' in engine_ids
 
+    def test_excludes_ensembles(self, client: TestClient, sample_project_record):
+        project_id = sample_project_record['id']
+        ensemble = {
+            'engine_type': 'ensemble',
+            'name': 'Combo',
+            'config': {'engine_ids': ['gemini-flash', 'my-vllm']},
+        }
+        config = _new_fmt(
+            engines={
+                'gemini-flash': _gemini_engine(),
+                'my-vllm': _vllm_engine(),
+                'combo': ensemble,
+            },
+            default_id='combo',
+        )
+        with patch(
+            'saegim.repositories.project_repo.get_ocr_config',
+            new_callable=AsyncMock,
+            return_value=config,
+        ):
+            response = client.get(f'/api/v1/projects/{project_id}/available-engines')
+
+        engine_ids = [e['engine_id'] for e in response.json()['engines']]
+        assert engine_ids == ['gemini-flash', 'my-vllm']
+
     def test_empty_when_no_engines(self, client: TestClient, sample_project_record):
         project_id = sample_project_record['id']
         with patch(
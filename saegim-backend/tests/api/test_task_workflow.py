@@ -49,6 +49,7 @@ def _page_record(page_id=None, assigned_to=None, page_status='pending'):
         'assigned_to': assigned_to,
         'locked_at': None,
         'updated_at': datetime.datetime.now(tz=datetime.UTC),
+        'version': 1,
     }
 
 
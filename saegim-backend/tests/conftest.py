@@ -67,6 +67,7 @@ def app(test_settings: Settings, mock_pool):
     with (
         patch('saegim.app.create_pool', new_callable=AsyncMock),
         patch('saegim.app.close_pool', new_callable=AsyncMock),
+        patch('saegim.app.get_change_feed', return_value=AsyncMock()),
         patch('saegim.core.database._pool', mock_pool),
         patch('saegim.core.database.get_pool', return_value=mock_pool),
     ):
@@ -193,6 +194,7 @@ def sample_page_record(sample_document_record):
         'assigned_to': None,
         'locked_at': None,
         'updated_at': datetime.datetime.now(tz=datetime.UTC),
+        'version': 1,
     }
 
 
@@ -0,0 +1,144 @@
+"""Tests for the LISTEN/NOTIFY change feed."""
+
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from saegim.core import change_feed
+from saegim.core.change_feed import CHANNEL, RESYNC_EVENT, ChangeFeed, event_topics
+
+
+def _page_event(**overrides: object) -> dict:
+    event = {
+        'kind': 'page',
+        'op': 'UPDATE',
+        'page_id': str(uuid.uuid4()),
+        'document_id': str(uuid.uuid4()),
+        'project_id': str(uuid.uuid4()),
+        'status': 'in_progress',
+        'version': 2,
+    }
+    event.update(overrides)
+    return event
+
+
+class TestEventTopics:
+    def test_page_event_topics(self):
+        event = _page_event()
+
+        assert event_topics(event) == {
+            f'page:{event["page_id"]}',
+            f'document:{event["document_id"]}',
+            f'project:{event["project_id"]}',
+        }
+
+    def test_document_event_has_no_page_topic(self):
+        event = {'kind': 'document', 'document_id': 'd1', 'project_id': 'p1'}
+
+        assert event_topics(event) == {'document:d1', 'project:p1'}
+
+
+class TestPublish:
+    def test_delivers_to_matching_subscribers_only(self):
+        feed = ChangeFeed()
+        event = _page_event()
+
+        with (
+            feed.subscribe({f'document:{event["document_id"]}'}) as matching,
+            feed.subscribe({'document:other'}) as other,
+        ):
+            feed.publish(event)
+
+            assert matching.get_nowait() == event
+            assert other.empty()
+
+    def test_resync_reaches_every_subscriber(self):
+        feed = ChangeFeed()
+
+        with feed.subscribe({'page:a'}) as first, feed.subscribe({'project:b'}) as second:
+            feed.publish(RESYNC_EVENT)
+
+            assert first.get_nowait() == RESYNC_EVENT
+            assert second.get_nowait() == RESYNC_EVENT
+
+    def test_full_queue_drops_oldest_event(self):
+        feed = ChangeFeed()
+        page_id = str(uuid.uuid4())
+
+        with (
+            patch.object(change_feed, '_QUEUE_SIZE', 2),
+            feed.subscribe({f'page:{page_id}'}) as queue,
+        ):
+            for version in (1, 2, 3):
+                feed.publish(_page_event(page_id=page_id, version=version))
+
+            assert [queue.get_nowait()['version'] for _ in range(queue.qsize())] == [2, 3]
+
+    def test_unsubscribes_on_exit(self):
+        feed = ChangeFeed()
+
+        with feed.subscribe({'page:a'}):
+            assert len(feed._subscribers) == 1
+
+        assert feed._subscribers == {}
+
+
+class TestListening:
+    @pytest.mark.asyncio
+    async def test_start_listens_and_publishes_notifications(self):
+        conn = MagicMock()
+        conn.add_listener = AsyncMock()
+        conn.close = AsyncMock()
+        feed = ChangeFeed()
+        event = _page_event()
+
+        with patch.object(change_feed.asyncpg, 'connect', AsyncMock(return_value=conn)):
+            await feed.start('postgresql://localhost/test')
+
+        assert feed.listening
+        channel, callback = conn.add_listener.await_args.args
+        assert channel == CHANNEL
+        with feed.subscribe({f'page:{event["page_id"]}'}) as queue:
+            callback(conn, 1, CHANNEL, json.dumps(event))
+            callback(conn, 1, CHANNEL, 'not json')
+
+            assert queue.get_nowait() == event
+            assert queue.empty()
+
+        await feed.stop()
+        conn.close.assert_awaited_once()
+        assert not feed.listening
+
+    @pytest.mark.asyncio
+    async def test_start_survives_unreachable_database(self):
+        feed = ChangeFeed()
+
+        with (
+            patch.object(change_feed.asyncpg, 'connect', AsyncMock(side_effect=OSError('refused'))),
+            patch.object(change_feed, '_RECONNECT_DELAY', 3600),
+        ):
+            await feed.start('postgresql://localhost/test')
+
+        assert not feed.listening
+        assert feed._reconnect_task is not None
+        await feed.stop()
+        assert feed._reconnect_task is None
+
+    @pytest.mark.asyncio
+    async def test_reconnect_sends_resync(self):
+        conn = MagicMock()
+        conn.add_listener = AsyncMock()
+        feed = ChangeFeed()
+        feed._database_url = 'postgresql://localhost/test'
+
+        with (
+            patch.object(change_feed.asyncpg, 'connect', AsyncMock(return_value=conn)),
+            patch.object(change_feed, '_RECONNECT_DELAY', 0),
+            feed.subscribe({'page:a'}) as queue,
+        ):
+            await feed._reconnect()
+
+            assert queue.get_nowait() == RESYNC_EVENT
+        assert feed.listening
@@ -0,0 +1,44 @@
+"""Tests for database pool setup."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from saegim.core import database
+
+
+class TestJsonCodecs:
+    @pytest.mark.asyncio
+    async def test_registers_json_and_jsonb_codecs(self):
+        conn = MagicMock()
+        conn.set_type_codec = AsyncMock()
+
+        await database._init_connection(conn)
+
+        registered = [call.args[0] for call in conn.set_type_codec.await_args_list]
+        assert registered == ['json', 'jsonb']
+        codec = conn.set_type_codec.await_args.kwargs
+        assert codec['schema'] == 'pg_catalog'
+        assert codec['decoder']('{"layout_dets": []}') == {'layout_dets': []}
+        assert codec['decoder'](codec['encoder']({'text': '본문'})) == {'text': '본문'}
+
+    @pytest.mark.asyncio
+    async def test_codecs_use_orjson(self):
+        conn = MagicMock()
+        conn.set_type_codec = AsyncMock()
+
+        await database._init_connection(conn)
+
+        codec = conn.set_type_codec.await_args.kwargs
+        assert codec['decoder'] is database.orjson.loads
+        encoded = codec['encoder']({'order_map': {3: 1}, 'text': '본문'})
+        # asyncpg sends JSON parameters as text, with stdlib-compatible keys
+        assert encoded == '{"order_map":{"3":1},"text":"본문"}'
+
+    @pytest.mark.asyncio
+    async def test_pool_connections_use_codecs(self):
+        with patch.object(database.asyncpg, 'create_pool', new_callable=AsyncMock) as create:
+            await database.create_pool('postgresql://localhost/test')
+
+        assert create.await_args.kwargs['init'] is database._init_connection
+        database._pool = None
@@ -0,0 +1,134 @@
+"""Database tests of the page_elements split in migrations/001_init.sql.
+
+These run the migration against a real PostgreSQL database inside a
+transaction that is rolled back, so the database is left untouched. They are
+skipped unless ``SAEGIM_TEST_DATABASE_URL`` is set.
+"""
+
+import json
+import os
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import asyncpg
+import pytest
+
+DATABASE_URL = os.environ.get('SAEGIM_TEST_DATABASE_URL', '')
+MIGRATION = Path(__file__).resolve().parents[2] / 'migrations' / '001_init.sql'
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason='SAEGIM_TEST_DATABASE_URL not set')
+
+FULL_DET = {
+    'category_type': 'text_block',
+    'poly': [100, 200, 300, 200, 300, 400, 100, 400],
+    'ignore': False,
+    'order': 2,
+    'anno_id': 5,
+    'text': '본문 텍스트',
+    'attribute': {'text_language': 'text_ko', 'text_background': 'white'},
+    'line_with_spans': [],
+    'merge_list': [],
+    'latex': '',
+    'html': '',
+}
+
+# Keys with an unexpected JSON type stay in page_elements.extra
+ODD_DET = {'anno_id': '7', 'order': 1.5, 'poly': None, 'text': 3, 'custom': {'a': 1}}
+
+
+@asynccontextmanager
+async def _migrated() -> AsyncIterator[asyncpg.Connection]:
+    """Connect, run the migration and roll everything back afterwards.
+
+    Yields:
+        asyncpg.Connection: Connection inside the migrated transaction.
+    """
+    conn = await asyncpg.connect(DATABASE_URL)
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        await conn.execute(MIGRATION.read_text())
+        yield conn
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+
+async def _create_page(conn: asyncpg.Connection, annotation_data: dict) -> uuid.UUID:
+    project_id = await conn.fetchval("INSERT INTO projects (name) VALUES ('db test') RETURNING id")
+    document_id = await conn.fetchval(
+        "INSERT INTO documents (project_id, filename, pdf_path) VALUES ($1, 'a.pdf', '/a.pdf') "
+        'RETURNING id',
+        project_id,
+    )
+    return await conn.fetchval(
+        'INSERT INTO pages (document_id, page_no, annotation_data) VALUES ($1, 1, $2::jsonb) '
+        'RETURNING id',
+        document_id,
+        json.dumps(annotation_data),
+    )
+
+
+class TestLayoutDetRoundTrip:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('det', [FULL_DET, ODD_DET, {}])
+    async def test_element_json_restores_det(self, det):
+        async with _migrated() as conn:
+            restored = await conn.fetchval(
+                'SELECT page_element_json(layout_det_row($1, 0, $2::jsonb))::text',
+                uuid.uuid4(),
+                json.dumps(det),
+            )
+
+        assert json.loads(restored) == det
+
+    @pytest.mark.asyncio
+    async def test_typed_keys_go_to_columns(self):
+        async with _migrated() as conn:
+            row = await conn.fetchrow(
+                'SELECT (r).anno_id, (r).reading_order, (r).text, (r).extra::text AS extra '
+                'FROM (SELECT layout_det_row($1, 0, $2::jsonb) AS r) s',
+                uuid.uuid4(),
+                json.dumps(FULL_DET),
+            )
+
+        assert (row['anno_id'], row['reading_order'], row['text']) == (5, 2, '본문 텍스트')
+        assert set(json.loads(row['extra'])) == {'line_with_spans', 'merge_list'}
+
+
+class TestLayoutDetsMove:
+    @pytest.mark.asyncio
+    async def test_migration_moves_embedded_layout_dets(self):
+        annotation = {
+            'layout_dets': [FULL_DET, ODD_DET],
+            'page_attribute': {'language': 'ko'},
+            'extra': {'relation': []},
+        }
+        async with _migrated() as conn:
+            page_id = await _create_page(conn, annotation)
+            # Pages written before the split still embed their elements
+            await conn.execute(MIGRATION.read_text())
+
+            stored = await conn.fetchval(
+                'SELECT annotation_data::text FROM pages WHERE id = $1', page_id
+            )
+            positions = await conn.fetch(
+                'SELECT position FROM page_elements WHERE page_id = $1 ORDER BY position',
+                page_id,
+            )
+            assembled = await conn.fetchval(
+                'SELECT annotation_data::text FROM page_annotations WHERE page_id = $1', page_id
+            )
+
+        assert json.loads(stored)['layout_dets'] == []
+        assert [record['position'] for record in positions] == [0, 1]
+        assert json.loads(assembled) == annotation
+
+    @pytest.mark.asyncio
+    async def test_annotation_gin_index_dropped(self):
+        async with _migrated() as conn:
+            exists = await conn.fetchval("SELECT to_regclass('idx_pages_annotation') IS NOT NULL")
+
+        assert not exists
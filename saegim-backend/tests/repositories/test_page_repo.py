@@ -0,0 +1,428 @@
+"""Tests for page repository functions."""
+
+import datetime
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from saegim.repositories import page_repo
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    conn.fetchrow = AsyncMock()
+    conn.fetchval = AsyncMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.execute = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    conn.transaction.return_value = transaction
+    return conn
+
+
+@pytest.fixture
+def mock_pool(mock_conn):
+    pool = MagicMock()
+    acquire = MagicMock()
+    acquire.__aenter__ = AsyncMock(return_value=mock_conn)
+    acquire.__aexit__ = AsyncMock(return_value=False)
+    pool.acquire.return_value = acquire
+    return pool
+
+
+class TestPatchAnnotation:
+    @pytest.mark.asyncio
+    async def test_locks_row_and_stores_result(self, mock_pool, mock_conn):
+        page_id = uuid.uuid4()
+        updated = {
+            'id': page_id,
+            'status': 'pending',
+            'updated_at': datetime.datetime.now(tz=datetime.UTC),
+        }
+        mock_conn.fetchrow.side_effect = [
+            {'annotation_data': {'layout_dets': []}},
+            updated,
+        ]
+
+        result = await page_repo.patch_annotation(
+            mock_pool, page_id, lambda data: {**data, 'extra': {}}
+        )
+
+        assert result == updated
+        select_sql = mock_conn.fetchrow.await_args_list[0].args[0]
+        assert 'FOR UPDATE' in select_sql
+        update_args = mock_conn.fetchrow.await_args_list[1].args
+        assert update_args[1] == {'layout_dets': [], 'extra': {}}
+        assert update_args[2] == page_id
+
+    @pytest.mark.asyncio
+    async def test_writes_only_changed_elements(self, mock_pool, mock_conn):
+        page_id = uuid.uuid4()
+        dets = [{'anno_id': 0, 'text': 'a'}, {'anno_id': 1, 'text': 'b'}]
+        mock_conn.fetchrow.side_effect = [
+            {'annotation_data': {'layout_dets': dets}},
+            {'id': page_id},
+        ]
+        mock_conn.fetch.return_value = [
+            {'position': 0, 'det': dict(dets[0])},
+            {'position': 1, 'det': dict(dets[1])},
+        ]
+
+        def apply(data):
+            data['layout_dets'][1]['text'] = 'changed'
+            return data
+
+        await page_repo.patch_annotation(mock_pool, page_id, apply)
+
+        stored = mock_conn.fetchrow.await_args_list[1].args[1]
+        assert stored == {'layout_dets': []}
+        upsert_args = mock_conn.execute.await_args.args
+        assert 'layout_det_row' in upsert_args[0]
+        assert upsert_args[2] == [[1, {'anno_id': 1, 'text': 'changed'}]]
+
+    @pytest.mark.asyncio
+    async def test_missing_page(self, mock_pool, mock_conn):
+        mock_conn.fetchrow.return_value = None
+        apply = MagicMock()
+
+        result = await page_repo.patch_annotation(mock_pool, uuid.uuid4(), apply)
+
+        assert result is None
+        apply.assert_not_called()
+        assert mock_conn.fetchrow.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_null_annotation_patched_as_empty_object(self, mock_pool, mock_conn):
+        mock_conn.fetchrow.side_effect = [{'annotation_data': None}, {'id': uuid.uuid4()}]
+        apply = MagicMock(return_value={})
+
+        await page_repo.patch_annotation(mock_pool, uuid.uuid4(), apply)
+
+        apply.assert_called_once_with({})
+
+    @pytest.mark.asyncio
+    async def test_full_rereads_page(self, mock_pool, mock_conn):
+        page = {'id': uuid.uuid4(), 'annotation_data': {'layout_dets': []}}
+        mock_conn.fetchrow.side_effect = [{'annotation_data': {}}, {'id': page['id']}, page]
+
+        result = await page_repo.patch_annotation(mock_pool, page['id'], dict, full=True)
+
+        assert result == page
+        assert 'page_annotation(id, annotation_data)' in mock_conn.fetchrow.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_stale_version_not_locked(self, mock_pool, mock_conn):
+        mock_conn.fetchrow.return_value = None
+        apply = MagicMock()
+
+        result = await page_repo.patch_annotation(
+            mock_pool, uuid.uuid4(), apply, expected_version=3
+        )
+
+        assert result is None
+        apply.assert_not_called()
+        select_args = mock_conn.fetchrow.await_args_list[0].args
+        assert 'version = $2' in select_args[0]
+        assert select_args[2] == 3
+
+
+class TestElementStorage:
+    @pytest.mark.asyncio
+    async def test_update_stores_elements_as_rows(self, mock_pool, mock_conn):
+        page_id = uuid.uuid4()
+        mock_conn.fetchrow.return_value = {'id': page_id}
+        annotation = {'layout_dets': [{'anno_id': 0}], 'page_attribute': {'language': 'ko'}}
+
+        await page_repo.update_annotation(mock_pool, page_id, annotation)
+
+        stored = mock_conn.fetchrow.await_args_list[0].args[1]
+        assert stored == {'layout_dets': [], 'page_attribute': {'language': 'ko'}}
+        upsert_args = mock_conn.execute.await_args.args
+        assert upsert_args[2] == [[0, {'anno_id': 0}]]
+
+    @pytest.mark.asyncio
+    async def test_update_deletes_trailing_elements(self, mock_pool, mock_conn):
+        page_id = uuid.uuid4()
+        mock_conn.fetchrow.return_value = {'id': page_id}
+        mock_conn.fetch.return_value = [
+            {'position': 0, 'det': {'anno_id': 0}},
+            {'position': 1, 'det': {'anno_id': 1}},
+        ]
+
+        await page_repo.update_annotation(mock_pool, page_id, {'layout_dets': [{'anno_id': 0}]})
+
+        mock_conn.execute.assert_awaited_once()
+        sql, _, position = mock_conn.execute.await_args.args
+        assert sql.startswith('DELETE FROM page_elements')
+        assert position == 1
+
+    @pytest.mark.asyncio
+    async def test_update_missing_page_writes_no_elements(self, mock_pool, mock_conn):
+        mock_conn.fetchrow.return_value = None
+
+        result = await page_repo.update_annotation(
+            mock_pool, uuid.uuid4(), {'layout_dets': [{'anno_id': 0}]}
+        )
+
+        assert result is None
+        mock_conn.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_update_sparse_skips_page_reread(self, mock_pool, mock_conn):
+        state = {'id': uuid.uuid4(), 'version': 2}
+        mock_conn.fetchrow.return_value = state
+
+        result = await page_repo.update_annotation(mock_pool, state['id'], {}, full=False)
+
+        assert result == state
+        assert mock_conn.fetchrow.await_count == 1
+        sql = mock_conn.fetchrow.await_args.args[0]
+        assert 'RETURNING id, status, updated_at, version' in sql
+
+    @pytest.mark.asyncio
+    async def test_add_element_inserts_one_row(self, mock_pool, mock_conn):
+        page_id = uuid.uuid4()
+        mock_conn.fetchval.return_value = page_id
+
+        await page_repo.add_element(mock_pool, page_id, {'anno_id': 3})
+
+        sql, row_page_id, element = mock_conn.fetchrow.await_args_list[0].args
+        assert 'INSERT INTO page_elements' in sql
+        assert row_page_id == page_id
+        assert element == {'anno_id': 3}
+        assert mock_conn.fetchrow.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_add_element_allocates_anno_id_and_order(self, mock_pool, mock_conn):
+        mock_conn.fetchval.return_value = uuid.uuid4()
+
+        await page_repo.add_element(mock_pool, uuid.uuid4(), {'category_type': 'figure'})
+
+        lock_sql = mock_conn.fetchval.await_args.args[0]
+        insert_sql = mock_conn.fetchrow.await_args_list[0].args[0]
+        assert lock_sql.lstrip().startswith('UPDATE pages')
+        assert 'MAX(anno_id) + 1' in insert_sql
+        assert "jsonb_build_object('anno_id', next.anno_id, 'order', next.reading_order)" in (
+            insert_sql
+        )
+
+    @pytest.mark.asyncio
+    async def test_add_element_sparse_returns_added_element(self, mock_pool, mock_conn):
+        mock_conn.fetchval.return_value = uuid.uuid4()
+        added = {'id': uuid.uuid4(), 'version': 2, 'element': {'anno_id': 4}}
+        mock_conn.fetchrow.return_value = added
+
+        result = await page_repo.add_element(mock_pool, uuid.uuid4(), {}, full=False)
+
+        assert result == added
+        assert mock_conn.fetchrow.await_count == 1
+        assert (
+            'RETURNING page_element_json(e) AS element' in (mock_conn.fetchrow.await_args.args[0])
+        )
+
+    @pytest.mark.asyncio
+    async def test_delete_element_deletes_rows_by_anno_id(self, mock_pool, mock_conn):
+        page_id = uuid.uuid4()
+        mock_conn.fetchrow.return_value = {'id': page_id}
+
+        await page_repo.delete_element(mock_pool, page_id, 3)
+
+        mock_conn.execute.assert_awaited_once_with(
+            'DELETE FROM page_elements WHERE page_id = $1 AND anno_id = $2', page_id, 3
+        )
+
+    @pytest.mark.asyncio
+    async def test_accept_splits_auto_extracted_elements(self, mock_pool, mock_conn):
+        page_id = uuid.uuid4()
+        auto = {'layout_dets': [{'anno_id': 0}, {'anno_id': 1}], 'extra': {'relation': []}}
+        mock_conn.fetchrow.side_effect = [{'auto_extracted_data': auto}, {}]
+
+        await page_repo.accept_auto_extracted(mock_pool, page_id)
+
+        accept_sql = mock_conn.fetchrow.await_args_list[0].args[0]
+        assert 'NOT EXISTS (SELECT 1 FROM page_elements' in accept_sql
+        upsert_args = mock_conn.execute.await_args.args
+        assert upsert_args[2] == [[0, {'anno_id': 0}], [1, {'anno_id': 1}]]
+
+    @pytest.mark.asyncio
+    async def test_accept_drops_ensemble_engine_results(self, mock_pool, mock_conn):
+        mock_conn.fetchrow.side_effect = [{'auto_extracted_data': {'layout_dets': []}}, {}]
+
+        await page_repo.accept_auto_extracted(mock_pool, uuid.uuid4())
+
+        accept_sql = mock_conn.fetchrow.await_args_list[0].args[0]
+        assert "END #- '{extra,engine_results}' #- '{extra,engine_errors}'," in accept_sql
+        assert "jsonb_set(auto_extracted_data, '{layout_dets}', '[]'::jsonb)" in accept_sql
+
+
+class TestSparseReturning:
+    @pytest.mark.asyncio
+    async def test_relation_returns_full_page_by_default(self, mock_pool):
+        mock_pool.fetchrow = AsyncMock(return_value=None)
+
+        await page_repo.add_relation(mock_pool, uuid.uuid4(), {'source_anno_id': 0})
+
+        sql = mock_pool.fetchrow.await_args.args[0]
+        assert 'auto_extracted_data' in sql
+        assert "'{extra,relation}'" in sql
+
+    @pytest.mark.asyncio
+    async def test_relation_sparse_returns_page_state(self, mock_pool):
+        mock_pool.fetchrow = AsyncMock(return_value=None)
+
+        await page_repo.delete_relation(mock_pool, uuid.uuid4(), 0, 1, full=False)
+
+        sql = mock_pool.fetchrow.await_args.args[0]
+        assert 'RETURNING id, status, updated_at, version' in sql
+        assert 'auto_extracted_data' not in sql
+
+    @pytest.mark.asyncio
+    async def test_page_attribute_sparse_returns_page_state(self, mock_pool):
+        mock_pool.fetchrow = AsyncMock(return_value=None)
+
+        await page_repo.update_page_attribute(mock_pool, uuid.uuid4(), {}, full=False)
+
+        sql = mock_pool.fetchrow.await_args.args[0]
+        assert "'{page_attribute}'" in sql
+        assert 'auto_extracted_data' not in sql
+
+
+class TestJsonReads:
+    @pytest.mark.asyncio
+    async def test_page_context_decodes_json_by_default(self, mock_pool):
+        mock_pool.fetchrow = AsyncMock(return_value=None)
+
+        await page_repo.get_by_id_with_context(mock_pool, uuid.uuid4())
+
+        sql = mock_pool.fetchrow.await_args.args[0]
+        assert '::text' not in sql
+
+    @pytest.mark.asyncio
+    async def test_page_context_raw_json_selects_text(self, mock_pool):
+        mock_pool.fetchrow = AsyncMock(return_value=None)
+
+        await page_repo.get_by_id_with_context(mock_pool, uuid.uuid4(), raw_json=True)
+
+        sql = mock_pool.fetchrow.await_args.args[0]
+        assert 'page_annotation(p.id, p.annotation_data)::text AS annotation_data' in sql
+        assert 'p.auto_extracted_data::text AS auto_extracted_data' in sql
+
+    @pytest.mark.asyncio
+    async def test_page_list_built_as_json_array(self, mock_pool):
+        mock_pool.fetchval = AsyncMock(return_value='[]')
+        document_id = uuid.uuid4()
+
+        result = await page_repo.list_by_document_json(mock_pool, document_id)
+
+        assert result == '[]'
+        sql, arg = mock_pool.fetchval.await_args.args
+        assert 'json_agg(' in sql
+        assert 'ORDER BY page_no' in sql
+        assert arg == document_id
+
+    @pytest.mark.asyncio
+    async def test_export_entries_move_page_attribute_into_page_info(self, mock_pool):
+        mock_pool.fetch = AsyncMock(return_value=[])
+
+        await page_repo.get_export_entries(mock_pool, uuid.uuid4())
+
+        sql = mock_pool.fetch.await_args.args[0]
+        assert "COALESCE(pa.annotation_data, '{}'::jsonb) #- '{extra,engine_results}'" in sql
+        assert ") - 'page_attribute'" in sql
+        assert "'page_info', jsonb_build_object(" in sql
+        assert ')::text AS entry' in sql
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'read',
+        [page_repo.list_by_document_for_export, page_repo.get_all_by_project_with_document],
+    )
+    async def test_zip_exports_drop_ensemble_engine_results(self, mock_pool, read):
+        mock_pool.fetch = AsyncMock(return_value=[])
+
+        await read(mock_pool, uuid.uuid4())
+
+        sql = mock_pool.fetch.await_args.args[0]
+        assert (
+            "pa.annotation_data #- '{extra,engine_results}' #- '{extra,engine_errors}'"
+            ' AS annotation_data'
+        ) in sql
+
+
+class TestVersioning:
+    @pytest.mark.asyncio
+    async def test_update_bumps_version_and_checks_expected(self, mock_pool, mock_conn):
+        mock_conn.fetchrow.return_value = None
+        page_id = uuid.uuid4()
+
+        await page_repo.update_annotation(mock_pool, page_id, {}, expected_version=4)
+
+        sql, *args = mock_conn.fetchrow.await_args.args
+        assert 'version = version + 1' in sql
+        assert '($3::int IS NULL OR version = $3)' in sql
+        assert args == [{}, page_id, 4]
+
+    @pytest.mark.asyncio
+    async def test_update_without_expected_version(self, mock_pool, mock_conn):
+        mock_conn.fetchrow.return_value = None
+
+        await page_repo.update_annotation(mock_pool, uuid.uuid4(), {})
+
+        assert mock_conn.fetchrow.await_args.args[-1] is None
+
+    @pytest.mark.asyncio
+    async def test_get_version(self, mock_pool):
+        mock_pool.fetchval = AsyncMock(return_value=7)
+
+        assert await page_repo.get_version(mock_pool, uuid.uuid4()) == 7
+
+
+class TestPartialResults:
+    @pytest.mark.asyncio
+    async def test_partial_write_leaves_complete_result(self, mock_pool):
+        mock_pool.execute = AsyncMock()
+        page_id = uuid.uuid4()
+        partial = {'layout_dets': [], 'extra': {'partial': True}}
+
+        await page_repo.update_partial_extracted_data(mock_pool, page_id, partial)
+
+        sql, *args = mock_pool.execute.await_args.args
+        assert 'SET partial_extracted_data = $1::jsonb' in sql
+        assert 'auto_extracted_data' not in sql
+        assert args == [partial, page_id]
+
+    @pytest.mark.asyncio
+    async def test_final_result_clears_partial(self, mock_pool):
+        mock_pool.fetchrow = AsyncMock(return_value=None)
+
+        await page_repo.update_auto_extracted_data(mock_pool, uuid.uuid4(), {'layout_dets': []})
+
+        assert 'partial_extracted_data = NULL' in mock_pool.fetchrow.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_clear_partials_of_document(self, mock_pool):
+        mock_pool.execute = AsyncMock()
+        document_id = uuid.uuid4()
+
+        await page_repo.clear_partial_extracted_data(mock_pool, document_id)
+
+        sql, arg = mock_pool.execute.await_args.args
+        assert 'SET partial_extracted_data = NULL' in sql
+        assert arg == document_id
+
+
+class TestDuplicateCandidates:
+    @pytest.mark.asyncio
+    async def test_requires_result_of_same_engine(self, mock_pool):
+        mock_pool.fetch = AsyncMock(return_value=[])
+        document_id = uuid.uuid4()
+
+        await page_repo.list_duplicate_candidates(mock_pool, document_id, 'a' * 64)
+
+        sql, *args = mock_pool.fetch.await_args.args
+        assert 'JOIN page_extraction_results r ON r.page_id = p.id AND r.engine_key = $2' in sql
+        assert 'auto_extracted_data' not in sql
+        assert args == [document_id, 'a' * 64]
@@ -85,6 +85,28 @@ class TestEngineInstance:
         )
         assert instance.engine_type == 'split_pipeline'
 
+    def test_split_pipeline_layout_runtime_options(self):
+        instance = EngineInstance(
+            engine_type='split_pipeline',
+            name='PP-DocLayout CPU',
+            config={
+                'layout_provider': 'pp_doclayout',
+                'ocr_provider': 'gemini',
+                'layout_device': 'cuda:1',
+                'layout_num_threads': 4,
+                'layout_max_concurrency': 2,
+            },
+        )
+        assert instance.config['layout_device'] == 'cuda:1'
+
+    def test_split_pipeline_invalid_layout_device(self):
+        with pytest.raises(ValidationError):
+            EngineInstance(
+                engine_type='split_pipeline',
+                name='Bad device',
+                config={'ocr_provider': 'gemini', 'layout_device': 'gpu0'},
+            )
+
     def test_invalid_engine_type_pdfminer(self):
         with pytest.raises(ValidationError):
             EngineInstance(
@@ -169,6 +191,36 @@ class TestEngineInstance:
                 config={'api_key': 'key'},
             )
 
+    def test_ensemble_config(self):
+        instance = EngineInstance(
+            engine_type='ensemble',
+            name='Layout + Gemini',
+            config={
+                'engine_ids': ['pp-layout', 'gemini'],
+                'box_engine_id': 'pp-layout',
+                'text_preferences': {'table': ['gemini']},
+            },
+        )
+        assert instance.engine_type == 'ensemble'
+
+    def test_ensemble_requires_two_engines(self):
+        with pytest.raises(ValidationError):
+            EngineInstance(engine_type='ensemble', name='Solo', config={'engine_ids': ['a']})
+
+    def test_ensemble_rejects_unknown_references(self):
+        with pytest.raises(ValidationError, match='box_engine_id'):
+            EngineInstance(
+                engine_type='ensemble',
+                name='Bad box',
+                config={'engine_ids': ['a', 'b'], 'box_engine_id': 'c'},
+            )
+        with pytest.raises(ValidationError, match='unknown engines'):
+            EngineInstance(
+                engine_type='ensemble',
+                name='Bad prefs',
+                config={'engine_ids': ['a', 'b'], 'text_preferences': {'table': ['c']}},
+            )
+
 
 class TestEngineInstanceCreate:
     def test_auto_generate_id(self):
@@ -7,6 +7,7 @@ from saegim.services.adapters.chandra import (
     elements_to_page_ir,
     loads_lenient,
     parse_openai_response,
+    parse_partial_elements,
     strip_markdown_fences,
 )
 from saegim.services.docir import Geometry, PageIR
@@ -137,6 +138,31 @@ class TestParseOpenaiResponse:
         assert parsed[0]['category_type'] == 'title'
 
 
+class TestParsePartialElements:
+    def test_drops_truncated_trailing_element(self):
+        text = '[{"category_type": "title", "text": "A"}, {"category_type": "text_block", "te'
+        elements = parse_partial_elements(text)
+        assert elements == [{'category_type': 'title', 'text': 'A'}]
+
+    def test_keeps_element_closed_before_comma(self):
+        text = '```json\n[{"category_type": "title", "text": "A"},'
+        assert parse_partial_elements(text) == [{'category_type': 'title', 'text': 'A'}]
+
+    def test_complete_array(self):
+        text = '[{"text": "A"}, {"text": "B"}]'
+        assert len(parse_partial_elements(text)) == 2
+
+    def test_empty_and_garbage(self):
+        assert parse_partial_elements('') == []
+        assert parse_partial_elements('not json') == []
+
+    def test_adapter_parse_partial(self):
+        text = '[{"category_type": "title", "bbox": [1, 2, 3, 4], "text": "A"}, {"cat'
+        page = ChandraAdapter().parse_partial(text, 800, 1200)
+        assert len(page.elements) == 1
+        assert page.elements[0].geometry == Geometry(bbox=(1.0, 2.0, 3.0, 4.0))
+
+
 class TestStripMarkdownFences:
     def test_no_fences(self):
         assert strip_markdown_fences('[{"key": "val"}]') == '[{"key": "val"}]'
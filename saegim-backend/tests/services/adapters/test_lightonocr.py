@@ -138,6 +138,18 @@ class TestParseResponse:
         assert page.elements[1].kind == 'figure'
 
 
+class TestParsePartial:
+    def test_ignores_incomplete_last_line(self):
+        adapter = LightOnOcrAdapter()
+        page = adapter.parse_partial('First line\nSecond li', 1000, 1000)
+        assert len(page.elements) == 1
+        assert page.elements[0].text == 'First line'
+
+    def test_no_complete_line(self):
+        page = LightOnOcrAdapter().parse_partial('partial', 1000, 1000)
+        assert page.elements == ()
+
+
 class TestNormalizeToPixel:
     def test_origin(self):
         assert _normalize_to_pixel(0, 0, 1000, 2000) == (0.0, 0.0)
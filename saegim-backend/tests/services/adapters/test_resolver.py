@@ -42,3 +42,9 @@ class TestResolveAdapter:
     def test_paddleocr_vl_underscore(self):
         adapter = resolve_adapter('custom/paddleocr_vl_model')
         assert isinstance(adapter, PaddleOcrVlAdapter)
+
+    def test_adapters_declare_image_encoding(self):
+        for model in ('datalab-to/chandra', 'lightonai/LightOnOCR-2-1B', 'PaddleOCR-VL'):
+            encoding = resolve_adapter(model).image_encoding
+            assert encoding.max_side is not None
+            assert encoding.format in ('png', 'jpeg', 'webp')
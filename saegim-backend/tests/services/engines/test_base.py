@@ -43,3 +43,37 @@ class TestBaseOCREngine:
 
         engine = ConcreteEngine()
         assert isinstance(engine, BaseOCREngine)
+
+    def test_extract_page_streaming_defaults_to_extract_page(self):
+        class ConcreteEngine(BaseOCREngine):
+            def extract_page(
+                self, image_path: Path, page_width: int, page_height: int
+            ) -> dict[str, Any]:
+                return {'layout_dets': [{'text': 'final'}], 'page_attribute': {}, 'extra': {}}
+
+            def test_connection(self) -> tuple[bool, str]:
+                return (True, 'ok')
+
+        partials = []
+        result = ConcreteEngine().extract_page_streaming(
+            Path('/fake/image.png'), 100, 100, partials.append
+        )
+
+        assert result['layout_dets'] == [{'text': 'final'}]
+        assert partials == []
+
+    def test_extract_pages_defaults_to_page_loop(self):
+        class ConcreteEngine(BaseOCREngine):
+            def extract_page(
+                self, image_path: Path, page_width: int, page_height: int
+            ) -> dict[str, Any]:
+                return {'layout_dets': [{'text': image_path.name}], 'extra': {}}
+
+            def test_connection(self) -> tuple[bool, str]:
+                return (True, 'ok')
+
+        engine = ConcreteEngine()
+        results = engine.extract_pages([(Path('/a.png'), 10, 10), (Path('/b.png'), 10, 10)])
+
+        assert engine.batch_size == 1
+        assert [r['layout_dets'][0]['text'] for r in results] == ['a.png', 'b.png']
@@ -0,0 +1,143 @@
+"""Tests for the ensemble engine."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from saegim.services.engines.base import BaseOCREngine
+from saegim.services.engines.ensemble_engine import EnsembleEngine, merge_results
+from saegim.services.exporters.omnidocbench import bbox_to_poly
+
+
+def _det(bbox, category='text_block', **content):
+    return {'category_type': category, 'poly': bbox_to_poly(bbox), 'order': 0, **content}
+
+
+def _page(*dets):
+    return {'layout_dets': list(dets), 'page_attribute': {}, 'extra': {'relation': []}}
+
+
+def _member(result=None, error=None):
+    member = MagicMock(spec=BaseOCREngine)
+    member.batch_size = 1
+    if error is not None:
+        member.extract_pages.side_effect = error
+    else:
+        member.extract_pages.side_effect = lambda pages: [result for _ in pages]
+    return member
+
+
+class TestMergeResults:
+    def test_boxes_from_box_engine_text_from_preference(self):
+        layout = _page(
+            _det((10, 10, 200, 50), 'title'),
+            _det((10, 60, 200, 300), 'table'),
+        )
+        vlm = _page(
+            _det((12, 11, 198, 52), 'title', text='Report'),
+            _det((8, 58, 205, 310), 'table', html='<table></table>'),
+        )
+
+        merged = merge_results(
+            {'layout': layout, 'vlm': vlm},
+            box_engine_id='layout',
+            text_preferences={'table': ['vlm']},
+        )
+
+        dets = merged['layout_dets']
+        assert len(dets) == 2
+        assert dets[0]['poly'] == bbox_to_poly((10, 10, 200, 50))
+        assert dets[0]['text'] == 'Report'
+        assert dets[1]['category_type'] == 'table'
+        assert dets[1]['html'] == '<table></table>'
+        assert [d['anno_id'] for d in dets] == [0, 1]
+
+    def test_preference_order_picks_content(self):
+        first = _page(_det((0, 0, 100, 100), text='first'))
+        second = _page(_det((0, 0, 100, 100), text='second'))
+
+        default = merge_results({'a': first, 'b': second})
+        preferred = merge_results({'a': first, 'b': second}, text_preferences={'text_block': ['b']})
+
+        assert default['layout_dets'][0]['text'] == 'first'
+        assert preferred['layout_dets'][0]['text'] == 'second'
+
+    def test_falls_back_to_engine_with_content(self):
+        boxes_only = _page(_det((0, 0, 100, 100)))
+        with_text = _page(_det((0, 0, 100, 100), text='found'))
+
+        merged = merge_results({'layout': boxes_only, 'vlm': with_text})
+
+        assert merged['layout_dets'][0]['text'] == 'found'
+
+    def test_unmatched_regions_are_kept(self):
+        a = _page(_det((0, 0, 100, 100), text='shared'))
+        b = _page(_det((0, 0, 100, 100), text='shared'), _det((0, 500, 100, 600), text='only b'))
+
+        merged = merge_results({'a': a, 'b': b})
+
+        assert [d.get('text') for d in merged['layout_dets']] == ['shared', 'only b']
+
+    def test_raw_results_and_errors_kept(self):
+        a = _page(_det((0, 0, 100, 100), text='x'))
+
+        merged = merge_results({'a': a}, errors={'b': 'timeout'})
+
+        assert merged['extra']['engine_results'] == {'a': a}
+        assert merged['extra']['engine_errors'] == {'b': 'timeout'}
+
+
+class TestEnsembleEngine:
+    def test_runs_all_members_and_merges(self, tmp_path):
+        a = _member(_page(_det((0, 0, 100, 100), text='from a')))
+        b = _member(_page(_det((0, 0, 100, 100), text='from b')))
+        engine = EnsembleEngine({'a': a, 'b': b}, text_preferences={'text_block': ['b']})
+
+        results = engine.extract_pages(
+            [(tmp_path / 'p1.png', 100, 100), (tmp_path / 'p2.png', 100, 100)]
+        )
+
+        assert len(results) == 2
+        assert results[0]['layout_dets'][0]['text'] == 'from b'
+        a.extract_pages.assert_called_once()
+        b.extract_pages.assert_called_once()
+
+    def test_failed_member_is_skipped(self, tmp_path):
+        a = _member(error=RuntimeError('down'))
+        b = _member(_page(_det((0, 0, 100, 100), text='from b')))
+        engine = EnsembleEngine({'a': a, 'b': b})
+
+        result = engine.extract_page(tmp_path / 'p1.png', 100, 100)
+
+        assert result['layout_dets'][0]['text'] == 'from b'
+        assert result['extra']['engine_errors'] == {'a': 'down'}
+
+    def test_all_members_failing_raises(self, tmp_path):
+        engine = EnsembleEngine({'a': _member(error=RuntimeError('down'))})
+
+        with pytest.raises(RuntimeError, match='down'):
+            engine.extract_page(tmp_path / 'p1.png', 100, 100)
+
+    def test_forwards_pdf_text_layer(self):
+        a, b = _member(), _member()
+        engine = EnsembleEngine({'a': a, 'b': b})
+
+        engine.use_pdf_text_layer(Path('doc.pdf'), {Path('p1.png'): 0})
+
+        a.use_pdf_text_layer.assert_called_once_with(Path('doc.pdf'), {Path('p1.png'): 0})
+        b.use_pdf_text_layer.assert_called_once()
+
+    def test_connection_requires_all_members(self):
+        a, b = _member(), _member()
+        a.test_connection.return_value = (True, 'ok')
+        b.test_connection.return_value = (False, 'unreachable')
+
+        ok, message = EnsembleEngine({'a': a, 'b': b}).test_connection()
+
+        assert ok is False
+        assert message == 'a: ok | b: unreachable'
+
+    def test_unknown_box_engine_raises(self):
+        with pytest.raises(ValueError, match='not a member'):
+            EnsembleEngine({'a': _member()}, box_engine_id='b')
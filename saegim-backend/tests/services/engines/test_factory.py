@@ -5,6 +5,8 @@ from unittest.mock import patch
 import pytest
 
 from saegim.services.engines.factory import build_engine, build_engine_by_id
+from saegim.services.image_encoding import ImageEncoding
+from saegim.services.inference_options import InferenceOptions
 
 _MODULE = 'saegim.services.engines.factory'
 
@@ -173,6 +175,56 @@ class TestBuildEngineById:
         with pytest.raises(ValueError, match='Unknown engine_type'):
             build_engine_by_id(config)
 
+    @patch(f'{_MODULE}._build_vllm')
+    def test_ensemble_by_id(self, mock_build):
+        from saegim.services.engines.ensemble_engine import EnsembleEngine
+
+        vllm_entry = {'engine_type': 'vllm', 'name': 'vLLM', 'config': {'host': 'gpu'}}
+        config = {
+            'default_engine_id': 'combo',
+            'engines': {
+                'chandra': vllm_entry,
+                'olmocr': vllm_entry,
+                'combo': {
+                    'engine_type': 'ensemble',
+                    'name': 'Combo',
+                    'config': {'engine_ids': ['chandra', 'olmocr'], 'box_engine_id': 'olmocr'},
+                },
+            },
+        }
+        engine = build_engine_by_id(config)
+        assert isinstance(engine, EnsembleEngine)
+        assert mock_build.call_count == 2
+
+    def test_ensemble_missing_member_raises(self):
+        config = {
+            'default_engine_id': 'combo',
+            'engines': {
+                'combo': {
+                    'engine_type': 'ensemble',
+                    'name': 'Combo',
+                    'config': {'engine_ids': ['gone', 'also-gone']},
+                },
+            },
+        }
+        with pytest.raises(ValueError, match="member 'gone' not found"):
+            build_engine_by_id(config)
+
+    def test_nested_ensemble_raises(self):
+        config = {
+            'default_engine_id': 'outer',
+            'engines': {
+                'inner': {'engine_type': 'ensemble', 'name': 'Inner', 'config': {}},
+                'outer': {
+                    'engine_type': 'ensemble',
+                    'name': 'Outer',
+                    'config': {'engine_ids': ['inner']},
+                },
+            },
+        }
+        with pytest.raises(ValueError, match='itself an ensemble'):
+            build_engine_by_id(config)
+
 
 class TestSplitPipelineOcrConfigExtraction:
     @patch(f'{_MODULE}._build_split_pipeline')
@@ -228,3 +280,85 @@ class TestSplitPipelineLayoutProvider:
 
         _build_split_pipeline(config)
         assert mock_cls.call_args.kwargs['layout_provider'] == 'docling'
+
+    @patch(_SPLIT_ENGINE, autospec=True)
+    def test_crop_encoding_passed_to_engine(self, mock_cls):
+        mock_cls.return_value = mock_cls
+        config = {
+            'docling_model_name': 'ibm-granite/granite-docling-258M',
+            'ocr_provider': 'gemini',
+            'ocr_api_key': 'key',
+            'crop_format': 'jpeg',
+            'crop_quality': 80,
+            'crop_max_side': 1024,
+            'crop_grayscale': True,
+        }
+        from saegim.services.engines.factory import _build_split_pipeline
+
+        _build_split_pipeline(config)
+        assert mock_cls.call_args.kwargs['crop_encoding'] == ImageEncoding(
+            format='jpeg', quality=80, max_side=1024, grayscale=True
+        )
+
+    @patch(_SPLIT_ENGINE, autospec=True)
+    def test_layout_batch_size_passed_to_engine(self, mock_cls):
+        mock_cls.return_value = mock_cls
+        config = {
+            'docling_model_name': 'ibm-granite/granite-docling-258M',
+            'ocr_provider': 'gemini',
+            'ocr_api_key': 'key',
+            'layout_batch_size': 8,
+        }
+        from saegim.services.engines.factory import _build_split_pipeline
+
+        _build_split_pipeline(config)
+        assert mock_cls.call_args.kwargs['layout_batch_size'] == 8
+
+    @patch(_SPLIT_ENGINE, autospec=True)
+    def test_layout_options_passed_to_engine(self, mock_cls):
+        mock_cls.return_value = mock_cls
+        config = {
+            'ocr_provider': 'gemini',
+            'ocr_api_key': 'key',
+            'layout_device': 'cpu',
+            'layout_num_threads': 2,
+            'layout_max_concurrency': 1,
+        }
+        from saegim.services.engines.factory import _build_split_pipeline
+
+        _build_split_pipeline(config)
+        assert mock_cls.call_args.kwargs['layout_options'] == InferenceOptions(
+            device='cpu', num_threads=2, max_concurrency=1
+        )
+        assert mock_cls.call_args.kwargs['layout_server_url'] is None
+
+    @patch(_SPLIT_ENGINE, autospec=True)
+    def test_layout_server_url_passed_to_engine(self, mock_cls):
+        mock_cls.return_value = mock_cls
+        config = {
+            'ocr_provider': 'gemini',
+            'ocr_api_key': 'key',
+            'layout_server_url': 'http://127.0.0.1:5100',
+        }
+        from saegim.services.engines.factory import _build_split_pipeline
+
+        _build_split_pipeline(config)
+        assert mock_cls.call_args.kwargs['layout_server_url'] == 'http://127.0.0.1:5100'
+
+    @patch(_SPLIT_ENGINE, autospec=True)
+    def test_text_layer_regions_passed_to_engine(self, mock_cls):
+        mock_cls.return_value = mock_cls
+        config = {'ocr_provider': 'gemini', 'ocr_api_key': 'key', 'text_layer_regions': True}
+        from saegim.services.engines.factory import _build_split_pipeline
+
+        _build_split_pipeline(config)
+        assert mock_cls.call_args.kwargs['text_layer_regions'] is True
+
+    @patch(_SPLIT_ENGINE, autospec=True)
+    def test_reuse_repeated_regions_passed_to_engine(self, mock_cls):
+        mock_cls.return_value = mock_cls
+        config = {'ocr_provider': 'gemini', 'ocr_api_key': 'key', 'reuse_repeated_regions': True}
+        from saegim.services.engines.factory import _build_split_pipeline
+
+        _build_split_pipeline(config)
+        assert mock_cls.call_args.kwargs['reuse_repeated_regions'] is True
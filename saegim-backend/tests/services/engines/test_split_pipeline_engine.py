@@ -7,6 +7,11 @@ import pytest
 
 from saegim.services.engines.base import BaseOCREngine
 from saegim.services.engines.split_pipeline_engine import SplitPipelineEngine
+from saegim.services.image_encoding import DEFAULT_ENCODING
+from saegim.services.inference_options import DEFAULT_INFERENCE_OPTIONS
+from saegim.services.remote_layout_detector import RemoteLayoutDetector
+from saegim.services.repeated_regions import RepeatedRegionCache
+from saegim.services.text_layer import PdfRegionTextSource
 
 _MODULE = 'saegim.services.engines.split_pipeline_engine'
 
@@ -60,9 +65,16 @@ class TestSplitPipelineEngineInit:
             ocr_provider='gemini',
             ocr_config={'api_key': 'k'},
         )
-        mock_detector_cls.assert_called_once_with(model_name='ibm-granite/granite-docling-258M')
+        mock_detector_cls.assert_called_once_with(
+            model_name='ibm-granite/granite-docling-258M',
+            batch_size=1,
+            options=DEFAULT_INFERENCE_OPTIONS,
+        )
         mock_pipeline_cls.assert_called_once_with(
-            mock_detector_cls.return_value, mock_text_provider
+            mock_detector_cls.return_value,
+            mock_text_provider,
+            crop_encoding=DEFAULT_ENCODING,
+            repeated_regions=None,
         )
 
     @patch(f'{_MODULE}.OcrPipeline')
@@ -93,6 +105,86 @@ class TestSplitPipelineEngineInit:
         )
         assert engine._layout_provider_name == 'docling'
 
+    @patch(f'{_MODULE}.OcrPipeline', new=MagicMock())
+    @patch(f'{_MODULE}._create_text_provider')
+    def test_onnx_int8_layout_provider(self, mock_text):
+        mock_text.return_value = MagicMock()
+        with patch(
+            'saegim.services.pp_doclayout_onnx_service.PPDocLayoutV3OnnxDetector'
+        ) as mock_onnx:
+            SplitPipelineEngine(
+                docling_model_name='ibm-granite/granite-docling-258M',
+                ocr_provider='gemini',
+                ocr_config={'api_key': 'k'},
+                layout_provider='pp_doclayout_onnx_int8',
+            )
+        mock_onnx.assert_called_once_with(
+            batch_size=1, quantize=True, options=DEFAULT_INFERENCE_OPTIONS
+        )
+
+    @patch(f'{_MODULE}.OcrPipeline', new=MagicMock())
+    @patch(f'{_MODULE}.DoclingLayoutDetector')
+    @patch(f'{_MODULE}._create_text_provider')
+    def test_layout_server_url_uses_remote_detector(self, mock_text, mock_docling):
+        mock_text.return_value = MagicMock()
+        engine = SplitPipelineEngine(
+            docling_model_name='custom/docling',
+            ocr_provider='gemini',
+            ocr_config={'api_key': 'k'},
+            layout_server_url='unix:///run/saegim/layout.sock',
+        )
+
+        detector = engine._layout_detector
+        assert isinstance(detector, RemoteLayoutDetector)
+        assert detector.server_url == 'unix:///run/saegim/layout.sock'
+        assert detector.model_name == 'custom/docling'
+        mock_docling.assert_not_called()
+
+    @patch(f'{_MODULE}.OcrPipeline')
+    @patch(f'{_MODULE}.DoclingLayoutDetector', new=MagicMock())
+    @patch(f'{_MODULE}._create_text_provider', new=MagicMock())
+    def test_pdf_text_layer_used_when_enabled(self, mock_pipeline_cls, tmp_path):
+        page_indices = {tmp_path / 'p1.png': 0}
+        engine = SplitPipelineEngine(
+            docling_model_name='ibm-granite/granite-docling-258M',
+            ocr_provider='gemini',
+            ocr_config={'api_key': 'k'},
+            text_layer_regions=True,
+        )
+
+        engine.use_pdf_text_layer(tmp_path / 'doc.pdf', page_indices)
+
+        source = mock_pipeline_cls.return_value.set_text_source.call_args.args[0]
+        assert isinstance(source, PdfRegionTextSource)
+        assert source.pdf_path == tmp_path / 'doc.pdf'
+
+    @patch(f'{_MODULE}.OcrPipeline')
+    @patch(f'{_MODULE}.DoclingLayoutDetector', new=MagicMock())
+    @patch(f'{_MODULE}._create_text_provider', new=MagicMock())
+    def test_pdf_text_layer_ignored_by_default(self, mock_pipeline_cls, tmp_path):
+        engine = SplitPipelineEngine(
+            docling_model_name='ibm-granite/granite-docling-258M',
+            ocr_provider='gemini',
+            ocr_config={'api_key': 'k'},
+        )
+
+        engine.use_pdf_text_layer(tmp_path / 'doc.pdf', {tmp_path / 'p1.png': 0})
+
+        mock_pipeline_cls.return_value.set_text_source.assert_not_called()
+
+    @patch(f'{_MODULE}.OcrPipeline')
+    @patch(f'{_MODULE}.DoclingLayoutDetector', new=MagicMock())
+    @patch(f'{_MODULE}._create_text_provider', new=MagicMock())
+    def test_repeated_region_cache_when_enabled(self, mock_pipeline_cls):
+        SplitPipelineEngine(
+            docling_model_name='ibm-granite/granite-docling-258M',
+            ocr_provider='gemini',
+            ocr_config={'api_key': 'k'},
+            reuse_repeated_regions=True,
+        )
+        cache = mock_pipeline_cls.call_args.kwargs['repeated_regions']
+        assert isinstance(cache, RepeatedRegionCache)
+
     def test_unknown_layout_provider_raises(self):
         with pytest.raises(ValueError, match='Unknown layout provider'):
             SplitPipelineEngine(
@@ -124,6 +216,28 @@ class TestSplitPipelineEngineExtractPage:
         assert result == expected
         mock_pipeline.extract_page.assert_called_once_with(Path('/fake/image.png'), 1200, 1600)
 
+    @patch(f'{_MODULE}.OcrPipeline')
+    @patch(f'{_MODULE}.DoclingLayoutDetector')
+    @patch(f'{_MODULE}._create_text_provider')
+    def test_extract_pages_batches_layout(self, mock_text, mock_detector_cls, mock_pipeline_cls):
+        mock_text.return_value = MagicMock()
+        mock_pipeline = MagicMock()
+        mock_pipeline_cls.return_value = mock_pipeline
+        mock_pipeline.extract_pages.return_value = [{'layout_dets': []}, {'layout_dets': []}]
+
+        engine = SplitPipelineEngine(
+            docling_model_name='ibm-granite/granite-docling-258M',
+            ocr_provider='gemini',
+            ocr_config={'api_key': 'k'},
+            layout_batch_size=4,
+        )
+        results = engine.extract_pages([(Path('/a.png'), 10, 10), (Path('/b.png'), 10, 10)])
+
+        assert engine.batch_size == 4
+        assert mock_detector_cls.call_args.kwargs['batch_size'] == 4
+        mock_pipeline.extract_pages.assert_called_once_with([Path('/a.png'), Path('/b.png')])
+        assert len(results) == 2
+
 
 class TestSplitPipelineEngineTestConnection:
     @patch(f'{_MODULE}._check_ocr_provider')
@@ -41,6 +41,19 @@ class TestVllmEngineExtractPage:
         assert result == expected
         mock_provider.extract_page.assert_called_once_with(Path('/fake/image.png'), 1200, 1600)
 
+    @patch(f'{_MODULE}.VllmOcrProvider')
+    def test_streaming_passes_callback(self, mock_provider_cls):
+        mock_provider = MagicMock()
+        mock_provider_cls.return_value = mock_provider
+        callback = MagicMock()
+
+        engine = VllmEngine()
+        engine.extract_page_streaming(Path('/fake/image.png'), 1200, 1600, callback)
+
+        mock_provider.extract_page.assert_called_once_with(
+            Path('/fake/image.png'), 1200, 1600, on_partial=callback
+        )
+
 
 class TestVllmEngineTestConnection:
     @patch(f'{_MODULE}.check_vllm_connection')
@@ -9,6 +9,7 @@ from saegim.services.docir import (
     Geometry,
     PageIR,
     RecognitionResult,
+    rescale_page_ir,
 )
 
 
@@ -145,3 +146,35 @@ class TestRecognitionResult:
         r = RecognitionResult(element_id='e0', text='Hi', category_hint='text_block')
         with pytest.raises(dataclasses.FrozenInstanceError):
             r.text = 'modified'  # type: ignore[misc]
+
+
+class TestRescalePageIR:
+    def test_scales_bbox_and_polygon(self):
+        page = PageIR(
+            page_id='p1',
+            width_px=500,
+            height_px=1000,
+            elements=(
+                ElementIR(
+                    id='e0',
+                    kind='text_block',
+                    geometry=Geometry(
+                        bbox=(10.0, 20.0, 100.0, 200.0),
+                        polygon=[(10.0, 20.0), (100.0, 200.0)],
+                    ),
+                ),
+                ElementIR(id='e1', kind='text_block', text='no geometry'),
+            ),
+        )
+        scaled = rescale_page_ir(page, 1000, 1500)
+
+        assert scaled.width_px == 1000
+        assert scaled.height_px == 1500
+        assert scaled.elements[0].geometry.bbox == (20.0, 30.0, 200.0, 300.0)
+        assert scaled.elements[0].geometry.polygon == [(20.0, 30.0), (200.0, 300.0)]
+        assert scaled.elements[1].geometry is None
+        assert scaled.elements[1].text == 'no geometry'
+
+    def test_same_size_returns_page(self):
+        page = PageIR(page_id='p1', width_px=500, height_px=1000)
+        assert rescale_page_ir(page, 500, 1000) is page
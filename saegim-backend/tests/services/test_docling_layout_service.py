@@ -1,12 +1,21 @@
 """Tests for Docling layout detection service."""
 
+from unittest.mock import patch
+
 import pytest
+from PIL import Image
 
 from saegim.services.docling_layout_service import (
+    DoclingLayoutDetector,
+    DocTagsStopMonitor,
+    _clean_doctags,
     _extract_locs,
     _otsl_to_html,
     _scale_bbox,
+    has_repetition_loop,
+    ink_ratio,
     parse_doctags_to_regions,
+    token_budget,
 )
 
 
@@ -132,3 +141,108 @@ class TestParseDoctags:
         doctags = '<unknown><loc_0><loc_0><loc_100><loc_100>data</unknown>'
         regions = parse_doctags_to_regions(doctags, 500, 500)
         assert regions == []
+
+
+_MODULE = 'saegim.services.docling_layout_service'
+
+
+class TestDoclingDetectLayoutBatch:
+    @patch(f'{_MODULE}.DoclingLayoutDetector._ensure_model_loaded')
+    @patch(f'{_MODULE}.DoclingLayoutDetector._run_batch_inference')
+    def test_scales_each_page_to_its_size(self, mock_inference, mock_load, tmp_path):
+        small = tmp_path / 'small.png'
+        large = tmp_path / 'large.png'
+        Image.new('RGB', (500, 500)).save(small)
+        Image.new('RGB', (1000, 2000)).save(large)
+        doctags = '<text><loc_0><loc_0><loc_250><loc_250>Hi</text>'
+        mock_inference.return_value = [doctags, doctags]
+
+        detector = DoclingLayoutDetector(batch_size=2)
+        results = detector.detect_layout_batch([small, large])
+
+        mock_inference.assert_called_once()
+        assert results[0][0].bbox == (0.0, 0.0, 250.0, 250.0)
+        assert results[1][0].bbox == (0.0, 0.0, 500.0, 1000.0)
+
+    def test_invalid_batch_size_raises(self):
+        with pytest.raises(ValueError, match='batch_size'):
+            DoclingLayoutDetector(batch_size=0)
+
+
+def _decode(ids):
+    return ''.join(f'<{i}>' if i != 99 else '</doctag>' for i in ids)
+
+
+class TestTokenBudget:
+    def test_blank_page_ink_ratio(self):
+        assert ink_ratio(Image.new('RGB', (600, 800), color='white')) == 0.0
+
+    def test_half_dark_page_ink_ratio(self):
+        image = Image.new('L', (200, 200), color=255)
+        image.paste(0, (0, 0, 200, 100))
+        assert ink_ratio(image) == pytest.approx(0.5, abs=0.02)
+
+    def test_blank_page_gets_minimum_budget(self):
+        assert token_budget(Image.new('RGB', (600, 800), color='white')) == 1024
+
+    def test_dense_page_is_capped(self):
+        assert token_budget(Image.new('RGB', (600, 800), color='black')) == 8192
+
+    def test_budget_grows_with_ink(self):
+        sparse = Image.new('L', (200, 200), color=255)
+        sparse.paste(0, (0, 0, 200, 4))
+        dense = Image.new('L', (200, 200), color=255)
+        dense.paste(0, (0, 0, 200, 20))
+        assert 1024 < token_budget(sparse) < token_budget(dense) < 8192
+
+
+class TestRepetitionLoop:
+    def test_short_sequence_is_not_a_loop(self):
+        assert has_repetition_loop([1] * 100) is False
+
+    def test_single_token_loop(self):
+        assert has_repetition_loop(list(range(50)) + [7] * 256) is True
+
+    def test_multi_token_loop(self):
+        assert has_repetition_loop([3, 4, 5, 6, 7] * 60) is True
+
+    def test_varied_tokens(self):
+        assert has_repetition_loop(list(range(400))) is False
+
+    def test_loop_must_cover_window(self):
+        assert has_repetition_loop(list(range(200)) + [7] * 100) is False
+
+
+class TestDocTagsStopMonitor:
+    def test_stops_sequence_that_closed_document(self):
+        monitor = DocTagsStopMonitor(_decode, batch_size=2)
+
+        assert monitor.update([[1, 2], [1, 3]], generated=2) == [False, False]
+        assert monitor.update([[1, 2, 99], [1, 3, 4]], generated=3) == [True, False]
+        assert monitor.looped == [False, False]
+
+    def test_ignores_prompt_tokens(self):
+        monitor = DocTagsStopMonitor(_decode, batch_size=1)
+        assert monitor.update([[99, 1]], generated=0) == [False]
+
+    def test_stops_looping_sequence(self):
+        monitor = DocTagsStopMonitor(_decode, batch_size=2)
+        looping = [5, 6] * 128
+        varied = list(range(256))
+
+        assert monitor.update([looping, varied], generated=256) == [True, False]
+        assert monitor.looped == [True, False]
+
+    def test_finished_sequence_stays_finished(self):
+        monitor = DocTagsStopMonitor(_decode, batch_size=1)
+        monitor.update([[99]], generated=1)
+        assert monitor.update([[99, 1, 2]], generated=3) == [True]
+
+
+class TestCleanDoctags:
+    def test_drops_tokens_after_document_end(self):
+        text = '<doctag><text>a</text></doctag><end_of_utterance><pad><pad>'
+        assert _clean_doctags(text) == '<doctag><text>a</text></doctag>'
+
+    def test_truncated_output_is_kept(self):
+        assert _clean_doctags('<doctag><text>a</text><eos>') == '<doctag><text>a</text>'
@@ -1,6 +1,8 @@
 """Tests for document upload and PDF conversion service."""
 
+import asyncio
 import uuid
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -723,6 +725,443 @@ class TestReExtract:
         )
 
 
+class TestPartialPublisher:
+    @pytest.mark.asyncio
+    async def test_writes_partial_from_worker_thread(self, mock_pool):
+        page_id = uuid.uuid4()
+        partial = {'layout_dets': [{'text': 'A'}], 'extra': {'partial': True}}
+
+        with patch.object(
+            document_service.page_repo,
+            'update_partial_extracted_data',
+            new_callable=AsyncMock,
+        ) as mock_update:
+            publish = document_service._make_partial_publisher(mock_pool, page_id)
+            await asyncio.to_thread(publish, partial)
+
+        mock_update.assert_awaited_once_with(mock_pool, page_id, partial)
+
+    @pytest.mark.asyncio
+    async def test_throttles_writes(self, mock_pool):
+        with patch.object(
+            document_service.page_repo,
+            'update_partial_extracted_data',
+            new_callable=AsyncMock,
+        ) as mock_update:
+            publish = document_service._make_partial_publisher(mock_pool, uuid.uuid4())
+
+            def _publish_twice():
+                publish({'layout_dets': []})
+                publish({'layout_dets': []})
+
+            await asyncio.to_thread(_publish_twice)
+
+        assert mock_update.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_write_failure_does_not_raise(self, mock_pool):
+        with patch.object(
+            document_service.page_repo,
+            'update_partial_extracted_data',
+            new_callable=AsyncMock,
+            side_effect=RuntimeError('db down'),
+        ):
+            publish = document_service._make_partial_publisher(mock_pool, uuid.uuid4())
+            await asyncio.to_thread(publish, {'layout_dets': []})
+
+
+class TestOcrExtractionBackground:
+    @staticmethod
+    def _pages(count):
+        return [
+            {
+                'page_id': str(uuid.uuid4()),
+                'page_idx': i,
+                'width': 100,
+                'height': 200,
+                'image_path': f'/tmp/p{i}.png',
+            }
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batched_engine_groups_pages(self, mock_pool, document_id):
+        pages = self._pages(5)
+        engine = MagicMock()
+        engine.batch_size = 2
+        engine.extract_pages.side_effect = lambda batch: [{'layout_dets': []} for _ in batch]
+
+        with (
+            patch.object(document_service, 'build_engine', return_value=engine),
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ) as mock_update,
+            patch.object(
+                document_service.document_repo, 'update_status', new_callable=AsyncMock
+            ) as mock_status,
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, pages, {'engine_type': 'split_pipeline'}
+            )
+
+        batch_sizes = [len(call.args[0]) for call in engine.extract_pages.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+        engine.extract_page_streaming.assert_not_called()
+        assert mock_update.await_count == 5
+        mock_status.assert_awaited_once_with(mock_pool, document_id=document_id, status='ready')
+
+    @pytest.mark.asyncio
+    async def test_single_page_engine_streams(self, mock_pool, document_id):
+        pages = self._pages(2)
+        engine = MagicMock()
+        engine.batch_size = 1
+        engine.extract_page_streaming.return_value = {'layout_dets': []}
+
+        with (
+            patch.object(document_service, 'build_engine', return_value=engine),
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ),
+            patch.object(document_service.document_repo, 'update_status', new_callable=AsyncMock),
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, pages, {'engine_type': 'vllm'}
+            )
+
+        assert engine.extract_page_streaming.call_count == 2
+        engine.extract_pages.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stream_failure_keeps_previous_result(self, mock_pool, document_id):
+        pages = self._pages(1)
+        partial = {'layout_dets': [{'text': 'A'}], 'extra': {'partial': True}}
+
+        def _fail_mid_stream(_path, _width, _height, on_partial):
+            on_partial(partial)
+            raise ConnectionError
+
+        engine = MagicMock()
+        engine.batch_size = 1
+        engine.extract_page_streaming.side_effect = _fail_mid_stream
+
+        with (
+            patch.object(document_service, 'build_engine', return_value=engine),
+            patch.object(
+                document_service.page_repo,
+                'update_partial_extracted_data',
+                new_callable=AsyncMock,
+            ) as mock_partial,
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ) as mock_update,
+            patch.object(
+                document_service.page_repo,
+                'clear_partial_extracted_data',
+                new_callable=AsyncMock,
+            ) as mock_clear,
+            patch.object(
+                document_service.document_repo, 'update_status', new_callable=AsyncMock
+            ) as mock_status,
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, pages, {'engine_type': 'vllm'}
+            )
+
+        mock_partial.assert_awaited_once_with(mock_pool, uuid.UUID(pages[0]['page_id']), partial)
+        mock_update.assert_not_awaited()
+        mock_clear.assert_awaited_once_with(mock_pool, document_id)
+        mock_status.assert_awaited_once_with(
+            mock_pool, document_id=document_id, status='extraction_failed'
+        )
+
+    @pytest.mark.asyncio
+    async def test_text_layer_routing_skips_ocr_for_text_pages(
+        self, mock_pool, document_id, tmp_path
+    ):
+        pages = self._pages(3)
+        engine = MagicMock()
+        engine.batch_size = 1
+        engine.extract_page_streaming.return_value = {'layout_dets': []}
+        ocr_config = {
+            'engine_type': 'vllm',
+            'vllm': {'host': 'localhost', 'port': 8000, 'text_layer_routing': True},
+        }
+
+        with (
+            patch.object(document_service, 'build_engine', return_value=engine),
+            patch.object(document_service.text_layer, 'find_text_layer_pages', return_value={0, 2}),
+            patch.object(
+                document_service.extraction_service,
+                'extract_page_elements',
+                return_value={'layout_dets': [{'category_type': 'text_block', 'text': 'a'}]},
+            ) as mock_pdfminer,
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ) as mock_update,
+            patch.object(document_service.document_repo, 'update_status', new_callable=AsyncMock),
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, pages, ocr_config, pdf_path=tmp_path / 'doc.pdf'
+            )
+
+        assert [call.kwargs['page_no'] for call in mock_pdfminer.call_args_list] == [0, 2]
+        assert engine.extract_page_streaming.call_count == 1
+        assert engine.extract_page_streaming.call_args.args[0] == Path('/tmp/p1.png')
+        assert mock_update.await_count == 3
+        engine.use_pdf_text_layer.assert_called_once_with(
+            tmp_path / 'doc.pdf', {Path('/tmp/p1.png'): 1}
+        )
+
+    @pytest.mark.asyncio
+    async def test_text_layer_routing_disabled_by_default(self, mock_pool, document_id, tmp_path):
+        engine = MagicMock()
+        engine.batch_size = 1
+        engine.extract_page_streaming.return_value = {'layout_dets': []}
+        ocr_config = {
+            'default_engine_id': 'vlm',
+            'engines': {'vlm': {'engine_type': 'vllm', 'name': 'VLM', 'config': {}}},
+        }
+
+        with (
+            patch.object(document_service, 'build_engine_by_id', return_value=engine),
+            patch.object(document_service.text_layer, 'find_text_layer_pages') as mock_find,
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ),
+            patch.object(document_service.document_repo, 'update_status', new_callable=AsyncMock),
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, self._pages(2), ocr_config, pdf_path=tmp_path / 'doc.pdf'
+            )
+
+        mock_find.assert_not_called()
+        assert engine.extract_page_streaming.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_blank_and_duplicate_pages_skip_engine(self, mock_pool, document_id, tmp_path):
+        from PIL import Image, ImageDraw
+
+        def text_page():
+            image = Image.new('RGB', (300, 400), color='white')
+            draw = ImageDraw.Draw(image)
+            for row in range(10):
+                draw.rectangle((20, 30 + row * 30, 250 - row * 10, 40 + row * 30), fill='black')
+            return image
+
+        pages = self._pages(4)
+        Image.new('RGB', (300, 400), color='white').save(tmp_path / 'blank.png')
+        text_page().save(tmp_path / 'text.png')
+        text_page().save(tmp_path / 'copy.png')
+        text_page().save(tmp_path / 'other_doc.png')
+        for page, name in zip(pages, ['blank', 'text', 'copy', 'text'], strict=True):
+            page['image_path'] = str(tmp_path / f'{name}.png')
+        other_page_id = uuid.uuid4()
+        other_phash = document_service.page_fingerprint.fingerprint_file(
+            tmp_path / 'other_doc.png'
+        ).phash
+
+        engine = MagicMock()
+        engine.batch_size = 1
+        engine.extract_page_streaming.return_value = {'layout_dets': []}
+        ocr_config = {
+            'engine_type': 'vllm',
+            'vllm': {'skip_blank_pages': True, 'reuse_duplicate_pages': True},
+        }
+        twin_result = {'layout_dets': [{'category_type': 'title', 'text': 'stored'}]}
+
+        with (
+            patch.object(document_service, 'build_engine', return_value=engine),
+            patch.object(
+                document_service.extraction_result_repo,
+                'get_for_pages',
+                new_callable=AsyncMock,
+                return_value=[{'page_id': other_page_id, 'result': twin_result}],
+            ) as mock_get,
+            patch.object(
+                document_service.page_repo,
+                'list_duplicate_candidates',
+                new_callable=AsyncMock,
+                return_value=[
+                    {
+                        'id': other_page_id,
+                        'image_path': str(tmp_path / 'other_doc.png'),
+                        'image_phash': other_phash,
+                    }
+                ],
+            ) as mock_candidates,
+            patch.object(
+                document_service.page_repo, 'update_image_phash', new_callable=AsyncMock
+            ) as mock_phash,
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ) as mock_update,
+            patch.object(
+                document_service.extraction_result_repo, 'upsert', new_callable=AsyncMock
+            ) as mock_upsert,
+            patch.object(document_service.document_repo, 'update_status', new_callable=AsyncMock),
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, pages, ocr_config
+            )
+
+        run = document_service.engine_run(ocr_config)
+        # Only pages with a result of the same engine configuration are candidates
+        assert mock_candidates.await_args.args[1:] == (document_id, run.key)
+        assert mock_phash.await_count == 4
+        engine.extract_page_streaming.assert_not_called()
+        # Blank page stored as empty result
+        blank_call = mock_update.await_args_list[0]
+        assert blank_call.args[1] == uuid.UUID(pages[0]['page_id'])
+        assert blank_call.args[2]['layout_dets'] == []
+        # Every text page gets the stored result of the page in another document
+        assert mock_get.await_args.args[1:] == ([other_page_id], run.key)
+        copied = {call.args[1]: call.args[2] for call in mock_update.await_args_list[1:]}
+        assert copied == {uuid.UUID(page['page_id']): twin_result for page in pages[1:]}
+        # Skipped and copied pages are stored under the run like extracted ones
+        recorded = {call.args[1]: call.kwargs for call in mock_upsert.await_args_list}
+        assert set(recorded) == {uuid.UUID(page['page_id']) for page in pages}
+        assert all(kwargs['engine_key'] == run.key for kwargs in recorded.values())
+        assert recorded[uuid.UUID(pages[0]['page_id'])]['result']['layout_dets'] == []
+        assert recorded[uuid.UUID(pages[3]['page_id'])]['result'] == twin_result
+
+    @pytest.mark.asyncio
+    async def test_stored_results_skip_engine(self, mock_pool, document_id):
+        pages = self._pages(3)
+        engine = MagicMock()
+        engine.batch_size = 1
+        engine.extract_page_streaming.return_value = {'layout_dets': []}
+        ocr_config = {'engine_type': 'vllm', 'vllm': {'host': 'localhost'}}
+        stored = {'layout_dets': [{'category_type': 'title', 'text': 'cached'}]}
+
+        with (
+            patch.object(document_service, 'build_engine', return_value=engine),
+            patch.object(
+                document_service.extraction_result_repo,
+                'get_for_pages',
+                new_callable=AsyncMock,
+                return_value=[
+                    {'page_id': uuid.UUID(pages[0]['page_id']), 'result': {'layout_dets': []}},
+                    {'page_id': uuid.UUID(pages[2]['page_id']), 'result': stored},
+                ],
+            ) as mock_get,
+            patch.object(
+                document_service.extraction_result_repo, 'upsert', new_callable=AsyncMock
+            ) as mock_upsert,
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ) as mock_update,
+            patch.object(document_service.document_repo, 'update_status', new_callable=AsyncMock),
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, pages, ocr_config
+            )
+
+        run = document_service.engine_run(ocr_config)
+        assert mock_get.await_args.args[2] == run.key
+        assert engine.extract_page_streaming.call_count == 1
+        assert engine.extract_page_streaming.call_args.args[0] == Path('/tmp/p1.png')
+        restored = {call.args[1]: call.args[2] for call in mock_update.await_args_list[:2]}
+        assert restored[uuid.UUID(pages[2]['page_id'])] == stored
+        # Only the newly extracted page is stored again
+        mock_upsert.assert_awaited_once()
+        assert mock_upsert.await_args.args[1] == uuid.UUID(pages[1]['page_id'])
+        assert mock_upsert.await_args.kwargs['engine_key'] == run.key
+        assert mock_upsert.await_args.kwargs['engine_type'] == 'vllm'
+        assert mock_upsert.await_args.kwargs['duration_ms'] >= 0
+
+    @pytest.mark.asyncio
+    async def test_force_ignores_stored_results(self, mock_pool, document_id):
+        engine = MagicMock()
+        engine.batch_size = 1
+        engine.extract_page_streaming.return_value = {'layout_dets': []}
+
+        with (
+            patch.object(document_service, 'build_engine', return_value=engine),
+            patch.object(
+                document_service.extraction_result_repo, 'get_for_pages', new_callable=AsyncMock
+            ) as mock_get,
+            patch.object(
+                document_service.extraction_result_repo, 'upsert', new_callable=AsyncMock
+            ) as mock_upsert,
+            patch.object(
+                document_service.page_repo,
+                'update_auto_extracted_data',
+                new_callable=AsyncMock,
+            ),
+            patch.object(document_service.document_repo, 'update_status', new_callable=AsyncMock),
+        ):
+            await document_service._run_ocr_extraction_background(
+                mock_pool, document_id, self._pages(2), {'engine_type': 'vllm'}, force=True
+            )
+
+        mock_get.assert_not_called()
+        assert engine.extract_page_streaming.call_count == 2
+        assert mock_upsert.await_count == 2
+
+
+class TestEngineRun:
+    def test_same_config_same_key(self):
+        config = {'engine_type': 'vllm', 'vllm': {'host': 'a', 'port': 1}}
+        reordered = {'vllm': {'port': 1, 'host': 'a'}, 'engine_type': 'vllm'}
+
+        assert document_service.engine_run(config) == document_service.engine_run(reordered)
+
+    def test_config_change_changes_key(self):
+        base = document_service.engine_run({'engine_type': 'vllm', 'vllm': {'model': 'a'}})
+        changed = document_service.engine_run({'engine_type': 'vllm', 'vllm': {'model': 'b'}})
+
+        assert base.key != changed.key
+
+    def test_instance_name_does_not_change_key(self):
+        def config(name):
+            return {
+                'default_engine_id': 'vlm',
+                'engines': {'vlm': {'engine_type': 'vllm', 'name': name, 'config': {'port': 1}}},
+            }
+
+        run = document_service.engine_run(config('VLM'))
+
+        assert run == document_service.engine_run(config('Renamed'))
+        assert run.engine_type == 'vllm'
+        assert run.engine_id == 'vlm'
+
+    def test_ensemble_key_covers_members(self):
+        def config(member_model):
+            return {
+                'default_engine_id': 'ens',
+                'engines': {
+                    'ens': {'engine_type': 'ensemble', 'config': {'engine_ids': ['a']}},
+                    'a': {'engine_type': 'vllm', 'config': {'model': member_model}},
+                },
+            }
+
+        assert (
+            document_service.engine_run(config('x')).key
+            != document_service.engine_run(config('y')).key
+        )
+
+    def test_pdfminer(self):
+        run = document_service.engine_run({'engine_type': 'pdfminer'})
+
+        assert run.engine_type == 'pdfminer'
+        assert run.engine_id is None
+        assert len(run.key) == 64
+
+
 class TestDeleteWithFiles:
     @pytest.mark.asyncio
     async def test_returns_false_when_document_not_found(self, mock_pool):
@@ -282,6 +282,27 @@ class TestGeminiTextOcrProvider:
         assert result == 'Extracted text'
         mock_client.post.assert_called_once()
 
+    @patch('saegim.services.gemini_ocr_service.httpx.Client')
+    def test_extract_text_uses_detected_mime_type(self, mock_client_cls):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            'candidates': [{'content': {'parts': [{'text': 'text'}]}}],
+        }
+        mock_response.raise_for_status = MagicMock()
+
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.post.return_value = mock_response
+        mock_client_cls.return_value = mock_client
+
+        provider = GeminiTextOcrProvider(api_key='test-key')
+        provider.extract_text(b'RIFF\x00\x00\x00\x00WEBPVP8 ', 'text_block')
+
+        payload = mock_client.post.call_args.kwargs['json']
+        inline_data = payload['contents'][0]['parts'][1]['inline_data']
+        assert inline_data['mime_type'] == 'image/webp'
+
     @patch('saegim.services.gemini_ocr_service.httpx.Client')
     def test_extract_text_table_category(self, mock_client_cls):
         mock_response = MagicMock()
@@ -0,0 +1,157 @@
+"""Tests for OCR payload image encoding."""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+from saegim.services.image_encoding import (
+    DEFAULT_ENCODING,
+    ImageEncoding,
+    detect_mime_type,
+    encode_image,
+    image_encoding_from_config,
+    prepare_page_image,
+    scaled_size,
+)
+
+
+def _make_bitmap(width: int = 200, height: int = 100) -> np.ndarray:
+    """Create a coloured test bitmap."""
+    bitmap = np.zeros((height, width, 3), dtype=np.uint8)
+    bitmap[..., 0] = 200
+    bitmap[: height // 2, :, 2] = 255
+    return bitmap
+
+
+def _decode(data: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+class TestEncodeImage:
+    def test_default_is_png(self):
+        data = encode_image(_make_bitmap())
+        image = _decode(data)
+        assert image.format == 'PNG'
+        assert image.size == (200, 100)
+        assert image.mode == 'RGB'
+
+    def test_jpeg(self):
+        data = encode_image(_make_bitmap(), ImageEncoding(format='jpeg', quality=70))
+        assert _decode(data).format == 'JPEG'
+
+    def test_jpeg_from_rgba(self):
+        bitmap = np.zeros((10, 10, 4), dtype=np.uint8)
+        data = encode_image(bitmap, ImageEncoding(format='jpeg'))
+        assert _decode(data).mode == 'RGB'
+
+    def test_webp(self):
+        data = encode_image(_make_bitmap(), ImageEncoding(format='webp', quality=60))
+        assert _decode(data).format == 'WEBP'
+
+    def test_lower_quality_is_smaller(self):
+        rng = np.random.default_rng(0)
+        bitmap = rng.integers(0, 255, size=(200, 200, 3), dtype=np.uint8)
+        high = encode_image(bitmap, ImageEncoding(format='jpeg', quality=95))
+        low = encode_image(bitmap, ImageEncoding(format='jpeg', quality=30))
+        assert len(low) < len(high)
+
+    def test_downscales_longer_side(self):
+        data = encode_image(_make_bitmap(400, 100), ImageEncoding(max_side=200))
+        assert _decode(data).size == (200, 50)
+
+    def test_small_image_not_upscaled(self):
+        data = encode_image(_make_bitmap(100, 50), ImageEncoding(max_side=200))
+        assert _decode(data).size == (100, 50)
+
+    def test_grayscale_text_region(self):
+        data = encode_image(_make_bitmap(), ImageEncoding(grayscale=True), category='text_block')
+        assert _decode(data).mode == 'L'
+
+    def test_grayscale_keeps_colour_for_figures_and_tables(self):
+        encoding = ImageEncoding(grayscale=True)
+        for category in ('figure', 'table'):
+            data = encode_image(_make_bitmap(), encoding, category=category)
+            assert _decode(data).mode == 'RGB'
+
+
+class TestImageEncodingFromConfig:
+    def test_defaults(self):
+        assert image_encoding_from_config({}) == DEFAULT_ENCODING
+
+    def test_reads_crop_fields(self):
+        config = {
+            'crop_format': 'webp',
+            'crop_quality': 75,
+            'crop_max_side': 1280,
+            'crop_grayscale': True,
+            'model': 'ignored',
+        }
+        assert image_encoding_from_config(config) == ImageEncoding(
+            format='webp', quality=75, max_side=1280, grayscale=True
+        )
+
+
+class TestDetectMimeType:
+    def test_png(self):
+        assert detect_mime_type(encode_image(_make_bitmap())) == 'image/png'
+
+    def test_jpeg(self):
+        data = encode_image(_make_bitmap(), ImageEncoding(format='jpeg'))
+        assert detect_mime_type(data) == 'image/jpeg'
+
+    def test_webp(self):
+        data = encode_image(_make_bitmap(), ImageEncoding(format='webp'))
+        assert detect_mime_type(data) == 'image/webp'
+
+    def test_unknown_defaults_to_png(self):
+        assert detect_mime_type(b'not an image') == 'image/png'
+
+
+class TestScaledSize:
+    def test_fits(self):
+        assert scaled_size(800, 600, 1000) == (800, 600)
+
+    def test_no_limit(self):
+        assert scaled_size(4000, 3000, None) == (4000, 3000)
+
+    def test_downscales_preserving_aspect(self):
+        assert scaled_size(1190, 1684, 842) == (595, 842)
+
+
+class TestPreparePageImage:
+    def _write_png(self, tmp_path, width: int, height: int):
+        path = tmp_path / 'page.png'
+        Image.fromarray(_make_bitmap(width, height)).save(path, format='PNG')
+        return path
+
+    def test_fitting_png_passes_original_bytes(self, tmp_path):
+        path = self._write_png(tmp_path, 200, 100)
+        prepared = prepare_page_image(path, ImageEncoding(max_side=400), 200, 100)
+        assert prepared.data == path.read_bytes()
+        assert prepared.mime_type == 'image/png'
+        assert (prepared.width, prepared.height) == (200, 100)
+
+    def test_downscales_and_reencodes(self, tmp_path):
+        path = self._write_png(tmp_path, 400, 200)
+        encoding = ImageEncoding(format='jpeg', quality=80, max_side=100)
+        prepared = prepare_page_image(path, encoding, 400, 200)
+
+        assert prepared.mime_type == 'image/jpeg'
+        assert (prepared.width, prepared.height) == (100, 50)
+        assert _decode(prepared.data).size == (100, 50)
+
+    def test_format_change_without_resize(self, tmp_path):
+        path = self._write_png(tmp_path, 200, 100)
+        prepared = prepare_page_image(path, ImageEncoding(format='webp'), 200, 100)
+        assert prepared.mime_type == 'image/webp'
+        assert (prepared.width, prepared.height) == (200, 100)
+
+    def test_undecodable_image_passed_through(self, tmp_path):
+        path = tmp_path / 'page.png'
+        path.write_bytes(b'\x89PNG\r\n\x1a\nfake')
+        prepared = prepare_page_image(path, ImageEncoding(max_side=100), 800, 1200)
+        assert prepared.data == path.read_bytes()
+        assert (prepared.width, prepared.height) == (800, 1200)
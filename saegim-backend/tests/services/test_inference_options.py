@@ -0,0 +1,118 @@
+"""Tests for local layout model runtime options."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from saegim.services.inference_options import (
+    DEFAULT_INFERENCE_OPTIONS,
+    InferenceOptions,
+    apply_thread_settings,
+    inference_options_from_config,
+    inference_slot,
+    resolve_device,
+)
+
+
+def _mock_torch(cuda: bool = False) -> MagicMock:
+    torch = MagicMock()
+    torch.cuda.is_available.return_value = cuda
+    return torch
+
+
+class TestInferenceOptionsFromConfig:
+    def test_defaults(self):
+        assert inference_options_from_config({}) == DEFAULT_INFERENCE_OPTIONS
+        assert DEFAULT_INFERENCE_OPTIONS.max_concurrency == 1
+
+    def test_reads_layout_fields(self):
+        options = inference_options_from_config(
+            {
+                'layout_device': 'cuda:1',
+                'layout_num_threads': 4,
+                'layout_interop_threads': 2,
+                'layout_max_concurrency': 3,
+            }
+        )
+        assert options == InferenceOptions(
+            device='cuda:1', num_threads=4, num_interop_threads=2, max_concurrency=3
+        )
+
+    def test_empty_device_means_auto(self):
+        assert inference_options_from_config({'layout_device': ''}).device is None
+
+
+class TestResolveDevice:
+    def test_auto_prefers_cuda(self):
+        assert resolve_device(_mock_torch(cuda=True), None) == 'cuda'
+
+    def test_auto_falls_back_to_cpu(self):
+        assert resolve_device(_mock_torch(cuda=False), None) == 'cpu'
+
+    def test_pinned_device(self):
+        assert resolve_device(_mock_torch(cuda=True), 'cuda:1') == 'cuda:1'
+
+    def test_cpu_pinned_on_gpu_host(self):
+        assert resolve_device(_mock_torch(cuda=True), 'cpu') == 'cpu'
+
+    def test_cuda_without_gpu_falls_back(self):
+        assert resolve_device(_mock_torch(cuda=False), 'cuda') == 'cpu'
+
+
+class TestApplyThreadSettings:
+    def test_defaults_leave_torch_untouched(self):
+        torch = _mock_torch()
+        apply_thread_settings(torch, DEFAULT_INFERENCE_OPTIONS)
+        torch.set_num_threads.assert_not_called()
+        torch.set_num_interop_threads.assert_not_called()
+
+    def test_sets_thread_counts(self):
+        torch = _mock_torch()
+        apply_thread_settings(torch, InferenceOptions(num_threads=4, num_interop_threads=1))
+        torch.set_num_threads.assert_called_once_with(4)
+        torch.set_num_interop_threads.assert_called_once_with(1)
+
+    def test_late_interop_setting_is_ignored(self):
+        torch = _mock_torch()
+        torch.set_num_interop_threads.side_effect = RuntimeError('already started')
+        apply_thread_settings(torch, InferenceOptions(num_interop_threads=2))
+
+
+class TestInferenceSlot:
+    @staticmethod
+    def _max_parallel(key: str, *limits: int | None, workers: int = 4) -> int:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def _work(limit: int | None):
+            nonlocal active, peak
+            with inference_slot(key, limit):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        threads = [
+            threading.Thread(target=_work, args=(limits[i % len(limits)],)) for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return peak
+
+    def test_limits_concurrency(self):
+        assert self._max_parallel('test:limit-one', 1) == 1
+
+    def test_limit_of_two(self):
+        assert self._max_parallel('test:limit-two', 2) <= 2
+
+    def test_unbounded(self):
+        assert self._max_parallel('test:unbounded', None) > 1
+
+    def test_conflicting_limits_keep_first(self, caplog):
+        assert self._max_parallel('test:conflict', 1, 3, workers=6) == 1
+        assert 'Ignoring max_concurrency=3' in caplog.text
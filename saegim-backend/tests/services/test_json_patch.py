@@ -0,0 +1,125 @@
+"""Tests for RFC 6902 JSON Patch application."""
+
+import pytest
+
+from saegim.services.json_patch import (
+    JsonPatchError,
+    JsonPatchTestFailedError,
+    apply_patch,
+    parse_pointer,
+)
+
+
+@pytest.fixture
+def annotation():
+    return {
+        'layout_dets': [
+            {'anno_id': 0, 'category_type': 'title', 'text': 'A'},
+            {'anno_id': 1, 'category_type': 'text_block', 'text': 'B'},
+        ],
+        'page_attribute': {'language': 'ko'},
+        'extra': {'relation': []},
+    }
+
+
+class TestParsePointer:
+    def test_root(self):
+        assert parse_pointer('') == []
+
+    def test_unescapes_tokens(self):
+        assert parse_pointer('/a~1b/c~0d') == ['a/b', 'c~d']
+
+    def test_rejects_relative_pointer(self):
+        with pytest.raises(JsonPatchError):
+            parse_pointer('layout_dets')
+
+
+class TestApplyPatch:
+    def test_replace_text(self, annotation):
+        patched = apply_patch(
+            annotation, [{'op': 'replace', 'path': '/layout_dets/1/text', 'value': 'C'}]
+        )
+
+        assert patched['layout_dets'][1]['text'] == 'C'
+        # Original document is untouched
+        assert annotation['layout_dets'][1]['text'] == 'B'
+
+    def test_add_appends_with_dash(self, annotation):
+        element = {'anno_id': 2, 'category_type': 'figure'}
+        patched = apply_patch(
+            annotation, [{'op': 'add', 'path': '/layout_dets/-', 'value': element}]
+        )
+
+        assert patched['layout_dets'][-1] == element
+
+    def test_add_inserts_at_index(self, annotation):
+        patched = apply_patch(
+            annotation, [{'op': 'add', 'path': '/layout_dets/0', 'value': {'anno_id': 9}}]
+        )
+
+        assert [det['anno_id'] for det in patched['layout_dets']] == [9, 0, 1]
+
+    def test_add_null_value(self, annotation):
+        patched = apply_patch(annotation, [{'op': 'add', 'path': '/extra/note', 'value': None}])
+
+        assert patched['extra'] == {'relation': [], 'note': None}
+
+    def test_remove(self, annotation):
+        patched = apply_patch(annotation, [{'op': 'remove', 'path': '/layout_dets/0'}])
+
+        assert [det['anno_id'] for det in patched['layout_dets']] == [1]
+
+    def test_move_and_copy(self, annotation):
+        patched = apply_patch(
+            annotation,
+            [
+                {'op': 'move', 'from': '/layout_dets/0', 'path': '/layout_dets/-'},
+                {'op': 'copy', 'from': '/page_attribute', 'path': '/extra/attr'},
+            ],
+        )
+
+        assert [det['anno_id'] for det in patched['layout_dets']] == [1, 0]
+        assert patched['extra']['attr'] == {'language': 'ko'}
+
+    def test_move_into_own_child_fails(self, annotation):
+        with pytest.raises(JsonPatchError):
+            apply_patch(annotation, [{'op': 'move', 'from': '/extra', 'path': '/extra/relation/0'}])
+
+    def test_test_operation(self, annotation):
+        ops = [
+            {'op': 'test', 'path': '/layout_dets/0/text', 'value': 'A'},
+            {'op': 'replace', 'path': '/layout_dets/0/text', 'value': 'Z'},
+        ]
+
+        assert apply_patch(annotation, ops)['layout_dets'][0]['text'] == 'Z'
+
+    def test_failed_test_operation(self, annotation):
+        with pytest.raises(JsonPatchTestFailedError):
+            apply_patch(annotation, [{'op': 'test', 'path': '/layout_dets/0/text', 'value': 'X'}])
+
+    def test_failure_applies_nothing(self, annotation):
+        ops = [
+            {'op': 'replace', 'path': '/layout_dets/0/text', 'value': 'Z'},
+            {'op': 'remove', 'path': '/layout_dets/5'},
+        ]
+
+        with pytest.raises(JsonPatchError):
+            apply_patch(annotation, ops)
+        assert annotation['layout_dets'][0]['text'] == 'A'
+
+    @pytest.mark.parametrize(
+        'operation',
+        [
+            {'op': 'replace', 'path': '/missing', 'value': 1},
+            {'op': 'remove', 'path': '/layout_dets/01'},
+            {'op': 'add', 'path': '/layout_dets/3', 'value': {}},
+            {'op': 'add', 'path': '/layout_dets/0/text/x', 'value': 1},
+            {'op': 'add', 'path': '/extra/x'},
+            {'op': 'copy', 'path': '/extra/x'},
+            {'op': 'remove', 'path': ''},
+            {'op': 'frobnicate', 'path': '/extra'},
+        ],
+    )
+    def test_invalid_operations(self, annotation, operation):
+        with pytest.raises(JsonPatchError):
+            apply_patch(annotation, [operation])
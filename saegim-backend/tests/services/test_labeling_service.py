@@ -50,8 +50,10 @@ def _make_page_record(
         'assigned_to': None,
         'locked_at': None,
         'updated_at': datetime.datetime.now(tz=datetime.UTC),
+        'version': 1,
     }
     if with_context:
+        record['partial_extracted_data'] = None
         record['project_id'] = uuid.uuid4()
         record['project_name'] = 'Test Project'
         record['document_filename'] = 'test.pdf'
@@ -89,30 +91,11 @@ class TestGetPageData:
         assert result['auto_extracted_data'] is None
 
     @pytest.mark.asyncio
-    async def test_parses_json_string_annotation(self, mock_pool, page_id, document_id):
-        annotation_str = '{"layout_dets": [{"anno_id": 0}]}'
-        record = _make_page_record(
-            page_id,
-            document_id,
-            annotation_data=annotation_str,
-            with_context=True,
-        )
-
-        with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id_with_context = AsyncMock(return_value=record)
-            result = await labeling_service.get_page_data(mock_pool, page_id)
-
-        assert result is not None
-        assert result['annotation_data'] == {'layout_dets': [{'anno_id': 0}]}
-
-    @pytest.mark.asyncio
-    async def test_parses_json_string_auto_extracted(self, mock_pool, page_id, document_id):
-        auto_data_str = '{"model": "test", "results": []}'
+    async def test_returns_empty_dict_for_null_annotation(self, mock_pool, page_id, document_id):
         record = _make_page_record(
             page_id,
             document_id,
             annotation_data=None,
-            auto_extracted_data=auto_data_str,
             with_context=True,
         )
 
@@ -121,10 +104,10 @@ class TestGetPageData:
             result = await labeling_service.get_page_data(mock_pool, page_id)
 
         assert result is not None
-        assert result['auto_extracted_data'] == {'model': 'test', 'results': []}
+        assert result['annotation_data'] == {}
 
     @pytest.mark.asyncio
-    async def test_returns_empty_dict_for_null_annotation(self, mock_pool, page_id, document_id):
+    async def test_raw_json_keeps_stored_text(self, mock_pool, page_id, document_id):
         record = _make_page_record(
             page_id,
             document_id,
@@ -134,10 +117,12 @@ class TestGetPageData:
 
         with patch.object(labeling_service, 'page_repo') as mock_repo:
             mock_repo.get_by_id_with_context = AsyncMock(return_value=record)
-            result = await labeling_service.get_page_data(mock_pool, page_id)
+            result = await labeling_service.get_page_data(mock_pool, page_id, raw_json=True)
 
+        mock_repo.get_by_id_with_context.assert_awaited_once_with(mock_pool, page_id, raw_json=True)
         assert result is not None
-        assert result['annotation_data'] == {}
+        assert result['annotation_data'] == '{}'
+        assert result['auto_extracted_data'] is None
 
 
 class TestSaveAnnotation:
@@ -158,21 +143,57 @@ class TestSaveAnnotation:
             mock_repo.update_annotation = AsyncMock(return_value=record)
             result = await labeling_service.save_annotation(mock_pool, page_id, annotation)
 
-        mock_repo.update_annotation.assert_called_once_with(mock_pool, page_id, annotation)
+        mock_repo.update_annotation.assert_called_once_with(
+            mock_pool, page_id, annotation, expected_version=None
+        )
         assert result is not None
         assert result['annotation_data'] == annotation
 
+
+class TestPatchAnnotation:
+    @staticmethod
+    def _run_apply(annotation):
+        async def patch_annotation(_pool, _page_id, apply, *, expected_version=None):  # noqa: ARG001
+            return {
+                'id': uuid.uuid4(),
+                'status': 'in_progress',
+                'updated_at': datetime.datetime.now(tz=datetime.UTC),
+                'version': 2,
+                'patched': apply(annotation),
+            }
+
+        return patch_annotation
+
     @pytest.mark.asyncio
-    async def test_parses_json_string_result(self, mock_pool, page_id, document_id):
-        annotation_str = '{"layout_dets": []}'
-        record = _make_page_record(page_id, document_id, annotation_data=annotation_str)
+    async def test_returns_none_when_page_not_found(self, mock_pool, page_id):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.patch_annotation = AsyncMock(return_value=None)
+            result = await labeling_service.patch_annotation(mock_pool, page_id, [])
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_applies_operations_under_lock(self, mock_pool, page_id):
+        annotation = {'layout_dets': [{'anno_id': 0, 'text': 'a'}]}
+        ops = [{'op': 'replace', 'path': '/layout_dets/0/text', 'value': 'b'}]
 
         with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.update_annotation = AsyncMock(return_value=record)
-            result = await labeling_service.save_annotation(mock_pool, page_id, {})
+            mock_repo.patch_annotation = AsyncMock(side_effect=self._run_apply(annotation))
+            result = await labeling_service.patch_annotation(mock_pool, page_id, ops)
 
         assert result is not None
-        assert result['annotation_data'] == {'layout_dets': []}
+        assert result['applied'] == 1
+        assert result['status'] == 'in_progress'
+        assert 'annotation_data' not in result
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_object_result(self, mock_pool, page_id):
+        ops = [{'op': 'replace', 'path': '', 'value': []}]
+
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.patch_annotation = AsyncMock(side_effect=self._run_apply({}))
+            with pytest.raises(labeling_service.json_patch.JsonPatchError):
+                await labeling_service.patch_annotation(mock_pool, page_id, ops)
 
 
 class TestSavePageAttribute:
@@ -194,7 +215,9 @@ class TestSavePageAttribute:
             mock_repo.update_page_attribute = AsyncMock(return_value=record)
             result = await labeling_service.save_page_attribute(mock_pool, page_id, page_attr)
 
-        mock_repo.update_page_attribute.assert_called_once_with(mock_pool, page_id, page_attr)
+        mock_repo.update_page_attribute.assert_called_once_with(
+            mock_pool, page_id, page_attr, expected_version=None, full=True
+        )
         assert result is not None
         assert result['annotation_data']['page_attribute'] == page_attr
 
@@ -224,7 +247,7 @@ class TestAddElement:
     @pytest.mark.asyncio
     async def test_returns_none_when_page_not_found(self, mock_pool, page_id):
         with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id = AsyncMock(return_value=None)
+            mock_repo.add_element = AsyncMock(return_value=None)
             result = await labeling_service.add_element(
                 mock_pool,
                 page_id,
@@ -232,106 +255,41 @@ class TestAddElement:
             )
 
         assert result is None
+        mock_repo.get_version.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_assigns_anno_id_starting_from_zero(self, mock_pool, page_id, document_id):
-        record = _make_page_record(
-            page_id,
-            document_id,
-            annotation_data={'layout_dets': []},
-        )
+    async def test_adds_in_single_repo_call(self, mock_pool, page_id, document_id):
         updated = _make_page_record(
-            page_id,
-            document_id,
-            annotation_data={'layout_dets': [{'anno_id': 0, 'category_type': 'text_block'}]},
-        )
-
-        element = {'category_type': 'text_block', 'poly': [0, 0, 100, 0, 100, 100, 0, 100]}
-
-        with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id = AsyncMock(return_value=record)
-            mock_repo.add_element = AsyncMock(return_value=updated)
-            await labeling_service.add_element(mock_pool, page_id, element)
-
-        added = mock_repo.add_element.call_args[0][2]
-        assert added['anno_id'] == 0
-        assert added['order'] == 0
-
-    @pytest.mark.asyncio
-    async def test_assigns_next_anno_id(self, mock_pool, page_id, document_id):
-        record = _make_page_record(
             page_id,
             document_id,
             annotation_data={
-                'layout_dets': [
-                    {'anno_id': 0, 'category_type': 'text_block'},
-                    {'anno_id': 2, 'category_type': 'figure'},
-                ],
+                'layout_dets': [{'anno_id': 0, 'category_type': 'text_block', 'order': 0}]
             },
         )
-        updated = _make_page_record(page_id, document_id, annotation_data={'layout_dets': []})
-
-        element = {'category_type': 'table', 'poly': [0, 0, 100, 0, 100, 100, 0, 100]}
-
-        with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id = AsyncMock(return_value=record)
-            mock_repo.add_element = AsyncMock(return_value=updated)
-            await labeling_service.add_element(mock_pool, page_id, element)
-
-        added = mock_repo.add_element.call_args[0][2]
-        assert added['anno_id'] == 3
-        assert added['order'] == 2
-
-    @pytest.mark.asyncio
-    async def test_handles_null_annotation_data(self, mock_pool, page_id, document_id):
-        record = _make_page_record(page_id, document_id, annotation_data=None)
-        updated = _make_page_record(page_id, document_id, annotation_data={'layout_dets': []})
-
-        element = {'category_type': 'text_block'}
+        element = {'category_type': 'text_block', 'poly': [0, 0, 100, 0, 100, 100, 0, 100]}
 
         with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id = AsyncMock(return_value=record)
             mock_repo.add_element = AsyncMock(return_value=updated)
-            await labeling_service.add_element(mock_pool, page_id, element)
+            result = await labeling_service.add_element(mock_pool, page_id, element)
 
-        added = mock_repo.add_element.call_args[0][2]
-        assert added['anno_id'] == 0
-        assert added['order'] == 0
+        mock_repo.get_by_id.assert_not_called()
+        mock_repo.add_element.assert_awaited_once_with(
+            mock_pool, page_id, element, expected_version=None, full=True
+        )
+        assert result['annotation_data']['layout_dets'][0]['anno_id'] == 0
 
     @pytest.mark.asyncio
-    async def test_handles_json_string_annotation(self, mock_pool, page_id, document_id):
-        record = _make_page_record(
-            page_id,
-            document_id,
-            annotation_data='{"layout_dets": [{"anno_id": 5}]}',
-        )
+    async def test_leaves_anno_id_allocation_to_repo(self, mock_pool, page_id, document_id):
         updated = _make_page_record(page_id, document_id, annotation_data={'layout_dets': []})
-
         element = {'category_type': 'figure'}
 
         with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id = AsyncMock(return_value=record)
             mock_repo.add_element = AsyncMock(return_value=updated)
             await labeling_service.add_element(mock_pool, page_id, element)
 
         added = mock_repo.add_element.call_args[0][2]
-        assert added['anno_id'] == 6
-        assert added['order'] == 1
-
-    @pytest.mark.asyncio
-    async def test_returns_none_when_add_element_fails(self, mock_pool, page_id, document_id):
-        record = _make_page_record(page_id, document_id, annotation_data={'layout_dets': []})
-
-        with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id = AsyncMock(return_value=record)
-            mock_repo.add_element = AsyncMock(return_value=None)
-            result = await labeling_service.add_element(
-                mock_pool,
-                page_id,
-                {'category_type': 'text_block'},
-            )
-
-        assert result is None
+        assert 'anno_id' not in added
+        assert 'order' not in added
 
 
 class TestAddRelation:
@@ -459,7 +417,9 @@ class TestAddRelation:
             result = await labeling_service.add_relation(mock_pool, page_id, relation)
 
         assert result is not None
-        mock_repo.add_relation.assert_called_once_with(mock_pool, page_id, relation)
+        mock_repo.add_relation.assert_called_once_with(
+            mock_pool, page_id, relation, expected_version=1, full=True
+        )
         assert len(result['annotation_data']['extra']['relation']) == 1
 
 
@@ -484,7 +444,9 @@ class TestDeleteRelation:
             mock_repo.delete_relation = AsyncMock(return_value=record)
             result = await labeling_service.delete_relation(mock_pool, page_id, 0, 1)
 
-        mock_repo.delete_relation.assert_called_once_with(mock_pool, page_id, 0, 1)
+        mock_repo.delete_relation.assert_called_once_with(
+            mock_pool, page_id, 0, 1, expected_version=None, full=True
+        )
         assert result is not None
         assert result['annotation_data']['extra']['relation'] == []
 
@@ -575,23 +537,6 @@ class TestUpdateReadingOrder:
         orders = {el['anno_id']: el['order'] for el in call_annotation['layout_dets']}
         assert orders == {0: 2, 1: 1, 2: 0}
 
-    @pytest.mark.asyncio
-    async def test_handles_json_string_annotation(self, mock_pool, page_id, document_id):
-        record = _make_page_record(
-            page_id,
-            document_id,
-            annotation_data='{"layout_dets": [{"anno_id": 0, "order": 0}]}',
-        )
-        updated_record = _make_page_record(page_id, document_id, annotation_data={})
-
-        with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.get_by_id = AsyncMock(return_value=record)
-            mock_repo.update_annotation = AsyncMock(return_value=updated_record)
-            await labeling_service.update_reading_order(mock_pool, page_id, {'0': 5})
-
-        call_annotation = mock_repo.update_annotation.call_args[0][2]
-        assert call_annotation['layout_dets'][0]['order'] == 5
-
     @pytest.mark.asyncio
     async def test_returns_none_when_update_annotation_fails(self, mock_pool, page_id, document_id):
         record = _make_page_record(
@@ -605,6 +550,7 @@ class TestUpdateReadingOrder:
         with patch.object(labeling_service, 'page_repo') as mock_repo:
             mock_repo.get_by_id = AsyncMock(return_value=record)
             mock_repo.update_annotation = AsyncMock(return_value=None)
+            mock_repo.get_version = AsyncMock(return_value=None)
             result = await labeling_service.update_reading_order(mock_pool, page_id, {'0': 1})
 
         assert result is None
@@ -628,21 +574,315 @@ class TestDeleteElement:
             mock_repo.delete_element = AsyncMock(return_value=record)
             result = await labeling_service.delete_element(mock_pool, page_id, 0)
 
-        mock_repo.delete_element.assert_called_once_with(mock_pool, page_id, 0)
+        mock_repo.delete_element.assert_called_once_with(
+            mock_pool, page_id, 0, expected_version=None, full=True
+        )
         assert result is not None
         assert result['annotation_data'] == remaining
 
+
+class TestSelectExtractionResult:
+    @pytest.mark.asyncio
+    async def test_returns_none_when_result_not_found(self, mock_pool, page_id):
+        with (
+            patch.object(labeling_service, 'extraction_result_repo') as mock_results,
+            patch.object(labeling_service, 'page_repo') as mock_repo,
+        ):
+            mock_results.get_by_id = AsyncMock(return_value=None)
+            mock_repo.update_auto_extracted_data = AsyncMock()
+            result = await labeling_service.select_extraction_result(
+                mock_pool, page_id, uuid.uuid4()
+            )
+
+        assert result is None
+        mock_repo.update_auto_extracted_data.assert_not_called()
+
     @pytest.mark.asyncio
-    async def test_parses_json_string_result(self, mock_pool, page_id, document_id):
+    async def test_sets_auto_extracted_data(self, mock_pool, page_id, document_id):
+        result_id = uuid.uuid4()
+        stored = {'layout_dets': [{'anno_id': 0, 'category_type': 'title'}]}
+        record = _make_page_record(
+            page_id, document_id, auto_extracted_data=stored, with_context=True
+        )
+
+        with (
+            patch.object(labeling_service, 'extraction_result_repo') as mock_results,
+            patch.object(labeling_service, 'page_repo') as mock_repo,
+        ):
+            mock_results.get_by_id = AsyncMock(
+                return_value={
+                    'id': result_id,
+                    'result': {'layout_dets': [{'anno_id': 0, 'category_type': 'title'}]},
+                }
+            )
+            mock_repo.update_auto_extracted_data = AsyncMock()
+            mock_repo.get_by_id_with_context = AsyncMock(return_value=record)
+            result = await labeling_service.select_extraction_result(mock_pool, page_id, result_id)
+
+        mock_results.get_by_id.assert_awaited_once_with(mock_pool, page_id, result_id)
+        mock_repo.update_auto_extracted_data.assert_awaited_once_with(
+            mock_pool, page_id, stored, expected_version=None
+        )
+        assert result is not None
+        assert result['auto_extracted_data'] == stored
+
+
+class TestPageVersions:
+    @pytest.mark.asyncio
+    async def test_save_raises_conflict_on_stale_version(self, mock_pool, page_id):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.update_annotation = AsyncMock(return_value=None)
+            mock_repo.get_version = AsyncMock(return_value=5)
+            with pytest.raises(labeling_service.PageVersionConflictError) as exc_info:
+                await labeling_service.save_annotation(mock_pool, page_id, {}, expected_version=3)
+
+        assert exc_info.value.current_version == 5
+
+    @pytest.mark.asyncio
+    async def test_save_returns_none_for_missing_page(self, mock_pool, page_id):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.update_annotation = AsyncMock(return_value=None)
+            mock_repo.get_version = AsyncMock(return_value=None)
+            result = await labeling_service.save_annotation(
+                mock_pool, page_id, {}, expected_version=3
+            )
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_add_element_rejects_stale_version(self, mock_pool, page_id):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.add_element = AsyncMock(return_value=None)
+            mock_repo.get_version = AsyncMock(return_value=4)
+            with pytest.raises(labeling_service.PageVersionConflictError):
+                await labeling_service.add_element(
+                    mock_pool, page_id, {'category_type': 'text_block'}, expected_version=3
+                )
+
+        assert mock_repo.add_element.await_args.kwargs['expected_version'] == 3
+
+
+class TestSparseResults:
+    @pytest.fixture
+    def state(self, page_id):
+        return {
+            'id': page_id,
+            'status': 'in_progress',
+            'updated_at': datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+            'version': 3,
+        }
+
+    @pytest.mark.asyncio
+    async def test_add_element_returns_added_element(self, mock_pool, page_id, state):
+        record = {**state, 'element': {'anno_id': 4, 'order': 4}}
+
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.add_element = AsyncMock(return_value=record)
+            result = await labeling_service.add_element(
+                mock_pool, page_id, {'category_type': 'figure'}, full=False
+            )
+
+        assert mock_repo.add_element.await_args.kwargs['full'] is False
+        assert result == {**state, 'element': {'anno_id': 4, 'order': 4}}
+
+    @pytest.mark.asyncio
+    async def test_delete_element_returns_anno_id(self, mock_pool, page_id, state):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.delete_element = AsyncMock(return_value=state)
+            result = await labeling_service.delete_element(mock_pool, page_id, 7, full=False)
+
+        assert result == {**state, 'anno_id': 7}
+        assert 'annotation_data' not in result
+
+    @pytest.mark.asyncio
+    async def test_delete_relation_returns_relation(self, mock_pool, page_id, state):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.delete_relation = AsyncMock(return_value=state)
+            result = await labeling_service.delete_relation(mock_pool, page_id, 0, 1, full=False)
+
+        assert result['relation'] == {'source_anno_id': 0, 'target_anno_id': 1}
+
+    @pytest.mark.asyncio
+    async def test_reading_order_returns_order_map(self, mock_pool, page_id, document_id, state):
         record = _make_page_record(
             page_id,
             document_id,
-            annotation_data='{"layout_dets": []}',
+            annotation_data={'layout_dets': [{'anno_id': 0, 'order': 0}]},
         )
 
         with patch.object(labeling_service, 'page_repo') as mock_repo:
-            mock_repo.delete_element = AsyncMock(return_value=record)
-            result = await labeling_service.delete_element(mock_pool, page_id, 0)
+            mock_repo.get_by_id = AsyncMock(return_value=record)
+            mock_repo.update_annotation = AsyncMock(return_value=state)
+            result = await labeling_service.update_reading_order(
+                mock_pool, page_id, {'0': 2}, full=False
+            )
+
+        assert mock_repo.update_annotation.await_args.kwargs['full'] is False
+        assert result == {**state, 'order_map': {'0': 2}}
+
+    @pytest.mark.asyncio
+    async def test_sparse_miss_still_detects_conflict(self, mock_pool, page_id):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.update_page_attribute = AsyncMock(return_value=None)
+            mock_repo.get_version = AsyncMock(return_value=5)
+            with pytest.raises(labeling_service.PageVersionConflictError):
+                await labeling_service.save_page_attribute(
+                    mock_pool, page_id, {}, expected_version=4, full=False
+                )
+
+
+class TestApplyElementBatch:
+    @staticmethod
+    def _run_apply(annotation, applied):
+        async def patch_annotation(_pool, page_id, apply, *, expected_version=None, full=False):  # noqa: ARG001
+            applied.append(apply(annotation))
+            return {
+                'id': page_id,
+                'status': 'in_progress',
+                'updated_at': datetime.datetime.now(tz=datetime.UTC),
+                'version': 2,
+            }
+
+        return patch_annotation
+
+    async def _apply(self, mock_pool, page_id, annotation, operations):
+        applied: list = []
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.patch_annotation = AsyncMock(side_effect=self._run_apply(annotation, applied))
+            result = await labeling_service.apply_element_batch(
+                mock_pool, page_id, operations, full=False
+            )
+        return result, applied[0]
+
+    @pytest.mark.asyncio
+    async def test_creates_elements_with_new_anno_ids(self, mock_pool, page_id):
+        annotation = {'layout_dets': [{'anno_id': 4, 'order': 0}]}
+        operations = [
+            {'op': 'create', 'element': {'category_type': 'text_block'}},
+            {'op': 'create', 'element': {'category_type': 'figure'}},
+        ]
+
+        result, patched = await self._apply(mock_pool, page_id, annotation, operations)
+
+        assert result['created_anno_ids'] == [5, 6]
+        assert patched['layout_dets'][1:] == [
+            {'category_type': 'text_block', 'anno_id': 5, 'order': 1},
+            {'category_type': 'figure', 'anno_id': 6, 'order': 2},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_updates_and_deletes_elements(self, mock_pool, page_id):
+        annotation = {
+            'layout_dets': [
+                {'anno_id': 0, 'category_type': 'text_block'},
+                {'anno_id': 1, 'category_type': 'text_block'},
+            ]
+        }
+        operations = [
+            {'op': 'update', 'anno_id': 0, 'changes': {'category_type': 'title'}},
+            {'op': 'delete', 'anno_id': 1},
+        ]
+
+        _, patched = await self._apply(mock_pool, page_id, annotation, operations)
+
+        assert patched['layout_dets'] == [{'anno_id': 0, 'category_type': 'title'}]
+        assert annotation['layout_dets'][0]['category_type'] == 'text_block'
+        assert 'extra' not in patched
+
+    @pytest.mark.asyncio
+    async def test_deleted_anno_id_not_reused(self, mock_pool, page_id):
+        annotation = {'layout_dets': [{'anno_id': 0}, {'anno_id': 1}]}
+        operations = [
+            {'op': 'delete', 'anno_id': 1},
+            {'op': 'create', 'element': {'category_type': 'figure'}},
+        ]
+
+        result, patched = await self._apply(mock_pool, page_id, annotation, operations)
+
+        assert result['created_anno_ids'] == [2]
+        assert [el['anno_id'] for el in patched['layout_dets']] == [0, 2]
+        assert patched['layout_dets'][1]['order'] == 1
+
+    @pytest.mark.asyncio
+    async def test_relations_reference_created_elements(self, mock_pool, page_id):
+        annotation = {
+            'layout_dets': [{'anno_id': 0}],
+            'extra': {'relation': [{'source_anno_id': 0, 'target_anno_id': 9}]},
+        }
+        operations = [
+            {'op': 'create', 'element': {'category_type': 'figure_caption'}},
+            {
+                'op': 'add_relation',
+                'source_anno_id': 0,
+                'target_anno_id': 1,
+                'relation_type': 'figure_caption',
+            },
+            {'op': 'delete_relation', 'source_anno_id': 0, 'target_anno_id': 9},
+        ]
+
+        _, patched = await self._apply(mock_pool, page_id, annotation, operations)
+
+        assert patched['extra']['relation'] == [
+            {'source_anno_id': 0, 'target_anno_id': 1, 'relation_type': 'figure_caption'}
+        ]
+
+    @pytest.mark.parametrize(
+        ('operation', 'message'),
+        [
+            ({'op': 'update', 'anno_id': 7, 'changes': {}}, 'Element with anno_id 7 not found'),
+            ({'op': 'delete', 'anno_id': 7}, 'Element with anno_id 7 not found'),
+            (
+                {'op': 'add_relation', 'source_anno_id': 0, 'target_anno_id': 0},
+                'Self-referencing',
+            ),
+            (
+                {'op': 'add_relation', 'source_anno_id': 0, 'target_anno_id': 7},
+                'Target element with anno_id 7 not found',
+            ),
+            (
+                {'op': 'add_relation', 'source_anno_id': 0, 'target_anno_id': 1},
+                'Duplicate relation',
+            ),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_invalid_operation_fails_whole_batch(
+        self, mock_pool, page_id, operation, message
+    ):
+        annotation = {
+            'layout_dets': [{'anno_id': 0}, {'anno_id': 1}],
+            'extra': {'relation': [{'source_anno_id': 0, 'target_anno_id': 1}]},
+        }
+        operations = [{'op': 'create', 'element': {'category_type': 'figure'}}, operation]
+
+        with pytest.raises(ValueError, match=message) as exc_info:
+            await self._apply(mock_pool, page_id, annotation, operations)
+
+        assert str(exc_info.value).startswith('operations[1]')
+
+    @pytest.mark.asyncio
+    async def test_returns_full_page_by_default(self, mock_pool, page_id, document_id):
+        record = _make_page_record(page_id, document_id, annotation_data={'layout_dets': []})
+
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.patch_annotation = AsyncMock(return_value=record)
+            result = await labeling_service.apply_element_batch(
+                mock_pool, page_id, [{'op': 'delete', 'anno_id': 0}], expected_version=1
+            )
 
         assert result is not None
         assert result['annotation_data'] == {'layout_dets': []}
+        assert mock_repo.patch_annotation.await_args.kwargs == {
+            'expected_version': 1,
+            'full': True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_version_conflict(self, mock_pool, page_id):
+        with patch.object(labeling_service, 'page_repo') as mock_repo:
+            mock_repo.patch_annotation = AsyncMock(return_value=None)
+            mock_repo.get_version = AsyncMock(return_value=3)
+            with pytest.raises(labeling_service.PageVersionConflictError):
+                await labeling_service.apply_element_batch(
+                    mock_pool, page_id, [], expected_version=2
+                )
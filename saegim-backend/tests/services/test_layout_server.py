@@ -0,0 +1,142 @@
+"""Tests for the shared local layout server."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from saegim.services.layout_server import LayoutBatcher, create_layout_server_app
+from saegim.services.layout_types import LayoutRegion
+
+_CREATE_DETECTOR = 'saegim.services.engines.split_pipeline_engine.create_layout_detector'
+
+
+class FakeDetector:
+    """Detector returning one region per page and recording batch sizes."""
+
+    def __init__(self, fail_on: str | None = None) -> None:
+        """Record batches; raise when a batch contains ``fail_on``."""
+        self.batches: list[list[Path]] = []
+        self._fail_on = fail_on
+
+    def detect_layout(self, image_path: Path) -> list[LayoutRegion]:
+        return self.detect_layout_batch([image_path])[0]
+
+    def detect_layout_batch(self, image_paths):
+        self.batches.append(list(image_paths))
+        if self._fail_on and any(p.name == self._fail_on for p in image_paths):
+            msg = f'cannot read {self._fail_on}'
+            raise OSError(msg)
+        return [
+            [LayoutRegion(bbox=(0.0, 0.0, 10.0, 10.0), category='title', score=0.9, text=p.name)]
+            for p in image_paths
+        ]
+
+
+def _write_image(path: Path) -> Path:
+    Image.new('RGB', (20, 20), color='white').save(path)
+    return path
+
+
+class TestLayoutBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_batch(self):
+        detector = FakeDetector()
+        batcher = LayoutBatcher(detector, max_batch_size=8, max_wait_s=0.05)
+
+        results = await asyncio.gather(
+            batcher.detect([Path('/a.png')]),
+            batcher.detect([Path('/b.png'), Path('/c.png')]),
+        )
+        await batcher.close()
+
+        assert [len(b) for b in detector.batches] == [3]
+        assert results[0][0][0].text == 'a.png'
+        assert [r[0].text for r in results[1]] == ['b.png', 'c.png']
+
+    @pytest.mark.asyncio
+    async def test_respects_max_batch_size(self):
+        detector = FakeDetector()
+        batcher = LayoutBatcher(detector, max_batch_size=2, max_wait_s=0.05)
+
+        await batcher.detect([Path(f'/p{i}.png') for i in range(5)])
+        await batcher.close()
+
+        assert [len(b) for b in detector.batches] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_failed_page_does_not_fail_its_batch(self):
+        detector = FakeDetector(fail_on='bad.png')
+        batcher = LayoutBatcher(detector, max_batch_size=8, max_wait_s=0.05)
+
+        good, bad = await asyncio.gather(
+            batcher.detect([Path('/good.png')]),
+            batcher.detect([Path('/bad.png')]),
+            return_exceptions=True,
+        )
+        await batcher.close()
+
+        assert good[0][0].text == 'good.png'
+        assert isinstance(bad, OSError)
+
+
+class TestLayoutServerApp:
+    def test_detect_returns_regions(self, tmp_path):
+        image = _write_image(tmp_path / 'page.png')
+        detector = FakeDetector()
+
+        with (
+            patch(_CREATE_DETECTOR, return_value=detector) as mock_create,
+            TestClient(create_layout_server_app(image_root=tmp_path)) as client,
+        ):
+            response = client.post(
+                '/detect',
+                json={'provider': 'pp_doclayout', 'image_paths': [str(image)]},
+            )
+            health = client.get('/health').json()
+
+        assert response.status_code == 200
+        region = response.json()['results'][0][0]
+        assert region['category'] == 'title'
+        assert region['bbox'] == [0.0, 0.0, 10.0, 10.0]
+        assert mock_create.call_args.args[0] == 'pp_doclayout'
+        assert mock_create.call_args.kwargs['options'].max_concurrency is None
+        assert health['detectors'] == ['pp_doclayout:default']
+
+    def test_detector_is_loaded_once(self, tmp_path):
+        image = _write_image(tmp_path / 'page.png')
+
+        with (
+            patch(_CREATE_DETECTOR, return_value=FakeDetector()) as mock_create,
+            TestClient(create_layout_server_app()) as client,
+        ):
+            for _ in range(2):
+                client.post('/detect', json={'image_paths': [str(image)]})
+
+        mock_create.assert_called_once()
+
+    def test_missing_image_returns_404(self, tmp_path):
+        with TestClient(create_layout_server_app()) as client:
+            response = client.post('/detect', json={'image_paths': [str(tmp_path / 'no.png')]})
+        assert response.status_code == 404
+
+    def test_image_outside_root_returns_403(self, tmp_path):
+        image = _write_image(tmp_path / 'page.png')
+        root = tmp_path / 'storage'
+        root.mkdir()
+
+        with TestClient(create_layout_server_app(image_root=root)) as client:
+            response = client.post('/detect', json={'image_paths': [str(image)]})
+        assert response.status_code == 403
+
+    def test_unknown_provider_returns_400(self, tmp_path):
+        image = _write_image(tmp_path / 'page.png')
+
+        with TestClient(create_layout_server_app()) as client:
+            response = client.post(
+                '/detect', json={'provider': 'unknown', 'image_paths': [str(image)]}
+            )
+        assert response.status_code == 400
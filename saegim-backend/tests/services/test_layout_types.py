@@ -0,0 +1,19 @@
+"""Tests for shared layout detection types."""
+
+import pytest
+
+from saegim.services.layout_types import bbox_iou
+
+
+class TestBboxIou:
+    def test_identical_boxes(self):
+        assert bbox_iou((0.0, 0.0, 10.0, 10.0), (0.0, 0.0, 10.0, 10.0)) == 1.0
+
+    def test_disjoint_boxes(self):
+        assert bbox_iou((0.0, 0.0, 10.0, 10.0), (20.0, 20.0, 30.0, 30.0)) == 0.0
+
+    def test_half_overlap(self):
+        assert bbox_iou((0.0, 0.0, 10.0, 10.0), (5.0, 0.0, 15.0, 10.0)) == pytest.approx(1 / 3)
+
+    def test_degenerate_box(self):
+        assert bbox_iou((0.0, 0.0, 0.0, 0.0), (0.0, 0.0, 10.0, 10.0)) == 0.0
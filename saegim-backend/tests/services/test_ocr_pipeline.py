@@ -1,9 +1,10 @@
 """Tests for 2-stage OCR pipeline orchestrator."""
 
 import io
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 
 from saegim.services.layout_types import LayoutRegion
 from saegim.services.ocr_pipeline import (
@@ -11,6 +12,7 @@ from saegim.services.ocr_pipeline import (
     _build_layout_det,
     _crop_region,
 )
+from saegim.services.repeated_regions import RepeatedRegionCache
 
 
 def _make_test_image(width: int = 800, height: int = 1200):
@@ -46,6 +48,13 @@ class TestCropRegion:
         img.close()
         cropped.close()
 
+    def test_crop_from_array(self):
+        page = np.zeros((100, 100, 3), dtype=np.uint8)
+        result = _crop_region(page, (10.0, 20.0, 50.0, 60.0))
+        cropped = Image.open(io.BytesIO(result))
+        assert cropped.size == (40, 40)
+        cropped.close()
+
     def test_crop_zero_area_returns_empty(self):
         img = _make_test_image(100, 100)
         result = _crop_region(img, (50.0, 50.0, 50.0, 50.0))
@@ -192,3 +201,154 @@ class TestOcrPipeline:
 
         # With no text provider and no builtin OCR, text should be empty
         assert 'text' not in result['layout_dets'][0]
+
+    def test_extract_page_builtin_ocr_does_not_decode_image(self, tmp_path):
+        image_path = _make_test_image_path(tmp_path)
+
+        mock_layout_detector = MagicMock()
+        mock_layout_detector.detect_layout.return_value = [
+            LayoutRegion(bbox=(10.0, 20.0, 300.0, 60.0), category='title', score=0.95),
+        ]
+
+        pipeline = OcrPipeline(mock_layout_detector, use_builtin_ocr=True)
+        with patch('saegim.services.ocr_pipeline.load_page_array') as mock_load:
+            pipeline.extract_page(image_path, 800, 1200)
+
+        mock_load.assert_not_called()
+
+    def test_extract_pages_uses_batch_detection(self, tmp_path):
+        image_path = _make_test_image_path(tmp_path)
+
+        mock_layout_detector = MagicMock()
+        mock_layout_detector.detect_layout_batch.return_value = [
+            [LayoutRegion(bbox=(10.0, 20.0, 300.0, 60.0), category='title', score=0.95)],
+            [],
+        ]
+        mock_text_provider = MagicMock()
+        mock_text_provider.extract_text.return_value = 'Title'
+
+        pipeline = OcrPipeline(mock_layout_detector, mock_text_provider)
+        results = pipeline.extract_pages([image_path, image_path])
+
+        mock_layout_detector.detect_layout_batch.assert_called_once_with([image_path, image_path])
+        mock_layout_detector.detect_layout.assert_not_called()
+        assert len(results) == 2
+        assert results[0]['layout_dets'][0]['text'] == 'Title'
+        assert results[1]['layout_dets'] == []
+
+    def test_text_source_fills_text_regions(self, tmp_path):
+        image_path = _make_test_image_path(tmp_path)
+
+        mock_layout_detector = MagicMock()
+        mock_layout_detector.detect_layout.return_value = [
+            LayoutRegion(bbox=(10.0, 20.0, 300.0, 60.0), category='title', score=0.95),
+            LayoutRegion(bbox=(10.0, 80.0, 300.0, 200.0), category='text_block', score=0.9),
+            LayoutRegion(bbox=(10.0, 220.0, 300.0, 400.0), category='table', score=0.9),
+        ]
+        mock_text_provider = MagicMock()
+        mock_text_provider.extract_text.side_effect = ['Scanned paragraph', '<table></table>']
+        mock_source = MagicMock()
+        mock_source.region_text.side_effect = ['PDF title', '']
+
+        pipeline = OcrPipeline(mock_layout_detector, mock_text_provider, text_source=mock_source)
+        result = pipeline.extract_page(image_path, 800, 1200)
+
+        dets = result['layout_dets']
+        assert dets[0]['text'] == 'PDF title'
+        # No characters in the PDF for this region: falls back to OCR
+        assert dets[1]['text'] == 'Scanned paragraph'
+        # Tables always go to OCR for their structure
+        assert dets[2]['html'] == '<table></table>'
+        assert mock_source.region_text.call_count == 2
+        assert [c.args[1] for c in mock_text_provider.extract_text.call_args_list] == [
+            'text_block',
+            'table',
+        ]
+
+    def test_text_source_covering_all_regions_skips_decode(self, tmp_path):
+        image_path = _make_test_image_path(tmp_path)
+
+        mock_layout_detector = MagicMock()
+        mock_layout_detector.detect_layout.return_value = [
+            LayoutRegion(bbox=(10.0, 20.0, 300.0, 60.0), category='title', score=0.95),
+        ]
+        mock_text_provider = MagicMock()
+        mock_source = MagicMock()
+        mock_source.region_text.return_value = 'PDF title'
+
+        pipeline = OcrPipeline(mock_layout_detector, mock_text_provider)
+        pipeline.set_text_source(mock_source)
+        with patch('saegim.services.ocr_pipeline.load_page_array') as mock_load:
+            pipeline.extract_page(image_path, 800, 1200)
+
+        mock_load.assert_not_called()
+        mock_text_provider.extract_text.assert_not_called()
+
+    def test_repeated_header_ocrd_once(self, tmp_path):
+        paths = []
+        for page_no in (1, 2):
+            image = Image.new('RGB', (800, 1200), color='white')
+            draw = ImageDraw.Draw(image)
+            draw.text((120, 40), 'Annual Report 2024', fill='black')
+            draw.text((400, 1150), str(page_no), fill='black')
+            path = tmp_path / f'page_{page_no}.png'
+            image.save(path, format='PNG')
+            paths.append(path)
+
+        mock_layout_detector = MagicMock()
+        mock_layout_detector.detect_layout.return_value = [
+            LayoutRegion(bbox=(100.0, 20.0, 700.0, 80.0), category='text_block', score=0.9),
+            LayoutRegion(bbox=(380.0, 1140.0, 420.0, 1170.0), category='page_number', score=0.9),
+        ]
+        mock_text_provider = MagicMock()
+        mock_text_provider.extract_text.side_effect = ['Annual Report 2024', '1', '2']
+
+        pipeline = OcrPipeline(
+            mock_layout_detector,
+            mock_text_provider,
+            repeated_regions=RepeatedRegionCache(),
+        )
+        results = [pipeline.extract_page(path, 800, 1200) for path in paths]
+
+        assert results[1]['layout_dets'][0]['text'] == 'Annual Report 2024'
+        assert results[1]['layout_dets'][1]['text'] == '2'
+        # Header OCR'd on the first page only; page numbers on every page
+        assert [c.args[1] for c in mock_text_provider.extract_text.call_args_list] == [
+            'text_block',
+            'page_number',
+            'page_number',
+        ]
+
+    def test_repeated_footer_ocrs_changed_page_number_only(self, tmp_path):
+        font = ImageFont.load_default(size=24)
+        paths = []
+        for page_no in (9, 10):
+            image = Image.new('RGB', (800, 1200), color='white')
+            draw = ImageDraw.Draw(image)
+            draw.text((120, 1140), f'Annual Report - Page {page_no}', fill='black', font=font)
+            path = tmp_path / f'page_{page_no}.png'
+            image.save(path, format='PNG')
+            paths.append(path)
+
+        mock_layout_detector = MagicMock()
+        mock_layout_detector.detect_layout.return_value = [
+            LayoutRegion(bbox=(100.0, 1120.0, 700.0, 1180.0), category='text_block', score=0.9),
+        ]
+        mock_text_provider = MagicMock()
+        mock_text_provider.extract_text.side_effect = ['Annual Report - Page 9', '10']
+
+        pipeline = OcrPipeline(
+            mock_layout_detector,
+            mock_text_provider,
+            repeated_regions=RepeatedRegionCache(),
+        )
+        results = [pipeline.extract_page(path, 800, 1200) for path in paths]
+
+        assert results[1]['layout_dets'][0]['text'] == 'Annual Report - Page 10'
+        # The second page sends only the page number to OCR
+        full, digits = (
+            Image.open(io.BytesIO(c.args[0]))
+            for c in mock_text_provider.extract_text.call_args_list
+        )
+        assert full.size == (600, 60)
+        assert digits.width < 60
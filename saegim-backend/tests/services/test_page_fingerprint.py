@@ -0,0 +1,74 @@
+"""Tests for page image fingerprints."""
+
+from PIL import Image, ImageDraw
+
+from saegim.services.page_fingerprint import (
+    NEAR_DUPLICATE_DISTANCE,
+    compute_fingerprint,
+    fingerprint_file,
+    hamming_distance,
+    same_page,
+)
+
+
+def _text_page(seed: int = 0, size=(600, 800)) -> Image.Image:
+    image = Image.new('RGB', size, color='white')
+    draw = ImageDraw.Draw(image)
+    for row in range(20):
+        width = 200 + ((row * 37 + seed * 101) % 300)
+        draw.rectangle((50, 60 + row * 30, 50 + width, 72 + row * 30), fill='black')
+    return image
+
+
+class TestBlankDetection:
+    def test_white_page_is_blank(self):
+        assert compute_fingerprint(Image.new('RGB', (600, 800), color='white')).blank
+
+    def test_scanned_gray_page_with_speck_is_blank(self):
+        image = Image.new('L', (600, 800), color=200)
+        ImageDraw.Draw(image).ellipse((300, 400, 303, 403), fill=0)
+        assert compute_fingerprint(image).blank
+
+    def test_text_page_is_not_blank(self):
+        assert not compute_fingerprint(_text_page()).blank
+
+
+class TestPerceptualHash:
+    def test_rescaled_page_hashes_alike(self):
+        page = _text_page()
+        small = page.resize((300, 400))
+        distance = hamming_distance(
+            compute_fingerprint(page).phash, compute_fingerprint(small).phash
+        )
+        assert distance <= NEAR_DUPLICATE_DISTANCE
+
+    def test_different_pages_hash_apart(self):
+        a = compute_fingerprint(_text_page(seed=0)).phash
+        b = compute_fingerprint(_text_page(seed=1).transpose(Image.Transpose.ROTATE_180)).phash
+        assert hamming_distance(a, b) > NEAR_DUPLICATE_DISTANCE
+
+    def test_hash_fits_bigint(self):
+        phash = compute_fingerprint(_text_page()).phash
+        assert -(2**63) <= phash < 2**63
+
+    def test_hamming_distance_handles_sign(self):
+        assert hamming_distance(-1, 0) == 64
+        assert hamming_distance(5, 5) == 0
+
+
+class TestSamePage:
+    def test_identical_renders(self, tmp_path):
+        _text_page().save(tmp_path / 'a.png')
+        _text_page().save(tmp_path / 'b.png')
+        assert same_page(tmp_path / 'a.png', tmp_path / 'b.png')
+        assert fingerprint_file(tmp_path / 'a.png') == fingerprint_file(tmp_path / 'b.png')
+
+    def test_same_layout_different_text(self, tmp_path):
+        _text_page(seed=0).save(tmp_path / 'a.png')
+        _text_page(seed=1).save(tmp_path / 'b.png')
+        assert not same_page(tmp_path / 'a.png', tmp_path / 'b.png')
+
+    def test_different_aspect_ratio(self, tmp_path):
+        _text_page().save(tmp_path / 'a.png')
+        _text_page(size=(800, 600)).save(tmp_path / 'b.png')
+        assert not same_page(tmp_path / 'a.png', tmp_path / 'b.png')
@@ -0,0 +1,124 @@
+"""Tests for the decode-once page image cache."""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from saegim.services.page_image_cache import (
+    PageImageCache,
+    clamp_bbox,
+    crop_view,
+)
+
+
+def _write_page(path, width: int = 100, height: int = 80, color: str = 'white'):
+    """Write a test page image and return its path."""
+    img = Image.new('RGB', (width, height), color=color)
+    img.save(path, format='PNG')
+    img.close()
+    return path
+
+
+class TestPageImageCache:
+    def test_decodes_rgb_array(self, tmp_path):
+        path = _write_page(tmp_path / 'page.png', 100, 80)
+        cache = PageImageCache()
+        page = cache.get(path)
+        assert page.shape == (80, 100, 3)
+        assert page.dtype == np.uint8
+        assert not page.flags.writeable
+
+    def test_converts_non_rgb_modes(self, tmp_path):
+        path = tmp_path / 'gray.png'
+        Image.new('L', (20, 10), color=128).save(path)
+        page = PageImageCache().get(path)
+        assert page.shape == (10, 20, 3)
+
+    def test_second_get_returns_cached_array(self, tmp_path):
+        path = _write_page(tmp_path / 'page.png')
+        cache = PageImageCache()
+        first = cache.get(path)
+        second = cache.get(path)
+        assert first is second
+        assert len(cache) == 1
+        assert cache.current_bytes == first.nbytes
+
+    def test_modified_file_is_decoded_again(self, tmp_path):
+        path = _write_page(tmp_path / 'page.png', color='white')
+        cache = PageImageCache()
+        first = cache.get(path)
+
+        _write_page(path, 120, 80, color='black')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = cache.get(path)
+        assert second is not first
+        assert second.shape == (80, 120, 3)
+        assert second[0, 0].tolist() == [0, 0, 0]
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        paths = [_write_page(tmp_path / f'p{i}.png', 10, 10) for i in range(3)]
+        page_bytes = 10 * 10 * 3
+        cache = PageImageCache(max_bytes=page_bytes * 2)
+
+        first = cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])  # refresh p0
+        cache.get(paths[2])  # evicts p1
+
+        assert len(cache) == 2
+        assert cache.current_bytes == page_bytes * 2
+        assert cache.get(paths[0]) is first
+
+    def test_oversized_page_is_not_cached(self, tmp_path):
+        path = _write_page(tmp_path / 'page.png', 10, 10)
+        cache = PageImageCache(max_bytes=10)
+        page = cache.get(path)
+        assert page.shape == (10, 10, 3)
+        assert len(cache) == 0
+
+    def test_resize_evicts(self, tmp_path):
+        paths = [_write_page(tmp_path / f'p{i}.png', 10, 10) for i in range(2)]
+        cache = PageImageCache()
+        for path in paths:
+            cache.get(path)
+        cache.resize(10 * 10 * 3)
+        assert len(cache) == 1
+
+    def test_clear(self, tmp_path):
+        cache = PageImageCache()
+        cache.get(_write_page(tmp_path / 'page.png'))
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(OSError):  # noqa: PT011
+            PageImageCache().get(tmp_path / 'missing.png')
+
+
+class TestClampBbox:
+    def test_within_bounds(self):
+        assert clamp_bbox((10.5, 20.2, 50.9, 60.0), 100, 100) == (10, 20, 50, 60)
+
+    def test_clamped(self):
+        assert clamp_bbox((-10.0, -5.0, 200.0, 150.0), 100, 80) == (0, 0, 100, 80)
+
+    def test_zero_area(self):
+        assert clamp_bbox((50.0, 50.0, 50.0, 60.0), 100, 100) is None
+
+
+class TestCropView:
+    def test_crop_is_view(self):
+        page = np.zeros((80, 100, 3), dtype=np.uint8)
+        region = crop_view(page, (10.0, 20.0, 50.0, 60.0))
+        assert region is not None
+        assert region.shape == (40, 40, 3)
+        assert np.shares_memory(region, page)
+
+    def test_zero_area_returns_none(self):
+        page = np.zeros((80, 100, 3), dtype=np.uint8)
+        assert crop_view(page, (200.0, 200.0, 300.0, 300.0)) is None
@@ -0,0 +1,186 @@
+"""Tests for the PP-DocLayoutV3 ONNX Runtime backend."""
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from saegim.services.layout_types import bbox_iou
+from saegim.services.pp_doclayout_onnx_service import (
+    PPDocLayoutV3OnnxDetector,
+    _atomic_output,
+    _OnnxOutputs,
+    artifact_dir,
+    default_cache_dir,
+    export_onnx,
+)
+
+_MODULE = 'saegim.services.pp_doclayout_onnx_service'
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent.parent / 'sample' / '2602.04118v1_eng.pdf'
+
+
+def _write_artifacts(model_dir: Path, *filenames: str) -> None:
+    model_dir.mkdir(parents=True, exist_ok=True)
+    for filename in filenames:
+        (model_dir / filename).write_bytes(b'onnx')
+    (model_dir / 'meta.json').write_text(
+        json.dumps({'outputs': ['logits', 'pred_boxes'], 'id2label': {'0': 'text'}})
+    )
+
+
+class TestCacheLocation:
+    def test_env_override(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('SAEGIM_MODEL_CACHE', str(tmp_path))
+        assert default_cache_dir() == tmp_path
+
+    def test_xdg_cache_home(self, monkeypatch, tmp_path):
+        monkeypatch.delenv('SAEGIM_MODEL_CACHE', raising=False)
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+        assert default_cache_dir() == tmp_path / 'saegim' / 'onnx'
+
+    def test_artifact_dir_flattens_model_name(self, tmp_path):
+        path = artifact_dir(tmp_path, 'PaddlePaddle/PP-DocLayoutV3_safetensors')
+        assert path == tmp_path / 'PaddlePaddle--PP-DocLayoutV3_safetensors'
+
+
+class TestExportOnnx:
+    @patch(f'{_MODULE}._export_fp32')
+    def test_cached_fp32_is_reused(self, mock_export, tmp_path):
+        _write_artifacts(tmp_path, 'model.onnx')
+
+        path = export_onnx('m', tmp_path)
+
+        assert path == tmp_path / 'model.onnx'
+        mock_export.assert_not_called()
+
+    @patch(f'{_MODULE}._export_fp32')
+    def test_missing_artifacts_are_exported(self, mock_export, tmp_path):
+        model_dir = tmp_path / 'm'
+        mock_export.side_effect = lambda _name, model_path, _meta: _write_artifacts(
+            model_path.parent, model_path.name
+        )
+
+        path = export_onnx('m', model_dir)
+
+        mock_export.assert_called_once_with('m', model_dir / 'model.onnx', model_dir / 'meta.json')
+        assert path.exists()
+
+    @patch(f'{_MODULE}._export_fp32')
+    def test_cached_int8_is_reused(self, mock_export, tmp_path):
+        _write_artifacts(tmp_path, 'model.onnx', 'model.int8.onnx')
+
+        path = export_onnx('m', tmp_path, quantize=True)
+
+        assert path == tmp_path / 'model.int8.onnx'
+        mock_export.assert_not_called()
+
+
+class TestAtomicOutput:
+    def test_renames_unique_temp_file_into_place(self, tmp_path):
+        target = tmp_path / 'model.onnx'
+
+        with _atomic_output(target) as first, _atomic_output(target) as second:
+            assert first != second
+            assert first.parent == tmp_path
+            first.write_bytes(b'first')
+            second.write_bytes(b'second')
+
+        assert target.read_bytes() == b'first'
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_failure_leaves_no_files(self, tmp_path):
+        target = tmp_path / 'model.onnx'
+
+        def export() -> None:
+            with _atomic_output(target) as tmp:
+                tmp.write_bytes(b'partial')
+                raise TimeoutError
+
+        with pytest.raises(TimeoutError):
+            export()
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestOnnxOutputs:
+    def test_attribute_access(self):
+        outputs = _OnnxOutputs({'logits': 1})
+        assert outputs.logits == 1
+        assert outputs['logits'] == 1
+
+    def test_missing_attribute_raises(self):
+        with pytest.raises(AttributeError):
+            _ = _OnnxOutputs().pred_boxes
+
+
+class TestPPDocLayoutV3OnnxDetector:
+    def test_lazy_loading(self, tmp_path):
+        detector = PPDocLayoutV3OnnxDetector(cache_dir=tmp_path, quantize=True)
+        assert detector._session is None
+        assert detector.quantize is True
+
+    @patch(f'{_MODULE}.importlib')
+    def test_missing_dependencies(self, mock_importlib, tmp_path):
+        mock_importlib.import_module.side_effect = ImportError('no onnxruntime')
+
+        ok, msg = PPDocLayoutV3OnnxDetector(cache_dir=tmp_path).test_connection()
+
+        assert ok is False
+        assert 'onnxruntime' in msg
+
+    @patch(f'{_MODULE}.importlib')
+    def test_reports_cached_artifacts(self, mock_importlib, tmp_path):
+        detector = PPDocLayoutV3OnnxDetector(cache_dir=tmp_path, quantize=True)
+        _write_artifacts(artifact_dir(tmp_path, detector.model_name), 'model.int8.onnx')
+
+        ok, msg = detector.test_connection()
+
+        assert ok is True
+        assert 'int8' in msg
+        assert 'cached' in msg
+
+
+def _has_model_deps() -> bool:
+    return all(
+        importlib.util.find_spec(name) is not None
+        for name in ('torch', 'transformers', 'onnxruntime', 'onnx')
+    )
+
+
+@pytest.mark.skipif(
+    not (_has_model_deps() and os.environ.get('SAEGIM_RUN_MODEL_TESTS') and SAMPLE_PDF.exists()),
+    reason='Requires torch, onnxruntime, model download and SAEGIM_RUN_MODEL_TESTS=1',
+)
+class TestOnnxParity:
+    """Compare ONNX boxes against the PyTorch detector on a real page."""
+
+    @pytest.mark.parametrize(('quantize', 'min_iou'), [(False, 0.95), (True, 0.85)])
+    def test_boxes_match_torch(self, tmp_path, quantize, min_iou):
+        import pypdfium2 as pdfium
+
+        from saegim.services.pp_doclayout_service import PPDocLayoutV3Detector
+
+        pdf = pdfium.PdfDocument(str(SAMPLE_PDF))
+        image_path = tmp_path / 'page.png'
+        pdf[0].render(scale=2.0).to_pil().save(image_path)
+        pdf.close()
+
+        expected = PPDocLayoutV3Detector().detect_layout(image_path)
+        actual = PPDocLayoutV3OnnxDetector(
+            cache_dir=tmp_path / 'cache', quantize=quantize
+        ).detect_layout(image_path)
+
+        assert expected
+        matched = sum(
+            1
+            for ref in expected
+            if any(
+                det.category == ref.category and bbox_iou(det.bbox, ref.bbox) >= min_iou
+                for det in actual
+            )
+        )
+        assert matched / len(expected) >= 0.9
@@ -4,6 +4,7 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from PIL import Image
 
 from saegim.services.layout_types import LayoutRegion
 from saegim.services.pp_doclayout_service import (
@@ -119,6 +120,10 @@ class TestPPDocLayoutV3DetectorInit:
         assert detector._model is None
         assert detector._processor is None
 
+    def test_invalid_batch_size_raises(self):
+        with pytest.raises(ValueError, match='batch_size'):
+            PPDocLayoutV3Detector(batch_size=0)
+
 
 class TestPPDocLayoutV3DetectorDetectLayout:
     @patch(f'{_MODULE}.PPDocLayoutV3Detector._ensure_model_loaded')
@@ -148,6 +153,32 @@ class TestPPDocLayoutV3DetectorDetectLayout:
         assert regions == []
 
 
+class TestPPDocLayoutV3DetectorDetectLayoutBatch:
+    @patch(f'{_MODULE}.PPDocLayoutV3Detector._ensure_model_loaded')
+    @patch(f'{_MODULE}.PPDocLayoutV3Detector._run_batch_inference')
+    def test_splits_into_batches(self, mock_inference, mock_load, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f'p{i}.png'
+            Image.new('RGB', (40, 60), color='white').save(path)
+            paths.append(path)
+        mock_inference.side_effect = lambda images: [
+            [{'label': 'text', 'score': 0.9, 'box': [0.0, 0.0, 10.0, 10.0]}] for _ in images
+        ]
+
+        detector = PPDocLayoutV3Detector(batch_size=2)
+        results = detector.detect_layout_batch(paths)
+
+        assert [len(call.args[0]) for call in mock_inference.call_args_list] == [2, 1]
+        assert len(results) == 3
+        assert all(regions[0].category == 'text_block' for regions in results)
+
+    @patch(f'{_MODULE}.PPDocLayoutV3Detector._ensure_model_loaded')
+    def test_empty_input_skips_model(self, mock_load):
+        assert PPDocLayoutV3Detector().detect_layout_batch([]) == []
+        mock_load.assert_not_called()
+
+
 class TestPPDocLayoutV3DetectorTestConnection:
     @patch(f'{_MODULE}.importlib')
     def test_success_with_cuda(self, mock_importlib):
@@ -0,0 +1,93 @@
+"""Tests for the layout server client."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from saegim.services.remote_layout_detector import RemoteLayoutDetector, _client_args
+
+_MODULE = 'saegim.services.remote_layout_detector'
+
+
+def _mock_client(handler):
+    return httpx.Client(base_url='http://layout-server', transport=httpx.MockTransport(handler))
+
+
+class TestClientArgs:
+    def test_http_url(self):
+        base_url, transport = _client_args('http://127.0.0.1:5100/')
+        assert base_url == 'http://127.0.0.1:5100'
+        assert transport is None
+
+    def test_unix_socket_url(self):
+        base_url, transport = _client_args('unix:///run/saegim/layout.sock')
+        assert base_url == 'http://layout-server'
+        assert isinstance(transport, httpx.HTTPTransport)
+
+
+class TestRemoteLayoutDetector:
+    def test_detect_layout_batch(self):
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(
+                200,
+                json={
+                    'results': [
+                        [{'bbox': [1, 2, 3, 4], 'category': 'table', 'score': 0.8, 'text': None}],
+                        [],
+                    ]
+                },
+            )
+
+        detector = RemoteLayoutDetector(
+            'http://127.0.0.1:5100', provider='docling', model_name='custom/docling'
+        )
+        with patch.object(RemoteLayoutDetector, '_client', return_value=_mock_client(handler)):
+            results = detector.detect_layout_batch([Path('/s/a.png'), Path('/s/b.png')])
+
+        assert requests[0]['provider'] == 'docling'
+        assert requests[0]['model_name'] == 'custom/docling'
+        assert len(requests[0]['image_paths']) == 2
+        assert results[0][0].bbox == (1.0, 2.0, 3.0, 4.0)
+        assert results[0][0].category == 'table'
+        assert results[1] == []
+
+    def test_server_error_raises_runtime_error(self):
+        detector = RemoteLayoutDetector('http://127.0.0.1:5100')
+        client = _mock_client(lambda _request: httpx.Response(500, text='boom'))
+        with (
+            patch.object(RemoteLayoutDetector, '_client', return_value=client),
+            pytest.raises(RuntimeError, match='Layout server error 500'),
+        ):
+            detector.detect_layout(Path('/s/a.png'))
+
+    def test_empty_batch_skips_request(self):
+        with patch.object(RemoteLayoutDetector, '_client') as mock_client:
+            assert RemoteLayoutDetector('http://x').detect_layout_batch([]) == []
+        mock_client.assert_not_called()
+
+    def test_connection_ok(self):
+        client = _mock_client(
+            lambda _request: httpx.Response(
+                200, json={'status': 'ok', 'detectors': ['docling:default']}
+            )
+        )
+        with patch.object(RemoteLayoutDetector, '_client', return_value=client):
+            ok, msg = RemoteLayoutDetector('http://127.0.0.1:5100').test_connection()
+        assert ok is True
+        assert 'docling:default' in msg
+
+    def test_connection_unreachable(self):
+        def handler(request):
+            msg = 'refused'
+            raise httpx.ConnectError(msg, request=request)
+
+        with patch.object(RemoteLayoutDetector, '_client', return_value=_mock_client(handler)):
+            ok, msg = RemoteLayoutDetector('http://127.0.0.1:5100').test_connection()
+        assert ok is False
+        assert 'unreachable' in msg
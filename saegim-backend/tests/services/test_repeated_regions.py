@@ -0,0 +1,154 @@
+"""Tests for the recurring header/footer region cache."""
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from saegim.services.repeated_regions import (
+    ChangedSpan,
+    RepeatedRegionCache,
+    ink_mask,
+    is_margin_region,
+    same_ink,
+)
+
+_HEADER_BBOX = (100.0, 20.0, 700.0, 80.0)
+
+
+def _page(header: str, *, shift: int = 0, size: int | None = None) -> np.ndarray:
+    """Render a white page with a running header."""
+    image = Image.new('RGB', (800, 1200), color='white')
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=size) if size else None
+    draw.text((120 + shift, 40 + shift), header, fill='black', font=font)
+    draw.rectangle((100, 500, 700, 520), fill='black')
+    return np.asarray(image)
+
+
+class TestIsMarginRegion:
+    def test_top_and_bottom_bands(self):
+        assert is_margin_region('text_block', (0, 10, 100, 100), 1200)
+        assert is_margin_region('text_block', (0, 1100, 100, 1190), 1200)
+        assert not is_margin_region('text_block', (0, 500, 100, 600), 1200)
+
+    def test_header_category_anywhere(self):
+        assert is_margin_region('header', (0, 500, 100, 600), 1200)
+
+    def test_page_numbers_and_figures_never_cached(self):
+        assert not is_margin_region('page_number', (0, 1150, 50, 1190), 1200)
+        assert not is_margin_region('figure', (0, 10, 100, 100), 1200)
+
+
+class TestInkMask:
+    def test_trims_to_ink(self):
+        crop = np.full((20, 30), 255, dtype=np.uint8)
+        crop[5:8, 10:20] = 0
+        mask = ink_mask(crop)
+        assert mask is not None
+        assert mask.shape == (3, 10)
+        assert mask.all()
+
+    def test_blank_crop(self):
+        assert ink_mask(np.full((20, 30, 3), 255, dtype=np.uint8)) is None
+
+
+class TestSameInk:
+    def test_one_pixel_jitter_matches(self):
+        a = np.zeros((20, 60), dtype=bool)
+        a[5:15, 10:50] = True
+        b = np.zeros((20, 60), dtype=bool)
+        b[6:16, 10:50] = True
+        assert same_ink(a, b)
+
+    def test_different_size_rejected(self):
+        assert not same_ink(np.ones((20, 60), dtype=bool), np.ones((20, 80), dtype=bool))
+
+
+class TestRepeatedRegionCache:
+    def test_reuses_text_of_identical_header(self):
+        cache = RepeatedRegionCache()
+        key = cache.key(_page('Annual Report 2024'), 'text_block', _HEADER_BBOX)
+        assert key is not None
+        assert cache.get(key) is None
+        cache.put(key, 'Annual Report 2024')
+
+        later = cache.key(_page('Annual Report 2024', shift=1), 'text_block', _HEADER_BBOX)
+        assert later is not None
+        assert cache.get(later) == 'Annual Report 2024'
+        assert cache.hits == 1
+
+    def test_changed_header_is_a_miss(self):
+        cache = RepeatedRegionCache()
+        key = cache.key(_page('Chapter 3 - Methods'), 'text_block', _HEADER_BBOX)
+        cache.put(key, 'Chapter 3 - Methods')
+
+        other = cache.key(_page('Chapter 4 - Methods'), 'text_block', _HEADER_BBOX)
+        assert cache.get(other) is None
+
+    def test_other_position_or_category_is_a_miss(self):
+        cache = RepeatedRegionCache()
+        page = _page('Annual Report 2024')
+        cache.put(cache.key(page, 'text_block', _HEADER_BBOX), 'Annual Report 2024')
+
+        assert cache.get(cache.key(page, 'title', _HEADER_BBOX)) is None
+        moved = (100.0, 40.0, 700.0, 100.0)
+        assert cache.get(cache.key(page, 'text_block', moved)) is None
+
+    def test_body_regions_have_no_key(self):
+        cache = RepeatedRegionCache()
+        assert cache.key(_page('x'), 'text_block', (100.0, 490.0, 700.0, 530.0)) is None
+
+    def test_empty_text_not_cached(self):
+        cache = RepeatedRegionCache()
+        cache.put(cache.key(_page('Annual Report'), 'text_block', _HEADER_BBOX), '')
+        assert len(cache) == 0
+
+
+class TestChangedSpan:
+    def test_changed_chapter_number(self):
+        cache = RepeatedRegionCache()
+        key = cache.key(_page('Chapter 3 - Methods', size=24), 'text_block', _HEADER_BBOX)
+        cache.put(key, 'Chapter 3 - Methods')
+
+        other = cache.key(
+            _page('Chapter 4 - Methods', shift=1, size=24), 'text_block', _HEADER_BBOX
+        )
+        span = cache.changed_span(other)
+
+        assert span is not None
+        assert (span.prefix, span.suffix) == ('Chapter ', ' - Methods')
+        # The span covers the digit only, not the words around it
+        x0, y0, x1, y1 = span.bbox
+        assert 200 < x0 < x1 < 250
+        assert y0 < 45 < 65 < y1
+        assert cache.partial_hits == 1
+
+    def test_longer_page_number(self):
+        cache = RepeatedRegionCache()
+        key = cache.key(_page('Annual Report - Page 9', size=24), 'text_block', _HEADER_BBOX)
+        cache.put(key, 'Annual Report - Page 9')
+
+        other = cache.key(_page('Annual Report - Page 10', size=24), 'text_block', _HEADER_BBOX)
+        span = cache.changed_span(other)
+
+        assert span is not None
+        assert span.splice(' 10\n') == 'Annual Report - Page 10'
+
+    def test_changed_words_without_digits_rejected(self):
+        cache = RepeatedRegionCache()
+        key = cache.key(_page('Chapter 3 - Methods', size=24), 'text_block', _HEADER_BBOX)
+        cache.put(key, 'Chapter 3 - Methods')
+
+        other = cache.key(_page('Chapter 3 - Results', size=24), 'text_block', _HEADER_BBOX)
+        assert cache.changed_span(other) is None
+
+    def test_text_not_matching_words_rejected(self):
+        cache = RepeatedRegionCache()
+        key = cache.key(_page('Chapter 3 - Methods', size=24), 'text_block', _HEADER_BBOX)
+        cache.put(key, 'Chapter 3 Methods')
+
+        other = cache.key(_page('Chapter 4 - Methods', size=24), 'text_block', _HEADER_BBOX)
+        assert cache.changed_span(other) is None
+
+    def test_splice(self):
+        span = ChangedSpan(bbox=(0.0, 0.0, 10.0, 10.0), prefix='p. ', suffix=' of 20')
+        assert span.splice('7') == 'p. 7 of 20'
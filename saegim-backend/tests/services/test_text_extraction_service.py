@@ -7,9 +7,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from PIL import Image
 
+from saegim.services import page_image_cache
+from saegim.services.image_encoding import DEFAULT_ENCODING, ImageEncoding
 from saegim.services.text_extraction_service import (
     NoTextProviderError,
     TextExtractionError,
+    build_crop_encoding,
     build_text_provider,
     crop_region,
     extract_text_from_region,
@@ -300,6 +303,43 @@ class TestBuildTextProviderMultiInstance:
         assert provider is not None
 
 
+class TestBuildCropEncoding:
+    def test_multi_instance_engine_config(self):
+        config = {
+            'default_engine_id': 'gemini-flash',
+            'engines': {
+                'gemini-flash': {
+                    'engine_type': 'commercial_api',
+                    'name': 'Gemini Flash',
+                    'config': {
+                        'provider': 'gemini',
+                        'api_key': 'key',
+                        'crop_format': 'webp',
+                        'crop_quality': 70,
+                    },
+                },
+                'local': {
+                    'engine_type': 'vllm',
+                    'name': 'Local',
+                    'config': {'host': 'localhost'},
+                },
+            },
+        }
+        assert build_crop_encoding(config) == ImageEncoding(format='webp', quality=70)
+        assert build_crop_encoding(config, 'local') == DEFAULT_ENCODING
+
+    def test_unknown_engine_uses_default(self):
+        config = {'default_engine_id': None, 'engines': {}}
+        assert build_crop_encoding(config, 'missing') == DEFAULT_ENCODING
+
+    def test_legacy_flat_format(self):
+        config = {
+            'engine_type': 'vllm',
+            'vllm': {'host': 'localhost', 'crop_grayscale': True},
+        }
+        assert build_crop_encoding(config) == ImageEncoding(grayscale=True)
+
+
 class TestExtractTextFromRegion:
     def test_success(self, tmp_path):
         image_path = _make_test_image_path(tmp_path)
@@ -351,6 +391,32 @@ class TestExtractTextFromRegion:
         extract_text_from_region(image_path, poly, 'table', mock_provider)
         assert mock_provider.extract_text.call_args[0][1] == 'table'
 
+    def test_crop_encoding_applied(self, tmp_path):
+        image_path = _make_test_image_path(tmp_path)
+        poly = [10.0, 20.0, 100.0, 20.0, 100.0, 60.0, 10.0, 60.0]
+        mock_provider = MagicMock()
+        mock_provider.extract_text.return_value = 'text'
+
+        encoding = ImageEncoding(format='jpeg', quality=80)
+        extract_text_from_region(image_path, poly, 'text_block', mock_provider, encoding)
+
+        assert mock_provider.extract_text.call_args[0][0][:3] == b'\xff\xd8\xff'
+
+    def test_repeated_regions_decode_page_once(self, tmp_path):
+        image_path = _make_test_image_path(tmp_path)
+        poly = [10.0, 20.0, 100.0, 20.0, 100.0, 60.0, 10.0, 60.0]
+        mock_provider = MagicMock()
+        mock_provider.extract_text.return_value = 'text'
+
+        with patch(
+            'saegim.services.page_image_cache._decode_rgb',
+            wraps=page_image_cache._decode_rgb,
+        ) as mock_decode:
+            extract_text_from_region(image_path, poly, 'text_block', mock_provider)
+            extract_text_from_region(image_path, poly, 'title', mock_provider)
+
+        mock_decode.assert_called_once()
+
 
 class TestResolveTextProvider:
     @pytest.fixture
@@ -390,7 +456,7 @@ class TestResolveTextProvider:
                 return_value=ocr_config,
             ),
         ):
-            _, provider = await resolve_text_provider(mock_pool, page_id, engine_id='vllm')
+            _, provider, _ = await resolve_text_provider(mock_pool, page_id, engine_id='vllm')
         assert provider is not None
 
     @pytest.mark.asyncio
@@ -485,7 +551,7 @@ class TestResolveTextProvider:
                 return_value=ocr_config,
             ),
         ):
-            _, provider = await resolve_text_provider(mock_pool, page_id)
+            _, provider, _ = await resolve_text_provider(mock_pool, page_id)
         assert provider is not None
 
     @pytest.mark.asyncio
@@ -521,7 +587,9 @@ class TestResolveTextProvider:
                 return_value=ocr_config,
             ),
         ):
-            _, provider = await resolve_text_provider(mock_pool, page_id, engine_id='gemini-flash')
+            _, provider, _ = await resolve_text_provider(
+                mock_pool, page_id, engine_id='gemini-flash'
+            )
         assert provider is not None
 
     @pytest.mark.asyncio
@@ -0,0 +1,103 @@
+"""Tests for PDF text layer inspection."""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from saegim.services.text_layer import (
+    CharGrid,
+    PdfChar,
+    PdfRegionTextSource,
+    TextLayerStats,
+    _is_valid_char,
+    find_text_layer_pages,
+)
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent.parent / 'sample' / '2602.04118v1_eng.pdf'
+
+
+class TestTextLayerStats:
+    def test_text_page_is_usable(self):
+        assert TextLayerStats(char_count=500, valid_ratio=1.0, image_coverage=0.1).usable
+
+    def test_too_few_chars(self):
+        assert not TextLayerStats(char_count=3, valid_ratio=1.0, image_coverage=0.0).usable
+
+    def test_garbled_text(self):
+        assert not TextLayerStats(char_count=500, valid_ratio=0.5, image_coverage=0.0).usable
+
+    def test_image_dominated_page(self):
+        assert not TextLayerStats(char_count=500, valid_ratio=1.0, image_coverage=0.9).usable
+
+    def test_page_with_rules_or_drawings(self):
+        stats = TextLayerStats(char_count=500, valid_ratio=1.0, image_coverage=0.0, path_count=3)
+        assert not stats.usable
+
+    def test_header_and_footnote_rules_allowed(self):
+        stats = TextLayerStats(char_count=500, valid_ratio=1.0, image_coverage=0.0, path_count=2)
+        assert stats.usable
+
+
+class TestIsValidChar:
+    @pytest.mark.parametrize('char', ['a', '가', '1', '.', '∑'])
+    def test_real_text(self, char):
+        assert _is_valid_char(char)
+
+    @pytest.mark.parametrize('char', ['\ufffd', '\ue000', '\x02'])
+    def test_undecodable(self, char):
+        assert not _is_valid_char(char)
+
+
+class TestFindTextLayerPages:
+    def test_image_only_pdf_has_no_text_pages(self, tmp_path):
+        pdf_path = tmp_path / 'scan.pdf'
+        Image.new('RGB', (600, 800), color='white').save(pdf_path)
+
+        assert find_text_layer_pages(pdf_path, [0]) == set()
+
+    @pytest.mark.skipif(not SAMPLE_PDF.exists(), reason='sample PDF not available')
+    def test_born_digital_pdf(self):
+        # Pages 0 and 3 are plain text; page 4 has a ruled table, page 6 more rules
+        assert find_text_layer_pages(SAMPLE_PDF, [0, 3, 4, 6]) == {0, 3}
+
+
+def _line(text, x, y, step=10.0):
+    return [PdfChar(char=c, center=(x + i * step, y)) for i, c in enumerate(text)]
+
+
+class TestCharGrid:
+    def test_keeps_words_and_lines(self):
+        chars = [*_line('ab cd', 10, 10), PdfChar('\r', (0, 0)), PdfChar('\n', (0, 0))]
+        chars += _line('ef', 10, 30)
+        grid = CharGrid(chars, cell=16)
+
+        assert grid.text_in((0, 0, 100, 40)) == 'ab cd\nef'
+
+    def test_only_chars_inside_box(self):
+        chars = [*_line('left', 10, 10), PdfChar(' ', (0, 0)), *_line('right', 200, 10)]
+        grid = CharGrid(chars, cell=16)
+
+        assert grid.text_in((190, 0, 400, 20)) == 'right'
+        assert grid.text_in((0, 100, 400, 200)) == ''
+
+    def test_skipped_chars_become_a_space(self):
+        chars = _line('a', 10, 10) + _line('X', 500, 10) + _line('b', 20, 10)
+        assert CharGrid(chars, cell=16).text_in((0, 0, 100, 20)) == 'a b'
+
+
+class TestPdfRegionTextSource:
+    def test_unknown_page_image_has_no_text(self, tmp_path):
+        source = PdfRegionTextSource(tmp_path / 'doc.pdf', {})
+        assert source.region_text(tmp_path / 'other.png', (0, 0, 10, 10)) == ''
+
+    @pytest.mark.skipif(not SAMPLE_PDF.exists(), reason='sample PDF not available')
+    def test_region_text_from_sample_pdf(self, tmp_path):
+        image_path = tmp_path / 'p1.png'
+        # 612pt wide page rendered at 2x
+        Image.new('RGB', (1224, 1584), color='white').save(image_path)
+        source = PdfRegionTextSource(SAMPLE_PDF, {image_path: 0})
+
+        text = source.region_text(image_path, (100, 160, 1200, 200))
+
+        assert text == 'Learning to Reason in 13 Parameters'
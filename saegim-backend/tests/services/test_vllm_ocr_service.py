@@ -4,7 +4,10 @@ import json
 from unittest.mock import MagicMock, patch
 
 import pytest
+from PIL import Image
 
+from saegim.services.adapters.chandra import ChandraAdapter
+from saegim.services.image_encoding import ImageEncoding
 from saegim.services.vllm_ocr_service import (
     VllmOcrProvider,
     VllmTextOcrProvider,
@@ -54,6 +57,110 @@ class TestVllmOcrProvider:
         assert det['poly'] == [50.0, 100.0, 500.0, 100.0, 500.0, 300.0, 50.0, 300.0]
         assert det['text'] == 'Hello world'
 
+    def test_extract_page_downscales_and_rescales_coordinates(self, tmp_path):
+        image_path = tmp_path / 'test.png'
+        Image.new('RGB', (800, 1200), color='white').save(image_path, format='PNG')
+
+        adapter = ChandraAdapter()
+        adapter.image_encoding = ImageEncoding(format='jpeg', max_side=600)
+
+        elements = [{'category_type': 'text_block', 'bbox': [50, 100, 200, 300], 'order': 0}]
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            'choices': [{'message': {'content': json.dumps(elements)}}],
+        }
+        mock_response.raise_for_status = MagicMock()
+
+        with patch('saegim.services.vllm_ocr_service.httpx.Client') as mock_client_cls:
+            mock_client = MagicMock()
+            mock_client.__enter__ = MagicMock(return_value=mock_client)
+            mock_client.__exit__ = MagicMock(return_value=False)
+            mock_client.post.return_value = mock_response
+            mock_client_cls.return_value = mock_client
+
+            provider = VllmOcrProvider(model='test-model', adapter=adapter)
+            result = provider.extract_page(image_path, page_width=800, page_height=1200)
+
+        payload = mock_client.post.call_args.kwargs['json']
+        content = payload['messages'][0]['content']
+        assert '(width: 400, height: 600)' in content[0]['text']
+        assert content[1]['image_url']['url'].startswith('data:image/jpeg;base64,')
+        # Model saw a 400x600 image; coordinates are scaled back by 2x
+        det = result['layout_dets'][0]
+        assert det['poly'] == [100.0, 200.0, 400.0, 200.0, 400.0, 600.0, 100.0, 600.0]
+
+    def test_extract_page_streaming_publishes_partials(self, tmp_path):
+        image_path = tmp_path / 'test.png'
+        image_path.write_bytes(b'\x89PNG\r\n\x1a\nfake image data')
+
+        deltas = [
+            '[{"category_type": "title", "bbox": [1, 2, 3, 4], "text": "A"}',
+            ', {"category_type": "text_block", "bbox": [5, 6, 7, 8], "text": "B',
+            '"}]',
+        ]
+        lines = [f'data: {json.dumps({"choices": [{"delta": {"content": d}}]})}' for d in deltas]
+        lines = [': keep-alive', *lines, 'data: [DONE]']
+
+        mock_response = MagicMock()
+        mock_response.is_error = False
+        mock_response.iter_lines.return_value = iter(lines)
+        mock_stream = MagicMock()
+        mock_stream.__enter__ = MagicMock(return_value=mock_response)
+        mock_stream.__exit__ = MagicMock(return_value=False)
+
+        partials = []
+        with (
+            patch('saegim.services.vllm_ocr_service.httpx.Client') as mock_client_cls,
+            patch('saegim.services.vllm_ocr_service._PARTIAL_INTERVAL_S', 0.0),
+        ):
+            mock_client = MagicMock()
+            mock_client.__enter__ = MagicMock(return_value=mock_client)
+            mock_client.__exit__ = MagicMock(return_value=False)
+            mock_client.stream.return_value = mock_stream
+            mock_client_cls.return_value = mock_client
+
+            provider = VllmOcrProvider(model='test-model')
+            result = provider.extract_page(
+                image_path, page_width=800, page_height=1200, on_partial=partials.append
+            )
+
+        assert mock_client.stream.call_args.kwargs['json']['stream'] is True
+        assert partials
+        assert all(p['extra']['partial'] is True for p in partials)
+        assert [d['text'] for d in partials[0]['layout_dets']] == ['A']
+        assert [d['text'] for d in result['layout_dets']] == ['A', 'B']
+        assert 'partial' not in result['extra']
+
+    def test_extract_page_streaming_api_error(self, tmp_path):
+        import httpx
+
+        image_path = tmp_path / 'test.png'
+        image_path.write_bytes(b'\x89PNG\r\n\x1a\nfake')
+
+        mock_response = MagicMock()
+        mock_response.is_error = True
+        mock_response.status_code = 503
+        mock_response.text = 'Service Unavailable'
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            'error', request=MagicMock(), response=mock_response
+        )
+        mock_stream = MagicMock()
+        mock_stream.__enter__ = MagicMock(return_value=mock_response)
+        mock_stream.__exit__ = MagicMock(return_value=False)
+
+        with patch('saegim.services.vllm_ocr_service.httpx.Client') as mock_client_cls:
+            mock_client = MagicMock()
+            mock_client.__enter__ = MagicMock(return_value=mock_client)
+            mock_client.__exit__ = MagicMock(return_value=False)
+            mock_client.stream.return_value = mock_stream
+            mock_client_cls.return_value = mock_client
+
+            provider = VllmOcrProvider(model='test-model')
+            with pytest.raises(RuntimeError, match='503'):
+                provider.extract_page(image_path, 800, 1200, on_partial=MagicMock())
+
+        mock_response.read.assert_called_once()
+
     def test_extract_page_api_error(self, tmp_path):
         import httpx
 
@@ -152,6 +259,27 @@ class TestVllmTextOcrProvider:
         assert result == 'Extracted text'
         mock_client.post.assert_called_once()
 
+    @patch('saegim.services.vllm_ocr_service.httpx.Client')
+    def test_extract_text_uses_detected_mime_type(self, mock_client_cls):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            'choices': [{'message': {'content': 'text'}}],
+        }
+        mock_response.raise_for_status = MagicMock()
+
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.post.return_value = mock_response
+        mock_client_cls.return_value = mock_client
+
+        provider = VllmTextOcrProvider()
+        provider.extract_text(b'\xff\xd8\xff\xe0fake-jpeg', 'text_block')
+
+        payload = mock_client.post.call_args.kwargs['json']
+        image_url = payload['messages'][0]['content'][1]['image_url']['url']
+        assert image_url.startswith('data:image/jpeg;base64,')
+
     @patch('saegim.services.vllm_ocr_service.httpx.Client')
     def test_extract_text_api_error(self, mock_client_cls):
         import httpx
@@ -16,6 +16,7 @@ class TestBootstrapDefaultAdmin:
         with (
             patch('saegim.app.create_pool', new_callable=AsyncMock, return_value=fake_pool),
             patch('saegim.app.close_pool', new_callable=AsyncMock),
+            patch('saegim.app.get_change_feed', return_value=AsyncMock()),
             patch(
                 'saegim.repositories.user_repo.count_all', new_callable=AsyncMock, return_value=0
             ),
@@ -42,6 +43,7 @@ class TestBootstrapDefaultAdmin:
         with (
             patch('saegim.app.create_pool', new_callable=AsyncMock, return_value=fake_pool),
             patch('saegim.app.close_pool', new_callable=AsyncMock),
+            patch('saegim.app.get_change_feed', return_value=AsyncMock()),
             patch(
                 'saegim.repositories.user_repo.count_all', new_callable=AsyncMock, return_value=3
             ),
@@ -145,16 +145,18 @@ export const api = {
       body: body ? JSON.stringify(body) : undefined,
     }),
 
-  put: <T>(path: string, body?: unknown) =>
+  put: <T>(path: string, body?: unknown, headers?: Record<string, string>) =>
     request<T>(path, {
       method: 'PUT',
       body: body ? JSON.stringify(body) : undefined,
+      headers,
     }),
 
-  patch: <T>(path: string, body?: unknown) =>
+  patch: <T>(path: string, body?: unknown, headers?: Record<string, string>) =>
     request<T>(path, {
       method: 'PATCH',
       body: body ? JSON.stringify(body) : undefined,
+      headers,
     }),
 
   delete: <T>(path: string, body?: unknown) =>
@@ -163,6 +165,14 @@ export const api = {
       body: body ? JSON.stringify(body) : undefined,
     }),
 
+  /** For streamed responses (e.g., server-sent events). Returns the raw Response. */
+  stream: (path: string, signal?: AbortSignal) =>
+    requestRaw(path, {
+      method: 'GET',
+      headers: { Accept: 'text/event-stream' },
+      signal,
+    }),
+
   /** For multipart uploads (e.g., PDF files). Does NOT set Content-Type. */
   upload: (path: string, formData: FormData) =>
     requestRaw(path, {
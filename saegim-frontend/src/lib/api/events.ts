@@ -0,0 +1,64 @@
+/**
+ * Real-time change events (server-sent events over fetch, so the Bearer token is sent).
+ */
+
+import { api } from './client'
+import type { ChangeEvent, ChangeTopics } from './types'
+
+/**
+ * Parse complete SSE messages from a text buffer.
+ * Returns the parsed events and the unconsumed remainder.
+ */
+export function parseChangeEvents(buffer: string): {
+  readonly events: readonly ChangeEvent[]
+  readonly rest: string
+} {
+  const messages = buffer.replace(/\r\n/g, '\n').split('\n\n')
+  const rest = messages.pop() ?? ''
+  const events: ChangeEvent[] = []
+  for (const message of messages) {
+    const data = message
+      .split('\n')
+      .filter((line) => line.startsWith('data:'))
+      .map((line) => line.slice(5).trimStart())
+      .join('\n')
+    if (data) {
+      events.push(JSON.parse(data) as ChangeEvent)
+    }
+  }
+  return { events, rest }
+}
+
+/**
+ * Stream change events for a page, document or project until the signal aborts.
+ * Resolves when the stream ends; rejects with ApiError/NetworkError if it cannot be opened.
+ */
+export async function subscribeChanges(
+  topics: ChangeTopics,
+  onEvent: (event: ChangeEvent) => void,
+  signal: AbortSignal,
+): Promise<void> {
+  const params = new URLSearchParams()
+  for (const [key, value] of Object.entries(topics)) {
+    if (value) params.set(key, value)
+  }
+  const res = await api.stream(`/api/v1/events?${params}`, signal)
+  if (!res.body) return
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  try {
+    for (;;) {
+      const { value, done } = await reader.read()
+      if (done) return
+      const parsed = parseChangeEvents(buffer + value)
+      buffer = parsed.rest
+      parsed.events.forEach(onEvent)
+    }
+  } catch (error) {
+    if (signal.aborted) return
+    throw error
+  } finally {
+    reader.releaseLock()
+  }
+}
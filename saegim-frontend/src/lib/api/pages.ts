@@ -4,6 +4,9 @@
 
 import { api } from './client'
 import type {
+  JsonPatchOperation,
+  PageMutationResponse,
+  PagePatchResponse,
   PageResponse,
   ReviewRequest,
   SavePageAttributesRequest,
@@ -14,15 +17,33 @@ export async function getPage(pageId: string): Promise<PageResponse> {
   return api.get<PageResponse>(`/api/v1/pages/${pageId}`)
 }
 
-export async function savePage(pageId: string, data: SavePageRequest): Promise<void> {
-  await api.put(`/api/v1/pages/${pageId}`, data)
+/** Page version as an If-Match header, so a stale save fails with 412. */
+function ifMatch(version?: number): Record<string, string> | undefined {
+  return version === undefined ? undefined : { 'If-Match': `"${version}"` }
+}
+
+export async function savePage(
+  pageId: string,
+  data: SavePageRequest,
+  version?: number,
+): Promise<PageResponse> {
+  return api.put<PageResponse>(`/api/v1/pages/${pageId}`, data, ifMatch(version))
+}
+
+/** Save annotation changes as a JSON Patch instead of the whole document. */
+export async function patchPage(
+  pageId: string,
+  operations: readonly JsonPatchOperation[],
+  version?: number,
+): Promise<PagePatchResponse> {
+  return api.patch<PagePatchResponse>(`/api/v1/pages/${pageId}`, operations, ifMatch(version))
 }
 
 export async function savePageAttributes(
   pageId: string,
   data: SavePageAttributesRequest,
-): Promise<void> {
-  await api.put(`/api/v1/pages/${pageId}/attributes`, data)
+): Promise<PageMutationResponse> {
+  return api.put<PageMutationResponse>(`/api/v1/pages/${pageId}/attributes?view=minimal`, data)
 }
 
 export async function acceptExtraction(pageId: string): Promise<PageResponse> {
@@ -34,12 +55,12 @@ export async function forceAcceptExtraction(pageId: string): Promise<PageRespons
   return api.post<PageResponse>(`/api/v1/pages/${pageId}/force-accept-extraction`)
 }
 
-/** Update reading order of layout elements. */
+/** Update reading order of layout elements. Returns only the new page version. */
 export async function updateReadingOrder(
   pageId: string,
   orderMap: Record<string, number>,
-): Promise<PageResponse> {
-  return api.put<PageResponse>(`/api/v1/pages/${pageId}/reading-order`, {
+): Promise<PageMutationResponse> {
+  return api.put<PageMutationResponse>(`/api/v1/pages/${pageId}/reading-order?view=minimal`, {
     order_map: orderMap,
   })
 }
@@ -2,7 +2,7 @@
  * API request/response type definitions matching the backend schemas.
  */
 
-import type { AnnotationData, PageAttribute } from '$lib/types/omnidocbench'
+import type { AnnotationData, LayoutElement, PageAttribute } from '$lib/types/omnidocbench'
 
 // --- Projects ---
 
@@ -20,28 +20,55 @@ export interface CreateProjectRequest {
 
 // --- OCR Config (multi-instance engine registry) ---
 
-export type EngineType = 'commercial_api' | 'vllm' | 'split_pipeline' | 'pdfminer'
-export type RegisterableEngineType = 'commercial_api' | 'vllm' | 'split_pipeline'
+export type EngineType = 'commercial_api' | 'vllm' | 'split_pipeline' | 'ensemble' | 'pdfminer'
+export type RegisterableEngineType = 'commercial_api' | 'vllm' | 'split_pipeline' | 'ensemble'
 export type CommercialApiProvider = 'gemini' | 'vllm'
 export type SplitPipelineOcrProvider = 'gemini' | 'vllm'
-export type SplitPipelineLayoutProvider = 'docling' | 'pp_doclayout'
+export type SplitPipelineLayoutProvider =
+  | 'docling'
+  | 'pp_doclayout'
+  | 'pp_doclayout_onnx'
+  | 'pp_doclayout_onnx_int8'
 
-export interface CommercialApiConfig {
+export type CropImageFormat = 'png' | 'jpeg' | 'webp'
+
+export interface CropEncodingConfig {
+  readonly crop_format?: CropImageFormat
+  readonly crop_quality?: number
+  readonly crop_max_side?: number | null
+  readonly crop_grayscale?: boolean
+}
+
+export interface PageRoutingConfig {
+  readonly text_layer_routing?: boolean
+  readonly skip_blank_pages?: boolean
+  readonly reuse_duplicate_pages?: boolean
+}
+
+export interface CommercialApiConfig extends CropEncodingConfig, PageRoutingConfig {
   readonly provider: CommercialApiProvider
   readonly api_key?: string
   readonly model: string
   readonly prompt?: string
 }
 
-export interface VllmServerConfig {
+export interface VllmServerConfig extends CropEncodingConfig, PageRoutingConfig {
   readonly host: string
   readonly port: number
   readonly model?: string
 }
 
-export interface SplitPipelineConfig {
+export interface SplitPipelineConfig extends CropEncodingConfig, PageRoutingConfig {
   readonly layout_provider?: SplitPipelineLayoutProvider
   readonly docling_model_name: string
+  readonly layout_batch_size?: number
+  readonly layout_device?: string | null
+  readonly layout_num_threads?: number | null
+  readonly layout_interop_threads?: number | null
+  readonly layout_max_concurrency?: number | null
+  readonly layout_server_url?: string
+  readonly text_layer_regions?: boolean
+  readonly reuse_repeated_regions?: boolean
   readonly ocr_provider: SplitPipelineOcrProvider
   readonly ocr_api_key?: string
   readonly ocr_host?: string
@@ -49,6 +76,13 @@ export interface SplitPipelineConfig {
   readonly ocr_model?: string
 }
 
+export interface EnsembleConfig extends PageRoutingConfig {
+  readonly engine_ids: readonly string[]
+  readonly box_engine_id?: string
+  readonly text_preferences?: Readonly<Record<string, readonly string[]>>
+  readonly iou_threshold?: number
+}
+
 export interface EngineInstance {
   readonly engine_type: RegisterableEngineType
   readonly name: string
@@ -124,6 +158,42 @@ export interface DocumentStatusResponse {
   readonly processed_pages: number
 }
 
+// --- Change events ---
+
+export interface PageChangeEvent {
+  readonly kind: 'page'
+  readonly op: 'insert' | 'update'
+  readonly page_id: string
+  readonly document_id: string
+  readonly project_id: string
+  readonly status: PageStatus
+  readonly version: number
+  readonly assigned_to: string | null
+  readonly locked: boolean
+}
+
+export interface DocumentChangeEvent {
+  readonly kind: 'document'
+  readonly op: 'insert' | 'update' | 'delete'
+  readonly document_id: string
+  readonly project_id: string
+  readonly status: DocumentStatus
+  readonly total_pages: number
+}
+
+/** Sent after the server reconnects to the database; events may have been missed. */
+export interface ResyncEvent {
+  readonly kind: 'resync'
+}
+
+export type ChangeEvent = PageChangeEvent | DocumentChangeEvent | ResyncEvent
+
+export interface ChangeTopics {
+  readonly page_id?: string
+  readonly document_id?: string
+  readonly project_id?: string
+}
+
 // --- Pages ---
 
 export type PageStatus = 'pending' | 'in_progress' | 'submitted' | 'reviewed'
@@ -140,13 +210,32 @@ export interface PageResponse {
   readonly pdf_url: string
   readonly annotation_data: AnnotationData
   readonly auto_extracted_data: AnnotationData | null
+  /** Elements received so far while an extraction is streaming. */
+  readonly partial_extracted_data?: AnnotationData | null
   readonly status: PageStatus
   readonly assigned_to?: string | null
+  readonly version: number
   readonly project_id?: string
   readonly project_name?: string
   readonly document_filename?: string
 }
 
+export interface ExtractionResultSummary {
+  readonly id: string
+  readonly page_id: string
+  readonly engine_key: string
+  readonly engine_type: string
+  readonly engine_id: string | null
+  readonly duration_ms: number | null
+  readonly element_count: number
+  readonly created_at: string
+  readonly updated_at: string
+}
+
+export interface ExtractionResultResponse extends ExtractionResultSummary {
+  readonly result: AnnotationData
+}
+
 export interface PageSummary {
   readonly id: string
   readonly page_no: number
@@ -157,6 +246,34 @@ export interface SavePageRequest {
   readonly annotation_data: AnnotationData
 }
 
+/** RFC 6902 JSON Patch operation against annotation_data. */
+export type JsonPatchOperation =
+  | { readonly op: 'add' | 'replace' | 'test'; readonly path: string; readonly value: unknown }
+  | { readonly op: 'remove'; readonly path: string }
+  | { readonly op: 'move' | 'copy'; readonly from: string; readonly path: string }
+
+export interface PagePatchResponse {
+  readonly id: string
+  readonly status: PageStatus
+  readonly updated_at: string
+  readonly version: number
+  readonly applied: number
+}
+
+/** Sparse result of a page edit requested with `?view=minimal`. */
+export interface PageMutationResponse {
+  readonly id: string
+  readonly status: PageStatus
+  readonly updated_at: string
+  readonly version: number
+  readonly element?: LayoutElement | null
+  readonly anno_id?: number | null
+  readonly relation?: Record<string, unknown> | null
+  readonly page_attribute?: PageAttribute | null
+  readonly order_map?: Record<string, number> | null
+  readonly created_anno_ids?: readonly number[] | null
+}
+
 export interface SavePageAttributesRequest {
   readonly page_attribute: PageAttribute
 }
@@ -0,0 +1,68 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest'
+import { parseChangeEvents, subscribeChanges } from '$lib/api/events'
+import type { ChangeEvent } from '$lib/api/types'
+
+const mockFetch = vi.fn()
+
+beforeEach(() => {
+  vi.stubGlobal('fetch', mockFetch)
+})
+
+afterEach(() => {
+  vi.restoreAllMocks()
+})
+
+const documentEvent = {
+  kind: 'document',
+  op: 'update',
+  document_id: 'd1',
+  project_id: 'proj1',
+  status: 'ready',
+  total_pages: 3,
+}
+
+function sseResponse(chunks: readonly string[]): Response {
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      const encoder = new TextEncoder()
+      chunks.forEach((chunk) => controller.enqueue(encoder.encode(chunk)))
+      controller.close()
+    },
+  })
+  return new Response(stream, {
+    status: 200,
+    headers: { 'Content-Type': 'text/event-stream' },
+  })
+}
+
+describe('parseChangeEvents', () => {
+  it('parses complete messages and keeps the remainder', () => {
+    const buffer =
+      'retry: 5000\n\n: keepalive\n\n' +
+      `event: document\ndata: ${JSON.stringify(documentEvent)}\n\nevent: pa`
+
+    const { events, rest } = parseChangeEvents(buffer)
+
+    expect(events).toEqual([documentEvent])
+    expect(rest).toBe('event: pa')
+  })
+})
+
+describe('subscribeChanges', () => {
+  it('delivers events split across chunks', async () => {
+    const message = `event: document\ndata: ${JSON.stringify(documentEvent)}\n\n`
+    mockFetch.mockResolvedValueOnce(
+      sseResponse(['retry: 5000\n\n', message.slice(0, 20), message.slice(20)]),
+    )
+    const received: ChangeEvent[] = []
+
+    await subscribeChanges(
+      { project_id: 'proj1' },
+      (event) => received.push(event),
+      new AbortController().signal,
+    )
+
+    expect(received).toEqual([documentEvent])
+    expect(mockFetch.mock.calls[0][0]).toContain('/api/v1/events?project_id=proj1')
+  })
+})